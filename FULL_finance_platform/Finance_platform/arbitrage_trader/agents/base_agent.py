@@ -20,6 +20,10 @@ from ..models.types import (
 class BaseAgent(ABC):
     """Base class for all arbitrage detection agents."""
 
+    # CPU-bound agents are run on the orchestrator's detector thread pool so
+    # they do not block latency-critical agents on the event loop
+    cpu_bound = False
+
     def __init__(
         self,
         agent_id: str,
@@ -17,6 +17,8 @@ from ..models.types import (
 class StatisticalArbitrageAgent(BaseAgent):
     """Agent specialized in detecting statistical arbitrage opportunities."""
 
+    cpu_bound = True
+
     def __init__(self, agent_id: str = "statistical_agent", config: dict = None):
         """
         Initialize statistical arbitrage agent.
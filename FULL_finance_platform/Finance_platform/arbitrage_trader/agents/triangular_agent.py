@@ -38,7 +38,15 @@ class TriangularArbitrageAgent(BaseAgent):
 
         # Initialize detector
         min_profit = Decimal(self.config.get("min_profit_threshold", "0.001"))
-        self.detector = TriangularArbitrageDetector(min_profit_threshold=min_profit)
+        self.detector = TriangularArbitrageDetector(
+            min_profit_threshold=min_profit,
+            enable_cycle_search=self.config.get("enable_cycle_search", False),
+            max_cycle_length=self.config.get("max_cycle_length", 6),
+            max_quote_age=self.config.get("max_quote_age", 10.0)
+        )
+
+        # Bellman-Ford cycle search is heavy enough to run off the event loop
+        self.cpu_bound = self.detector.enable_cycle_search
 
     async def on_start(self):
         """Called when agent starts."""
@@ -2,7 +2,7 @@
 
 from .cross_exchange import CrossExchangeDetector
 from .statistical import StatisticalArbitrageDetector
-from .triangular import TriangularArbitrageDetector
+from .triangular import TriangularArbitrageDetector, CurrencyGraph
 from .order_book_analysis import OrderBookAnalyzer, OrderBook, OrderBookLevel
 from .market_microstructure import MicrostructureAnalyzer
 from .ml_prediction import MLArbitragePredictor
@@ -18,6 +18,7 @@ from .execution_algorithms import (
     ExecutionManager
 )
 from .correlation_analysis import CorrelationAnalyzer
+from .rolling_statistics import RollingStatistics
 from .risk_models import RiskCalculator
 
 __all__ = [
@@ -25,6 +26,7 @@ __all__ = [
     "CrossExchangeDetector",
     "StatisticalArbitrageDetector",
     "TriangularArbitrageDetector",
+    "CurrencyGraph",
 
     # Market Analysis
     "OrderBookAnalyzer",
@@ -46,5 +48,6 @@ __all__ = [
 
     # Risk & Correlation
     "CorrelationAnalyzer",
+    "RollingStatistics",
     "RiskCalculator"
 ]
@@ -9,6 +9,7 @@ from scipy import stats
 from collections import deque
 import uuid
 
+from .rolling_statistics import RollingStatistics
 from ..models.types import (
     MarketData,
     ArbitrageOpportunity,
@@ -34,6 +35,9 @@ class CorrelationAnalyzer:
         # Historical price storage
         self.price_history: Dict[str, deque] = {}
 
+        # Time-aligned rolling window backing correlations and spread z-scores
+        self.statistics = RollingStatistics(window=self.lookback_period)
+
         # Correlation matrix cache
         self.correlation_matrix: Dict[Tuple[str, str], Decimal] = {}
         self.last_update: Optional[datetime] = None
@@ -45,6 +49,8 @@ class CorrelationAnalyzer:
         Args:
             market_data: List of market data
         """
+        prices = {}
+
         for data in market_data:
             key = f"{data.exchange}:{data.symbol}"
 
@@ -55,6 +61,9 @@ class CorrelationAnalyzer:
                 "timestamp": data.timestamp,
                 "price": float(data.mid_price)
             })
+            prices[key] = float(data.mid_price)
+
+        self.statistics.update(prices)
 
     def calculate_correlation(
         self,
@@ -71,23 +80,20 @@ class CorrelationAnalyzer:
         Returns:
             Correlation coefficient (-1 to 1) or None
         """
-        if (asset1 not in self.price_history or
-            asset2 not in self.price_history):
+        if asset1 not in self.statistics or asset2 not in self.statistics:
             return None
 
-        prices1 = [p["price"] for p in self.price_history[asset1]]
-        prices2 = [p["price"] for p in self.price_history[asset2]]
+        if asset1 == asset2:
+            return Decimal(1)
 
-        if len(prices1) < 2 or len(prices2) < 2:
-            return None
+        # Pearson correlation over the ticks both assets share
+        correlation = self.statistics.correlation(
+            np.array([self.statistics.column(asset1)]),
+            np.array([self.statistics.column(asset2)])
+        )[0]
 
-        # Align lengths
-        min_len = min(len(prices1), len(prices2))
-        prices1 = prices1[-min_len:]
-        prices2 = prices2[-min_len:]
-
-        # Calculate Pearson correlation
-        correlation = np.corrcoef(prices1, prices2)[0, 1]
+        if np.isnan(correlation):
+            return None
 
         return Decimal(str(correlation))
 
@@ -147,19 +153,14 @@ class CorrelationAnalyzer:
         Returns:
             Dictionary of (asset1, asset2) -> correlation
         """
-        assets = list(self.price_history.keys())
+        assets = self.statistics.keys
+        correlation = self.statistics.correlation_matrix()
 
         matrix = {}
 
-        for i, asset1 in enumerate(assets):
-            for asset2 in assets[i:]:
-                if asset1 == asset2:
-                    matrix[(asset1, asset2)] = Decimal(1)
-                else:
-                    corr = self.calculate_correlation(asset1, asset2)
-                    if corr is not None:
-                        matrix[(asset1, asset2)] = corr
-                        matrix[(asset2, asset1)] = corr  # Symmetric
+        rows, cols = np.nonzero(~np.isnan(correlation))
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            matrix[(assets[i], assets[j])] = Decimal(str(correlation[i, j]))
 
         self.correlation_matrix = matrix
         self.last_update = datetime.now()
@@ -179,29 +180,25 @@ class CorrelationAnalyzer:
         Returns:
             List of highly correlated pairs
         """
-        if not self.correlation_matrix:
-            self.build_correlation_matrix()
-
-        pairs = []
-
-        processed = set()
-
-        for (asset1, asset2), corr in self.correlation_matrix.items():
-            if asset1 == asset2:
-                continue
-
-            pair_key = tuple(sorted([asset1, asset2]))
-            if pair_key in processed:
-                continue
-
-            if abs(corr) >= threshold:
-                pairs.append({
-                    "asset1": asset1,
-                    "asset2": asset2,
-                    "correlation": float(corr),
-                    "type": "positive" if corr > 0 else "negative"
-                })
-                processed.add(pair_key)
+        assets = self.statistics.keys
+        correlation = self.statistics.correlation_matrix()
+
+        rows, cols = np.triu_indices(len(assets), k=1)
+        values = correlation[rows, cols]
+        with np.errstate(invalid="ignore"):
+            selected = np.abs(values) >= float(threshold)
+
+        pairs = [
+            {
+                "asset1": assets[i],
+                "asset2": assets[j],
+                "correlation": corr,
+                "type": "positive" if corr > 0 else "negative"
+            }
+            for i, j, corr in zip(
+                rows[selected].tolist(), cols[selected].tolist(), values[selected].tolist()
+            )
+        ]
 
         # Sort by absolute correlation
         pairs.sort(key=lambda x: abs(x["correlation"]), reverse=True)
@@ -353,20 +350,28 @@ class CorrelationAnalyzer:
         Returns:
             List of cointegrated pairs
         """
-        assets = list(self.price_history.keys())
+        assets = self.statistics.keys
         cointegrated_pairs = []
 
-        for i, asset1 in enumerate(assets):
-            for asset2 in assets[i+1:]:
-                result = self.calculate_cointegration(asset1, asset2)
-
-                if result and result["cointegrated"]:
-                    # Calculate confidence based on half-life and z-score stability
-                    confidence = min(1.0, 1.0 / (1.0 + result["half_life"] / 20.0))
-
-                    if confidence >= min_confidence:
-                        result["confidence"] = confidence
-                        cointegrated_pairs.append(result)
+        # Screen all pairs at once: cointegration requires |z| < 3 on the
+        # current spread, so only survivors need the half-life regression
+        counts = self.statistics.counts()
+        rows, cols = np.triu_indices(len(assets), k=1)
+        enough = (counts[rows] >= 20) & (counts[cols] >= 20)
+        rows, cols = rows[enough], cols[enough]
+        z_scores, _, _ = self.statistics.pair_spreads(rows, cols)
+        candidates = np.isnan(z_scores) | (np.abs(z_scores) < 3)
+
+        for i, j in zip(rows[candidates].tolist(), cols[candidates].tolist()):
+            result = self.calculate_cointegration(assets[i], assets[j])
+
+            if result and result["cointegrated"]:
+                # Calculate confidence based on half-life and z-score stability
+                confidence = min(1.0, 1.0 / (1.0 + result["half_life"] / 20.0))
+
+                if confidence >= min_confidence:
+                    result["confidence"] = confidence
+                    cointegrated_pairs.append(result)
 
         # Sort by confidence
         cointegrated_pairs.sort(key=lambda x: x["confidence"], reverse=True)
@@ -16,8 +16,7 @@ from ..models.types import (
 )
 
 
-class MLArbitragePr
-edictor:
+class MLArbitragePredictor:
     """ML-based arbitrage opportunity predictor."""
 
     def __init__(self, config: dict = None):
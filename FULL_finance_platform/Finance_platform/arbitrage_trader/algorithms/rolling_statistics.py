@@ -0,0 +1,277 @@
+"""
+Rolling price statistics shared by statistical arbitrage and correlation analysis.
+
+Price history lives in a ring-buffer NumPy matrix (window x symbols). Running
+sums and cross-products over the window are updated with O(N^2) vectorized
+work per tick, so the full correlation matrix, hedge ratios and spread
+z-scores are available without re-reading the history.
+"""
+from typing import List, Dict, Tuple
+import numpy as np
+
+
+class RollingStatistics:
+    """Incremental rolling means, correlations and pair spreads over a price window."""
+
+    def __init__(self, window: int = 20, initial_capacity: int = 16, rebuild_interval: int = None):
+        """
+        Initialize rolling statistics.
+
+        Args:
+            window: Number of ticks kept per symbol
+            initial_capacity: Initial number of symbol columns (grows as needed)
+            rebuild_interval: Ticks between exact recomputations of the running
+                              sums to bound floating point drift (default: window)
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2")
+
+        self.window = window
+        self.rebuild_interval = rebuild_interval or window
+
+        self.keys: List[str] = []
+        self._columns: Dict[str, int] = {}
+
+        # Ring buffer of prices (shifted by a per-symbol reference) and validity
+        self._capacity = initial_capacity
+        self._prices = np.zeros((window, initial_capacity))
+        self._valid = np.zeros((window, initial_capacity), dtype=bool)
+        self._reference = np.zeros(initial_capacity)
+        self._last = np.full(initial_capacity, np.nan)
+        self._position = 0
+        self._ticks_since_rebuild = 0
+
+        # Running sums over rows where both symbols are valid:
+        # n[i, j], sum x_i, sum x_i^2 and sum x_i * x_j
+        self._n = np.zeros((initial_capacity, initial_capacity))
+        self._sum = np.zeros((initial_capacity, initial_capacity))
+        self._sum_sq = np.zeros((initial_capacity, initial_capacity))
+        self._sum_cross = np.zeros((initial_capacity, initial_capacity))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+    def column(self, key: str) -> int:
+        """Get the matrix column of a symbol key."""
+        return self._columns[key]
+
+    def update(self, prices: Dict[str, float]):
+        """
+        Append one tick.
+
+        Symbols missing from this tick carry their last price forward so all
+        columns stay time-aligned.
+
+        Args:
+            prices: Dict of symbol key -> price
+        """
+        for key, price in prices.items():
+            col = self._columns.get(key)
+            if col is None:
+                col = self._add_column(key, price)
+            self._last[col] = price
+
+        n = len(self.keys)
+        valid = ~np.isnan(self._last[:n])
+        values = np.where(valid, self._last[:n] - self._reference[:n], 0.0)
+
+        # Evict the oldest row, then write the new one in its place
+        row = self._position
+        self._accumulate(self._prices[row, :n], self._valid[row, :n], sign=-1.0)
+        self._prices[row, :n] = values
+        self._valid[row, :n] = valid
+        self._accumulate(values, valid, sign=1.0)
+
+        self._position = (row + 1) % self.window
+        self._ticks_since_rebuild += 1
+        if self._ticks_since_rebuild >= self.rebuild_interval:
+            self.rebuild()
+
+    def rebuild(self):
+        """Recompute running sums exactly from the ring buffer."""
+        n = len(self.keys)
+        x = self._prices[:, :n]
+        m = self._valid[:, :n].astype(np.float64)
+        xm = x * m
+
+        self._n[:n, :n] = m.T @ m
+        self._sum[:n, :n] = xm.T @ m
+        self._sum_sq[:n, :n] = (xm * x).T @ m
+        self._sum_cross[:n, :n] = xm.T @ xm
+        self._ticks_since_rebuild = 0
+
+    def counts(self) -> np.ndarray:
+        """Number of ticks in the window for each symbol."""
+        n = len(self.keys)
+        return np.diag(self._n[:n, :n]).copy()
+
+    def last_prices(self) -> np.ndarray:
+        """Most recent price of each symbol."""
+        return self._last[:len(self.keys)].copy()
+
+    def mean(self) -> np.ndarray:
+        """Rolling mean price of each symbol."""
+        n = len(self.keys)
+        count = np.diag(self._n[:n, :n])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.diag(self._sum[:n, :n]) / count + self._reference[:n]
+
+    def std(self) -> np.ndarray:
+        """Rolling population standard deviation of each symbol."""
+        n = len(self.keys)
+        count = np.diag(self._n[:n, :n])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.diag(self._sum[:n, :n]) / count
+            variance = np.diag(self._sum_sq[:n, :n]) / count - mean ** 2
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    def pair_moments(
+        self,
+        rows: np.ndarray = None,
+        cols: np.ndarray = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pairwise moments over the ticks where both symbols are valid.
+
+        Args:
+            rows: Column indices of the first symbol of each pair (default: all)
+            cols: Column indices of the second symbol of each pair (default: all)
+
+        Returns:
+            (count, mean_i, mean_j, var_i, var_j, cov) for every (rows[k], cols[k])
+            pair, or (N, N) matrices when no indices are given. Means are in
+            reference-shifted units.
+        """
+        n = len(self.keys)
+        if rows is None:
+            index = (slice(0, n), slice(0, n))
+            transposed = index
+        else:
+            index = (rows, cols)
+            transposed = (cols, rows)
+
+        count = self._n[index]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_i = self._sum[index] / count
+            mean_j = self._sum[transposed] / count
+            if rows is None:
+                mean_j = mean_j.T
+            var_i = np.maximum(self._sum_sq[index] / count - mean_i ** 2, 0.0)
+            var_j = self._sum_sq[transposed] / count
+            if rows is None:
+                var_j = var_j.T
+            var_j = np.maximum(var_j - mean_j ** 2, 0.0)
+            cov = self._sum_cross[index] / count - mean_i * mean_j
+        return count, mean_i, mean_j, var_i, var_j, cov
+
+    def correlation_matrix(self) -> np.ndarray:
+        """
+        Pearson correlation of every symbol pair.
+
+        Returns:
+            (N, N) matrix, NaN where a pair has fewer than two common ticks or
+            zero variance
+        """
+        corr = self.correlation()
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def correlation(self, rows: np.ndarray = None, cols: np.ndarray = None) -> np.ndarray:
+        """
+        Pearson correlation of selected symbol pairs.
+
+        Args:
+            rows: Column indices of the first symbol of each pair (default: all)
+            cols: Column indices of the second symbol of each pair (default: all)
+
+        Returns:
+            Correlation per pair (or (N, N) matrix), NaN where a pair has fewer
+            than two common ticks or zero variance
+        """
+        count, _, _, var_i, var_j, cov = self.pair_moments(rows, cols)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.sqrt(var_i * var_j)
+        corr = np.where(count < 2, np.nan, corr)
+        return np.clip(corr, -1.0, 1.0)
+
+    def pair_spreads(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Hedge ratio, current spread and spread z-score for symbol pairs.
+
+        The hedge ratio regresses symbol rows[k] on symbol cols[k] and the
+        spread is price_row - hedge_ratio * price_col.
+
+        Args:
+            rows: Column indices of the first symbol of each pair
+            cols: Column indices of the second symbol of each pair
+
+        Returns:
+            (z_scores, current_spreads, hedge_ratios) arrays, z-score NaN where
+            the spread has zero variance
+        """
+        _, mean_i, mean_j, var_i, var_j, cov = self.pair_moments(rows, cols)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hedge_ratio = cov / var_j
+            spread_mean = mean_i - hedge_ratio * mean_j
+            spread_var = var_i - 2 * hedge_ratio * cov + hedge_ratio ** 2 * var_j
+            spread_std = np.sqrt(np.maximum(spread_var, 0.0))
+
+            last = self._last - self._reference
+            current = last[rows] - hedge_ratio * last[cols]
+            z_scores = (current - spread_mean) / spread_std
+
+            # Treat spreads that are flat up to rounding as zero variance
+            scale = np.sqrt(var_i) + np.abs(hedge_ratio) * np.sqrt(var_j)
+            z_scores[~(spread_std > 1e-9 * scale)] = np.nan
+
+        raw_spread = self._last[rows] - hedge_ratio * self._last[cols]
+        return z_scores, raw_spread, hedge_ratio
+
+    def _add_column(self, key: str, price: float) -> int:
+        """Register a new symbol, growing the matrices if needed."""
+        col = len(self.keys)
+        if col == self._capacity:
+            self._grow(self._capacity * 2)
+
+        self.keys.append(key)
+        self._columns[key] = col
+        # Shift by the first price seen to keep running sums well conditioned
+        self._reference[col] = price
+        self._last[col] = np.nan
+        return col
+
+    def _grow(self, capacity: int):
+        """Resize all per-symbol storage to a new column capacity."""
+        def widen(array: np.ndarray, shape: Tuple[int, ...], fill=0) -> np.ndarray:
+            grown = np.full(shape, fill, dtype=array.dtype)
+            grown[tuple(slice(0, s) for s in array.shape)] = array
+            return grown
+
+        self._prices = widen(self._prices, (self.window, capacity))
+        self._valid = widen(self._valid, (self.window, capacity), False)
+        self._reference = widen(self._reference, (capacity,))
+        self._last = widen(self._last, (capacity,), np.nan)
+        self._n = widen(self._n, (capacity, capacity))
+        self._sum = widen(self._sum, (capacity, capacity))
+        self._sum_sq = widen(self._sum_sq, (capacity, capacity))
+        self._sum_cross = widen(self._sum_cross, (capacity, capacity))
+        self._capacity = capacity
+
+    def _accumulate(self, values: np.ndarray, valid: np.ndarray, sign: float):
+        """Add (sign=1) or remove (sign=-1) one row from the running sums."""
+        n = len(values)
+        m = valid.astype(np.float64)
+        xm = values * m
+
+        self._n[:n, :n] += sign * np.outer(m, m)
+        self._sum[:n, :n] += sign * np.outer(xm, m)
+        self._sum_sq[:n, :n] += sign * np.outer(xm * values, m)
+        self._sum_cross[:n, :n] += sign * np.outer(xm, xm)
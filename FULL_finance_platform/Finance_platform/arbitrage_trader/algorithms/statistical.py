@@ -7,8 +7,8 @@ from decimal import Decimal
 from datetime import datetime
 import uuid
 import numpy as np
-from collections import deque
 
+from .rolling_statistics import RollingStatistics
 from ..models.types import (
     MarketData,
     ArbitrageOpportunity,
@@ -42,8 +42,8 @@ class StatisticalArbitrageDetector:
         self.z_score_exit_threshold = z_score_exit_threshold
         self.correlation_threshold = correlation_threshold
 
-        # Historical price data storage
-        self.price_history: Dict[str, deque] = {}
+        # Rolling price window shared by pair and mean reversion statistics
+        self.statistics = RollingStatistics(window=lookback_period)
 
     def detect_opportunities(
         self,
@@ -65,19 +65,18 @@ class StatisticalArbitrageDetector:
 
         # Find cointegrated pairs
         pairs = self._find_pairs(market_data)
+        data_by_symbol = {}
+        for data in market_data:
+            data_by_symbol.setdefault(data.symbol, data)
 
-        for pair in pairs:
-            symbol1, symbol2 = pair
-            data1 = next((d for d in market_data if d.symbol == symbol1), None)
-            data2 = next((d for d in market_data if d.symbol == symbol2), None)
-
-            if not data1 or not data2:
-                continue
+        spread_infos = self._calculate_spread_zscores(pairs)
 
-            # Calculate spread and z-score
-            spread_info = self._calculate_spread_zscore(symbol1, symbol2)
+        for pair, spread_info in zip(pairs, spread_infos):
+            symbol1, symbol2 = pair
+            data1 = data_by_symbol.get(symbol1)
+            data2 = data_by_symbol.get(symbol2)
 
-            if not spread_info:
+            if not data1 or not data2 or not spread_info:
                 continue
 
             z_score, spread, hedge_ratio = spread_info
@@ -97,16 +96,20 @@ class StatisticalArbitrageDetector:
         return opportunities
 
     def _update_price_history(self, market_data: List[MarketData]):
-        """Update historical price data."""
-        for data in market_data:
-            if data.symbol not in self.price_history:
-                self.price_history[data.symbol] = deque(maxlen=self.lookback_period)
-
-            self.price_history[data.symbol].append({
-                'timestamp': data.timestamp,
-                'price': float(data.mid_price),
-                'volume': float(data.bid_volume + data.ask_volume) / 2
-            })
+        """Append the latest mid prices to the rolling window."""
+        self.statistics.update({
+            data.symbol: float(data.mid_price) for data in market_data
+        })
+
+    def _valid_columns(self, symbols: List[str]) -> List[str]:
+        """Symbols with a full lookback window, in first-seen order."""
+        counts = self.statistics.counts()
+        valid = []
+        for symbol in dict.fromkeys(symbols):
+            if (symbol in self.statistics and
+                counts[self.statistics.column(symbol)] >= self.lookback_period):
+                valid.append(symbol)
+        return valid
 
     def _find_pairs(self, market_data: List[MarketData]) -> List[Tuple[str, str]]:
         """
@@ -115,30 +118,21 @@ class StatisticalArbitrageDetector:
         In a real implementation, this would use cointegration tests.
         For now, we use a simplified correlation-based approach.
         """
-        pairs = []
-        symbols = [d.symbol for d in market_data]
-
         # Check if we have enough historical data
-        valid_symbols = [
-            s for s in symbols
-            if s in self.price_history and len(self.price_history[s]) >= self.lookback_period
-        ]
-
-        for i, symbol1 in enumerate(valid_symbols):
-            for symbol2 in valid_symbols[i + 1:]:
-                # Calculate correlation
-                prices1 = [p['price'] for p in self.price_history[symbol1]]
-                prices2 = [p['price'] for p in self.price_history[symbol2]]
-
-                if len(prices1) < 2 or len(prices2) < 2:
-                    continue
+        valid_symbols = self._valid_columns([d.symbol for d in market_data])
+        if len(valid_symbols) < 2:
+            return []
 
-                correlation = np.corrcoef(prices1, prices2)[0, 1]
+        columns = np.array([self.statistics.column(s) for s in valid_symbols])
+        correlation = self.statistics.correlation_matrix()[np.ix_(columns, columns)]
 
-                if abs(correlation) >= self.correlation_threshold:
-                    pairs.append((symbol1, symbol2))
+        rows, cols = np.triu_indices(len(valid_symbols), k=1)
+        selected = np.abs(correlation[rows, cols]) >= self.correlation_threshold
 
-        return pairs
+        return [
+            (valid_symbols[i], valid_symbols[j])
+            for i, j in zip(rows[selected].tolist(), cols[selected].tolist())
+        ]
 
     def _calculate_spread_zscore(
         self,
@@ -151,32 +145,35 @@ class StatisticalArbitrageDetector:
         Returns:
             Tuple of (z_score, current_spread, hedge_ratio) or None
         """
-        if (symbol1 not in self.price_history or
-            symbol2 not in self.price_history or
-            len(self.price_history[symbol1]) < self.lookback_period or
-            len(self.price_history[symbol2]) < self.lookback_period):
+        if len(self._valid_columns([symbol1, symbol2])) < 2:
             return None
 
-        prices1 = np.array([p['price'] for p in self.price_history[symbol1]])
-        prices2 = np.array([p['price'] for p in self.price_history[symbol2]])
-
-        # Calculate hedge ratio using linear regression
-        hedge_ratio = np.polyfit(prices2, prices1, 1)[0]
-
-        # Calculate spread
-        spread = prices1 - hedge_ratio * prices2
+        return self._calculate_spread_zscores([(symbol1, symbol2)])[0]
 
-        # Calculate z-score
-        mean_spread = np.mean(spread)
-        std_spread = np.std(spread)
+    def _calculate_spread_zscores(
+        self,
+        pairs: List[Tuple[str, str]]
+    ) -> List[Optional[Tuple[float, float, float]]]:
+        """
+        Calculate spreads and z-scores for many pairs in one vectorized pass.
 
-        if std_spread == 0:
-            return None
+        Returns:
+            One (z_score, current_spread, hedge_ratio) tuple or None per pair
+        """
+        if not pairs:
+            return []
 
-        current_spread = spread[-1]
-        z_score = (current_spread - mean_spread) / std_spread
+        z_scores, spreads, hedge_ratios = self.statistics.pair_spreads(
+            np.array([self.statistics.column(s1) for s1, _ in pairs]),
+            np.array([self.statistics.column(s2) for _, s2 in pairs])
+        )
 
-        return (float(z_score), float(current_spread), float(hedge_ratio))
+        return [
+            None if np.isnan(z) else (z, spread, hedge_ratio)
+            for z, spread, hedge_ratio in zip(
+                z_scores.tolist(), spreads.tolist(), hedge_ratios.tolist()
+            )
+        ]
 
     def _create_pairs_opportunity(
         self,
@@ -264,17 +261,20 @@ class StatisticalArbitrageDetector:
         """Detect mean reversion opportunities for individual symbols."""
         opportunities = []
 
+        means = self.statistics.mean()
+        stds = self.statistics.std()
+        valid_symbols = set(self._valid_columns([d.symbol for d in market_data]))
+
         for data in market_data:
-            if (data.symbol not in self.price_history or
-                len(self.price_history[data.symbol]) < self.lookback_period):
+            if data.symbol not in valid_symbols:
                 continue
 
-            prices = np.array([p['price'] for p in self.price_history[data.symbol]])
+            col = self.statistics.column(data.symbol)
             current_price = float(data.mid_price)
 
             # Calculate Bollinger Bands
-            mean_price = np.mean(prices)
-            std_price = np.std(prices)
+            mean_price = float(means[col])
+            std_price = float(stds[col])
 
             if std_price == 0:
                 continue
@@ -2,11 +2,11 @@
 Triangular arbitrage detection algorithms.
 Commonly used in cryptocurrency and forex markets.
 """
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Set
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
+import math
 import uuid
-from itertools import permutations
 
 from ..models.types import (
     MarketData,
@@ -17,17 +17,275 @@ from ..models.types import (
 )
 
 
+class CurrencyGraph:
+    """
+    Currency graph for one exchange, updated incrementally per quote.
+
+    Nodes are currencies and each BASE/QUOTE pair is an edge. Pairs are
+    indexed by (base, quote) and by currency so the triangles touching a
+    given pair can be found without scanning every other pair.
+
+    Quotes older than max_quote_age seconds, measured against the newest
+    quote seen, are dropped so cycles are never built from stale rates.
+    """
+
+    def __init__(self, max_quote_age: Optional[float] = None):
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_quote_age: Seconds a quote stays usable, or None to keep
+                           quotes until they are replaced
+        """
+        self.max_quote_age = max_quote_age
+        self.latest: Optional[datetime] = None
+        self.pairs: Dict[str, MarketData] = {}
+        self.legs: Dict[Tuple[str, str], Set[str]] = {}
+        self.quotes_by_base: Dict[str, Set[str]] = {}
+        self.bases_by_quote: Dict[str, Set[str]] = {}
+        self._parsed: Dict[str, Tuple[str, str]] = {}
+
+    def update(self, data: MarketData) -> bool:
+        """
+        Store the latest quote for a pair.
+
+        Args:
+            data: Market data for a BASE/QUOTE symbol
+
+        Returns:
+            True if the symbol is a currency pair and was stored
+        """
+        symbol = data.symbol
+        parsed = self._parsed.get(symbol)
+
+        if parsed is None:
+            parts = symbol.split('/')
+            if len(parts) != 2:
+                return False
+            parsed = (parts[0], parts[1])
+            self._parsed[symbol] = parsed
+
+            base, quote = parsed
+            self.legs.setdefault(parsed, set()).add(symbol)
+            self.quotes_by_base.setdefault(base, set()).add(quote)
+            self.bases_by_quote.setdefault(quote, set()).add(base)
+
+        self.pairs[symbol] = data
+        if self.latest is None or data.timestamp > self.latest:
+            self.latest = data.timestamp
+        return True
+
+    def expire(self) -> List[str]:
+        """
+        Drop quotes older than max_quote_age relative to the newest quote.
+
+        Returns:
+            Symbols that were removed
+        """
+        if self.max_quote_age is None or self.latest is None:
+            return []
+
+        cutoff = self.latest - timedelta(seconds=self.max_quote_age)
+        stale = [symbol for symbol, data in self.pairs.items() if data.timestamp < cutoff]
+        for symbol in stale:
+            self._remove(symbol)
+        return stale
+
+    def _remove(self, symbol: str):
+        """Remove a symbol and its index entries."""
+        del self.pairs[symbol]
+        parsed = self._parsed.pop(symbol)
+        base, quote = parsed
+
+        symbols = self.legs[parsed]
+        symbols.discard(symbol)
+        if symbols:
+            return
+
+        del self.legs[parsed]
+        self.quotes_by_base[base].discard(quote)
+        if not self.quotes_by_base[base]:
+            del self.quotes_by_base[base]
+        self.bases_by_quote[quote].discard(base)
+        if not self.bases_by_quote[quote]:
+            del self.bases_by_quote[quote]
+
+    def currencies(self, symbol: str) -> Tuple[str, str]:
+        """Get (base, quote) of a stored symbol."""
+        return self._parsed[symbol]
+
+    def _connecting(self, currency1: str, currency2: str) -> Set[str]:
+        """Symbols trading currency1 against currency2 in either orientation."""
+        return self.legs.get((currency1, currency2), set()) | self.legs.get((currency2, currency1), set())
+
+    def triangles_touching(self, symbol: str) -> Set[Tuple[str, str, str]]:
+        """
+        Find triangles (pair1, pair2, pair3) that include a symbol.
+
+        pair1 and pair2 share a base currency and pair3 connects their quote
+        currencies, in either orientation.
+
+        Args:
+            symbol: Updated pair
+
+        Returns:
+            Set of symbol triples
+        """
+        triangles = set()
+        base, quote = self._parsed[symbol]
+
+        # Symbol as pair1 or pair2: another pair on the same base, plus a connector
+        for other_quote in self.quotes_by_base.get(base, ()):
+            for other in self.legs[(base, other_quote)]:
+                if other == symbol:
+                    continue
+                for connector in self._connecting(quote, other_quote):
+                    if connector in (symbol, other):
+                        continue
+                    triangles.add((symbol, other, connector))
+                    triangles.add((other, symbol, connector))
+
+        # Symbol as pair3: two pairs on a common base quoted in its two currencies
+        for common_base in self.bases_by_quote.get(base, set()) & self.bases_by_quote.get(quote, set()):
+            for pair1 in self.legs[(common_base, base)]:
+                for pair2 in self.legs[(common_base, quote)]:
+                    if symbol in (pair1, pair2):
+                        continue
+                    triangles.add((pair1, pair2, symbol))
+                    triangles.add((pair2, pair1, symbol))
+
+        return triangles
+
+    def find_negative_cycle(
+        self,
+        min_length: int = 1,
+        max_length: Optional[int] = None,
+        max_attempts: int = 8
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Find a profitable conversion cycle with Bellman-Ford on -log(rate).
+
+        Selling BASE for QUOTE converts at the bid, buying BASE with QUOTE
+        converts at 1 / ask. A negative cycle in -log(rate) is a sequence of
+        conversions whose rate product exceeds one.
+
+        Every node still relaxing after the last pass leads to a cycle. When
+        none of them has an acceptable length, the best-rate leg of each
+        rejected cycle is removed and the search runs again, so a short cycle
+        cannot hide a longer one elsewhere in the graph.
+
+        Args:
+            min_length: Fewest legs in a reported cycle
+            max_length: Most legs in a reported cycle, or None for no limit
+            max_attempts: Bellman-Ford runs before giving up
+
+        Returns:
+            (symbols in trading order, currency held before each leg), or None
+        """
+        currencies = list(set(self.quotes_by_base) | set(self.bases_by_quote))
+        edges = []
+        for symbol, data in self.pairs.items():
+            base, quote = self._parsed[symbol]
+            if data.bid_price > 0:
+                edges.append((base, quote, -math.log(float(data.bid_price)), symbol))
+            if data.ask_price > 0:
+                edges.append((quote, base, math.log(float(data.ask_price)), symbol))
+
+        for _ in range(max_attempts):
+            cycles = self._negative_cycles(currencies, edges)
+            if not cycles:
+                return None
+
+            for cycle in cycles:
+                if len(cycle) >= min_length and (max_length is None or len(cycle) <= max_length):
+                    return [edge[3] for edge in cycle], [edge[0] for edge in cycle]
+
+            rejected = {min(cycle, key=lambda edge: edge[2]) for cycle in cycles}
+            edges = [edge for edge in edges if edge not in rejected]
+
+        return None
+
+    @staticmethod
+    def _negative_cycles(
+        currencies: List[str],
+        edges: List[Tuple[str, str, float, str]]
+    ) -> List[List[Tuple[str, str, float, str]]]:
+        """
+        Run Bellman-Ford and collect the distinct cycles it exposes.
+
+        Returns:
+            Cycles as lists of (source, target, weight, symbol) edges in order
+        """
+        # Virtual source: every currency starts at distance zero
+        distance = {currency: 0.0 for currency in currencies}
+        predecessor: Dict[str, Tuple[str, str, float, str]] = {}
+
+        relaxed: List[str] = []
+        for _ in range(len(currencies)):
+            relaxed = []
+            for edge in edges:
+                source, target, weight, _ = edge
+                candidate = distance[source] + weight
+                if candidate < distance[target] - 1e-12:
+                    distance[target] = candidate
+                    predecessor[target] = edge
+                    relaxed.append(target)
+            if not relaxed:
+                return []
+
+        cycles = []
+        seen: Set[str] = set()
+        for start in dict.fromkeys(relaxed):
+            # Walk back far enough to land inside the cycle
+            node = start
+            for _ in range(len(currencies)):
+                node = predecessor[node][0]
+            if node in seen:
+                continue
+
+            cycle = []
+            current = node
+            while True:
+                edge = predecessor[current]
+                cycle.append(edge)
+                seen.add(current)
+                current = edge[0]
+                if current == node:
+                    break
+            cycle.reverse()
+            cycles.append(cycle)
+
+        return cycles
+
+
 class TriangularArbitrageDetector:
     """Detects triangular arbitrage opportunities in currency/crypto markets."""
 
-    def __init__(self, min_profit_threshold: Decimal = Decimal("0.001")):
+    def __init__(
+        self,
+        min_profit_threshold: Decimal = Decimal("0.001"),
+        enable_cycle_search: bool = False,
+        max_cycle_length: int = 6,
+        max_quote_age: Optional[float] = 10.0
+    ):
         """
         Initialize triangular arbitrage detector.
 
         Args:
             min_profit_threshold: Minimum profit percentage threshold
+            enable_cycle_search: Also search for longer cycles (4+ legs) via
+                                 Bellman-Ford on log prices
+            max_cycle_length: Longest cycle reported by the cycle search
+            max_quote_age: Seconds a quote is used before it is dropped from
+                           the graph, or None to keep it until replaced
         """
         self.min_profit_threshold = min_profit_threshold
+        self.enable_cycle_search = enable_cycle_search
+        self.max_cycle_length = max_cycle_length
+        self.max_quote_age = max_quote_age
+
+        # Persistent per-exchange currency graphs
+        self.graphs: Dict[str, CurrencyGraph] = {}
 
     def detect_opportunities(
         self,
@@ -42,6 +300,10 @@ class TriangularArbitrageDetector:
         - Sell ETH for USD
         If final USD > initial USD, there's an arbitrage opportunity.
 
+        Quotes are merged into the per-exchange currency graph and only
+        triangles that include a pair updated by this call are evaluated.
+        Quotes older than max_quote_age are dropped first.
+
         Args:
             market_data: List of market data
 
@@ -54,8 +316,16 @@ class TriangularArbitrageDetector:
         exchange_data = self._group_by_exchange(market_data)
 
         for exchange, data_list in exchange_data.items():
+            graph = self.graphs.get(exchange)
+            if graph is None:
+                graph = self.graphs[exchange] = CurrencyGraph(self.max_quote_age)
+
+            updated = [data.symbol for data in data_list if graph.update(data)]
+            stale = set(graph.expire())
+            updated = [symbol for symbol in updated if symbol not in stale]
+
             # Find triangular paths
-            triangles = self._find_triangular_paths(data_list)
+            triangles = self._find_triangular_paths(graph, updated)
 
             for triangle in triangles:
                 opportunity = self._calculate_triangular_opportunity(
@@ -64,6 +334,11 @@ class TriangularArbitrageDetector:
                 if opportunity:
                     opportunities.append(opportunity)
 
+            if self.enable_cycle_search and updated:
+                opportunity = self._find_cycle_opportunity(graph, exchange)
+                if opportunity:
+                    opportunities.append(opportunity)
+
         return opportunities
 
     def _group_by_exchange(
@@ -80,52 +355,25 @@ class TriangularArbitrageDetector:
 
     def _find_triangular_paths(
         self,
-        market_data: List[MarketData]
+        graph: CurrencyGraph,
+        updated_symbols: List[str]
     ) -> List[Tuple[MarketData, MarketData, MarketData]]:
         """
-        Find potential triangular arbitrage paths.
+        Find triangular arbitrage paths that touch updated pairs.
 
         Returns triangles of the form (pair1, pair2, pair3) where:
         - pair1: BASE/QUOTE1
         - pair2: BASE/QUOTE2
         - pair3: QUOTE1/QUOTE2
         """
-        triangles = []
+        symbol_triangles = set()
+        for symbol in updated_symbols:
+            symbol_triangles |= graph.triangles_touching(symbol)
 
-        # Parse trading pairs into base and quote currencies
-        parsed_pairs = []
-        for data in market_data:
-            parts = data.symbol.split('/')
-            if len(parts) == 2:
-                parsed_pairs.append({
-                    'data': data,
-                    'base': parts[0],
-                    'quote': parts[1]
-                })
-
-        # Find triangular relationships
-        for i, pair1 in enumerate(parsed_pairs):
-            for j, pair2 in enumerate(parsed_pairs):
-                if i == j:
-                    continue
-
-                # Check if pair1 and pair2 share a base currency
-                if pair1['base'] != pair2['base']:
-                    continue
-
-                # Look for a third pair that connects the two quote currencies
-                for k, pair3 in enumerate(parsed_pairs):
-                    if k == i or k == j:
-                        continue
-
-                    # Check if pair3 connects quote1 and quote2
-                    if ((pair3['base'] == pair1['quote'] and pair3['quote'] == pair2['quote']) or
-                        (pair3['base'] == pair2['quote'] and pair3['quote'] == pair1['quote'])):
-
-                        triangle = (pair1['data'], pair2['data'], pair3['data'])
-                        triangles.append(triangle)
-
-        return triangles
+        return [
+            (graph.pairs[pair1], graph.pairs[pair2], graph.pairs[pair3])
+            for pair1, pair2, pair3 in symbol_triangles
+        ]
 
     def _calculate_triangular_opportunity(
         self,
@@ -144,11 +392,6 @@ class TriangularArbitrageDetector:
         """
         pair1, pair2, pair3 = triangle
 
-        # Parse currency pairs
-        base1, quote1 = pair1.symbol.split('/')
-        base2, quote2 = pair2.symbol.split('/')
-        base3, quote3 = pair3.symbol.split('/')
-
         # Starting with 1 unit of the common base currency
         initial_amount = Decimal(1000)  # Start with 1000 units
 
@@ -207,6 +450,105 @@ class TriangularArbitrageDetector:
 
         return opportunity
 
+    def _find_cycle_opportunity(
+        self,
+        graph: CurrencyGraph,
+        exchange: str
+    ) -> Optional[ArbitrageOpportunity]:
+        """
+        Build an opportunity from a negative log-price cycle longer than three legs.
+
+        Args:
+            graph: Exchange currency graph
+            exchange: Exchange name
+
+        Returns:
+            ArbitrageOpportunity if a profitable cycle exists, None otherwise
+        """
+        # Three-leg cycles are already covered by the triangle scan
+        found = graph.find_negative_cycle(min_length=4, max_length=self.max_cycle_length)
+        if not found:
+            return None
+
+        symbols, currencies = found
+
+        initial_amount = Decimal(1000)
+        amount = initial_amount
+        actions = []
+
+        for leg, (symbol, currency) in enumerate(zip(symbols, currencies), start=1):
+            data = graph.pairs[symbol]
+            base, quote = graph.currencies(symbol)
+
+            if currency == base:
+                # Sell base for quote at the bid
+                side, price, quantity = OrderSide.SELL, data.bid_price, amount
+                amount = amount * data.bid_price
+            else:
+                # Buy base with quote at the ask
+                side, price = OrderSide.BUY, data.ask_price
+                quantity = amount / data.ask_price
+                amount = quantity
+
+            actions.append(TradingAction(
+                action_id=f"{str(uuid.uuid4())}-{leg}",
+                exchange=data.exchange,
+                symbol=symbol,
+                side=side,
+                quantity=quantity,
+                price=price,
+                order_type="market",
+                priority=leg
+            ))
+
+        profit = amount - initial_amount
+        profit_percentage = (profit / initial_amount) * Decimal(100)
+
+        if profit_percentage < self.min_profit_threshold:
+            return None
+
+        legs = [graph.pairs[symbol] for symbol in symbols]
+        min_volume = min(min(d.bid_volume, d.ask_volume) for d in legs)
+        avg_spread = sum(d.spread_percentage for d in legs) / Decimal(len(legs))
+
+        confidence = (
+            min(profit_percentage / Decimal(5), Decimal("0.4")) +
+            min(min_volume / Decimal(100), Decimal("0.3")) +
+            Decimal("0.3") - min(avg_spread / Decimal(10), Decimal("0.3"))
+        )
+
+        # Each extra leg adds execution and price exposure
+        risk = min(
+            Decimal("0.3") + Decimal("0.1") * (len(legs) - 3) +
+            Decimal("0.4") - min(min_volume / Decimal(100), Decimal("0.4")) +
+            Decimal("0.2"),
+            Decimal(1)
+        )
+
+        return ArbitrageOpportunity(
+            opportunity_id=str(uuid.uuid4()),
+            arbitrage_type=ArbitrageType.TRIANGULAR,
+            market_type=legs[0].market_type,
+            symbol=":".join(symbols),
+            timestamp=datetime.now(),
+            expected_profit=profit,
+            expected_profit_percentage=profit_percentage,
+            confidence_score=confidence,
+            risk_score=risk,
+            detection_latency_ms=0,
+            market_data=legs,
+            suggested_actions=actions,
+            metadata={
+                "exchange": exchange,
+                "initial_amount": float(initial_amount),
+                "final_amount": float(amount),
+                "direction": "cycle",
+                "legs": len(legs),
+                "start_currency": currencies[0],
+                "path": " -> ".join(symbols)
+            }
+        )
+
     def _calculate_path_profit(
         self,
         initial_amount: Decimal,
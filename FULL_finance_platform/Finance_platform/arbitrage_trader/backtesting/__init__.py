@@ -4,16 +4,25 @@ from .engine import (
     BacktestEngine,
     BacktestConfig,
     BacktestMode,
+    NumericMode,
     BacktestTrade,
     BacktestResult,
     simple_momentum_strategy,
     mean_reversion_strategy,
     cross_exchange_arbitrage_strategy
 )
+from .columnar import ColumnarData, BarSeries
+from .optimization import (
+    BacktestOptimizer,
+    SweepResult,
+    WalkForwardResult,
+    parameter_grid
+)
 from .data_storage import (
     DataStorage,
     FileStorage,
     SQLiteStorage,
+    ColumnarStorage,
     CachedDataProvider
 )
 
@@ -22,8 +31,17 @@ __all__ = [
     "BacktestEngine",
     "BacktestConfig",
     "BacktestMode",
+    "NumericMode",
     "BacktestTrade",
     "BacktestResult",
+    "ColumnarData",
+    "BarSeries",
+
+    # Optimization
+    "BacktestOptimizer",
+    "SweepResult",
+    "WalkForwardResult",
+    "parameter_grid",
 
     # Example Strategies
     "simple_momentum_strategy",
@@ -34,5 +52,6 @@ __all__ = [
     "DataStorage",
     "FileStorage",
     "SQLiteStorage",
+    "ColumnarStorage",
     "CachedDataProvider"
 ]
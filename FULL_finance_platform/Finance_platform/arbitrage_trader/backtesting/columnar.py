@@ -0,0 +1,266 @@
+"""
+Columnar, time-aligned view of backtest historical data.
+
+Aligns per-symbol bar lists onto a single sorted timestamp index so the
+engine can look up every symbol's bar for a timestamp in O(1) instead of
+scanning each symbol's history.
+"""
+from typing import List, Dict, Optional, Sequence, Union
+from datetime import datetime
+import numpy as np
+
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarSeries(Sequence):
+    """
+    Read-only bar sequence backed by column arrays.
+
+    Behaves like a list of bar dicts (building each dict on access) while
+    exposing the underlying, possibly memory-mapped, arrays so that
+    ColumnarData can align it without touching individual bars.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        timestamp_type: str = "int",
+        extra: Optional[List[Dict]] = None
+    ):
+        """
+        Initialize bar series.
+
+        Args:
+            columns: Column name -> 1-D array, including "timestamp"
+            timestamp_type: "int", "float" or "datetime" (epoch milliseconds
+                            restored to datetime on access)
+            extra: Optional per-row dicts of non-numeric fields
+        """
+        self.columns = columns
+        self.timestamp_type = timestamp_type
+        self.extra = extra
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Raw timestamp column."""
+        return self.columns["timestamp"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Get one column, NaN-filled if the series does not have it."""
+        if name in self.columns:
+            return self.columns[name]
+        return np.full(len(self), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return BarSeries(
+                {name: values[start:stop] for name, values in self.columns.items()},
+                self.timestamp_type,
+                self.extra[start:stop] if self.extra is not None else None
+            )
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("bar index out of range")
+
+        bar = {}
+        for name, values in self.columns.items():
+            value = values[i].item()
+            if name == "timestamp":
+                if self.timestamp_type == "datetime":
+                    value = datetime.fromtimestamp(value / 1000)
+            elif value != value:  # NaN
+                if name not in OHLCV_FIELDS:
+                    continue
+                value = None
+            bar[name] = value
+
+        if self.extra is not None and self.extra[i]:
+            bar.update(self.extra[i])
+
+        return bar
+
+
+class ColumnarData:
+    """
+    Historical bars pre-aligned into NumPy arrays.
+
+    Attributes:
+        symbols: Symbol names in column order (insertion order of the source dict)
+        timestamps: Sorted unique timestamps across all symbols, shape (T,)
+        bar_index: Row of each symbol's bar at each timestamp, -1 if absent, shape (T, N)
+        ohlcv: Float64 OHLCV values, NaN if absent, shape (T, N, 5)
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        timestamps: np.ndarray,
+        bar_index: np.ndarray,
+        ohlcv: np.ndarray,
+        bars: Optional[Dict[str, List[Dict]]] = None
+    ):
+        """
+        Initialize columnar data.
+
+        Args:
+            symbols: Symbol names in column order
+            timestamps: Sorted unique timestamp index
+            bar_index: Source bar row per (timestamp, symbol), -1 if absent
+            ohlcv: OHLCV values per (timestamp, symbol, field)
+            bars: Original bar dicts, handed to strategies unchanged
+        """
+        self.symbols = list(symbols)
+        self.timestamps = timestamps
+        self.bar_index = bar_index
+        self.ohlcv = ohlcv
+        self.bars = bars or {}
+        self._symbol_columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_historical(cls, historical_data: Dict[str, List[Dict]]) -> "ColumnarData":
+        """
+        Align per-symbol bar lists onto a shared timestamp index.
+
+        Bars without a timestamp are ignored. When a symbol has several bars
+        with the same timestamp, the first one wins (matching the scan-based
+        engine loop).
+
+        Args:
+            historical_data: Dict of symbol -> list of bar dicts
+
+        Returns:
+            Aligned columnar data
+        """
+        symbols = list(historical_data.keys())
+
+        per_symbol = []
+        for symbol in symbols:
+            data = historical_data[symbol]
+            if isinstance(data, BarSeries):
+                # Array-backed series align without materializing bars
+                per_symbol.append((np.arange(len(data), dtype=np.int64), np.asarray(data.timestamps)))
+                continue
+
+            rows = [i for i, bar in enumerate(data) if "timestamp" in bar]
+            stamps = [data[i]["timestamp"] for i in rows]
+            per_symbol.append((np.asarray(rows, dtype=np.int64), np.asarray(stamps)))
+
+        non_empty = [stamps for _, stamps in per_symbol if len(stamps)]
+        if non_empty:
+            timestamps = np.unique(np.concatenate(non_empty))
+        else:
+            timestamps = np.asarray([], dtype=np.int64)
+
+        n_times, n_symbols = len(timestamps), len(symbols)
+        bar_index = np.full((n_times, n_symbols), -1, dtype=np.int64)
+        ohlcv = np.full((n_times, n_symbols, len(OHLCV_FIELDS)), np.nan, dtype=np.float64)
+
+        for col, (symbol, (rows, stamps)) in enumerate(zip(symbols, per_symbol)):
+            if not len(stamps):
+                continue
+
+            # First occurrence of each timestamp for this symbol
+            unique_stamps, first = np.unique(stamps, return_index=True)
+            positions = np.searchsorted(timestamps, unique_stamps)
+            source_rows = rows[first]
+            bar_index[positions, col] = source_rows
+
+            data = historical_data[symbol]
+            for f, name in enumerate(OHLCV_FIELDS):
+                if isinstance(data, BarSeries):
+                    ohlcv[positions, col, f] = data.column(name)[source_rows]
+                else:
+                    ohlcv[positions, col, f] = [
+                        _to_float(data[row].get(name)) for row in source_rows
+                    ]
+
+        return cls(symbols, timestamps, bar_index, ohlcv, bars=historical_data)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def column(self, symbol: str) -> int:
+        """Get the column index of a symbol."""
+        return self._symbol_columns[symbol]
+
+    def field(self, name: str) -> np.ndarray:
+        """Get a (T, N) view of one OHLCV field."""
+        return self.ohlcv[:, :, OHLCV_FIELDS.index(name)]
+
+    def values(self, name: str) -> np.ndarray:
+        """
+        Get a (T, N) float array of any bar key, NaN where absent.
+
+        OHLCV fields are served from the aligned arrays; other keys (e.g.
+        indicator columns such as "z_score") are extracted from the bars.
+        """
+        if name in OHLCV_FIELDS:
+            return self.field(name)
+
+        out = np.full(self.bar_index.shape, np.nan, dtype=np.float64)
+        for col, symbol in enumerate(self.symbols):
+            rows = self.bar_index[:, col]
+            present = np.nonzero(rows >= 0)[0]
+            data = self.bars[symbol]
+            if isinstance(data, BarSeries):
+                out[present, col] = data.column(name)[rows[present]]
+            else:
+                out[present, col] = [_to_float(data[row].get(name)) for row in rows[present].tolist()]
+        return out
+
+    def slice(self, start: int, stop: int) -> "ColumnarData":
+        """Get a view of timestamp positions [start, stop) sharing the source bars."""
+        return ColumnarData(
+            self.symbols,
+            self.timestamps[start:stop],
+            self.bar_index[start:stop],
+            self.ohlcv[start:stop],
+            bars=self.bars
+        )
+
+    def to_historical(self) -> Dict[str, List[Dict]]:
+        """Rebuild per-symbol bar lists (one bar per aligned timestamp)."""
+        historical_data = {}
+        for col, symbol in enumerate(self.symbols):
+            rows = self.bar_index[:, col]
+            data = self.bars[symbol]
+            bars = [data[row] for row in rows[rows >= 0].tolist()]
+            if bars:
+                historical_data[symbol] = bars
+        return historical_data
+
+    def bars_at(self, i: int) -> Dict[str, Dict]:
+        """
+        Get the original bar dicts for every symbol present at index i.
+
+        Args:
+            i: Position in the timestamp index
+
+        Returns:
+            Dict of symbol -> bar, in symbol column order
+        """
+        current_data = {}
+        for col, row in enumerate(self.bar_index[i].tolist()):
+            if row >= 0:
+                symbol = self.symbols[col]
+                current_data[symbol] = self.bars[symbol][row]
+        return current_data
+
+
+def _to_float(value) -> float:
+    """Convert a bar value to float, mapping missing values to NaN."""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
@@ -6,11 +6,16 @@ import os
 import logging
 import sqlite3
 import pickle
-from typing import List, Dict, Optional
+import shutil
+from typing import List, Dict, Optional, Sequence, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 from decimal import Decimal
 
+import numpy as np
+
+from .columnar import BarSeries
+
 
 class DataStorage:
     """Base class for data storage implementations."""
@@ -446,6 +451,267 @@ class SQLiteStorage(DataStorage):
             conn.close()
 
 
+class ColumnarStorage(DataStorage):
+    """
+    Binary columnar storage using memory-mapped NumPy column files.
+
+    Each series is a directory holding one .npy file per numeric column,
+    sorted by timestamp, plus a small JSON index. Loads memory-map the
+    columns, so range reads only touch the requested slice and the
+    backtest engine can consume the arrays directly.
+    """
+
+    INDEX_FILE = "index.json"
+    EXTRA_FILE = "extra.json"
+
+    def __init__(self, base_path: str = None):
+        """
+        Initialize columnar storage.
+
+        Args:
+            base_path: Base directory for storing series directories
+        """
+        if base_path is None:
+            base_path = os.path.join(os.path.expanduser("~"), ".arbitrage_trader", "data", "columnar")
+
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+        self.logger = logging.getLogger(__name__)
+
+    def _get_series_path(self, key: str) -> Path:
+        """Get series directory for a key."""
+        # Sanitize key for directory name
+        safe_key = key.replace("/", "_").replace("\\", "_").replace(":", "_")
+        return self.base_path / safe_key
+
+    def save(self, key: str, data: List[Dict], metadata: Dict = None):
+        """
+        Save data as column files.
+
+        Numeric fields (including Decimal) become float64 columns; other
+        fields are kept in a JSON side file. Bars are sorted by timestamp.
+
+        Args:
+            key: Storage key (e.g., "BTCUSDT_binance_1h")
+            data: List of OHLCV data points
+            metadata: Optional metadata
+        """
+        series_path = self._get_series_path(key)
+        if series_path.exists():
+            shutil.rmtree(series_path)
+        series_path.mkdir(parents=True)
+
+        bars = [bar for bar in data if bar.get("timestamp") is not None]
+        timestamps, timestamp_type = self._encode_timestamps([bar["timestamp"] for bar in bars])
+
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        bars = [bars[i] for i in order.tolist()]
+
+        np.save(series_path / "timestamp.npy", timestamps)
+
+        # Split remaining fields into numeric columns and extras
+        names = []
+        for bar in bars:
+            for name in bar:
+                if name != "timestamp" and name not in names:
+                    names.append(name)
+
+        columns = []
+        extra = [{} for _ in bars]
+        for name in names:
+            values = [bar.get(name) for bar in bars]
+            if all(v is None or (isinstance(v, (int, float, Decimal)) and not isinstance(v, bool)) for v in values):
+                column = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+                np.save(series_path / f"{name}.npy", column)
+                columns.append(name)
+            else:
+                for i, bar in enumerate(bars):
+                    if name in bar:
+                        extra[i][name] = bar[name]
+
+        has_extra = any(extra)
+        if has_extra:
+            with open(series_path / self.EXTRA_FILE, "w") as f:
+                json.dump(extra, f, default=str)
+
+        index = {
+            "key": key,
+            "timestamp": datetime.now().isoformat(),
+            "count": len(bars),
+            "metadata": metadata or {},
+            "columns": columns,
+            "timestamp_type": timestamp_type,
+            "start_time": timestamps[0].item() if len(bars) else None,
+            "end_time": timestamps[-1].item() if len(bars) else None,
+            "has_extra": has_extra
+        }
+
+        # Index is written last so a partially written series is never listed
+        with open(series_path / self.INDEX_FILE, "w") as f:
+            json.dump(index, f, indent=2)
+
+        self.logger.info(f"Saved {len(bars)} records to {series_path}")
+
+    def load_series(
+        self,
+        key: str,
+        start_time: Union[int, datetime] = None,
+        end_time: Union[int, datetime] = None
+    ) -> Optional[BarSeries]:
+        """
+        Memory-map a series, optionally restricted to a timestamp range.
+
+        Only the index and the timestamp column are searched; every column
+        is returned as a view of the mapped file.
+
+        Args:
+            key: Storage key
+            start_time: Start timestamp (inclusive)
+            end_time: End timestamp (inclusive)
+
+        Returns:
+            Array-backed bar series or None if not found
+        """
+        index = self._read_index(key)
+        if index is None:
+            return None
+
+        series_path = self._get_series_path(key)
+
+        try:
+            timestamps = np.load(series_path / "timestamp.npy", mmap_mode="r")
+
+            lo, hi = 0, len(timestamps)
+            if start_time is not None:
+                lo = int(np.searchsorted(timestamps, self._encode_bound(start_time), side="left"))
+            if end_time is not None:
+                hi = int(np.searchsorted(timestamps, self._encode_bound(end_time), side="right"))
+
+            columns = {"timestamp": timestamps[lo:hi]}
+            for name in index["columns"]:
+                columns[name] = np.load(series_path / f"{name}.npy", mmap_mode="r")[lo:hi]
+
+            extra = None
+            if index.get("has_extra"):
+                with open(series_path / self.EXTRA_FILE, "r") as f:
+                    extra = json.load(f)[lo:hi]
+
+            return BarSeries(columns, index["timestamp_type"], extra)
+
+        except Exception as e:
+            self.logger.error(f"Error loading {key}: {e}")
+            return None
+
+    def load(self, key: str) -> Optional[List[Dict]]:
+        """
+        Load data as a list of bar dicts.
+
+        Args:
+            key: Storage key
+
+        Returns:
+            List of data points or None if not found
+        """
+        series = self.load_series(key)
+        return list(series) if series is not None else None
+
+    def query(
+        self,
+        key: str,
+        start_time: Union[int, datetime] = None,
+        end_time: Union[int, datetime] = None,
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        Query data with filters.
+
+        Args:
+            key: Storage key
+            start_time: Start timestamp (inclusive)
+            end_time: End timestamp (inclusive)
+            limit: Maximum records to return
+
+        Returns:
+            Filtered data points
+        """
+        series = self.load_series(key, start_time, end_time)
+        if series is None:
+            return []
+
+        if limit:
+            series = series[:limit]
+
+        return list(series)
+
+    def exists(self, key: str) -> bool:
+        """Check if data exists."""
+        return (self._get_series_path(key) / self.INDEX_FILE).exists()
+
+    def delete(self, key: str):
+        """Delete series directory."""
+        series_path = self._get_series_path(key)
+        if series_path.exists():
+            shutil.rmtree(series_path)
+            self.logger.info(f"Deleted {series_path}")
+
+    def list_keys(self) -> List[str]:
+        """List all stored keys."""
+        keys = []
+        for index_path in sorted(self.base_path.glob(f"*/{self.INDEX_FILE}")):
+            with open(index_path, "r") as f:
+                keys.append(json.load(f)["key"])
+        return keys
+
+    def get_metadata(self, key: str) -> Optional[Dict]:
+        """Get metadata for a key."""
+        index = self._read_index(key)
+        if index is None:
+            return None
+
+        return {
+            "timestamp": index.get("timestamp"),
+            "count": index.get("count"),
+            "start_time": index.get("start_time"),
+            "end_time": index.get("end_time"),
+            **index.get("metadata", {})
+        }
+
+    def _read_index(self, key: str) -> Optional[Dict]:
+        """Read a series index."""
+        index_path = self._get_series_path(key) / self.INDEX_FILE
+        if not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, "r") as f:
+                return json.load(f)
+
+        except Exception as e:
+            self.logger.error(f"Error loading index for {key}: {e}")
+            return None
+
+    @staticmethod
+    def _encode_timestamps(timestamps: List) -> tuple:
+        """Encode timestamps as an array plus the type to restore on load."""
+        if timestamps and all(isinstance(ts, datetime) for ts in timestamps):
+            millis = [int(ts.timestamp() * 1000) for ts in timestamps]
+            return np.array(millis, dtype=np.int64), "datetime"
+
+        if all(isinstance(ts, int) for ts in timestamps):
+            return np.array(timestamps, dtype=np.int64), "int"
+
+        return np.array([float(ts) for ts in timestamps], dtype=np.float64), "float"
+
+    @staticmethod
+    def _encode_bound(bound: Union[int, float, datetime]):
+        """Encode a range bound like the stored timestamps."""
+        if isinstance(bound, datetime):
+            return int(bound.timestamp() * 1000)
+        return bound
+
+
 class CachedDataProvider:
     """Data provider with caching layer."""
 
@@ -468,27 +734,38 @@ class CachedDataProvider:
         self.cache_duration = timedelta(hours=cache_duration_hours)
         self.logger = logging.getLogger(__name__)
 
+    def _load_cached(self, key: str) -> Optional[Sequence[Dict]]:
+        """
+        Load cached bars, as a memory-mapped BarSeries when the storage supports it.
+
+        A BarSeries is a read-only sequence of bar dicts built on access, so
+        cache hits do not materialize the whole history.
+        """
+        if hasattr(self.storage, "load_series"):
+            return self.storage.load_series(key)
+        return self.storage.load(key)
+
     async def get_crypto_historical(
         self,
         symbol: str,
         days: int = 30,
         provider: str = "binance",
         force_refresh: bool = False
-    ) -> List[Dict]:
+    ) -> Sequence[Dict]:
         """Get crypto historical data with caching."""
         key = f"{symbol}_{provider}_{days}d_crypto"
 
         # Check cache
         if not force_refresh and self.storage.exists(key):
             metadata = None
-            if isinstance(self.storage, FileStorage):
+            if hasattr(self.storage, "get_metadata"):
                 metadata = self.storage.get_metadata(key)
 
             if metadata:
                 cached_time = datetime.fromisoformat(metadata.get("timestamp", ""))
                 if datetime.now() - cached_time < self.cache_duration:
                     self.logger.info(f"Using cached data for {key}")
-                    return self.storage.load(key)
+                    return self._load_cached(key)
 
         # Fetch fresh data
         self.logger.info(f"Fetching fresh data for {key}")
@@ -505,21 +782,21 @@ class CachedDataProvider:
         period: str = "1y",
         provider: str = "yahoo",
         force_refresh: bool = False
-    ) -> List[Dict]:
+    ) -> Sequence[Dict]:
         """Get stock historical data with caching."""
         key = f"{symbol}_{provider}_{period}_stock"
 
         # Check cache
         if not force_refresh and self.storage.exists(key):
             metadata = None
-            if isinstance(self.storage, FileStorage):
+            if hasattr(self.storage, "get_metadata"):
                 metadata = self.storage.get_metadata(key)
 
             if metadata:
                 cached_time = datetime.fromisoformat(metadata.get("timestamp", ""))
                 if datetime.now() - cached_time < self.cache_duration:
                     self.logger.info(f"Using cached data for {key}")
-                    return self.storage.load(key)
+                    return self._load_cached(key)
 
         # Fetch fresh data
         self.logger.info(f"Fetching fresh data for {key}")
@@ -536,21 +813,21 @@ class CachedDataProvider:
         to_currency: str,
         days: int = 100,
         force_refresh: bool = False
-    ) -> List[Dict]:
+    ) -> Sequence[Dict]:
         """Get forex historical data with caching."""
         key = f"{from_currency}{to_currency}_{days}d_forex"
 
         # Check cache
         if not force_refresh and self.storage.exists(key):
             metadata = None
-            if isinstance(self.storage, FileStorage):
+            if hasattr(self.storage, "get_metadata"):
                 metadata = self.storage.get_metadata(key)
 
             if metadata:
                 cached_time = datetime.fromisoformat(metadata.get("timestamp", ""))
                 if datetime.now() - cached_time < self.cache_duration:
                     self.logger.info(f"Using cached data for {key}")
-                    return self.storage.load(key)
+                    return self._load_cached(key)
 
         # Fetch fresh data
         self.logger.info(f"Fetching fresh data for {key}")
@@ -16,6 +16,7 @@ from ..models.types import (
     ArbitrageType, MarketType, OrderSide, OrderStatus
 )
 from ..services.data_providers import DataProviderManager
+from .columnar import ColumnarData
 
 
 class BacktestMode(Enum):
@@ -23,6 +24,13 @@ class BacktestMode(Enum):
     FAST = "fast"  # No delays
     REALISTIC = "realistic"  # Simulated latency
     TICK_BY_TICK = "tick_by_tick"  # Process each tick
+    COLUMNAR = "columnar"  # Pre-aligned NumPy arrays, O(1) bar lookup
+
+
+class NumericMode(Enum):
+    """Numeric representation for position and equity bookkeeping."""
+    DECIMAL = "decimal"  # Exact Decimal math on every bar
+    FLOAT = "float"  # float64 internally, Decimal only in the result
 
 
 @dataclass
@@ -34,6 +42,7 @@ class BacktestConfig:
     max_position_size: Decimal = Decimal("0.1")  # 10% of capital per trade
     risk_free_rate: Decimal = Decimal("0.02")  # 2% annual
     mode: BacktestMode = BacktestMode.FAST
+    numeric_mode: NumericMode = NumericMode.DECIMAL
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     symbols: List[str] = field(default_factory=list)
@@ -127,7 +136,8 @@ class BacktestEngine:
         self.data_provider = DataProviderManager()
 
         # State
-        self.capital = self.config.initial_capital
+        self._set_numeric_mode()
+        self.capital = self._to_number(self.config.initial_capital)
         self.positions: Dict[str, Dict] = {}
         self.trades: List[BacktestTrade] = []
         self.equity_curve: List[Dict] = []
@@ -233,46 +243,47 @@ class BacktestEngine:
         self.logger.info("Starting backtest...")
 
         # Reset state
-        self.capital = self.config.initial_capital
+        self._set_numeric_mode()
+        self.capital = self._to_number(self.config.initial_capital)
         self.positions = {}
         self.trades = []
         self.equity_curve = []
         self.daily_returns = []
 
-        # Get all timestamps across all symbols
-        all_timestamps = set()
-        for symbol, data in self.historical_data.items():
-            for bar in data:
-                if "timestamp" in bar:
-                    all_timestamps.add(bar["timestamp"])
+        if self.config.mode == BacktestMode.COLUMNAR:
+            # Align all symbols onto one timestamp index up front
+            columnar = ColumnarData.from_historical(self.historical_data)
+            sorted_timestamps = columnar.timestamps.tolist()
+        else:
+            columnar = None
 
-        # Sort timestamps
-        sorted_timestamps = sorted(all_timestamps)
+            # Get all timestamps across all symbols
+            all_timestamps = set()
+            for symbol, data in self.historical_data.items():
+                for bar in data:
+                    if "timestamp" in bar:
+                        all_timestamps.add(bar["timestamp"])
+
+            # Sort timestamps
+            sorted_timestamps = sorted(all_timestamps)
 
         if not sorted_timestamps:
             raise ValueError("No valid timestamps in historical data")
 
         # Track previous equity for daily returns
-        prev_equity = self.config.initial_capital
+        prev_equity = self.capital
         prev_date = None
 
         # Process each timestamp
         for i, timestamp in enumerate(sorted_timestamps):
             # Get current bar data for all symbols
-            current_data = {}
-            for symbol, data in self.historical_data.items():
-                bar = next(
-                    (b for b in data if b.get("timestamp") == timestamp),
-                    None
-                )
-                if bar:
-                    current_data[symbol] = bar
+            current_data = columnar.bars_at(i) if columnar is not None else self._scan_bars(timestamp)
 
             if not current_data:
                 continue
 
             # Run strategy
-            signals = self.strategy(current_data, self.positions, self.capital)
+            signals = self.strategy(current_data, self.positions, _to_decimal(self.capital))
 
             # Process signals
             for signal in signals:
@@ -305,14 +316,10 @@ class BacktestEngine:
         # Close remaining positions
         if sorted_timestamps:
             final_timestamp = sorted_timestamps[-1]
-            final_data = {}
-            for symbol, data in self.historical_data.items():
-                bar = next(
-                    (b for b in data if b.get("timestamp") == final_timestamp),
-                    None
-                )
-                if bar:
-                    final_data[symbol] = bar
+            if columnar is not None:
+                final_data = columnar.bars_at(len(sorted_timestamps) - 1)
+            else:
+                final_data = self._scan_bars(final_timestamp)
 
             await self._close_all_positions(final_data, final_timestamp)
 
@@ -323,6 +330,28 @@ class BacktestEngine:
 
         return result
 
+    def _set_numeric_mode(self):
+        """Bind number conversion and cost rates for the configured numeric mode."""
+        if self.config.numeric_mode == NumericMode.FLOAT:
+            self._to_number = float
+        else:
+            self._to_number = _to_decimal
+
+        self._commission_rate = self._to_number(self.config.commission_rate)
+        self._slippage_rate = self._to_number(self.config.slippage_rate)
+
+    def _scan_bars(self, timestamp: int) -> Dict:
+        """Get each symbol's bar at a timestamp by scanning its history."""
+        current_data = {}
+        for symbol, data in self.historical_data.items():
+            bar = next(
+                (b for b in data if b.get("timestamp") == timestamp),
+                None
+            )
+            if bar:
+                current_data[symbol] = bar
+        return current_data
+
     async def _process_signal(
         self,
         signal: Dict,
@@ -332,13 +361,13 @@ class BacktestEngine:
         """Process a trading signal."""
         symbol = signal.get("symbol")
         action = signal.get("action")  # "buy", "sell", "close"
-        quantity = Decimal(str(signal.get("quantity", 0)))
+        quantity = self._to_number(signal.get("quantity", 0))
 
         if not symbol or symbol not in current_data:
             return
 
         bar = current_data[symbol]
-        price = Decimal(str(bar.get("close", 0)))
+        price = self._to_number(bar.get("close", 0))
 
         if action == "buy":
             await self._open_position(symbol, OrderSide.BUY, quantity, price, timestamp, signal)
@@ -364,18 +393,18 @@ class BacktestEngine:
 
         # Calculate costs
         position_value = quantity * price
-        commission = position_value * self.config.commission_rate
-        slippage = position_value * self.config.slippage_rate
+        commission = position_value * self._commission_rate
+        slippage = position_value * self._slippage_rate
 
         # Check capital
         total_cost = position_value + commission + slippage
         if total_cost > self.capital:
             # Reduce quantity to fit capital
-            max_value = self.capital * (Decimal("1") - self.config.commission_rate - self.config.slippage_rate)
+            max_value = self.capital * (1 - self._commission_rate - self._slippage_rate)
             quantity = max_value / price
             position_value = quantity * price
-            commission = position_value * self.config.commission_rate
-            slippage = position_value * self.config.slippage_rate
+            commission = position_value * self._commission_rate
+            slippage = position_value * self._slippage_rate
             total_cost = position_value + commission + slippage
 
         if quantity <= 0:
@@ -425,8 +454,8 @@ class BacktestEngine:
 
         # Calculate exit costs
         position_value = position["quantity"] * price
-        exit_commission = position_value * self.config.commission_rate
-        exit_slippage = position_value * self.config.slippage_rate
+        exit_commission = position_value * self._commission_rate
+        exit_slippage = position_value * self._slippage_rate
 
         # Calculate PnL
         if position["side"] == OrderSide.BUY:
@@ -449,7 +478,7 @@ class BacktestEngine:
                 trade.slippage += exit_slippage
                 trade.pnl = net_pnl
                 entry_value = trade.entry_price * trade.quantity
-                trade.pnl_percentage = (net_pnl / entry_value * 100) if entry_value else Decimal("0")
+                trade.pnl_percentage = (net_pnl / entry_value * 100) if entry_value else self._to_number(0)
                 break
 
         # Remove position
@@ -464,14 +493,14 @@ class BacktestEngine:
         symbols = list(self.positions.keys())
         for symbol in symbols:
             if symbol in current_data:
-                price = Decimal(str(current_data[symbol].get("close", 0)))
+                price = self._to_number(current_data[symbol].get("close", 0))
                 await self._close_position(symbol, price, timestamp)
 
     def _update_positions(self, current_data: Dict):
         """Update position values with current prices."""
         for symbol, position in self.positions.items():
             if symbol in current_data:
-                position["current_price"] = Decimal(str(current_data[symbol].get("close", 0)))
+                position["current_price"] = self._to_number(current_data[symbol].get("close", 0))
 
     def _calculate_equity(self, current_data: Dict) -> Decimal:
         """Calculate total equity."""
@@ -479,7 +508,7 @@ class BacktestEngine:
 
         for symbol, position in self.positions.items():
             if symbol in current_data:
-                price = Decimal(str(current_data[symbol].get("close", 0)))
+                price = self._to_number(current_data[symbol].get("close", 0))
                 position_value = position["quantity"] * price
 
                 if position["side"] == OrderSide.BUY:
@@ -493,6 +522,9 @@ class BacktestEngine:
 
     def _calculate_results(self, timestamps: List[int]) -> BacktestResult:
         """Calculate backtest results."""
+        if self.config.numeric_mode == NumericMode.FLOAT:
+            self._convert_to_decimal()
+
         # Basic metrics
         start_time = timestamps[0]
         end_time = timestamps[-1]
@@ -571,6 +603,21 @@ class BacktestEngine:
             daily_returns=self.daily_returns
         )
 
+    def _convert_to_decimal(self):
+        """Convert float bookkeeping to Decimal at the result boundary."""
+        self.capital = _to_decimal(self.capital)
+        self.daily_returns = [_to_decimal(r) for r in self.daily_returns]
+
+        for trade in self.trades:
+            trade.quantity = _to_decimal(trade.quantity)
+            trade.entry_price = _to_decimal(trade.entry_price)
+            if trade.exit_price is not None:
+                trade.exit_price = _to_decimal(trade.exit_price)
+            trade.commission = _to_decimal(trade.commission)
+            trade.slippage = _to_decimal(trade.slippage)
+            trade.pnl = _to_decimal(trade.pnl)
+            trade.pnl_percentage = _to_decimal(trade.pnl_percentage)
+
     def _calculate_max_drawdown(self) -> tuple:
         """Calculate maximum drawdown."""
         if not self.equity_curve:
@@ -645,6 +692,11 @@ class BacktestEngine:
         return Decimal(str(round(sortino, 4)))
 
 
+def _to_decimal(value) -> Decimal:
+    """Convert a number to Decimal via its string form."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
 # Example strategies
 
 def simple_momentum_strategy(
@@ -0,0 +1,533 @@
+"""
+Parameter sweeps and walk-forward optimization for backtests.
+
+Historical data is loaded and aligned once. Each parameter grid is then
+evaluated either in a single vectorized pass across all parameter
+combinations (for strategies with a registered vectorized implementation,
+in float numeric mode) or by fanning BacktestEngine runs out across a
+process pool that lives for the whole sweep or walk-forward.
+"""
+import asyncio
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from functools import partial
+from typing import List, Dict, Optional, Callable, Any, Tuple
+
+import numpy as np
+
+from ..models.types import OrderSide
+from .columnar import ColumnarData
+from .engine import (
+    BacktestEngine,
+    BacktestConfig,
+    BacktestMode,
+    BacktestResult,
+    BacktestTrade,
+    NumericMode,
+    mean_reversion_strategy
+)
+
+
+@dataclass
+class SweepResult:
+    """One evaluated parameter combination in a sweep."""
+    params: Dict[str, Any]
+    result: BacktestResult
+    window: int = 0
+    rank: int = 0
+
+    def to_dict(self) -> Dict:
+        """Convert to a flat table row."""
+        row = {"window": self.window, "rank": self.rank, **self.params}
+        row.update({k: v for k, v in self.result.to_dict().items() if k != "metadata"})
+        return row
+
+
+@dataclass
+class WalkForwardResult:
+    """Best in-sample parameters and their out-of-sample result for one window."""
+    window: int
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+    best_params: Dict[str, Any]
+    train_result: BacktestResult
+    test_result: BacktestResult
+    ranking: List[SweepResult] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return {
+            "window": self.window,
+            "train_start": self.train_start.isoformat(),
+            "train_end": self.train_end.isoformat(),
+            "test_start": self.test_start.isoformat(),
+            "test_end": self.test_end.isoformat(),
+            "best_params": self.best_params,
+            "train": self.train_result.to_dict(),
+            "test": self.test_result.to_dict()
+        }
+
+
+def parameter_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a dict of parameter value lists into all combinations.
+
+    Args:
+        grid: Dict of parameter name -> candidate values
+
+    Returns:
+        List of parameter dicts (cartesian product)
+    """
+    if not grid:
+        return [{}]
+
+    names = list(grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+class BacktestOptimizer:
+    """Grid search and walk-forward optimization over preloaded data."""
+
+    def __init__(
+        self,
+        historical_data: Dict[str, List[Dict]],
+        config: BacktestConfig = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize optimizer.
+
+        Args:
+            historical_data: Dict of symbol -> bars, e.g. engine.historical_data
+                             after BacktestEngine.load_data()
+            config: Base backtest configuration shared by every run
+            max_workers: Process pool size for non-vectorized strategies
+                         (None = CPU count, 1 = run in-process)
+        """
+        self.config = config or BacktestConfig()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.logger = logging.getLogger(__name__)
+
+        self.historical_data = historical_data
+        self.columnar = ColumnarData.from_historical(historical_data)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        if not len(self.columnar):
+            raise ValueError("No valid timestamps in historical data")
+
+    @classmethod
+    def from_engine(cls, engine: BacktestEngine, max_workers: Optional[int] = None) -> "BacktestOptimizer":
+        """Create an optimizer from an engine that has already loaded data."""
+        if not engine.historical_data:
+            raise ValueError("No historical data loaded. Call load_data() first.")
+        return cls(engine.historical_data, engine.config, max_workers)
+
+    async def sweep(
+        self,
+        strategy: Callable,
+        grid: Dict[str, List[Any]],
+        metric: str = "sharpe_ratio",
+        windows: Optional[List[Tuple[int, int]]] = None
+    ) -> List[SweepResult]:
+        """
+        Evaluate every parameter combination and rank by a result metric.
+
+        Args:
+            strategy: Strategy function taking (data, positions, capital, **params)
+            grid: Dict of parameter name -> candidate values
+            metric: BacktestResult attribute to rank by (higher is better)
+            windows: Optional [start, stop) positions in the aligned timestamp
+                     index; defaults to the full history
+
+        Returns:
+            Sweep results ordered by window, then rank
+        """
+        combos = parameter_grid(grid)
+        windows = windows or [(0, len(self.columnar))]
+
+        table = []
+        try:
+            for w, (start, stop) in enumerate(windows):
+                results = await self._evaluate(strategy, combos, start, stop)
+                table.extend(self._rank(combos, results, metric, w))
+        finally:
+            self._shutdown_pool()
+
+        return table
+
+    async def walk_forward(
+        self,
+        strategy: Callable,
+        grid: Dict[str, List[Any]],
+        train_size: int,
+        test_size: int,
+        metric: str = "sharpe_ratio"
+    ) -> List[WalkForwardResult]:
+        """
+        Rolling in-sample optimization with out-of-sample evaluation.
+
+        Each window optimizes on train_size bars, then runs the best
+        parameters on the following test_size bars. Windows advance by
+        test_size.
+
+        Args:
+            strategy: Strategy function taking (data, positions, capital, **params)
+            grid: Dict of parameter name -> candidate values
+            train_size: In-sample window length in aligned bars
+            test_size: Out-of-sample window length in aligned bars
+            metric: BacktestResult attribute to rank by (higher is better)
+
+        Returns:
+            One WalkForwardResult per window
+        """
+        if train_size <= 0 or test_size <= 0:
+            raise ValueError("train_size and test_size must be positive")
+
+        combos = parameter_grid(grid)
+        total = len(self.columnar)
+
+        windows = []
+        start = 0
+        while start + train_size + test_size <= total:
+            windows.append((start, start + train_size, start + train_size + test_size))
+            start += test_size
+
+        if not windows:
+            raise ValueError(
+                f"Not enough data for one window: {total} bars < {train_size + test_size}"
+            )
+
+        try:
+            return await self._walk_windows(strategy, combos, windows, metric)
+        finally:
+            self._shutdown_pool()
+
+    async def _walk_windows(
+        self,
+        strategy: Callable,
+        combos: List[Dict[str, Any]],
+        windows: List[Tuple[int, int, int]],
+        metric: str
+    ) -> List[WalkForwardResult]:
+        """Optimize and test each (train_start, train_stop, test_stop) window."""
+        walk = []
+        for w, (train_start, train_stop, test_stop) in enumerate(windows):
+            train_results = await self._evaluate(strategy, combos, train_start, train_stop)
+            ranking = self._rank(combos, train_results, metric, w)
+            best = ranking[0]
+
+            test_result = (await self._evaluate(strategy, [best.params], train_stop, test_stop))[0]
+
+            walk.append(WalkForwardResult(
+                window=w,
+                train_start=best.result.start_date,
+                train_end=best.result.end_date,
+                test_start=test_result.start_date,
+                test_end=test_result.end_date,
+                best_params=best.params,
+                train_result=best.result,
+                test_result=test_result,
+                ranking=ranking
+            ))
+
+            self.logger.info(
+                f"Walk-forward window {w}: best {best.params}, "
+                f"out-of-sample {metric}={getattr(test_result, metric)}"
+            )
+
+        return walk
+
+    async def _evaluate(
+        self,
+        strategy: Callable,
+        combos: List[Dict[str, Any]],
+        start: int,
+        stop: int
+    ) -> List[BacktestResult]:
+        """Run every parameter combination over one window."""
+        window = self.columnar.slice(start, stop)
+
+        # The vectorized kernels do float math, so DECIMAL mode always uses the engine
+        if strategy in VECTORIZED_STRATEGIES and self.config.numeric_mode == NumericMode.FLOAT:
+            vectorized, supported_params = VECTORIZED_STRATEGIES[strategy]
+            if all(set(params) <= supported_params for params in combos):
+                return vectorized(window, combos, self.config)
+
+        runs = [partial(strategy, **params) for params in combos]
+
+        if self.max_workers <= 1 or len(runs) == 1:
+            historical_data = window.to_historical()
+            return [await _run_engine(historical_data, self.config, run) for run in runs]
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        futures = [loop.run_in_executor(pool, _run_in_worker, run, start, stop) for run in runs]
+        return list(await asyncio.gather(*futures))
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Worker pool shared by every window; workers receive the data once."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.historical_data, self.config)
+            )
+        return self._pool
+
+    def _shutdown_pool(self):
+        """Stop the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _rank(
+        self,
+        combos: List[Dict[str, Any]],
+        results: List[BacktestResult],
+        metric: str,
+        window: int
+    ) -> List[SweepResult]:
+        """Order results by metric, best first."""
+        rows = [
+            SweepResult(params=params, result=result, window=window)
+            for params, result in zip(combos, results)
+        ]
+        rows.sort(key=lambda row: getattr(row.result, metric), reverse=True)
+
+        for rank, row in enumerate(rows, start=1):
+            row.rank = rank
+
+        return rows
+
+
+# Process pool workers
+
+_worker_columnar: Optional[ColumnarData] = None
+_worker_config: Optional[BacktestConfig] = None
+_worker_window: Tuple[Optional[Tuple[int, int]], Dict[str, List[Dict]]] = (None, {})
+
+
+def _init_worker(historical_data: Dict[str, List[Dict]], config: BacktestConfig):
+    """Receive the full history once per worker process."""
+    global _worker_columnar, _worker_config, _worker_window
+    _worker_columnar = ColumnarData.from_historical(historical_data)
+    _worker_config = config
+    _worker_window = (None, {})
+
+
+def _run_in_worker(strategy: Callable, start: int, stop: int) -> BacktestResult:
+    """Run one parameter combination over window [start, stop) inside a worker process."""
+    global _worker_window
+    bounds, window_data = _worker_window
+    if bounds != (start, stop):
+        window_data = _worker_columnar.slice(start, stop).to_historical()
+        _worker_window = ((start, stop), window_data)
+    return asyncio.run(_run_engine(window_data, _worker_config, strategy))
+
+
+async def _run_engine(
+    historical_data: Dict[str, List[Dict]],
+    config: BacktestConfig,
+    strategy: Callable
+) -> BacktestResult:
+    """Run a single backtest on preloaded data."""
+    engine = BacktestEngine(replace(config, mode=BacktestMode.COLUMNAR))
+    engine.historical_data = historical_data
+    engine.set_strategy(strategy)
+    return await engine.run()
+
+
+# Vectorized strategy implementations
+
+def _to_datetime(timestamp) -> datetime:
+    """Convert an engine timestamp (seconds or milliseconds) to datetime."""
+    return datetime.fromtimestamp(timestamp / 1000) if timestamp > 1e10 else datetime.fromtimestamp(timestamp)
+
+
+def _vectorized_mean_reversion(
+    columnar: ColumnarData,
+    combos: List[Dict[str, Any]],
+    config: BacktestConfig
+) -> List[BacktestResult]:
+    """
+    Run mean_reversion_strategy for every z-score threshold in one pass.
+
+    Only used when config.numeric_mode is FLOAT; DECIMAL sweeps run the engine.
+
+    Reproduces BacktestEngine bookkeeping (float numeric mode) with state
+    arrays of shape (P, N) for P parameter combinations and N symbols, so
+    each bar costs one vectorized update per symbol instead of P engine
+    iterations.
+    """
+    thresholds = np.array(
+        [float(p.get("z_score_threshold", 2.0)) for p in combos], dtype=np.float64
+    )
+    n_params, n_symbols = len(combos), len(columnar.symbols)
+    timestamps = columnar.timestamps.tolist()
+
+    commission_rate = float(config.commission_rate)
+    slippage_rate = float(config.slippage_rate)
+    cost_rate = 1 + commission_rate + slippage_rate
+    fit_rate = 1 - commission_rate - slippage_rate
+    min_threshold = float(thresholds.min())
+
+    close = columnar.field("close")
+    z_scores = columnar.values("z_score")
+    present_mask = columnar.bar_index >= 0
+
+    capital = np.full(n_params, float(config.initial_capital))
+    side = np.zeros((n_params, n_symbols))  # +1 long, -1 short, 0 flat
+    quantity = np.zeros((n_params, n_symbols))
+    entry_price = np.zeros((n_params, n_symbols))
+    entry_costs = np.zeros((n_params, n_symbols))
+
+    trades: List[List[BacktestTrade]] = [[] for _ in range(n_params)]
+    open_trades: Dict[Tuple[int, int], BacktestTrade] = {}
+
+    equity_rows = np.empty((n_params, len(timestamps)))
+    capital_rows = np.empty((n_params, len(timestamps)))
+
+    def close_positions(mask: np.ndarray, col: int, price: float, timestamp):
+        idx = np.nonzero(mask)[0]
+        qty = quantity[idx, col]
+        position_value = qty * price
+        exit_commission = position_value * commission_rate
+        exit_slippage = position_value * slippage_rate
+        gross_pnl = side[idx, col] * (price - entry_price[idx, col]) * qty
+        net_pnl = gross_pnl - (entry_costs[idx, col] + exit_commission + exit_slippage)
+        capital[idx] += position_value - exit_commission - exit_slippage + gross_pnl
+
+        exit_time = _to_datetime(timestamp)
+        for p, pnl, c, s in zip(idx.tolist(), net_pnl.tolist(), exit_commission.tolist(), exit_slippage.tolist()):
+            trade = open_trades.pop((p, col))
+            trade.exit_price = price
+            trade.exit_timestamp = exit_time
+            trade.commission += c
+            trade.slippage += s
+            trade.pnl = pnl
+            entry_value = trade.entry_price * trade.quantity
+            trade.pnl_percentage = (pnl / entry_value * 100) if entry_value else 0.0
+
+        side[idx, col] = 0
+        quantity[idx, col] = 0
+
+    for t, timestamp in enumerate(timestamps):
+        present = np.nonzero(present_mask[t])[0]
+        capital_at_signal = capital.copy()
+
+        for col in present.tolist():
+            z = z_scores[t, col]
+            if np.isnan(z):
+                continue
+
+            price = close[t, col]
+            held = side[:, col] != 0
+
+            # Close held positions when returning to the mean
+            if abs(z) < 0.5 and held.any():
+                close_positions(held, col, price, timestamp)
+
+            # Open where flat and beyond each combination's threshold
+            if -min_threshold <= z <= min_threshold:
+                continue
+
+            direction = np.where(z < -thresholds, 1.0, np.where(z > thresholds, -1.0, 0.0))
+            opening = ~held & (direction != 0)
+            if not opening.any():
+                continue
+
+            idx = np.nonzero(opening)[0]
+            qty = capital_at_signal[idx] * 0.1 / price
+            total_cost = qty * price * cost_rate
+            over = total_cost > capital[idx]
+            qty = np.where(over, capital[idx] * fit_rate / price, qty)
+            valid = qty > 0
+            idx, qty = idx[valid], qty[valid]
+
+            position_value = qty * price
+            commission = position_value * commission_rate
+            slippage = position_value * slippage_rate
+            capital[idx] -= position_value + commission + slippage
+
+            side[idx, col] = direction[idx]
+            quantity[idx, col] = qty
+            entry_price[idx, col] = price
+            entry_costs[idx, col] = commission + slippage
+
+            entry_time = _to_datetime(timestamp)
+            symbol = columnar.symbols[col]
+            for p, q, c, s in zip(idx.tolist(), qty.tolist(), commission.tolist(), slippage.tolist()):
+                trade = BacktestTrade(
+                    timestamp=entry_time,
+                    symbol=symbol,
+                    side=OrderSide.BUY if direction[p] > 0 else OrderSide.SELL,
+                    quantity=q,
+                    entry_price=price,
+                    commission=c,
+                    slippage=s,
+                    strategy="mean_reversion"
+                )
+                trades[p].append(trade)
+                open_trades[(p, col)] = trade
+
+        # Equity counts only positions whose symbol has a bar at this timestamp
+        prices = np.where(present_mask[t], close[t], 0.0)
+        position_values = quantity * prices + side * (prices - entry_price) * quantity
+        equity_rows[:, t] = capital + np.where(side[:, present] != 0, position_values[:, present], 0.0).sum(axis=1)
+        capital_rows[:, t] = capital
+
+    # Close remaining positions at the final bar
+    final = len(timestamps) - 1
+    for col in np.nonzero(present_mask[final])[0].tolist():
+        held = side[:, col] != 0
+        if held.any():
+            close_positions(held, col, close[final, col], timestamps[final])
+
+    daily_returns = _daily_returns(timestamps, equity_rows, float(config.initial_capital))
+
+    results = []
+    result_config = replace(config, numeric_mode=NumericMode.FLOAT)
+    for p in range(n_params):
+        engine = BacktestEngine(result_config)
+        engine.capital = float(capital[p])
+        engine.trades = trades[p]
+        engine.daily_returns = daily_returns[p]
+        engine.equity_curve = [
+            {
+                "timestamp": timestamp,
+                "equity": equity,
+                "capital": cash,
+                "positions_value": equity - cash
+            }
+            for timestamp, equity, cash in zip(timestamps, equity_rows[p].tolist(), capital_rows[p].tolist())
+        ]
+        results.append(engine._calculate_results(timestamps))
+
+    return results
+
+
+def _daily_returns(timestamps: List, equity: np.ndarray, initial_capital: float) -> List[List[float]]:
+    """Returns between the first bars of consecutive days, as the engine computes them."""
+    dates = [_to_datetime(ts).date() for ts in timestamps]
+    day_starts = [i for i in range(1, len(dates)) if dates[i] != dates[i - 1]]
+
+    if not day_starts:
+        return [[] for _ in range(equity.shape[0])]
+
+    at_day_start = equity[:, day_starts]
+    previous = np.concatenate(
+        [np.full((equity.shape[0], 1), initial_capital), at_day_start[:, :-1]], axis=1
+    )
+    return ((at_day_start - previous) / previous).tolist()
+
+
+# Strategy -> (vectorized implementation, parameters it can vary)
+VECTORIZED_STRATEGIES: Dict[Callable, Tuple[Callable, set]] = {
+    mean_reversion_strategy: (_vectorized_mean_reversion, {"z_score_threshold"})
+}
@@ -9,8 +9,16 @@ DEFAULT_CONFIG = {
     # Market data configuration
     "market_data": {
         "update_interval_ms": 1000,  # Update every 1 second
+        "max_concurrent_fetches": 16,  # Concurrent fetches across all exchanges
+        "fetch_timeout_ms": 1000,  # Drop fetches slower than this
+        "stale_after_ms": 3000,  # Mark an exchange stale after this long without data
     },
 
+    # Agent dispatch configuration
+    "agent_deadline_ms": 500,  # Drop agent results arriving later than this per tick
+    "agent_deadlines_ms": {},  # Per-agent overrides, e.g. {"statistical": 800}
+    "detector_workers": 4,  # Thread pool size for CPU-bound agents
+
     # Exchanges and symbols to monitor
     "exchanges": {
         "binance": [
@@ -74,6 +82,9 @@ DEFAULT_CONFIG = {
         "triangular": {
             "enabled": True,
             "min_profit_threshold": "0.001",  # 0.1% minimum profit
+            "enable_cycle_search": False,  # Bellman-Ford search for 4+ leg cycles
+            "max_cycle_length": 6,
+            "max_quote_age": 10.0,  # Seconds before a quote is dropped from the graph
             "min_confidence": "0.7",
             "max_risk": "0.5"
         }
@@ -3,8 +3,11 @@ Orchestrator for the multi-agent arbitrage trading system.
 Coordinates all agents, services, and manages the overall workflow.
 """
 import asyncio
+import heapq
 import logging
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 
@@ -16,6 +19,7 @@ from .agents.risk_manager_agent import RiskManagerAgent
 
 from .services.market_data_service import MarketDataService
 from .services.execution_service import ExecutionService
+from .utils.metrics import LatencyHistogram
 
 from .models.types import (
     ArbitrageOpportunity,
@@ -58,6 +62,18 @@ class ArbitrageOrchestrator:
         self.total_detection_latency = 0
         self.total_execution_latency = 0
 
+        # Agent dispatch: per-agent deadlines, in-flight runs and latency
+        self.agent_deadline_ms = self.config.get("agent_deadline_ms", 500)
+        self.agent_deadlines_ms: Dict[str, float] = self.config.get("agent_deadlines_ms", {})
+        self._detector_pool = ThreadPoolExecutor(
+            max_workers=self.config.get("detector_workers", 4),
+            thread_name_prefix="detector"
+        )
+        self._agent_runs: Dict[str, asyncio.Task] = {}
+        self.agent_latency: Dict[str, LatencyHistogram] = {}
+        self.late_results: Dict[str, int] = {}
+        self.skipped_ticks: Dict[str, int] = {}
+
         # Setup logging
         self._setup_logging()
 
@@ -163,40 +179,114 @@ class ArbitrageOrchestrator:
         await self.market_data_service.stop()
         await self.execution_service.stop()
 
+        self._detector_pool.shutdown(wait=False, cancel_futures=True)
+
         self.logger.info("Arbitrage trading system stopped successfully")
 
     async def _on_market_data(self, market_data: List[MarketData]):
         """
         Handle incoming market data.
 
+        Detection agents run concurrently, each against its own deadline.
+        Opportunities from an agent are processed as soon as that agent
+        returns; results arriving after the deadline are dropped.
+
         Args:
             market_data: List of market data updates
         """
         if not self.is_running:
             return
 
-        # Process market data with all agents (except risk manager)
-        all_opportunities = []
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadlines: Dict[asyncio.Task, float] = {}
 
         for agent_id, agent in self.agents.items():
             if agent_id == "risk_manager":
-                # Risk manager monitors but doesn't detect opportunities
-                await agent.process_market_data(market_data)
                 continue
 
-            try:
-                opportunities = await agent.process_market_data(market_data)
-                all_opportunities.extend(opportunities)
+            # Never overlap runs of the same (stateful) agent
+            running = self._agent_runs.get(agent_id)
+            if running is not None and not running.done():
+                self.skipped_ticks[agent_id] = self.skipped_ticks.get(agent_id, 0) + 1
+                continue
+
+            task = asyncio.create_task(self._run_agent(agent_id, agent, market_data))
+            self._agent_runs[agent_id] = task
+            deadline_ms = self.agent_deadlines_ms.get(agent_id, self.agent_deadline_ms)
+            deadlines[task] = started + deadline_ms / 1000
+
+        # Risk manager monitors but doesn't detect opportunities
+        if self.risk_manager:
+            await self.risk_manager.process_market_data(market_data)
+
+        pending = set(deadlines)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, min(deadlines[t] for t in pending) - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                agent_id, opportunities, finished_at = task.result()
+                if finished_at > deadlines[task]:
+                    self._record_late(agent_id)
+                    continue
 
-            except Exception as e:
-                self.logger.error(
-                    f"Error processing data with agent {agent_id}: {e}",
-                    exc_info=True
+                # Process detected opportunities
+                if opportunities:
+                    await self._process_opportunities(opportunities)
+
+            expired = {t for t in pending if deadlines[t] <= loop.time()}
+            for task in expired:
+                self._record_late(self._task_agent_id(task))
+            pending -= expired
+
+    async def _run_agent(
+        self,
+        agent_id: str,
+        agent: BaseAgent,
+        market_data: List[MarketData]
+    ) -> Tuple[str, List[ArbitrageOpportunity], float]:
+        """
+        Run one agent, on the detector pool if it is CPU-bound.
+
+        Returns:
+            Tuple of (agent_id, opportunities, loop time at completion)
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        opportunities = []
+
+        try:
+            if agent.cpu_bound:
+                opportunities = await loop.run_in_executor(
+                    self._detector_pool, _run_coroutine, agent.process_market_data, market_data
                 )
+            else:
+                opportunities = await agent.process_market_data(market_data)
+
+        except Exception as e:
+            self.logger.error(
+                f"Error processing data with agent {agent_id}: {e}",
+                exc_info=True
+            )
+
+        if agent_id not in self.agent_latency:
+            self.agent_latency[agent_id] = LatencyHistogram()
+        self.agent_latency[agent_id].record((time.perf_counter() - started) * 1000)
 
-        # Process detected opportunities
-        if all_opportunities:
-            await self._process_opportunities(all_opportunities)
+        return agent_id, opportunities, loop.time()
+
+    def _task_agent_id(self, task: asyncio.Task) -> Optional[str]:
+        """Get the agent an in-flight run belongs to."""
+        return next((aid for aid, run in self._agent_runs.items() if run is task), None)
+
+    def _record_late(self, agent_id: str):
+        """Count a result dropped for missing its deadline."""
+        self.late_results[agent_id] = self.late_results.get(agent_id, 0) + 1
+        self.logger.warning(f"Agent {agent_id} missed its deadline; results dropped")
 
     async def _process_opportunities(
         self,
@@ -205,12 +295,23 @@ class ArbitrageOrchestrator:
         """
         Process detected arbitrage opportunities.
 
+        Opportunities are ranked lazily by expected profit: the best one is
+        checked and executed before the remainder is ordered.
+
         Args:
             opportunities: List of detected opportunities
         """
         self.total_opportunities += len(opportunities)
 
-        for opportunity in opportunities:
+        ranked = [
+            (-opportunity.expected_profit_percentage, i, opportunity)
+            for i, opportunity in enumerate(opportunities)
+        ]
+        heapq.heapify(ranked)
+
+        while ranked:
+            _, _, opportunity = heapq.heappop(ranked)
+
             # Check if opportunity is viable
             if not opportunity.is_viable():
                 continue
@@ -318,6 +419,12 @@ class ArbitrageOrchestrator:
             "total_opportunities": self.total_opportunities,
             "viable_opportunities": self.viable_opportunities,
             "executed_trades": self.executed_trades,
+            "agent_latency": {
+                agent_id: histogram.to_dict()
+                for agent_id, histogram in self.agent_latency.items()
+            },
+            "late_results": dict(self.late_results),
+            "skipped_ticks": dict(self.skipped_ticks),
             "agents": {
                 agent_id: agent.get_status()
                 for agent_id, agent in self.agents.items()
@@ -361,3 +468,8 @@ class ArbitrageOrchestrator:
                 "total_agents": len(self.agents)
             }
         )
+
+
+def _run_coroutine(coroutine_function, *args):
+    """Run an agent coroutine to completion on a detector pool thread."""
+    return asyncio.run(coroutine_function(*args))
@@ -3,29 +3,39 @@ Market data service for collecting real-time market data from various sources.
 """
 import asyncio
 import logging
-from typing import List, Dict, Set, Optional
+import time
+from typing import List, Dict, Set, Optional, Callable, Awaitable, Tuple
 from datetime import datetime
 from decimal import Decimal
 import random
 
 from ..models.types import MarketData, MarketType
+from ..utils.metrics import LatencyHistogram
 
 
 class MarketDataService:
     """Service for collecting and distributing market data."""
 
-    def __init__(self, config: dict = None):
+    def __init__(
+        self,
+        config: dict = None,
+        fetcher: Optional[Callable[[str, str], Awaitable[Optional[MarketData]]]] = None
+    ):
         """
         Initialize market data service.
 
         Args:
             config: Service configuration
+            fetcher: Async callable (exchange, symbol) -> MarketData used instead
+                     of the built-in simulated feed
         """
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
+        self.fetcher = fetcher or self._fetch_market_data
 
-        # Subscribers
+        # Subscribers (full cycle batches and per-exchange partial batches)
         self.subscribers: List = []
+        self.partial_subscribers: List = []
 
         # Market data cache
         self.latest_data: Dict[str, MarketData] = {}
@@ -33,6 +43,19 @@ class MarketDataService:
         # Active exchanges and symbols
         self.exchanges: Set[str] = set()
         self.symbols: Set[str] = set()
+        self.exchange_symbols: Dict[str, Set[str]] = {}
+
+        # Fan-in limits
+        self.update_interval = self.config.get("update_interval_ms", 1000) / 1000
+        self.fetch_timeout = self.config.get("fetch_timeout_ms", self.update_interval * 1000) / 1000
+        self.stale_after = self.config.get("stale_after_ms", 3 * self.update_interval * 1000) / 1000
+        self._fetch_semaphore = asyncio.Semaphore(self.config.get("max_concurrent_fetches", 16))
+
+        # Metrics
+        self.cycle_latency = LatencyHistogram()
+        self.source_latency: Dict[str, LatencyHistogram] = {}
+        self.source_updated_at: Dict[str, float] = {}
+        self.source_failures: Dict[str, int] = {}
 
         self.is_running = False
 
@@ -46,16 +69,24 @@ class MarketDataService:
         """
         self.exchanges.add(exchange)
         self.symbols.update(symbols)
+        self.exchange_symbols.setdefault(exchange, set()).update(symbols)
+        self.source_latency.setdefault(exchange, LatencyHistogram())
+        self.source_failures.setdefault(exchange, 0)
         self.logger.info(f"Added exchange {exchange} with {len(symbols)} symbols")
 
-    def subscribe(self, callback):
+    def subscribe(self, callback, partial: bool = False):
         """
         Subscribe to market data updates.
 
         Args:
             callback: Async callback function to receive market data updates
+            partial: Receive each exchange's batch as soon as it arrives instead
+                     of one batch per collection cycle
         """
-        self.subscribers.append(callback)
+        if partial:
+            self.partial_subscribers.append(callback)
+        else:
+            self.subscribers.append(callback)
         self.logger.info(f"Added subscriber: {callback}")
 
     async def start(self):
@@ -75,28 +106,140 @@ class MarketDataService:
         """Collect market data from exchanges (main loop)."""
         while self.is_running:
             try:
-                # Collect data from all exchanges
-                all_data = []
-
-                for exchange in self.exchanges:
-                    for symbol in self.symbols:
-                        data = await self._fetch_market_data(exchange, symbol)
-                        if data:
-                            all_data.append(data)
-                            self.latest_data[f"{exchange}:{symbol}"] = data
-
-                # Notify subscribers
-                if all_data:
-                    await self._notify_subscribers(all_data)
+                started = time.perf_counter()
+                await self.collect_cycle()
 
-                # Sleep interval based on config
-                interval = self.config.get("update_interval_ms", 1000) / 1000
-                await asyncio.sleep(interval)
+                # Sleep for the rest of the update interval
+                elapsed = time.perf_counter() - started
+                await asyncio.sleep(max(0.0, self.update_interval - elapsed))
 
             except Exception as e:
                 self.logger.error(f"Error collecting market data: {e}", exc_info=True)
                 await asyncio.sleep(1)
 
+    async def collect_cycle(self) -> List[MarketData]:
+        """
+        Run one collection cycle across all exchanges.
+
+        Exchanges are fetched concurrently; each exchange's batch is published
+        to partial subscribers as soon as it returns, and the combined batch
+        is published to regular subscribers once every exchange has finished.
+
+        Returns:
+            All market data collected in this cycle
+        """
+        started = time.perf_counter()
+
+        tasks = [
+            asyncio.create_task(self._fetch_exchange(exchange, sorted(symbols)))
+            for exchange, symbols in self.exchange_symbols.items()
+        ]
+
+        all_data = []
+        for next_batch in asyncio.as_completed(tasks):
+            exchange, batch = await next_batch
+            if not batch:
+                continue
+
+            all_data.extend(batch)
+            await self._notify_subscribers(batch, self.partial_subscribers)
+
+        self.cycle_latency.record((time.perf_counter() - started) * 1000)
+
+        # Notify subscribers
+        if all_data:
+            await self._notify_subscribers(all_data)
+
+        return all_data
+
+    async def _fetch_exchange(
+        self,
+        exchange: str,
+        symbols: List[str]
+    ) -> Tuple[str, List[MarketData]]:
+        """
+        Fetch all symbols of one exchange concurrently.
+
+        Args:
+            exchange: Exchange name
+            symbols: Symbols to fetch
+
+        Returns:
+            Tuple of (exchange, market data that arrived in time)
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._fetch_with_limit(exchange, symbol) for symbol in symbols
+        ))
+        self.source_latency[exchange].record((time.perf_counter() - started) * 1000)
+
+        batch = []
+        for symbol, data in zip(symbols, results):
+            if data:
+                batch.append(data)
+                self.latest_data[f"{exchange}:{symbol}"] = data
+
+        if batch:
+            self.source_updated_at[exchange] = time.monotonic()
+        if len(batch) < len(symbols):
+            self.source_failures[exchange] += len(symbols) - len(batch)
+
+        return exchange, batch
+
+    async def _fetch_with_limit(self, exchange: str, symbol: str) -> Optional[MarketData]:
+        """Fetch one symbol under the shared concurrency limit and timeout."""
+        async with self._fetch_semaphore:
+            try:
+                return await asyncio.wait_for(self.fetcher(exchange, symbol), self.fetch_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Timed out fetching {exchange}:{symbol}")
+            except Exception as e:
+                self.logger.error(f"Error fetching data for {exchange}:{symbol}: {e}")
+            return None
+
+    def get_staleness(self) -> Dict[str, float]:
+        """
+        Get seconds since each exchange last delivered data.
+
+        Returns:
+            Dict of exchange -> age in seconds (inf if never updated)
+        """
+        now = time.monotonic()
+        return {
+            exchange: now - self.source_updated_at[exchange]
+            if exchange in self.source_updated_at else float("inf")
+            for exchange in self.exchange_symbols
+        }
+
+    def get_stale_sources(self) -> List[str]:
+        """Get exchanges whose data is older than the stale_after_ms threshold."""
+        return [
+            exchange for exchange, age in self.get_staleness().items()
+            if age > self.stale_after
+        ]
+
+    def get_metrics(self) -> Dict:
+        """
+        Get fan-in latency and freshness metrics.
+
+        Returns:
+            Cycle latency histogram plus per-exchange latency, age and failures
+        """
+        staleness = self.get_staleness()
+
+        return {
+            "cycle_latency": self.cycle_latency.to_dict(),
+            "sources": {
+                exchange: {
+                    "latency": self.source_latency[exchange].to_dict(),
+                    "age_seconds": staleness[exchange],
+                    "stale": staleness[exchange] > self.stale_after,
+                    "failures": self.source_failures[exchange]
+                }
+                for exchange in self.exchange_symbols
+            }
+        }
+
     async def _fetch_market_data(
         self,
         exchange: str,
@@ -199,9 +342,9 @@ class MarketDataService:
 
         return price_map.get(symbol, 100.0)
 
-    async def _notify_subscribers(self, market_data: List[MarketData]):
+    async def _notify_subscribers(self, market_data: List[MarketData], subscribers: List = None):
         """Notify all subscribers of new market data."""
-        for subscriber in self.subscribers:
+        for subscriber in self.subscribers if subscribers is None else subscribers:
             try:
                 await subscriber(market_data)
             except Exception as e:
@@ -0,0 +1,90 @@
+"""
+Tests for the backtesting engine modes.
+"""
+
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arbitrage_trader.backtesting import (
+    BacktestEngine,
+    BacktestConfig,
+    BacktestMode,
+    NumericMode,
+    mean_reversion_strategy
+)
+
+
+def make_history(num_symbols: int, num_bars: int, step_ms: int, seed: int = 7):
+    """Build a random-walk bar history with gaps and z-scores."""
+    rng = random.Random(seed)
+    history = {}
+
+    for s in range(num_symbols):
+        price = 100.0
+        bars = []
+        for t in range(num_bars):
+            if rng.random() < 0.05:
+                continue  # Missing bar
+            price *= 1 + rng.gauss(0, 0.01)
+            bars.append({
+                "timestamp": 1_500_000_000_000 + t * step_ms,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": round(price, 2),
+                "volume": 1.0,
+                "z_score": rng.gauss(0, 1.5)
+            })
+        history[f"SYM{s}"] = bars
+
+    return history
+
+
+async def run_backtest(history, **config_kwargs):
+    """Run mean reversion over the given history."""
+    engine = BacktestEngine(BacktestConfig(**config_kwargs))
+    engine.historical_data = history
+    engine.set_strategy(mean_reversion_strategy)
+    return await engine.run()
+
+
+@pytest.mark.asyncio
+async def test_columnar_mode_matches_default_loop():
+    """Columnar mode produces the same result as the scanning loop."""
+    history = make_history(num_symbols=5, num_bars=500, step_ms=3_600_000)
+
+    default = await run_backtest(history, mode=BacktestMode.FAST)
+    columnar = await run_backtest(history, mode=BacktestMode.COLUMNAR)
+
+    assert columnar.total_trades > 0
+    assert columnar.to_dict() == default.to_dict()
+    assert columnar.equity_curve == default.equity_curve
+    assert [t.__dict__ for t in columnar.trades] == [t.__dict__ for t in default.trades]
+
+
+@pytest.mark.asyncio
+async def test_float_mode_within_a_cent_of_decimal():
+    """
+    Float64 bookkeeping stays within one cent of the Decimal path.
+
+    Runs three years of daily bars over several symbols and compares final
+    capital and every trade's PnL.
+    """
+    history = make_history(num_symbols=4, num_bars=3 * 365, step_ms=86_400_000)
+    tolerance = Decimal("0.01")
+
+    exact = await run_backtest(history, numeric_mode=NumericMode.DECIMAL)
+    fast = await run_backtest(history, numeric_mode=NumericMode.FLOAT)
+
+    assert isinstance(fast.final_capital, Decimal)
+    assert fast.total_trades == exact.total_trades > 0
+    assert abs(fast.final_capital - exact.final_capital) <= tolerance
+    for fast_trade, exact_trade in zip(fast.trades, exact.trades):
+        assert isinstance(fast_trade.pnl, Decimal)
+        assert abs(fast_trade.pnl - exact_trade.pnl) <= tolerance
@@ -0,0 +1,133 @@
+"""
+Tests for backtest parameter sweeps and walk-forward optimization.
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_trader.backtesting import (
+    BacktestOptimizer,
+    BacktestConfig,
+    NumericMode,
+    parameter_grid,
+    mean_reversion_strategy
+)
+from test_backtest_engine import make_history
+
+
+def threshold_strategy(current_data, positions, capital, z_score_threshold=2.0):
+    """Mean reversion wrapper that is not registered as vectorized."""
+    return mean_reversion_strategy(current_data, positions, capital, z_score_threshold)
+
+
+def test_parameter_grid():
+    """Grid expands to the cartesian product."""
+    combos = parameter_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+
+    assert len(combos) == 6
+    assert {"a": 2, "b": "z"} in combos
+    assert parameter_grid({}) == [{}]
+
+
+@pytest.mark.asyncio
+async def test_vectorized_sweep_matches_engine_runs():
+    """The vectorized sweep ranks and scores like per-combination engine runs."""
+    history = make_history(num_symbols=4, num_bars=400, step_ms=3_600_000)
+    config = BacktestConfig(numeric_mode=NumericMode.FLOAT)
+    grid = {"z_score_threshold": [0.3, 1.5, 2.5]}
+    optimizer = BacktestOptimizer(history, config, max_workers=2)
+
+    vectorized = await optimizer.sweep(mean_reversion_strategy, grid)
+    pooled = await optimizer.sweep(threshold_strategy, grid)
+
+    assert [row.rank for row in vectorized] == [1, 2, 3]
+    assert [row.params for row in vectorized] == [row.params for row in pooled]
+    for fast, exact in zip(vectorized, pooled):
+        assert fast.result.total_trades == exact.result.total_trades > 0
+        assert abs(fast.result.final_capital - exact.result.final_capital) <= Decimal("0.01")
+        assert fast.result.sharpe_ratio == exact.result.sharpe_ratio
+
+
+@pytest.mark.asyncio
+async def test_walk_forward_windows():
+    """Walk-forward rolls train/test windows through the aligned index."""
+    history = make_history(num_symbols=3, num_bars=500, step_ms=3_600_000)
+    optimizer = BacktestOptimizer(history, max_workers=1)
+
+    windows = await optimizer.walk_forward(
+        mean_reversion_strategy,
+        {"z_score_threshold": [1.0, 2.0]},
+        train_size=200,
+        test_size=100
+    )
+
+    assert len(windows) == 3
+    for window in windows:
+        assert window.train_end < window.test_start
+        assert window.best_params == window.ranking[0].params
+        assert len(window.ranking) == 2
+
+    with pytest.raises(ValueError):
+        await optimizer.walk_forward(mean_reversion_strategy, {}, train_size=400, test_size=200)
+
+
+@pytest.mark.asyncio
+async def test_decimal_mode_uses_engine(monkeypatch):
+    """DECIMAL sweeps bypass the float vectorized kernel and match engine runs exactly."""
+    from arbitrage_trader.backtesting import optimization
+
+    def fail(*args, **kwargs):
+        raise AssertionError("vectorized kernel used in DECIMAL mode")
+
+    monkeypatch.setitem(
+        optimization.VECTORIZED_STRATEGIES,
+        mean_reversion_strategy,
+        (fail, {"z_score_threshold"})
+    )
+
+    history = make_history(num_symbols=3, num_bars=200, step_ms=3_600_000)
+    config = BacktestConfig(numeric_mode=NumericMode.DECIMAL)
+    grid = {"z_score_threshold": [0.5, 2.0]}
+    optimizer = BacktestOptimizer(history, config, max_workers=1)
+
+    registered = await optimizer.sweep(mean_reversion_strategy, grid)
+    wrapped = await optimizer.sweep(threshold_strategy, grid)
+
+    for fast, exact in zip(registered, wrapped):
+        assert fast.params == exact.params
+        assert fast.result.final_capital == exact.result.final_capital
+
+
+@pytest.mark.asyncio
+async def test_walk_forward_reuses_one_pool(monkeypatch):
+    """Every walk-forward window runs on the same worker pool, shut down at the end."""
+    from arbitrage_trader.backtesting import optimization
+
+    pools = []
+
+    class CountingPool(optimization.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(optimization, "ProcessPoolExecutor", CountingPool)
+
+    history = make_history(num_symbols=2, num_bars=400, step_ms=3_600_000)
+    optimizer = BacktestOptimizer(history, max_workers=2)
+
+    windows = await optimizer.walk_forward(
+        threshold_strategy,
+        {"z_score_threshold": [1.0, 2.0]},
+        train_size=150,
+        test_size=100
+    )
+
+    assert len(windows) == 2
+    assert len(pools) == 1
+    assert optimizer._pool is None
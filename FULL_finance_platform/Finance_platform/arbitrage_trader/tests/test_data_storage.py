@@ -0,0 +1,120 @@
+"""
+Tests for backtesting data storage backends.
+"""
+
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_trader.backtesting import (
+    BacktestEngine,
+    BacktestConfig,
+    BacktestMode,
+    BarSeries,
+    ColumnarStorage,
+    mean_reversion_strategy
+)
+from test_backtest_engine import make_history
+
+
+def test_columnar_storage_round_trip(tmp_path):
+    """Bars, metadata and keys survive a save/load cycle."""
+    storage = ColumnarStorage(base_path=str(tmp_path))
+    bars = make_history(num_symbols=1, num_bars=50, step_ms=60_000)["SYM0"]
+
+    storage.save("SYM0/binance:1m", bars, metadata={"source": "binance"})
+
+    assert storage.exists("SYM0/binance:1m")
+    assert storage.list_keys() == ["SYM0/binance:1m"]
+    assert storage.load("SYM0/binance:1m") == bars
+    assert storage.get_metadata("SYM0/binance:1m")["source"] == "binance"
+
+    storage.delete("SYM0/binance:1m")
+    assert not storage.exists("SYM0/binance:1m")
+    assert storage.load("SYM0/binance:1m") is None
+
+
+def test_columnar_storage_range_reads(tmp_path):
+    """Range reads return memory-mapped slices of the requested window."""
+    storage = ColumnarStorage(base_path=str(tmp_path))
+    bars = make_history(num_symbols=1, num_bars=100, step_ms=60_000)["SYM0"]
+    storage.save("SYM0", bars)
+
+    start, end = bars[10]["timestamp"], bars[19]["timestamp"]
+    series = storage.load_series("SYM0", start_time=start, end_time=end)
+
+    assert isinstance(series, BarSeries)
+    assert isinstance(series.columns["close"], np.memmap)
+    assert len(series) == 10
+    assert list(series) == bars[10:20]
+    assert storage.query("SYM0", start_time=start, limit=3) == bars[10:13]
+
+
+def test_columnar_storage_datetime_and_mixed_fields(tmp_path):
+    """Datetime timestamps, Decimal prices and text fields are restored."""
+    storage = ColumnarStorage(base_path=str(tmp_path))
+    bars = [
+        {"timestamp": datetime(2024, 1, 1, hour), "close": Decimal("1.5"), "exchange": "binance"}
+        for hour in range(5)
+    ]
+    bars.append({"timestamp": datetime(2023, 12, 31), "close": None})
+    storage.save("mixed", bars)
+
+    loaded = storage.load("mixed")
+
+    assert loaded[0] == {"timestamp": datetime(2023, 12, 31), "close": None}
+    assert loaded[1] == {"timestamp": datetime(2024, 1, 1, 0), "close": 1.5, "exchange": "binance"}
+    assert len(storage.query("mixed", datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 3))) == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_consumes_stored_arrays(tmp_path):
+    """Columnar mode runs directly on memory-mapped series."""
+    storage = ColumnarStorage(base_path=str(tmp_path))
+    history = make_history(num_symbols=3, num_bars=300, step_ms=3_600_000)
+    for symbol, bars in history.items():
+        storage.save(symbol, bars)
+
+    async def run(historical_data):
+        engine = BacktestEngine(BacktestConfig(mode=BacktestMode.COLUMNAR))
+        engine.historical_data = historical_data
+        engine.set_strategy(mean_reversion_strategy)
+        return await engine.run()
+
+    from_dicts = await run(history)
+    from_arrays = await run({symbol: storage.load_series(symbol) for symbol in history})
+
+    assert from_arrays.total_trades > 0
+    assert from_arrays.to_dict() == from_dicts.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_returns_mapped_series(tmp_path):
+    """Cache hits on columnar storage come back as BarSeries views, not dict lists."""
+    from arbitrage_trader.backtesting.data_storage import CachedDataProvider
+
+    bars = make_history(num_symbols=1, num_bars=30, step_ms=60_000)["SYM0"]
+
+    class Provider:
+        calls = 0
+
+        async def get_crypto_historical(self, symbol, days, provider):
+            Provider.calls += 1
+            return bars
+
+    cached = CachedDataProvider(Provider(), storage=ColumnarStorage(base_path=str(tmp_path)))
+
+    fresh = await cached.get_crypto_historical("SYM0")
+    hit = await cached.get_crypto_historical("SYM0")
+
+    assert fresh is bars
+    assert Provider.calls == 1
+    assert isinstance(hit, BarSeries)
+    assert list(hit) == bars
@@ -0,0 +1,130 @@
+"""
+Tests for concurrent market data fan-in.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_trader.services.market_data_service import MarketDataService
+from arbitrage_trader.utils.metrics import LatencyHistogram
+from test_triangular import quote
+
+
+class SimulatedProvider:
+    """Local quote source with per-exchange injected delays."""
+
+    def __init__(self, delays: dict, failing: set = None):
+        self.delays = delays
+        self.failing = failing or set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, exchange: str, symbol: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[exchange])
+            if exchange in self.failing:
+                raise ConnectionError(f"{exchange} unavailable")
+            return quote(symbol, 100.0, exchange)
+        finally:
+            self.in_flight -= 1
+
+
+def make_service(provider: SimulatedProvider, **config) -> MarketDataService:
+    service = MarketDataService(config=config, fetcher=provider.fetch)
+    service.add_exchange("fast", [f"F{i}/USD" for i in range(5)])
+    service.add_exchange("slow", [f"S{i}/USD" for i in range(5)])
+    return service
+
+
+@pytest.mark.asyncio
+async def test_cycle_latency_is_bounded_by_slowest_exchange():
+    """Exchanges and symbols are fetched concurrently, not one after another."""
+    provider = SimulatedProvider({"fast": 0.01, "slow": 0.1})
+    service = make_service(provider, max_concurrent_fetches=16)
+
+    started = time.perf_counter()
+    data = await service.collect_cycle()
+    elapsed = time.perf_counter() - started
+
+    assert len(data) == 10
+    assert elapsed < 0.3  # sequential fetching would take 0.55s
+    assert len(service.latest_data) == 10
+    assert {d.exchange for d in data} == {"fast", "slow"}
+
+
+@pytest.mark.asyncio
+async def test_partial_batches_arrive_before_full_batch():
+    """Partial subscribers see the fast exchange before the slow one finishes."""
+    provider = SimulatedProvider({"fast": 0.01, "slow": 0.1})
+    service = make_service(provider)
+    events = []
+
+    async def on_partial(batch):
+        events.append(("partial", batch[0].exchange, len(batch)))
+
+    async def on_full(batch):
+        events.append(("full", None, len(batch)))
+
+    service.subscribe(on_partial, partial=True)
+    service.subscribe(on_full)
+    await service.collect_cycle()
+
+    assert events == [("partial", "fast", 5), ("partial", "slow", 5), ("full", None, 10)]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_staleness():
+    """Fetches respect the concurrency bound; failing sources go stale."""
+    provider = SimulatedProvider({"fast": 0.01, "slow": 0.01}, failing={"slow"})
+    service = make_service(provider, max_concurrent_fetches=3, stale_after_ms=50)
+
+    data = await service.collect_cycle()
+
+    assert provider.max_in_flight == 3
+    assert {d.exchange for d in data} == {"fast"}
+    assert service.get_stale_sources() == ["slow"]
+
+    await asyncio.sleep(0.06)
+    assert sorted(service.get_stale_sources()) == ["fast", "slow"]
+
+    metrics = service.get_metrics()
+    assert metrics["cycle_latency"]["count"] == 1
+    assert metrics["sources"]["slow"]["failures"] == 5
+    assert metrics["sources"]["fast"]["latency"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_fetches_time_out():
+    """A fetch slower than the timeout is dropped without holding up the cycle."""
+    provider = SimulatedProvider({"fast": 0.01, "slow": 1.0})
+    service = make_service(provider, fetch_timeout_ms=50)
+
+    started = time.perf_counter()
+    data = await service.collect_cycle()
+
+    assert time.perf_counter() - started < 0.5
+    assert {d.exchange for d in data} == {"fast"}
+    assert service.source_failures["slow"] == 5
+
+
+def test_latency_histogram_percentiles():
+    """Percentiles report bucket upper bounds, capped at the observed maximum."""
+    histogram = LatencyHistogram(buckets_ms=(10, 100))
+    for latency in [1, 2, 3, 50, 60, 500]:
+        histogram.record(latency)
+
+    summary = histogram.to_dict()
+    assert summary["buckets"] == {"le_10": 3, "le_100": 2, "overflow": 1}
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(80) == 100
+    assert histogram.percentile(99) == 500
+    assert summary["mean_ms"] == pytest.approx(616 / 6)
@@ -0,0 +1,171 @@
+"""
+Tests for concurrent agent dispatch in the orchestrator.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_trader.agents.base_agent import BaseAgent
+from arbitrage_trader.agents.risk_manager_agent import RiskManagerAgent
+from arbitrage_trader.models.types import (
+    ArbitrageOpportunity,
+    ArbitrageType,
+    MarketType
+)
+from arbitrage_trader.orchestrator import ArbitrageOrchestrator
+from test_triangular import quote
+
+
+def opportunity(profit: str) -> ArbitrageOpportunity:
+    """Viable opportunity with no exposure."""
+    return ArbitrageOpportunity(
+        opportunity_id=str(uuid.uuid4()),
+        arbitrage_type=ArbitrageType.CROSS_EXCHANGE,
+        market_type=MarketType.CRYPTO,
+        symbol="BTC/USD",
+        timestamp=datetime.now(),
+        expected_profit=Decimal(profit),
+        expected_profit_percentage=Decimal(profit),
+        confidence_score=Decimal("0.9"),
+        risk_score=Decimal("0.1"),
+        detection_latency_ms=0,
+        market_data=[],
+        suggested_actions=[]
+    )
+
+
+def cpu_work(iterations: int) -> int:
+    """Pure-Python arithmetic that holds the GIL, like a detector loop."""
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+class ScriptedAgent(BaseAgent):
+    """Agent that waits or computes, then returns fixed opportunities."""
+
+    def __init__(self, agent_id: str, delay: float, profits=(), work: int = 0):
+        super().__init__(agent_id, "ScriptedAgent", [ArbitrageType.CROSS_EXCHANGE], [MarketType.CRYPTO])
+        self.delay = delay
+        self.profits = profits
+        self.work = work
+        self.cpu_bound = work > 0
+        self.runs = 0
+        self.spans = []
+
+    async def on_start(self):
+        pass
+
+    async def on_stop(self):
+        pass
+
+    async def analyze_market_data(self, market_data):
+        self.runs += 1
+        started = time.perf_counter()
+        if self.work:
+            cpu_work(self.work)
+        else:
+            await asyncio.sleep(self.delay)
+        self.spans.append((threading.current_thread(), started, time.perf_counter()))
+        return [opportunity(p) for p in self.profits]
+
+
+class RecordingExecution:
+    """Execution service that records what was executed and when."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def execute_opportunity(self, opportunity):
+        self.executed.append((opportunity.expected_profit_percentage, time.perf_counter()))
+        return []
+
+    def get_performance_metrics(self):
+        return {"total_trades": 0}
+
+
+async def make_orchestrator(*agents, **config) -> ArbitrageOrchestrator:
+    orchestrator = ArbitrageOrchestrator(config)
+    orchestrator.risk_manager = RiskManagerAgent()
+    orchestrator.agents["risk_manager"] = orchestrator.risk_manager
+    orchestrator.execution_service = RecordingExecution()
+    for agent in agents:
+        orchestrator.agents[agent.agent_id] = agent
+        await agent.start()
+    await orchestrator.risk_manager.start()
+    orchestrator.is_running = True
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_fast_agent_executes_before_slow_agent_finishes():
+    """Late results are dropped and do not hold up the tick."""
+    fast = ScriptedAgent("fast", 0.0, profits=["0.5"])
+    slow = ScriptedAgent("slow", 0.5, profits=["0.9"])
+    orchestrator = await make_orchestrator(fast, slow, agent_deadlines_ms={"slow": 50})
+
+    started = time.perf_counter()
+    await orchestrator._on_market_data([quote("BTC/USD", 30000)])
+
+    assert time.perf_counter() - started < 0.3
+    assert [p for p, _ in orchestrator.execution_service.executed] == [Decimal("0.5")]
+    assert orchestrator.late_results == {"slow": 1}
+
+    # The slow agent is still running, so the next tick skips it
+    await orchestrator._on_market_data([quote("BTC/USD", 30000)])
+    assert slow.runs == 1
+    assert fast.runs == 2
+    assert orchestrator.skipped_ticks == {"slow": 1}
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_agents_run_off_the_event_loop():
+    """CPU-bound detectors run concurrently on the pool and never block the loop."""
+    agents = [ScriptedAgent(f"cpu{i}", 0.0, profits=["0.2"], work=1_000_000) for i in range(3)]
+    fast = ScriptedAgent("fast", 0.0, profits=["0.5"])
+    orchestrator = await make_orchestrator(*agents, fast, agent_deadline_ms=30000)
+
+    await orchestrator._on_market_data([quote("BTC/USD", 30000)])
+
+    spans = [agent.spans[0] for agent in agents]
+    threads = {thread for thread, _, _ in spans}
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
+
+    # Every detector started before any of them finished: they overlapped
+    assert max(start for _, start, _ in spans) < min(end for _, _, end in spans)
+
+    # The async agent's opportunity executed while the detectors were still busy
+    executed = orchestrator.execution_service.executed
+    assert executed[0][0] == Decimal("0.5")
+    assert executed[0][1] < min(end for _, _, end in spans)
+    assert len(executed) == 4
+
+    assert set(orchestrator.agent_latency) == {"cpu0", "cpu1", "cpu2", "fast"}
+    assert orchestrator.get_status()["agent_latency"]["cpu0"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_opportunities_execute_best_first():
+    """Within a batch the most profitable opportunity executes first."""
+    agent = ScriptedAgent("ranked", 0.0, profits=["0.2", "0.9", "0.0001", "0.5"])
+    orchestrator = await make_orchestrator(agent)
+
+    await orchestrator._on_market_data([quote("BTC/USD", 30000)])
+
+    executed = [p for p, _ in orchestrator.execution_service.executed]
+    assert executed == [Decimal("0.9"), Decimal("0.5"), Decimal("0.2")]
+    assert orchestrator.total_opportunities == 4
+    assert orchestrator.viable_opportunities == 3
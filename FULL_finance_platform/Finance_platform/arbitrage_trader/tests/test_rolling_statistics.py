@@ -0,0 +1,93 @@
+"""
+Tests for rolling price statistics and their use in statistical arbitrage.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_trader.algorithms.rolling_statistics import RollingStatistics
+from arbitrage_trader.algorithms.correlation_analysis import CorrelationAnalyzer
+from test_triangular import quote
+
+
+def random_prices(num_ticks: int, num_symbols: int, seed: int = 3) -> np.ndarray:
+    """Correlated random walks around very different price levels."""
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 1, num_ticks))
+    own = np.cumsum(rng.normal(0, 1, (num_ticks, num_symbols)), axis=0)
+    levels = np.logspace(0, 4, num_symbols)
+    return levels * (1 + 0.001 * (common[:, None] + own))
+
+
+def test_matches_numpy_over_window():
+    """Correlations, hedge ratios and z-scores match a full recomputation."""
+    window, num_symbols = 25, 12
+    prices = random_prices(200, num_symbols)
+    keys = [f"S{i}" for i in range(num_symbols)]
+
+    stats = RollingStatistics(window=window, initial_capacity=4)
+    for tick in prices:
+        stats.update(dict(zip(keys, tick.tolist())))
+
+    recent = prices[-window:]
+    np.testing.assert_allclose(stats.correlation_matrix(), np.corrcoef(recent.T), atol=1e-8)
+    np.testing.assert_allclose(stats.mean(), recent.mean(axis=0), rtol=1e-10)
+    np.testing.assert_allclose(stats.std(), recent.std(axis=0), rtol=1e-7)
+
+    rows, cols = np.triu_indices(num_symbols, k=1)
+    z_scores, spreads, hedge_ratios = stats.pair_spreads(rows, cols)
+    for k, (i, j) in enumerate(zip(rows, cols)):
+        hedge_ratio = np.polyfit(recent[:, j], recent[:, i], 1)[0]
+        spread = recent[:, i] - hedge_ratio * recent[:, j]
+        assert np.isclose(hedge_ratios[k], hedge_ratio, rtol=1e-6)
+        assert np.isclose(spreads[k], spread[-1], rtol=1e-6)
+        assert np.isclose(z_scores[k], (spread[-1] - spread.mean()) / spread.std(), atol=1e-5)
+
+
+def test_new_symbols_and_flat_prices():
+    """Late symbols only count ticks since first sighting; flat spreads have no z-score."""
+    stats = RollingStatistics(window=5)
+    for tick in range(8):
+        prices = {"A": 100.0 + tick, "FLAT": 50.0}
+        if tick >= 5:
+            prices["LATE"] = 10.0 + tick % 2
+        stats.update(prices)
+
+    assert stats.counts().tolist() == [5, 5, 3]
+    assert np.isnan(stats.correlation_matrix()[0, 1])
+
+    z_scores, _, _ = stats.pair_spreads(np.array([1]), np.array([0]))
+    assert np.isnan(z_scores[0])
+
+    # Correlation with the late symbol uses only the three shared ticks
+    late = np.array([11.0, 10.0, 11.0])
+    a = np.array([105.0, 106.0, 107.0])
+    assert np.isclose(stats.correlation(np.array([0]), np.array([2]))[0], np.corrcoef(a, late)[0, 1])
+
+
+def test_correlation_analyzer_uses_rolling_window():
+    """The analyzer's matrix and pair search agree with the per-pair correlation."""
+    analyzer = CorrelationAnalyzer({"lookback_period": 30})
+    prices = random_prices(60, 4, seed=11)
+    symbols = ["BTC/USD", "ETH/USD", "SOL/USD", "ADA/USD"]
+
+    for tick in prices:
+        analyzer.update_prices([quote(s, p, "kraken") for s, p in zip(symbols, tick.tolist())])
+
+    matrix = analyzer.build_correlation_matrix()
+    expected = np.corrcoef(prices[-30:].T)
+
+    assert len(matrix) == 16
+    assert float(matrix[("kraken:BTC/USD", "kraken:SOL/USD")]) == float(
+        analyzer.calculate_correlation("kraken:SOL/USD", "kraken:BTC/USD")
+    )
+    assert np.isclose(float(matrix[("kraken:ETH/USD", "kraken:ADA/USD")]), expected[1, 3], atol=1e-8)
+
+    pairs = analyzer.find_highly_correlated_pairs(threshold=0)
+    assert len(pairs) == 6
+    assert [abs(p["correlation"]) for p in pairs] == sorted((abs(p["correlation"]) for p in pairs), reverse=True)
@@ -0,0 +1,134 @@
+"""
+Tests for triangular arbitrage detection.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from arbitrage_trader.algorithms.triangular import TriangularArbitrageDetector, CurrencyGraph
+from arbitrage_trader.models.types import MarketData, MarketType, OrderSide
+
+
+def quote(symbol: str, mid: float, exchange: str = "binance", timestamp: datetime = None) -> MarketData:
+    """Build a tight two-sided quote around a mid price."""
+    return MarketData(
+        symbol=symbol,
+        exchange=exchange,
+        market_type=MarketType.CRYPTO,
+        bid_price=Decimal(str(mid * 0.9999)),
+        ask_price=Decimal(str(mid * 1.0001)),
+        bid_volume=Decimal(500),
+        ask_volume=Decimal(500),
+        timestamp=timestamp or datetime.now()
+    )
+
+
+def test_graph_finds_triangles_touching_a_pair():
+    """Triangles are found from the updated pair in every role."""
+    graph = CurrencyGraph()
+    for data in [quote("BTC/USD", 30000), quote("ETH/USD", 2000), quote("ETH/BTC", 0.07), quote("SOL/EUR", 20)]:
+        graph.update(data)
+
+    assert not graph.update(quote("BTCUSD", 30000))
+    assert graph.triangles_touching("SOL/EUR") == set()
+
+    expected = {
+        ("ETH/USD", "ETH/BTC", "BTC/USD"),
+        ("ETH/BTC", "ETH/USD", "BTC/USD")
+    }
+    assert graph.triangles_touching("BTC/USD") == expected
+    assert graph.triangles_touching("ETH/BTC") == expected
+
+
+def test_detector_keeps_graph_between_ticks():
+    """A single updated quote is evaluated against previously seen pairs."""
+    detector = TriangularArbitrageDetector(min_profit_threshold=Decimal("0.1"))
+
+    assert detector.detect_opportunities([quote("BTC/USD", 30000), quote("ETH/USD", 2000)]) == []
+
+    # Mispriced cross rate completes a profitable triangle
+    opportunities = detector.detect_opportunities([quote("ETH/BTC", 0.0680)])
+
+    assert opportunities
+    assert all("ETH/BTC" in opp.symbol for opp in opportunities)
+    assert all(opp.expected_profit_percentage >= Decimal("0.1") for opp in opportunities)
+
+
+def test_cycle_search_finds_four_leg_cycle():
+    """Bellman-Ford search reports profitable cycles longer than three legs."""
+    detector = TriangularArbitrageDetector(
+        min_profit_threshold=Decimal("0.1"),
+        enable_cycle_search=True
+    )
+
+    opportunities = detector.detect_opportunities([
+        quote("A/B", 1.01),
+        quote("B/C", 1.01),
+        quote("C/D", 1.0),
+        quote("D/A", 1.0)
+    ])
+
+    assert len(opportunities) == 1
+    cycle = opportunities[0]
+    assert cycle.metadata["legs"] == 4
+    assert cycle.expected_profit_percentage > Decimal("1.9")
+    assert [action.side for action in cycle.suggested_actions] == [OrderSide.SELL] * 4
+
+
+def test_stale_quotes_are_dropped():
+    """Quotes older than the max age never complete a triangle."""
+    detector = TriangularArbitrageDetector(min_profit_threshold=Decimal("0.1"), max_quote_age=5)
+    start = datetime(2024, 1, 1, 12, 0, 0)
+
+    detector.detect_opportunities([
+        quote("BTC/USD", 30000, timestamp=start),
+        quote("ETH/USD", 2000, timestamp=start)
+    ])
+    detector.detect_opportunities([quote("SOL/USD", 20, timestamp=start + timedelta(seconds=3))])
+
+    # BTC/USD and ETH/USD are 6s old by now; the cross rate alone is no triangle
+    later = start + timedelta(seconds=6)
+    assert detector.detect_opportunities([quote("ETH/BTC", 0.0680, timestamp=later)]) == []
+
+    graph = detector.graphs["binance"]
+    assert set(graph.pairs) == {"SOL/USD", "ETH/BTC"}
+    assert graph.triangles_touching("ETH/BTC") == set()
+    assert "ETH" not in graph.quotes_by_base or "USD" not in graph.quotes_by_base["ETH"]
+
+    # A fresh quote restores the triangle
+    opportunities = detector.detect_opportunities([
+        quote("BTC/USD", 30000, timestamp=later),
+        quote("ETH/USD", 2000, timestamp=later)
+    ])
+    assert opportunities
+
+
+def test_cycle_search_looks_past_short_cycles():
+    """A more profitable three-leg cycle does not hide a four-leg one."""
+    graph = CurrencyGraph()
+    for data in [
+        # Four-leg cycle A -> B -> C -> D -> A
+        quote("A/B", 1.01),
+        quote("B/C", 1.01),
+        quote("C/D", 1.0),
+        quote("D/A", 1.0),
+        # Stronger triangle sharing the A/B leg: A -> B -> E -> A
+        quote("B/E", 1.05),
+        quote("E/A", 1.05)
+    ]:
+        graph.update(data)
+
+    symbols, currencies = graph.find_negative_cycle()
+    assert len(symbols) == 3
+
+    symbols, currencies = graph.find_negative_cycle(min_length=4, max_length=6)
+    assert len(symbols) == 4
+    start = symbols.index("A/B")
+    assert symbols[start:] + symbols[:start] == ["A/B", "B/C", "C/D", "D/A"]
+    assert currencies[start] == "A"
+
+    assert graph.find_negative_cycle(min_length=5) is None
@@ -0,0 +1,80 @@
+"""
+Lightweight latency metrics.
+"""
+from typing import Dict, Optional, Sequence
+import bisect
+
+
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets_ms: Sorted bucket upper bounds in milliseconds; samples above
+                        the last bound land in an overflow bucket
+        """
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def record(self, latency_ms: float):
+        """Record one latency sample."""
+        self.counts[bisect.bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.min_ms = latency_ms if self.min_ms is None else min(self.min_ms, latency_ms)
+        self.max_ms = latency_ms if self.max_ms is None else max(self.max_ms, latency_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean latency, 0 if no samples."""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Estimate a latency percentile.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Upper bound of the bucket holding the percentile (the observed
+            maximum for the overflow bucket), 0 if no samples
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, int(round(pct / 100 * self.count)))
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if i < len(self.buckets_ms):
+                    return min(float(self.buckets_ms[i]), self.max_ms)
+                break
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        """Summary statistics and bucket counts."""
+        buckets = {f"le_{bound}": count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets["overflow"] = self.counts[-1]
+
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets
+        }
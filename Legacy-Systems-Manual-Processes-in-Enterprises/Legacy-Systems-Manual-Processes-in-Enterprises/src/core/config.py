@@ -67,6 +67,14 @@ class Settings(BaseSettings):
     ollama_model: str = "llama3.2:3b"  # Fast, efficient model
     ollama_embedding_model: str = "nomic-embed-text"  # Local embeddings
 
+    # LLM response cache
+    llm_cache_ttl: int = 86400
+    llm_cache_max_entries: int = 1000
+    llm_cache_max_memory_mb: int = 64
+    llm_cache_path: str = "data/llm_cache.sqlite3"  # Shared by all workers; empty disables
+    llm_cache_max_disk_mb: int = 512
+    llm_cache_normalization: str = "none"  # none, whitespace or volatile; the latter two merge distinct prompts
+
     # Legacy API support (optional - NOT REQUIRED)
     openai_api_key: str = ""
     openai_model: str = "gpt-4-turbo-preview"
@@ -3,7 +3,7 @@ Local LLM Client using Ollama
 100% FREE - No API keys required!
 
 Enhanced with:
-- Response caching for performance
+- Response caching for performance (bounded memory LRU + shared on-disk SQLite tier)
 - Streaming support
 - Batch processing
 - Advanced error handling
@@ -11,9 +11,14 @@ Enhanced with:
 """
 
 import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
 import time
-from typing import List, Dict, Any, Optional, AsyncGenerator
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 
 import httpx
 from loguru import logger
@@ -23,58 +28,426 @@ from src.core.config import get_settings
 settings = get_settings()
 
 
+# Volatile fields replaced when keys are normalized at the "volatile" level,
+# so prompts embedding logs that differ only in these still share a key
+VOLATILE_PATTERNS = [
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\b"), "<timestamp>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<date>"),
+    (re.compile(r"\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b"), "<time>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"), "<ip>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{12,}\b"), "<hex>"),
+    (re.compile(r"\b\d{6,}\b"), "<number>"),
+]
+
+NORMALIZATION_LEVELS = ("none", "whitespace", "volatile")
+
+
+def normalize_prompt(prompt: str, level: str = "whitespace") -> str:
+    """
+    Normalize a prompt for use in a cache key.
+
+    Args:
+        prompt: Prompt text
+        level: "none", "whitespace" (collapse runs of whitespace) or
+            "volatile" (also mask timestamps, ids, addresses and long numbers)
+
+    Returns:
+        str: Normalized prompt
+    """
+    if level == "none":
+        return prompt
+
+    if level == "volatile":
+        for pattern, replacement in VOLATILE_PATTERNS:
+            prompt = pattern.sub(replacement, prompt)
+
+    return " ".join(prompt.split())
+
+
+class SQLiteResponseStore:
+    """
+    On-disk LLM response store shared by every worker on the host.
+
+    Uses SQLite in WAL mode, so processes can read while another writes.
+    Storage is bounded by max_bytes: least recently used entries are
+    deleted once the total size of stored responses exceeds it. The total
+    is kept in a one-row table by triggers, so every process sees the
+    same figure without summing the table on each write.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on the total size of stored responses
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed "
+            "ON llm_responses (last_accessed)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_expires_at "
+            "ON llm_responses (expires_at)"
+        )
+        self._create_usage_table()
+
+    def _create_usage_table(self) -> None:
+        """Create the running totals and their triggers, summing existing rows once."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses_usage (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    entries INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO llm_responses_usage (id, entries, bytes) "
+                "SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            )
+            self._conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS llm_responses_usage_insert
+                AFTER INSERT ON llm_responses BEGIN
+                    UPDATE llm_responses_usage
+                    SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+                END
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS llm_responses_usage_update
+                AFTER UPDATE OF size ON llm_responses BEGIN
+                    UPDATE llm_responses_usage
+                    SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+                END
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS llm_responses_usage_delete
+                AFTER DELETE ON llm_responses BEGIN
+                    UPDATE llm_responses_usage
+                    SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+                END
+                """
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _usage(self) -> Tuple[int, int]:
+        """(entries, bytes) currently stored."""
+        return self._conn.execute(
+            "SELECT entries, bytes FROM llm_responses_usage WHERE id = 0"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[Tuple[str, int, float, float]]:
+        """Return (value, size, latency, expires_at) for a fresh entry, else None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, latency, expires_at FROM llm_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row[3] <= now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_responses SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            return row
+
+    def set(self, key: str, value: str, size: int, latency: float, expires_at: float) -> int:
+        """
+        Store an entry, then evict until under max_bytes.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        now = time.time()
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old
+            # row without firing delete triggers, which would skew the totals
+            self._conn.execute(
+                "INSERT INTO llm_responses "
+                "(key, value, size, latency, expires_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "latency = excluded.latency, expires_at = excluded.expires_at, "
+                "last_accessed = excluded.last_accessed",
+                (key, value, size, latency, expires_at, now),
+            )
+            return self._evict(now)
+
+    def _evict(self, now: float) -> int:
+        """Drop expired entries, then least recently used ones past max_bytes."""
+        evicted = self._conn.execute(
+            "DELETE FROM llm_responses WHERE expires_at <= ?", (now,)
+        ).rowcount
+
+        total = self._usage()[1]
+        if total <= self.max_bytes:
+            return evicted
+
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_accessed"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", victims)
+        return evicted + len(victims)
+
+    def clear(self) -> None:
+        """Delete all stored responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and total size."""
+        with self._lock:
+            entries, size = self._usage()
+        return {"entries": entries, "bytes": size}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
 class LLMCache:
-    """Simple in-memory cache for LLM responses."""
+    """
+    Tiered cache for LLM responses.
+
+    A bounded in-memory LRU sits in front of an optional on-disk
+    SQLiteResponseStore. Disk hits are promoted to memory. Each entry
+    remembers its size and how long the model took to produce it, so hits
+    are reported as bytes and latency saved.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        normalization: str = "none",
+        metrics: Optional["LLMMetrics"] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Time to live of cached responses
+            max_entries: Maximum entries held in memory
+            max_bytes: Maximum total size of responses held in memory
+            disk_path: SQLite file for the persistent tier (None for memory only)
+            max_disk_bytes: Maximum total size of the persistent tier
+            normalization: Key normalization level, see normalize_prompt
+            metrics: LLMMetrics that cache hits and misses are reported to
+        """
+        if normalization not in NORMALIZATION_LEVELS:
+            raise ValueError(f"Unknown normalization level: {normalization}")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.normalization = normalization
+        self.metrics = metrics
+
+        # key -> (value, size, latency, expires_at), least recently used first
+        self.cache: OrderedDict[str, Tuple[Any, int, float, float]] = OrderedDict()
+        self.memory_bytes = 0
+
+        self.disk: Optional[SQLiteResponseStore] = None
+        if disk_path:
+            try:
+                self.disk = SQLiteResponseStore(disk_path, max_disk_bytes)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache unavailable at {disk_path}: {e}")
 
-    def __init__(self, ttl_seconds: int = 3600):
-        """Initialize cache with TTL."""
-        self.cache: Dict[str, tuple[Any, datetime]] = {}
-        self.ttl = timedelta(seconds=ttl_seconds)
         self.hits = 0
+        self.disk_hits = 0
         self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.latency_saved = 0.0
 
     def _make_key(self, prompt: str, **kwargs) -> str:
-        """Create cache key from prompt and parameters."""
+        """Create cache key from the normalized prompt and parameters."""
+        prompt = normalize_prompt(prompt, self.normalization)
         key_data = f"{prompt}:{sorted(kwargs.items())}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return hashlib.sha256(key_data.encode()).hexdigest()
 
     def get(self, prompt: str, **kwargs) -> Optional[Any]:
         """Get cached response if available and fresh."""
         key = self._make_key(prompt, **kwargs)
-        if key in self.cache:
-            value, timestamp = self.cache[key]
-            if datetime.now() - timestamp < self.ttl:
-                self.hits += 1
-                logger.debug(f"Cache HIT - Saved LLM call!")
-                return value
-            else:
-                # Expired
-                del self.cache[key]
-
-        self.misses += 1
-        return None
-
-    def set(self, prompt: str, response: Any, **kwargs) -> None:
-        """Cache a response."""
+        now = time.time()
+
+        entry = self.cache.get(key)
+        if entry is not None and entry[3] <= now:
+            self._drop(key)
+            entry = None
+
+        if entry is not None:
+            self.cache.move_to_end(key)
+        elif self.disk is not None:
+            entry = self._disk_get(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            if self.metrics:
+                self.metrics.record_cache_miss()
+            return None
+
+        value, size, latency, _ = entry
+        self.hits += 1
+        self.bytes_saved += size
+        self.latency_saved += latency
+        if self.metrics:
+            self.metrics.record_cache_hit(size, latency)
+        logger.debug(f"Cache HIT - Saved LLM call!")
+        return value
+
+    def set(self, prompt: str, response: Any, latency_seconds: float = 0.0, **kwargs) -> None:
+        """
+        Cache a response.
+
+        Args:
+            prompt: Prompt the response was generated for
+            response: JSON-serializable response
+            latency_seconds: Time the model took to produce the response
+            **kwargs: Generation parameters that are part of the key
+        """
         key = self._make_key(prompt, **kwargs)
-        self.cache[key] = (response, datetime.now())
+        encoded = json.dumps(response)
+        size = len(encoded.encode())
+        expires_at = time.time() + self.ttl_seconds
+
+        entry = (response, size, latency_seconds, expires_at)
+        self._remember(key, entry)
+
+        if self.disk is not None:
+            try:
+                self.evictions += self.disk.set(key, encoded, size, latency_seconds, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache write failed: {e}")
+
+    def _disk_get(self, key: str) -> Optional[Tuple[Any, int, float, float]]:
+        try:
+            row = self.disk.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM disk cache read failed: {e}")
+            return None
+
+        if row is None:
+            return None
+        value, size, latency, expires_at = row
+        return json.loads(value), size, latency, expires_at
+
+    def _remember(self, key: str, entry: Tuple[Any, int, float, float]) -> None:
+        """Put an entry in the memory tier, evicting LRU entries past the bounds."""
+        if key in self.cache:
+            self._drop(key)
+
+        size = entry[1]
+        if size > self.max_bytes:
+            return
+
+        self.cache[key] = entry
+        self.memory_bytes += size
+
+        while len(self.cache) > self.max_entries or self.memory_bytes > self.max_bytes:
+            oldest = next(iter(self.cache))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, size, _, _ = self.cache.pop(key)
+        self.memory_bytes -= size
 
     def clear(self) -> None:
         """Clear all cached responses."""
         self.cache.clear()
+        self.memory_bytes = 0
+        if self.disk is not None:
+            try:
+                self.disk.clear()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache clear failed: {e}")
         logger.info("LLM cache cleared")
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         total = self.hits + self.misses
         hit_rate = (self.hits / total * 100) if total > 0 else 0
-        return {
+        stats = {
             "hits": self.hits,
             "misses": self.misses,
             "hit_rate": f"{hit_rate:.1f}%",
             "size": len(self.cache),
+            "memory_bytes": self.memory_bytes,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "latency_saved": f"{self.latency_saved:.2f}s",
+            "normalization": self.normalization,
         }
 
+        if self.disk is not None:
+            try:
+                disk = self.disk.stats()
+                stats["disk_entries"] = disk["entries"]
+                stats["disk_bytes"] = disk["bytes"]
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache stats failed: {e}")
+
+        return stats
+
 
 class LLMMetrics:
     """Track LLM usage metrics."""
@@ -86,6 +459,10 @@ class LLMMetrics:
         self.total_time = 0.0
         self.errors = 0
         self.model_usage: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_saved = 0
+        self.latency_saved = 0.0
 
     def record_request(
         self, model: str, tokens: int, duration: float, success: bool = True
@@ -100,6 +477,16 @@ class LLMMetrics:
 
         self.model_usage[model] = self.model_usage.get(model, 0) + 1
 
+    def record_cache_hit(self, size: int, latency: float) -> None:
+        """Record a response served from cache instead of the model."""
+        self.cache_hits += 1
+        self.bytes_saved += size
+        self.latency_saved += latency
+
+    def record_cache_miss(self) -> None:
+        """Record a cache lookup that fell through to the model."""
+        self.cache_misses += 1
+
     def get_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
         avg_time = (
@@ -108,6 +495,8 @@ class LLMMetrics:
         error_rate = (
             self.errors / self.total_requests * 100 if self.total_requests > 0 else 0
         )
+        lookups = self.cache_hits + self.cache_misses
+        cache_hit_rate = self.cache_hits / lookups * 100 if lookups > 0 else 0
 
         return {
             "total_requests": self.total_requests,
@@ -116,6 +505,9 @@ class LLMMetrics:
             "error_rate": f"{error_rate:.1f}%",
             "model_usage": self.model_usage,
             "cost_saved": f"${self.total_tokens * 0.00003:.2f}",  # vs GPT-4
+            "cache_hit_rate": f"{cache_hit_rate:.1f}%",
+            "cache_bytes_saved": self.bytes_saved,
+            "cache_latency_saved": f"{self.latency_saved:.2f}s",
         }
 
 
@@ -150,8 +542,20 @@ class LocalLLMClient:
         self.model = model or settings.ollama_model
         self.timeout = httpx.Timeout(settings.ai_timeout, connect=10.0)
 
-        self.cache = LLMCache() if enable_cache else None
         self.metrics = LLMMetrics()
+        self.cache = (
+            LLMCache(
+                ttl_seconds=settings.llm_cache_ttl,
+                max_entries=settings.llm_cache_max_entries,
+                max_bytes=settings.llm_cache_max_memory_mb * 1024 * 1024,
+                disk_path=settings.llm_cache_path or None,
+                max_disk_bytes=settings.llm_cache_max_disk_mb * 1024 * 1024,
+                normalization=settings.llm_cache_normalization,
+                metrics=self.metrics,
+            )
+            if enable_cache
+            else None
+        )
 
         logger.info(
             f"Initialized Enhanced Local LLM Client - Model: {self.model}, "
@@ -183,7 +587,7 @@ class LocalLLMClient:
 
         # Check cache
         if use_cache and self.cache:
-            cached = self.cache.get(prompt, temp=temperature, max=max_tokens)
+            cached = self.cache.get(prompt, model=self.model, temp=temperature, max=max_tokens)
             if cached:
                 return cached
 
@@ -215,7 +619,14 @@ class LocalLLMClient:
 
                 # Cache the result
                 if use_cache and self.cache:
-                    self.cache.set(prompt, generated_text, temp=temperature, max=max_tokens)
+                    self.cache.set(
+                        prompt,
+                        generated_text,
+                        latency_seconds=duration,
+                        model=self.model,
+                        temp=temperature,
+                        max=max_tokens,
+                    )
 
                 return generated_text
 
@@ -357,10 +768,12 @@ class LocalLLMClient:
         """
         # Check cache
         if self.cache:
-            cached = self.cache.get(f"embed:{text}")
+            cached = self.cache.get(f"embed:{text}", model=settings.ollama_embedding_model)
             if cached:
                 return cached
 
+        start_time = time.time()
+
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             try:
                 response = await client.post(
@@ -376,7 +789,12 @@ class LocalLLMClient:
 
                 # Cache the embedding
                 if self.cache:
-                    self.cache.set(f"embed:{text}", embedding)
+                    self.cache.set(
+                        f"embed:{text}",
+                        embedding,
+                        latency_seconds=time.time() - start_time,
+                        model=settings.ollama_embedding_model,
+                    )
 
                 return embedding
 
@@ -0,0 +1,148 @@
+"""Tests for the LLM response cache."""
+
+import time
+
+from src.core.llm import LLMCache, LLMMetrics, SQLiteResponseStore, normalize_prompt
+
+
+def test_memory_tier_is_bounded():
+    """Test LRU eviction by entry count and by bytes."""
+    cache = LLMCache(max_entries=2)
+    cache.set("a", "first")
+    cache.set("b", "second")
+    cache.get("a")
+    cache.set("c", "third")
+
+    assert cache.get("a") == "first"
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    cache = LLMCache(max_bytes=100)
+    for i in range(10):
+        cache.set(f"prompt {i}", "x" * 30)
+
+    assert cache.memory_bytes <= 100
+    assert len(cache.cache) == 3
+
+
+def test_disk_tier_persists_across_instances(tmp_path):
+    """Test responses survive a restart and are promoted to memory."""
+    path = str(tmp_path / "llm_cache.sqlite3")
+
+    cache = LLMCache(disk_path=path)
+    cache.set("Analyze this COBOL program", "Use Java", latency_seconds=2.5, model="llama")
+    cache.disk.close()
+
+    restarted = LLMCache(disk_path=path)
+    assert restarted.get("Analyze this COBOL program", model="llama") == "Use Java"
+    assert restarted.get("Analyze this COBOL program", model="other") is None
+    assert restarted.stats()["disk_hits"] == 1
+    assert len(restarted.cache) == 1
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    """Test least recently used responses are deleted past the disk budget."""
+    cache = LLMCache(disk_path=str(tmp_path / "llm_cache.sqlite3"), max_disk_bytes=250)
+    for i in range(10):
+        cache.set(f"prompt {i}", "y" * 48)
+
+    stats = cache.stats()
+    assert stats["disk_bytes"] <= 250
+    assert stats["disk_entries"] == 5
+
+
+def test_expired_responses_miss(tmp_path):
+    """Test expired responses are not served from either tier."""
+    cache = LLMCache(ttl_seconds=0, disk_path=str(tmp_path / "llm_cache.sqlite3"))
+    cache.set("prompt", "response")
+    time.sleep(0.01)
+
+    assert cache.get("prompt") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_volatile_normalization():
+    """Test prompts differing only in volatile log fields share a key."""
+    first = "Find errors:\n2024-05-01T10:00:00Z req=9f8e7d6c5b4a3f21 host 10.0.0.1  timeout"
+    second = "Find errors: 2024-06-02T11:30:59Z req=0a1b2c3d4e5f6789 host 10.0.0.2 timeout"
+
+    assert normalize_prompt(first, "whitespace") != normalize_prompt(second, "whitespace")
+    assert normalize_prompt(first, "volatile") == normalize_prompt(second, "volatile")
+    assert normalize_prompt("a  b", "none") == "a  b"
+
+    cache = LLMCache(normalization="volatile")
+    cache.set(first, "No errors")
+    assert cache.get(second) == "No errors"
+
+
+def test_hits_are_reported_to_metrics():
+    """Test hit rate, bytes saved and latency saved reach LLMMetrics."""
+    metrics = LLMMetrics()
+    cache = LLMCache(metrics=metrics)
+    cache.set("prompt", "response", latency_seconds=1.5)
+
+    cache.get("prompt")
+    cache.get("prompt")
+    cache.get("unknown")
+
+    stats = metrics.get_stats()
+    assert stats["cache_hit_rate"] == "66.7%"
+    assert stats["cache_bytes_saved"] == 2 * len('"response"')
+    assert stats["cache_latency_saved"] == "3.00s"
+
+
+def test_disk_totals_follow_every_change(tmp_path):
+    """Test the running totals match the table after replaces, deletes and expiry."""
+    path = str(tmp_path / "llm_cache.sqlite3")
+    store = SQLiteResponseStore(path, max_bytes=1000)
+
+    def summed():
+        return store._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()
+
+    future = time.time() + 60
+    store.set("a", "x", 100, 1.0, future)
+    store.set("b", "x", 200, 1.0, future)
+    store.set("a", "x", 300, 1.0, future)
+    assert store.stats() == {"entries": 2, "bytes": 500}
+
+    # Another process sharing the file sees and updates the same totals
+    other = SQLiteResponseStore(path, max_bytes=1000)
+    other.set("c", "x", 50, 1.0, time.time() - 1)
+    assert store.stats() == {"entries": 2, "bytes": 500}
+    assert store.get("a") is not None
+
+    # Eviction past the budget drops the least recently used entry
+    store.set("d", "x", 600, 1.0, future)
+    assert store.get("b") is None
+    assert store.stats() == {"entries": 2, "bytes": 900}
+    assert tuple(summed()) == (2, 900)
+
+    store.set("e", "x", 10, 1.0, time.time() - 1)
+    assert store.get("e") is None
+    assert tuple(summed()) == (2, 900)
+
+    other.clear()
+    assert store.stats() == {"entries": 0, "bytes": 0}
+    other.close()
+    store.close()
+
+
+def test_existing_store_is_summed_once(tmp_path):
+    """Test a store written before the totals table gets its totals on open."""
+    path = str(tmp_path / "llm_cache.sqlite3")
+    store = SQLiteResponseStore(path)
+    store.set("a", "x", 120, 1.0, time.time() + 60)
+    store.set("b", "x", 80, 1.0, time.time() + 60)
+    store._conn.executescript(
+        "DROP TRIGGER llm_responses_usage_insert; DROP TRIGGER llm_responses_usage_update; "
+        "DROP TRIGGER llm_responses_usage_delete; DROP TABLE llm_responses_usage;"
+    )
+    store.close()
+
+    reopened = SQLiteResponseStore(path)
+    assert reopened.stats() == {"entries": 2, "bytes": 200}
+    reopened.set("c", "x", 30, 1.0, time.time() + 60)
+    assert reopened.stats() == {"entries": 3, "bytes": 230}
+    reopened.close()
@@ -4,6 +4,7 @@ Base agent class for all agents in the system.
 
 import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import replace
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from loguru import logger
@@ -227,7 +228,7 @@ class BaseAgent(ABC):
             logger.warning(f"Agent {self.agent_id} has no message bus")
             return False
 
-        message.sender = self.agent_id
+        message = replace(message, sender=self.agent_id)
         return await self.message_bus.send_message(message)
 
     async def receive_message(self, timeout: Optional[float] = None) -> Optional[Message]:
@@ -263,7 +264,7 @@ class BaseAgent(ABC):
             logger.warning(f"Agent {self.agent_id} has no message bus")
             return None
 
-        message.sender = self.agent_id
+        message = replace(message, sender=self.agent_id)
         return await self.message_bus.send_and_wait_response(message, timeout)
 
     async def broadcast_message(self, content: Any, message_type: MessageType = MessageType.BROADCAST) -> bool:
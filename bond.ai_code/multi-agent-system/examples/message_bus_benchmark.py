@@ -0,0 +1,85 @@
+"""
+Message bus throughput benchmark.
+
+This example measures:
+- Broadcast fan-out throughput (deliveries/sec) as the agent count grows
+- Topic publish throughput
+- Batch receive drain rate
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from multi_agent_system.communication.message_bus import MessageBus
+from multi_agent_system.core.types import Message, MessageType
+
+
+async def bench_agent_count(n_agents: int, n_messages: int) -> dict:
+    """Broadcast and publish n_messages to n_agents, then drain every queue."""
+    bus = MessageBus(max_queue_size=n_messages * 2, history_size=1000)
+    agent_ids = [f"agent_{i}" for i in range(n_agents)]
+    for agent_id in agent_ids:
+        bus.register_agent(agent_id)
+        bus.subscribe(agent_id, "updates")
+
+    started = time.perf_counter()
+    for i in range(n_messages):
+        await bus.send_message(Message(
+            sender="benchmark",
+            recipient="*",
+            message_type=MessageType.BROADCAST,
+            content={"seq": i},
+            priority=i % 3,
+        ))
+    broadcast_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(n_messages):
+        await bus.publish("updates", Message(sender="benchmark", content={"seq": i}))
+    publish_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    received = 0
+    for agent_id in agent_ids:
+        while True:
+            batch = await bus.receive_messages(agent_id, max_messages=500, timeout=0.001)
+            if not batch:
+                break
+            received += len(batch)
+    receive_seconds = time.perf_counter() - started
+
+    deliveries = n_agents * n_messages
+    return {
+        "agents": n_agents,
+        "broadcast_per_sec": deliveries / broadcast_seconds,
+        "publish_per_sec": deliveries / publish_seconds,
+        "receive_per_sec": received / receive_seconds,
+    }
+
+
+async def main():
+    """Run the benchmark for increasing agent counts."""
+    logger.remove()
+
+    print("=" * 72)
+    print("MessageBus throughput (deliveries/sec)")
+    print("=" * 72)
+    print(f"{'agents':>8} {'broadcast':>16} {'publish':>16} {'batch receive':>16}")
+
+    for n_agents in (10, 50, 100, 250, 500):
+        result = await bench_agent_count(n_agents, n_messages=200)
+        print(
+            f"{result['agents']:>8} {result['broadcast_per_sec']:>16,.0f} "
+            f"{result['publish_per_sec']:>16,.0f} {result['receive_per_sec']:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
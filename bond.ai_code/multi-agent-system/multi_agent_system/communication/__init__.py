@@ -1,5 +1,5 @@
 """Communication module for agent messaging."""
 
-from multi_agent_system.communication.message_bus import MessageBus
+from multi_agent_system.communication.message_bus import AgentQueue, MessageBus
 
-__all__ = ["MessageBus"]
+__all__ = ["AgentQueue", "MessageBus"]
@@ -5,14 +5,158 @@ Implements an asynchronous, event-driven message passing system for agents.
 """
 
 import asyncio
+import heapq
+import itertools
+import time
 from collections import defaultdict, deque
-from typing import Callable, Dict, List, Optional, Set
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
 from multi_agent_system.core.types import Message, MessageType
 
 
+class AgentQueue:
+    """
+    Bounded priority queue of messages for one agent.
+
+    Higher Message.priority is delivered first, FIFO within a priority.
+    Entries reference shared message envelopes, so fan-out enqueues the same
+    Message object for every recipient. Tracks backpressure metrics.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued messages (<= 0 means unbounded)
+        """
+        self.maxsize = maxsize
+        self._heap: List[Tuple[int, int, Message]] = []
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        # Backpressure metrics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.dropped = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def full(self) -> bool:
+        """Whether the queue is at capacity."""
+        return 0 < self.maxsize <= len(self._heap)
+
+    def put_nowait(self, entry: Tuple[int, int, Message]) -> bool:
+        """
+        Enqueue without waiting.
+
+        Args:
+            entry: (negated priority, sequence, message) heap entry
+
+        Returns:
+            False if the queue is full
+        """
+        if self.full():
+            return False
+
+        heapq.heappush(self._heap, entry)
+        self.enqueued += 1
+        self.high_water = max(self.high_water, len(self._heap))
+        self._not_empty.set()
+        if self.full():
+            self._not_full.clear()
+        return True
+
+    async def put(self, entry: Tuple[int, int, Message], timeout: float) -> bool:
+        """
+        Enqueue, waiting up to timeout seconds for space.
+
+        Args:
+            entry: (negated priority, sequence, message) heap entry
+            timeout: Maximum time to wait while the queue is full
+
+        Returns:
+            False (and counts a drop) if no space freed up in time
+        """
+        if self.put_nowait(entry):
+            return True
+
+        self.blocked_puts += 1
+        started = time.monotonic()
+        deadline = started + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.dropped += 1
+                    return False
+                try:
+                    await asyncio.wait_for(self._not_full.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    continue
+                if self.put_nowait(entry):
+                    return True
+        finally:
+            self.blocked_seconds += time.monotonic() - started
+
+    def get_nowait(self) -> Optional[Message]:
+        """Dequeue the highest-priority message, or None if empty."""
+        if not self._heap:
+            return None
+
+        _, _, message = heapq.heappop(self._heap)
+        self.dequeued += 1
+        self._not_full.set()
+        if not self._heap:
+            self._not_empty.clear()
+        return message
+
+    async def get(self) -> Message:
+        """Wait for and dequeue the highest-priority message."""
+        while not self._heap:
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def remove_if(self, predicate: Callable[[Message], bool]) -> int:
+        """
+        Remove queued messages matching a predicate.
+
+        Returns:
+            Number of messages removed
+        """
+        kept = [entry for entry in self._heap if not predicate(entry[2])]
+        removed = len(self._heap) - len(kept)
+        if removed:
+            heapq.heapify(kept)
+            self._heap = kept
+            self._not_full.set()
+            if not kept:
+                self._not_empty.clear()
+        return removed
+
+    def get_metrics(self) -> Dict:
+        """Queue depth and backpressure metrics."""
+        return {
+            "depth": len(self._heap),
+            "capacity": self.maxsize,
+            "utilization": len(self._heap) / self.maxsize if self.maxsize > 0 else 0.0,
+            "high_water": self.high_water,
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "dropped": self.dropped,
+            "blocked_puts": self.blocked_puts,
+            "blocked_seconds": self.blocked_seconds,
+        }
+
+
 class MessageBus:
     """
     Asynchronous message bus for agent communication.
@@ -23,24 +167,45 @@ class MessageBus:
     - Priority queues
     - Message history
     - Pub/Sub pattern
+
+    Broadcasts and publishes deliver one shared message envelope by
+    reference to every recipient; recipients must treat received messages
+    as read-only.
     """
 
-    def __init__(self, max_queue_size: int = 1000, history_size: int = 10000):
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        history_size: int = 10000,
+        put_timeout: float = 1.0,
+    ):
         """
         Initialize the message bus.
 
         Args:
             max_queue_size: Maximum size of each agent's message queue
             history_size: Maximum number of messages to keep in history
+            put_timeout: Seconds to wait for space in a full queue before
+                dropping the message
         """
         self.max_queue_size = max_queue_size
         self.history_size = history_size
+        self.put_timeout = put_timeout
 
         # Agent message queues: agent_id -> priority queue
-        self.queues: Dict[str, asyncio.PriorityQueue] = {}
+        self.queues: Dict[str, AgentQueue] = {}
 
         # Subscribers for pub/sub: topic -> set of agent_ids
         self.subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self._agent_topics: Dict[str, Set[str]] = defaultdict(set)
+
+        # Precomputed fan-out targets, invalidated on (un)registration and
+        # subscription changes: topic -> [(agent_id, queue)]
+        self._topic_targets: Dict[str, List[Tuple[str, AgentQueue]]] = {}
+        self._broadcast_targets: Optional[List[Tuple[str, AgentQueue]]] = None
+
+        # FIFO tie-breaker within a priority
+        self._sequence = itertools.count()
 
         # Message history for debugging/learning
         self.history: deque = deque(maxlen=history_size)
@@ -53,6 +218,8 @@ class MessageBus:
             "total_messages": 0,
             "broadcasts": 0,
             "direct_messages": 0,
+            "published_messages": 0,
+            "deliveries": 0,
             "dropped_messages": 0,
         }
 
@@ -66,7 +233,8 @@ class MessageBus:
             agent_id: Unique identifier for the agent
         """
         if agent_id not in self.queues:
-            self.queues[agent_id] = asyncio.PriorityQueue(maxsize=self.max_queue_size)
+            self.queues[agent_id] = AgentQueue(maxsize=self.max_queue_size)
+            self._invalidate_targets(self._agent_topics.get(agent_id, ()))
             logger.debug(f"Agent {agent_id} registered with message bus")
 
     def unregister_agent(self, agent_id: str) -> None:
@@ -79,8 +247,10 @@ class MessageBus:
         if agent_id in self.queues:
             del self.queues[agent_id]
             # Remove from all subscriptions
-            for topic_subscribers in self.subscribers.values():
-                topic_subscribers.discard(agent_id)
+            topics = self._agent_topics.pop(agent_id, set())
+            for topic in topics:
+                self.subscribers[topic].discard(agent_id)
+            self._invalidate_targets(topics)
             logger.debug(f"Agent {agent_id} unregistered from message bus")
 
     async def send_message(self, message: Message) -> bool:
@@ -112,46 +282,68 @@ class MessageBus:
         """Send a message to a specific agent."""
         self.stats["direct_messages"] += 1
 
-        if message.recipient not in self.queues:
+        queue = self.queues.get(message.recipient)
+        if queue is None:
             logger.warning(f"Recipient {message.recipient} not registered")
             self.stats["dropped_messages"] += 1
             return False
 
-        try:
-            # Use negative priority for higher priority messages (min heap)
-            priority = -message.priority
-            await asyncio.wait_for(
-                self.queues[message.recipient].put((priority, message)),
-                timeout=1.0,
-            )
+        sent = await self._deliver(message, [(message.recipient, queue)])
+        if sent:
             logger.debug(f"Message {message.id} sent to {message.recipient}")
-            return True
-        except asyncio.TimeoutError:
-            logger.warning(f"Queue full for agent {message.recipient}")
-            self.stats["dropped_messages"] += 1
-            return False
+        return sent > 0
 
     async def _broadcast_message(self, message: Message) -> bool:
         """Broadcast a message to all registered agents."""
         self.stats["broadcasts"] += 1
 
-        sent_count = 0
-        for agent_id in self.queues.keys():
-            if agent_id != message.sender:  # Don't send to self
-                msg_copy = Message(
-                    sender=message.sender,
-                    recipient=agent_id,
-                    message_type=message.message_type,
-                    content=message.content,
-                    priority=message.priority,
-                    metadata=message.metadata,
-                )
-                if await self._send_direct_message(msg_copy):
-                    sent_count += 1
+        if self._broadcast_targets is None:
+            self._broadcast_targets = list(self.queues.items())
+
+        # Don't send to self
+        targets = [
+            target for target in self._broadcast_targets if target[0] != message.sender
+        ]
+        sent_count = await self._deliver(message, targets)
 
         logger.debug(f"Broadcast message {message.id} sent to {sent_count} agents")
         return sent_count > 0
 
+    async def _deliver(self, message: Message, targets: List[Tuple[str, AgentQueue]]) -> int:
+        """
+        Enqueue one envelope for every target.
+
+        Queues with space are filled immediately; full queues then wait for
+        space concurrently, up to put_timeout.
+
+        Returns:
+            Number of queues the message was delivered to
+        """
+        # Use negative priority for higher priority messages (min heap)
+        entry = (-message.priority, next(self._sequence), message)
+
+        sent_count = 0
+        blocked = []
+        for agent_id, queue in targets:
+            if queue.put_nowait(entry):
+                sent_count += 1
+            else:
+                blocked.append((agent_id, queue))
+
+        if blocked:
+            results = await asyncio.gather(
+                *(queue.put(entry, self.put_timeout) for _, queue in blocked)
+            )
+            for (agent_id, _), delivered in zip(blocked, results):
+                if delivered:
+                    sent_count += 1
+                else:
+                    logger.warning(f"Queue full for agent {agent_id}")
+                    self.stats["dropped_messages"] += 1
+
+        self.stats["deliveries"] += sent_count
+        return sent_count
+
     async def receive_message(
         self, agent_id: str, timeout: Optional[float] = None
     ) -> Optional[Message]:
@@ -165,22 +357,22 @@ class MessageBus:
         Returns:
             The received message, or None if timeout occurred
         """
-        if agent_id not in self.queues:
+        queue = self.queues.get(agent_id)
+        if queue is None:
             logger.warning(f"Agent {agent_id} not registered")
             return None
 
         try:
-            if timeout:
-                priority, message = await asyncio.wait_for(
-                    self.queues[agent_id].get(), timeout=timeout
-                )
-            else:
-                priority, message = await self.queues[agent_id].get()
-
-            # Check if message has expired
-            if self._is_expired(message):
+            while True:
+                if timeout:
+                    message = await asyncio.wait_for(queue.get(), timeout=timeout)
+                else:
+                    message = await queue.get()
+
+                # Check if message has expired
+                if not self._is_expired(message):
+                    break
                 logger.debug(f"Expired message {message.id} discarded")
-                return await self.receive_message(agent_id, timeout)
 
             logger.debug(f"Agent {agent_id} received message {message.id}")
             return message
@@ -188,6 +380,44 @@ class MessageBus:
         except asyncio.TimeoutError:
             return None
 
+    async def receive_messages(
+        self,
+        agent_id: str,
+        max_messages: int = 100,
+        timeout: Optional[float] = None,
+    ) -> List[Message]:
+        """
+        Receive a batch of messages for an agent.
+
+        Waits for the first message like receive_message, then drains up to
+        max_messages already queued, highest priority first.
+
+        Args:
+            agent_id: ID of the agent receiving the messages
+            max_messages: Maximum number of messages to return
+            timeout: Maximum time to wait for the first message (None = wait forever)
+
+        Returns:
+            Received messages (empty if timeout occurred)
+        """
+        first = await self.receive_message(agent_id, timeout)
+        if first is None:
+            return []
+
+        queue = self.queues.get(agent_id)
+        messages = [first]
+        while queue is not None and len(messages) < max_messages:
+            message = queue.get_nowait()
+            if message is None:
+                break
+            if self._is_expired(message):
+                logger.debug(f"Expired message {message.id} discarded")
+                continue
+            messages.append(message)
+
+        logger.debug(f"Agent {agent_id} received {len(messages)} messages")
+        return messages
+
     async def send_and_wait_response(
         self, message: Message, timeout: float = 30.0
     ) -> Optional[Message]:
@@ -201,7 +431,7 @@ class MessageBus:
         Returns:
             The response message, or None if timeout occurred
         """
-        message.requires_response = True
+        message = replace(message, requires_response=True)
 
         # Create a future for the response
         response_future = asyncio.Future()
@@ -232,7 +462,7 @@ class MessageBus:
         Returns:
             True if response was delivered
         """
-        response.in_response_to = original_message_id
+        response = replace(response, in_response_to=original_message_id)
 
         # If there's a pending future, resolve it
         if original_message_id in self.pending_responses:
@@ -253,6 +483,8 @@ class MessageBus:
             topic: Topic to subscribe to
         """
         self.subscribers[topic].add(agent_id)
+        self._agent_topics[agent_id].add(topic)
+        self._topic_targets.pop(topic, None)
         logger.debug(f"Agent {agent_id} subscribed to topic '{topic}'")
 
     def unsubscribe(self, agent_id: str, topic: str) -> None:
@@ -264,12 +496,17 @@ class MessageBus:
             topic: Topic to unsubscribe from
         """
         self.subscribers[topic].discard(agent_id)
+        self._agent_topics[agent_id].discard(topic)
+        self._topic_targets.pop(topic, None)
         logger.debug(f"Agent {agent_id} unsubscribed from topic '{topic}'")
 
     async def publish(self, topic: str, message: Message) -> int:
         """
         Publish a message to a topic.
 
+        Subscribers share one envelope: a copy of the message whose metadata
+        carries the topic.
+
         Args:
             topic: The topic to publish to
             message: The message to publish
@@ -277,22 +514,22 @@ class MessageBus:
         Returns:
             Number of subscribers that received the message
         """
-        if topic not in self.subscribers or not self.subscribers[topic]:
+        targets = self._topic_targets.get(topic)
+        if targets is None:
+            targets = [
+                (agent_id, self.queues[agent_id])
+                for agent_id in self.subscribers.get(topic, ())
+                if agent_id in self.queues
+            ]
+            self._topic_targets[topic] = targets
+
+        if not targets:
             logger.debug(f"No subscribers for topic '{topic}'")
             return 0
 
-        sent_count = 0
-        for agent_id in self.subscribers[topic]:
-            msg_copy = Message(
-                sender=message.sender,
-                recipient=agent_id,
-                message_type=message.message_type,
-                content=message.content,
-                priority=message.priority,
-                metadata={**message.metadata, "topic": topic},
-            )
-            if await self._send_direct_message(msg_copy):
-                sent_count += 1
+        self.stats["published_messages"] += 1
+        envelope = replace(message, metadata={**message.metadata, "topic": topic})
+        sent_count = await self._deliver(envelope, targets)
 
         logger.debug(f"Published message to topic '{topic}': {sent_count} recipients")
         return sent_count
@@ -319,16 +556,41 @@ class MessageBus:
             return list(filtered)[-limit:]
         return list(self.history)[-limit:]
 
+    def get_queue_metrics(self, agent_id: Optional[str] = None) -> Dict:
+        """
+        Get backpressure metrics per agent queue.
+
+        Args:
+            agent_id: Only return this agent's queue metrics
+
+        Returns:
+            Metrics dict for one agent, or agent_id -> metrics for all
+        """
+        if agent_id is not None:
+            queue = self.queues.get(agent_id)
+            return queue.get_metrics() if queue else {}
+        return {agent_id: queue.get_metrics() for agent_id, queue in self.queues.items()}
+
     def get_statistics(self) -> Dict:
         """Get message bus statistics."""
+        depths = [len(queue) for queue in self.queues.values()]
         return {
             **self.stats,
             "registered_agents": len(self.queues),
             "total_topics": len(self.subscribers),
             "history_size": len(self.history),
             "pending_responses": len(self.pending_responses),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "full_queues": sum(1 for queue in self.queues.values() if queue.full()),
         }
 
+    def _invalidate_targets(self, topics) -> None:
+        """Drop cached fan-out targets after membership changes."""
+        self._broadcast_targets = None
+        for topic in topics:
+            self._topic_targets.pop(topic, None)
+
     def _is_expired(self, message: Message) -> bool:
         """Check if a message has expired based on TTL."""
         if message.ttl <= 0:
@@ -343,11 +605,7 @@ class MessageBus:
         Returns:
             Number of messages cleared
         """
-        # This is a simplified implementation
-        # In production, you'd want a background task for this
         cleared = 0
-        for agent_id, queue in self.queues.items():
-            # Can't easily remove from asyncio.PriorityQueue
-            # Would need a custom implementation for full cleanup
-            pass
+        for queue in self.queues.values():
+            cleared += queue.remove_if(self._is_expired)
         return cleared
@@ -10,7 +10,8 @@ Features:
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional, Set, Callable
+import heapq
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -49,6 +50,102 @@ class CoordinationState:
     priority: int = 0  # For leader election (higher is better)
 
 
+class _CapabilityPool:
+    """
+    Alive agents holding a given set of capabilities.
+
+    Keeps a workload min-heap and a capability-count max-heap, both with
+    lazy invalidation: entries are pushed on every change and stale ones
+    are discarded when they surface. Each heap is built on its first query,
+    so strategies that never read it never maintain it, and the workload
+    heap is rebuilt with one entry per member once stale entries dominate.
+    """
+
+    def __init__(self, capabilities: FrozenSet[str], agents: Dict[str, CoordinationState]):
+        self.capabilities = capabilities
+        self.agents = agents
+        self.members: Dict[str, int] = {}  # agent_id -> registration order
+        self._ordered: Optional[List[str]] = None
+        self._load_heap: Optional[List[Tuple[int, int, str]]] = None
+        self._capability_heap: Optional[List[Tuple[int, int, str]]] = None
+
+    def add(self, state: CoordinationState, order: int) -> None:
+        self.members[state.agent_id] = order
+        self._ordered = None
+        if self._load_heap is not None:
+            heapq.heappush(self._load_heap, (state.workload, order, state.agent_id))
+        if self._capability_heap is not None:
+            heapq.heappush(self._capability_heap, (-len(state.capabilities), order, state.agent_id))
+
+    def remove(self, agent_id: str) -> None:
+        if self.members.pop(agent_id, None) is not None:
+            self._ordered = None
+
+    def update_workload(self, state: CoordinationState) -> None:
+        if self._load_heap is None:
+            return
+        order = self.members[state.agent_id]
+        heapq.heappush(self._load_heap, (state.workload, order, state.agent_id))
+        if len(self._load_heap) > 2 * len(self.members) + 16:
+            self._rebuild_load_heap()
+
+    def ordered(self) -> List[str]:
+        """Members in registration order."""
+        if self._ordered is None:
+            self._ordered = sorted(self.members, key=self.members.__getitem__)
+        return self._ordered
+
+    def least_loaded(self) -> Optional[str]:
+        """Member with the lowest workload, earliest registered on ties."""
+        if self._load_heap is None:
+            self._rebuild_load_heap()
+
+        heap = self._load_heap
+        while heap:
+            workload, order, agent_id = heap[0]
+            state = self.agents.get(agent_id)
+            if (
+                state is not None
+                and self.members.get(agent_id) == order
+                and state.workload == workload
+                and state.is_alive
+            ):
+                return agent_id
+            heapq.heappop(heap)
+        return None
+
+    def most_capable(self) -> Optional[str]:
+        """Member with the most capabilities, earliest registered on ties."""
+        if self._capability_heap is None:
+            self._capability_heap = [
+                (-len(self.agents[agent_id].capabilities), order, agent_id)
+                for agent_id, order in self.members.items()
+            ]
+            heapq.heapify(self._capability_heap)
+
+        heap = self._capability_heap
+        while heap:
+            neg_count, order, agent_id = heap[0]
+            state = self.agents.get(agent_id)
+            if (
+                state is not None
+                and self.members.get(agent_id) == order
+                and -neg_count == len(state.capabilities)
+                and state.is_alive
+            ):
+                return agent_id
+            heapq.heappop(heap)
+        return None
+
+    def _rebuild_load_heap(self) -> None:
+        """Replace the workload heap with one current entry per member."""
+        self._load_heap = [
+            (self.agents[agent_id].workload, order, agent_id)
+            for agent_id, order in self.members.items()
+        ]
+        heapq.heapify(self._load_heap)
+
+
 class DistributedCoordinator:
     """
     Distributed coordination system for agents.
@@ -58,6 +155,10 @@ class DistributedCoordinator:
     - Peer-to-peer task allocation
     - Consensus building
     - Fault tolerance and recovery
+
+    Capable agents are found through a capability -> agents index. Each
+    distinct set of required capabilities gets a pool of matching agents
+    with workload heaps, so allocation is O(log n) per task.
     """
 
     def __init__(
@@ -98,6 +199,21 @@ class DistributedCoordinator:
         # Round-robin counter
         self._round_robin_index = 0
 
+        # Capability index: capability -> alive agent IDs
+        self._capability_index: Dict[str, Set[str]] = {}
+
+        # Registration order (kept across re-registration, like dict order)
+        self._registration_order: Dict[str, int] = {}
+        self._next_registration = 0
+
+        # Agent pools per required capability set, and pools per agent
+        self._pools: Dict[FrozenSet[str], _CapabilityPool] = {}
+        self._agent_pools: Dict[str, Set[FrozenSet[str]]] = {}
+
+        # Leader ID, set by elections
+        self._leader_id: Optional[str] = None
+        self._election_scheduled = False
+
         logger.info(f"DistributedCoordinator initialized (strategy={strategy.value})")
 
     async def start(self) -> None:
@@ -135,12 +251,20 @@ class DistributedCoordinator:
             priority=priority
         )
 
+        if agent_id in self.agents:
+            self._unindex_agent(agent_id)
+        else:
+            self._registration_order[agent_id] = self._next_registration
+            self._next_registration += 1
+
         self.agents[agent_id] = state
+        self._index_agent(state)
 
         logger.info(f"Agent {agent_id} registered for coordination (priority={priority})")
 
-        # If no leader exists, trigger election
-        if not self._get_current_leader():
+        # If no leader exists, trigger election (once for a burst of registrations)
+        if not self._get_current_leader() and not self._election_scheduled:
+            self._election_scheduled = True
             asyncio.create_task(self._trigger_election())
 
     def unregister_agent(self, agent_id: str) -> None:
@@ -159,7 +283,9 @@ class DistributedCoordinator:
                 logger.warning(f"Leader {agent_id} unregistered, triggering election")
                 asyncio.create_task(self._trigger_election())
 
+            self._unindex_agent(agent_id)
             del self.agents[agent_id]
+            del self._registration_order[agent_id]
             self.metrics["failed_agents"] += 1
 
             logger.info(f"Agent {agent_id} unregistered from coordination")
@@ -199,6 +325,55 @@ class DistributedCoordinator:
             logger.info(f"Task {task_info['id']} queued (no suitable agent available)")
             return None
 
+    async def submit_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        required_capabilities: Optional[Sequence[Optional[Set[str]]]] = None
+    ) -> List[Optional[str]]:
+        """
+        Submit many tasks for allocation in one pass.
+
+        Tasks are allocated in order, exactly as repeated submit_task calls
+        would, but without per-task logging or awaiting.
+
+        Args:
+            tasks: Tasks to allocate
+            required_capabilities: Required capabilities per task (same
+                length as tasks), or None for no requirements
+
+        Returns:
+            Assigned agent ID per task, None for tasks that were queued
+        """
+        if required_capabilities is None:
+            required_capabilities = [None] * len(tasks)
+
+        now = datetime.now()
+        task_infos = [
+            {
+                "id": task.get("id", str(uuid.uuid4())),
+                "task": task,
+                "required_capabilities": caps or set(),
+                "submitted_at": now,
+            }
+            for task, caps in zip(tasks, required_capabilities)
+        ]
+
+        assignments = self._allocate_batch(task_infos)
+
+        allocated = 0
+        for task_info, assigned in zip(task_infos, assignments):
+            if assigned:
+                allocated += 1
+            else:
+                self.pending_tasks.append(task_info)
+
+        self.metrics["total_tasks_allocated"] += allocated
+        logger.info(
+            f"Batch of {len(tasks)} tasks: {allocated} allocated, "
+            f"{len(tasks) - allocated} queued"
+        )
+        return assignments
+
     async def _allocate_task(self, task_info: Dict[str, Any]) -> Optional[str]:
         """
         Allocate a task to an agent based on strategy.
@@ -209,56 +384,161 @@ class DistributedCoordinator:
         Returns:
             ID of assigned agent, or None
         """
-        required_caps = task_info["required_capabilities"]
+        return self._allocate(self._get_pool(task_info["required_capabilities"]))
+
+    def _allocate_batch(self, task_infos: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Allocate tasks in order, resolving each capability pool once."""
+        pools: Dict[FrozenSet[str], _CapabilityPool] = {}
+        assignments = []
+        for task_info in task_infos:
+            key = frozenset(task_info["required_capabilities"])
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = self._get_pool(key)
+            assignments.append(self._allocate(pool) if pool.members else None)
+        return assignments
+
+    def _allocate(self, pool: _CapabilityPool) -> Optional[str]:
+        """
+        Pick an agent from a capability pool based on strategy.
 
-        # Filter capable agents
-        capable_agents = [
-            agent_id
-            for agent_id, state in self.agents.items()
-            if state.is_alive and required_caps.issubset(state.capabilities)
-        ]
+        Args:
+            pool: Pool of agents holding the required capabilities
 
-        if not capable_agents:
+        Returns:
+            ID of assigned agent, or None
+        """
+        if not pool.members:
             return None
 
         # Apply allocation strategy
         if self.strategy == CoordinationStrategy.ROUND_ROBIN:
+            capable_agents = pool.ordered()
             assigned = capable_agents[self._round_robin_index % len(capable_agents)]
             self._round_robin_index += 1
-            self.agents[assigned].workload += 1
-            return assigned
 
-        elif self.strategy == CoordinationStrategy.LOAD_BASED:
+        elif self.strategy in (
+            CoordinationStrategy.LOAD_BASED,
+            # Simple auction: agent with lowest workload "bids" lowest
+            CoordinationStrategy.AUCTION_BASED,
+        ):
             # Assign to agent with lowest workload
-            assigned = min(
-                capable_agents,
-                key=lambda aid: self.agents[aid].workload
-            )
-            self.agents[assigned].workload += 1
-            return assigned
+            assigned = pool.least_loaded()
 
         elif self.strategy == CoordinationStrategy.CAPABILITY_BASED:
             # Assign to most capable agent (most capabilities)
-            assigned = max(
-                capable_agents,
-                key=lambda aid: len(self.agents[aid].capabilities)
-            )
-            self.agents[assigned].workload += 1
-            return assigned
+            assigned = pool.most_capable()
 
-        elif self.strategy == CoordinationStrategy.AUCTION_BASED:
-            # Simple auction: agent with lowest workload "bids" lowest
-            assigned = min(
-                capable_agents,
-                key=lambda aid: self.agents[aid].workload
+        else:
+            return None
+
+        if assigned is None:
+            return None
+
+        self._set_workload(assigned, self.agents[assigned].workload + 1)
+        return assigned
+
+    def _get_pool(self, required_capabilities: Set[str]) -> _CapabilityPool:
+        """Get (building on first use) the pool for a capability set."""
+        key = frozenset(required_capabilities)
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+
+        pool = _CapabilityPool(key, self.agents)
+        if key:
+            candidate_sets = sorted(
+                (self._capability_index.get(cap, set()) for cap in key), key=len
             )
-            self.agents[assigned].workload += 1
-            return assigned
+            candidates = set.intersection(*candidate_sets)
+        else:
+            candidates = [aid for aid, state in self.agents.items() if state.is_alive]
 
-        return None
+        for agent_id in candidates:
+            pool.add(self.agents[agent_id], self._registration_order[agent_id])
+            self._agent_pools[agent_id].add(key)
+
+        self._pools[key] = pool
+        return pool
+
+    def _index_agent(self, state: CoordinationState) -> None:
+        """Add an alive agent to the capability index and matching pools."""
+        self._agent_pools[state.agent_id] = set()
+        if not state.is_alive:
+            return
+
+        for cap in state.capabilities:
+            self._capability_index.setdefault(cap, set()).add(state.agent_id)
+
+        order = self._registration_order[state.agent_id]
+        for key, pool in self._pools.items():
+            if key <= state.capabilities:
+                pool.add(state, order)
+                self._agent_pools[state.agent_id].add(key)
+
+    def _unindex_agent(self, agent_id: str) -> None:
+        """Remove an agent from the capability index and all pools."""
+        state = self.agents[agent_id]
+        for cap in state.capabilities:
+            holders = self._capability_index.get(cap)
+            if holders is not None:
+                holders.discard(agent_id)
+                if not holders:
+                    del self._capability_index[cap]
+
+        for key in self._agent_pools.pop(agent_id, ()):
+            self._pools[key].remove(agent_id)
+
+    def _set_workload(self, agent_id: str, workload: int) -> None:
+        """Update an agent's workload and its position in every pool."""
+        state = self.agents[agent_id]
+        state.workload = workload
+        for key in self._agent_pools.get(agent_id, ()):
+            self._pools[key].update_workload(state)
+
+    def update_agent(
+        self,
+        agent_id: str,
+        capabilities: Optional[Set[str]] = None,
+        is_alive: Optional[bool] = None,
+    ) -> None:
+        """
+        Update an agent's capabilities or liveness and re-index it.
+
+        Args:
+            agent_id: ID of the agent
+            capabilities: New capability set
+            is_alive: New liveness flag
+        """
+        if agent_id not in self.agents:
+            return
+
+        state = self.agents[agent_id]
+        self._unindex_agent(agent_id)
+        if capabilities is not None:
+            state.capabilities = capabilities
+        if is_alive is not None:
+            state.is_alive = is_alive
+        self._index_agent(state)
+
+    def record_heartbeat(self, agent_id: str) -> None:
+        """
+        Record a heartbeat from an agent, reviving it if it was marked dead.
+
+        Args:
+            agent_id: ID of the agent
+        """
+        state = self.agents.get(agent_id)
+        if state is None:
+            return
+
+        state.last_heartbeat = datetime.now()
+        if not state.is_alive:
+            self.update_agent(agent_id, is_alive=True)
 
     async def _trigger_election(self) -> None:
         """Trigger a leader election (Bully algorithm variant)."""
+        self._election_scheduled = False
         if not self.agents:
             return
 
@@ -267,6 +547,7 @@ class DistributedCoordinator:
         logger.info("Starting leader election...")
 
         # Reset all agents to follower
+        self._leader_id = None
         for state in self.agents.values():
             if state.role == AgentRole.LEADER:
                 logger.info(f"Demoting current leader {state.agent_id}")
@@ -302,6 +583,7 @@ class DistributedCoordinator:
         if winner_id in self.agents:
             self.agents[winner_id].role = AgentRole.LEADER
             self.agents[winner_id].current_leader = winner_id
+            self._leader_id = winner_id
 
             # Update all other agents
             for agent_id, state in self.agents.items():
@@ -378,26 +660,23 @@ class DistributedCoordinator:
             if not self.pending_tasks:
                 continue
 
-            # Try to allocate pending tasks
-            allocated_tasks = []
-
-            for task_info in self.pending_tasks:
-                assigned = await self._allocate_task(task_info)
+            # Try to allocate pending tasks in one pass
+            pending_tasks = self.pending_tasks
+            self.pending_tasks = []
+            assignments = self._allocate_batch(pending_tasks)
 
+            for task_info, assigned in zip(pending_tasks, assignments):
                 if assigned:
                     self.metrics["total_tasks_allocated"] += 1
                     logger.info(f"Queued task {task_info['id']} allocated to {assigned}")
-                    allocated_tasks.append(task_info)
-
-            # Remove allocated tasks from queue
-            for task_info in allocated_tasks:
-                self.pending_tasks.remove(task_info)
+                else:
+                    self.pending_tasks.append(task_info)
 
     def _get_current_leader(self) -> Optional[str]:
         """Get the current leader agent ID."""
-        for agent_id, state in self.agents.items():
-            if state.role == AgentRole.LEADER and state.is_alive:
-                return agent_id
+        state = self.agents.get(self._leader_id)
+        if state is not None and state.role == AgentRole.LEADER and state.is_alive:
+            return self._leader_id
         return None
 
     def get_leader(self) -> Optional[str]:
@@ -412,7 +691,7 @@ class DistributedCoordinator:
             agent_id: ID of the agent
         """
         if agent_id in self.agents:
-            self.agents[agent_id].workload = max(0, self.agents[agent_id].workload - 1)
+            self._set_workload(agent_id, max(0, self.agents[agent_id].workload - 1))
 
     def get_coordination_state(self) -> Dict[str, Any]:
         """Get the current coordination state."""
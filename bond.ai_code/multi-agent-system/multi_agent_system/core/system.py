@@ -195,6 +195,10 @@ class MultiAgentSystem:
         for agent in self.agents.values():
             await agent.stop()
 
+        # Compact memory journals so the next start replays one record per memory
+        for memory in self.memories.values():
+            memory.flush()
+
         logger.info("Multi-Agent System stopped")
 
     async def execute_task(self, task_description: str, **kwargs) -> Result:
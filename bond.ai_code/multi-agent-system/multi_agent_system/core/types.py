@@ -2,9 +2,10 @@
 Core types and data models for the multi-agent system.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
 from datetime import datetime
 import uuid
 
@@ -113,9 +114,14 @@ class Result:
         }
 
 
-@dataclass
+@dataclass(frozen=True)
 class Message:
-    """Message passed between agents."""
+    """
+    Message passed between agents.
+
+    Messages are immutable because the bus delivers one envelope to every
+    recipient; use dataclasses.replace to derive a modified copy.
+    """
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     sender: str = ""
     recipient: str = ""  # Empty string means broadcast
@@ -126,7 +132,18 @@ class Message:
     in_response_to: Optional[str] = None
     timestamp: datetime = field(default_factory=datetime.now)
     ttl: int = 300  # Time to live in seconds
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Freeze metadata so recipients cannot change what others see."""
+        object.__setattr__(self, "metadata", MappingProxyType(dict(self.metadata)))
+
+    def __reduce__(self):
+        """Pickle and copy with plain-dict metadata; __post_init__ refreezes it."""
+        return (self.__class__, tuple(
+            dict(self.metadata) if f.name == "metadata" else getattr(self, f.name)
+            for f in fields(self)
+        ))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary."""
@@ -141,7 +158,7 @@ class Message:
             "in_response_to": self.in_response_to,
             "timestamp": self.timestamp.isoformat(),
             "ttl": self.ttl,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
         }
 
 
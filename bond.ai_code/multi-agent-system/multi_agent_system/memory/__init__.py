@@ -2,5 +2,6 @@
 
 from multi_agent_system.memory.memory_manager import MemoryManager, MemoryEntry
 from multi_agent_system.memory.semantic_memory import SemanticMemory
+from multi_agent_system.memory.vector_index import IVFIndex
 
-__all__ = ["MemoryManager", "MemoryEntry", "SemanticMemory"]
+__all__ = ["MemoryManager", "MemoryEntry", "SemanticMemory", "IVFIndex"]
@@ -5,9 +5,12 @@ Provides short-term and long-term memory with consolidation capabilities.
 """
 
 import asyncio
+import os
 import pickle
+import re
+import struct
 from collections import deque
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Hashable, Iterable, List, Optional, Set
 from datetime import datetime, timedelta
 from pathlib import Path
 from loguru import logger
@@ -49,6 +52,283 @@ class MemoryEntry:
         }
 
 
+class InvertedIndex:
+    """
+    Token inverted index answering case-insensitive substring queries.
+
+    Documents are indexed by the word tokens of their lowercased key and
+    value text. A query's inner tokens must appear whole in a matching
+    document, so candidates come from their posting lists; tokens at the
+    query edges may be partial and are looked up in a trigram index over the
+    vocabulary. Candidates are then verified with a substring check on the
+    cached text.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._texts: Dict[Hashable, tuple] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._vocabulary_grams: Dict[str, Set[str]] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, doc_id: Hashable, key: Any, value: Any) -> None:
+        """
+        Index (or re-index) a document.
+
+        Re-indexed documents keep their original position in result order.
+
+        Args:
+            doc_id: Document identifier
+            key: Memory key
+            value: Memory value
+        """
+        if doc_id in self._texts:
+            self._unindex(doc_id)
+        else:
+            self._order[doc_id] = self._next_order
+            self._next_order += 1
+
+        texts = (str(key).lower(), str(value).lower())
+        self._texts[doc_id] = texts
+        for token in self._tokens(texts):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                for gram in self._grams(token):
+                    self._vocabulary_grams.setdefault(gram, set()).add(token)
+            postings.add(doc_id)
+
+    def remove(self, doc_id: Hashable) -> None:
+        """Remove a document from the index."""
+        if doc_id in self._texts:
+            self._unindex(doc_id)
+            del self._texts[doc_id]
+            del self._order[doc_id]
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._texts.clear()
+        self._order.clear()
+        self._postings.clear()
+        self._vocabulary_grams.clear()
+
+    def search(self, query: str) -> List[Hashable]:
+        """
+        Find documents whose key or value contains the query.
+
+        Args:
+            query: Search query (case-insensitive substring)
+
+        Returns:
+            Matching document IDs in insertion order
+        """
+        query = query.lower()
+        candidates = self._candidates(query)
+
+        matches = [
+            doc_id for doc_id in candidates
+            if query in self._texts[doc_id][0] or query in self._texts[doc_id][1]
+        ]
+        matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def _candidates(self, query: str) -> Iterable[Hashable]:
+        """Documents that can contain the query, from the posting lists."""
+        whole: List[str] = []
+        partial = []
+        for match in self.TOKEN_PATTERN.finditer(query):
+            open_start = match.start() == 0
+            open_end = match.end() == len(query)
+            if open_start or open_end:
+                partial.append((match.group(), open_start, open_end))
+            else:
+                whole.append(match.group())
+
+        if whole:
+            postings = sorted(
+                (self._postings.get(token, set()) for token in whole), key=len
+            )
+            return set.intersection(*postings)
+
+        if not partial:
+            # No word characters to look up: verify every document
+            return list(self._texts)
+
+        # Resolve each edge token to the vocabulary tokens it can be part of
+        lookups = []
+        for token, open_start, open_end in partial:
+            if open_start and open_end:
+                matching = [t for t in self._vocabulary(token) if token in t]
+            elif open_start:
+                matching = [t for t in self._vocabulary(token) if t.endswith(token)]
+            else:
+                matching = [t for t in self._vocabulary(token) if t.startswith(token)]
+            lookups.append((sum(len(self._postings[t]) for t in matching), matching))
+
+        # Start from the most selective token; once the candidate set is
+        # smaller than the next token's postings, verification is cheaper
+        lookups.sort(key=lambda lookup: lookup[0])
+        candidates: Set[Hashable] = set().union(*(self._postings[t] for t in lookups[0][1]))
+        for size, matching in lookups[1:]:
+            if len(candidates) <= size:
+                break
+            candidates &= set().union(*(self._postings[t] for t in matching))
+        return candidates
+
+    def _vocabulary(self, token: str) -> Iterable[str]:
+        """Indexed tokens that may contain the given token."""
+        grams = self._grams(token)
+        if not grams:
+            # Too short for a trigram lookup: scan the vocabulary
+            return list(self._postings)
+
+        token_sets = sorted(
+            (self._vocabulary_grams.get(gram, set()) for gram in grams), key=len
+        )
+        return set.intersection(*token_sets)
+
+    def _grams(self, token: str) -> Set[str]:
+        """Distinct trigrams of a token."""
+        return {
+            token[i:i + self.GRAM_SIZE]
+            for i in range(len(token) - self.GRAM_SIZE + 1)
+        }
+
+    def _tokens(self, texts: tuple) -> Set[str]:
+        """Distinct tokens of a document's key and value text."""
+        return set(self.TOKEN_PATTERN.findall(texts[0])) | set(
+            self.TOKEN_PATTERN.findall(texts[1])
+        )
+
+    def _unindex(self, doc_id: Hashable) -> None:
+        """Drop a document from its posting lists."""
+        for token in self._tokens(self._texts[doc_id]):
+            postings = self._postings[token]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                for gram in self._grams(token):
+                    tokens = self._vocabulary_grams[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._vocabulary_grams[gram]
+
+
+class MemoryJournal:
+    """
+    Append-only journal of long-term memory changes.
+
+    Each record is a length-prefixed pickle of ("put", key, entry). Writes
+    append only the changed entry; compact() rewrites the file as one record
+    per live entry once stale records dominate.
+    """
+
+    HEADER = struct.Struct("<I")
+
+    def __init__(self, path: Path, compact_min_records: int = 1000, compact_ratio: float = 2.0):
+        """
+        Initialize journal.
+
+        Args:
+            path: Journal file path
+            compact_min_records: Never compact journals shorter than this
+            compact_ratio: Compact when records exceed this multiple of live entries
+        """
+        self.path = path
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+        self.records = 0
+        self._file: Optional[BinaryIO] = None
+
+    def load(self) -> Dict[str, MemoryEntry]:
+        """
+        Replay the journal.
+
+        A truncated trailing record (e.g. from a crash mid-write) is cut off
+        the file, so later appends follow the last complete record.
+
+        Returns:
+            Long-term memory dict
+        """
+        entries: Dict[str, MemoryEntry] = {}
+        self.records = 0
+        if not self.path.exists():
+            return entries
+
+        with open(self.path, "r+b") as f:
+            end = 0
+            while True:
+                header = f.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    torn = bool(header)
+                    break
+                (length,) = self.HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    torn = True
+                    break
+
+                op, key, entry = pickle.loads(payload)
+                if op == "put":
+                    entries[key] = entry
+                self.records += 1
+                end = f.tell()
+
+            if torn:
+                logger.warning(f"Dropping truncated record at end of {self.path}")
+                f.truncate(end)
+
+        return entries
+
+    def append(self, key: str, entry: MemoryEntry) -> None:
+        """Append one entry write."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(self._encode(key, entry))
+        self._file.flush()
+        self.records += 1
+
+    def needs_compaction(self, live_entries: int) -> bool:
+        """Whether stale records warrant a rewrite."""
+        return (
+            self.records >= self.compact_min_records
+            and self.records > self.compact_ratio * live_entries
+        )
+
+    def compact(self, entries: Dict[str, MemoryEntry]) -> None:
+        """Atomically rewrite the journal with only the live entries."""
+        self.close()
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for key, entry in entries.items():
+                f.write(self._encode(key, entry))
+        os.replace(tmp_path, self.path)
+        self.records = len(entries)
+
+    def delete(self) -> None:
+        """Remove the journal file."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+        self.records = 0
+
+    def close(self) -> None:
+        """Close the append handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _encode(self, key: str, entry: MemoryEntry) -> bytes:
+        payload = pickle.dumps(("put", key, entry), protocol=pickle.HIGHEST_PROTOCOL)
+        return self.HEADER.pack(len(payload)) + payload
+
+
 class MemoryManager:
     """
     Memory management system for agents.
@@ -58,6 +338,9 @@ class MemoryManager:
     - Long-term memory (persistent, unlimited)
     - Memory consolidation (important short-term -> long-term)
     - Memory retrieval with relevance scoring
+
+    Search uses token inverted indexes maintained on every store, and
+    long-term memory is persisted as an append-only journal.
     """
 
     def __init__(
@@ -87,16 +370,28 @@ class MemoryManager:
         # Long-term memory (persistent, unlimited)
         self.long_term: Dict[str, MemoryEntry] = {}
 
+        # Search indexes: short-term documents are keyed by an insertion
+        # sequence number (the deque may hold several entries per key),
+        # long-term documents by memory key
+        self._short_term_search = InvertedIndex()
+        self._short_term_entries: Dict[int, MemoryEntry] = {}
+        self._short_term_ids: deque = deque()
+        self._next_short_term_id = 0
+        self._long_term_search = InvertedIndex()
+
         # Shared knowledge base (accessible by all agents)
         self.shared_knowledge: Dict[str, Any] = {}
 
         # Storage path
         if long_term_path:
-            self.storage_path = Path(long_term_path) / f"{agent_id}_memory.pkl"
+            self.storage_path = Path(long_term_path) / f"{agent_id}_memory.journal"
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._legacy_storage_path = self.storage_path.with_suffix(".pkl")
+            self.journal: Optional[MemoryJournal] = MemoryJournal(self.storage_path)
             self._load_long_term_memory()
         else:
             self.storage_path = None
+            self.journal = None
 
         logger.info(f"MemoryManager initialized for agent {agent_id}")
 
@@ -114,9 +409,19 @@ class MemoryManager:
         """
         entry = MemoryEntry(key, value, importance, metadata)
 
-        # Add to short-term memory
+        # Add to short-term memory, unindexing the entry the deque drops
+        if len(self.short_term) == self.short_term.maxlen:
+            evicted_id = self._short_term_ids.popleft()
+            self._short_term_search.remove(evicted_id)
+            del self._short_term_entries[evicted_id]
+
+        entry_id = self._next_short_term_id
+        self._next_short_term_id += 1
         self.short_term.append(entry)
         self.short_term_index[key] = entry
+        self._short_term_ids.append(entry_id)
+        self._short_term_entries[entry_id] = entry
+        self._short_term_search.add(entry_id, key, value)
 
         logger.debug(f"Stored short-term memory: {key} (importance={importance})")
 
@@ -138,12 +443,13 @@ class MemoryManager:
         """
         entry = MemoryEntry(key, value, importance, metadata)
         self.long_term[key] = entry
+        self._long_term_search.add(key, key, value)
 
         logger.debug(f"Stored long-term memory: {key}")
 
         # Persist to disk if path is set
         if self.storage_path:
-            self._save_long_term_memory()
+            self._save_long_term_memory(key)
 
     def retrieve(self, key: str) -> Optional[Any]:
         """
@@ -183,6 +489,9 @@ class MemoryManager:
         """
         Search memories by query string.
 
+        Matches entries whose key or value (as indexed when stored) contains
+        the query, case-insensitively.
+
         Args:
             query: Search query
             limit: Maximum number of results
@@ -191,18 +500,17 @@ class MemoryManager:
         Returns:
             List of matching memory entries
         """
-        results = []
-
         # Search short-term
-        for entry in self.short_term:
-            if query.lower() in str(entry.key).lower() or query.lower() in str(entry.value).lower():
-                results.append(entry)
+        results = [
+            self._short_term_entries[entry_id]
+            for entry_id in self._short_term_search.search(query)
+        ]
 
         # Search long-term if requested
         if search_long_term:
-            for entry in self.long_term.values():
-                if query.lower() in str(entry.key).lower() or query.lower() in str(entry.value).lower():
-                    results.append(entry)
+            results.extend(
+                self.long_term[key] for key in self._long_term_search.search(query)
+            )
 
         # Sort by importance and access count
         results.sort(
@@ -247,22 +555,29 @@ class MemoryManager:
     def _consolidate_memory(self, entry: MemoryEntry) -> None:
         """Move a memory entry to long-term storage."""
         self.long_term[entry.key] = entry
+        self._long_term_search.add(entry.key, entry.key, entry.value)
 
         if self.storage_path:
-            self._save_long_term_memory()
+            self._save_long_term_memory(entry.key)
 
     def clear_short_term(self) -> None:
         """Clear all short-term memories."""
         self.short_term.clear()
         self.short_term_index.clear()
+        self._short_term_search.clear()
+        self._short_term_entries.clear()
+        self._short_term_ids.clear()
         logger.info("Cleared short-term memory")
 
     def clear_long_term(self) -> None:
         """Clear all long-term memories."""
         self.long_term.clear()
+        self._long_term_search.clear()
 
-        if self.storage_path and self.storage_path.exists():
-            self.storage_path.unlink()
+        if self.journal:
+            self.journal.delete()
+        if self.storage_path and self._legacy_storage_path.exists():
+            self._legacy_storage_path.unlink()
 
         logger.info("Cleared long-term memory")
 
@@ -276,29 +591,64 @@ class MemoryManager:
             "shared_knowledge_count": len(self.shared_knowledge),
         }
 
-    def _save_long_term_memory(self) -> None:
-        """Persist long-term memory to disk."""
-        if not self.storage_path:
+    def _save_long_term_memory(self, key: str) -> None:
+        """
+        Persist one long-term memory write to disk.
+
+        Appends the entry to the journal and compacts the journal once
+        superseded records outnumber live entries by the compaction ratio.
+
+        Args:
+            key: Key of the written entry
+        """
+        if not self.journal:
             return
 
         try:
-            with open(self.storage_path, "wb") as f:
-                pickle.dump(self.long_term, f)
-            logger.debug(f"Saved long-term memory to {self.storage_path}")
+            self.journal.append(key, self.long_term[key])
+            if self.journal.needs_compaction(len(self.long_term)):
+                self.journal.compact(self.long_term)
+                logger.debug(f"Compacted long-term memory journal {self.storage_path}")
         except Exception as e:
             logger.error(f"Failed to save long-term memory: {e}")
 
     def _load_long_term_memory(self) -> None:
         """Load long-term memory from disk."""
-        if not self.storage_path or not self.storage_path.exists():
+        if not self.journal:
             return
 
         try:
-            with open(self.storage_path, "rb") as f:
-                self.long_term = pickle.load(f)
+            if self.storage_path.exists():
+                self.long_term = self.journal.load()
+            elif self._legacy_storage_path.exists():
+                # Migrate a pickle snapshot written by earlier versions
+                with open(self._legacy_storage_path, "rb") as f:
+                    self.long_term = pickle.load(f)
+                self.journal.compact(self.long_term)
+            else:
+                return
+
+            for key, entry in self.long_term.items():
+                self._long_term_search.add(key, key, entry.value)
             logger.info(f"Loaded {len(self.long_term)} long-term memories from disk")
         except Exception as e:
-            logger.error(f"Failed to load long-term memory: {e}")
+            # Appending or compacting would bury or overwrite the unread
+            # entries, so leave the file alone for this session
+            logger.error(f"Failed to load long-term memory, not persisting to {self.storage_path}: {e}")
+            self.long_term = {}
+            self._long_term_search.clear()
+            self.journal.close()
+            self.journal = None
+
+    def flush(self) -> None:
+        """Compact the long-term memory journal and close its file handle."""
+        if not self.journal:
+            return
+
+        try:
+            self.journal.compact(self.long_term)
+        except Exception as e:
+            logger.error(f"Failed to compact long-term memory: {e}")
 
     # Shared knowledge methods
     def share_knowledge(self, key: str, value: Any) -> None:
@@ -13,6 +13,8 @@ from datetime import datetime
 from collections import defaultdict
 from loguru import logger
 
+from multi_agent_system.memory.vector_index import IVFIndex
+
 
 class SemanticMemory:
     """
@@ -23,6 +25,11 @@ class SemanticMemory:
     - Semantic similarity search
     - Context-aware ranking
     - Automatic relevance scoring
+
+    Embeddings live in one contiguous float32 matrix, one row per slot.
+    Evicted slots go on a free list and are reused, so similarity search is
+    a single matrix-vector product. Above approximate_threshold memories an
+    IVF index narrows each query to a few clusters.
     """
 
     def __init__(
@@ -30,6 +37,8 @@ class SemanticMemory:
         agent_id: str,
         embedding_dim: int = 384,  # Standard embedding dimension
         max_memories: int = 10000,
+        approximate_threshold: int = 100000,
+        n_probe: int = 8,
     ):
         """
         Initialize semantic memory.
@@ -38,18 +47,35 @@ class SemanticMemory:
             agent_id: ID of the agent
             embedding_dim: Dimension of embedding vectors
             max_memories: Maximum number of memories to store
+            approximate_threshold: Memory count above which queries use the
+                approximate IVF index instead of an exact scan. The default is
+                above max_memories, so recall is exact unless a caller lowers it
+            n_probe: Number of IVF clusters scanned per approximate query
         """
         self.agent_id = agent_id
         self.embedding_dim = embedding_dim
         self.max_memories = max_memories
-
-        # Memory storage
-        self.memories: List[Dict[str, Any]] = []
-        self.embeddings: List[np.ndarray] = []
-
-        # Index for fast lookup
+        self.approximate_threshold = approximate_threshold
+        self.n_probe = n_probe
+
+        # Slot storage: embedding rows plus per-slot memory and scoring state
+        self._capacity = min(max_memories, 1024)
+        self._matrix = np.zeros((self._capacity, embedding_dim), dtype=np.float32)
+        self._active = np.zeros(self._capacity, dtype=bool)
+        self._importance = np.zeros(self._capacity)
+        self._access = np.zeros(self._capacity)
+        self._sequence = np.zeros(self._capacity, dtype=np.int64)
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * self._capacity
+        self._free_slots: List[int] = []
+        self._high_water = 0
+        self._next_sequence = 0
+
+        # Key -> slot, in insertion order
         self.memory_index: Dict[str, int] = {}
 
+        # Approximate index, trained lazily once the memory is large
+        self.ivf_index: Optional[IVFIndex] = None
+
         # Statistics
         self.stats = {
             "total_stored": 0,
@@ -59,6 +85,16 @@ class SemanticMemory:
 
         logger.info(f"SemanticMemory initialized for {agent_id}")
 
+    @property
+    def memories(self) -> List[Dict[str, Any]]:
+        """Stored memories in insertion order."""
+        return [self._slots[slot] for slot in self.memory_index.values()]
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Embedding matrix of stored memories in insertion order."""
+        return self._matrix[list(self.memory_index.values())]
+
     def _generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for text.
@@ -116,18 +152,26 @@ class SemanticMemory:
 
         # Check if key exists
         if key in self.memory_index:
-            idx = self.memory_index[key]
-            self.memories[idx] = memory
-            self.embeddings[idx] = embedding
+            slot = self.memory_index[key]
         else:
             # Add new memory
-            if len(self.memories) >= self.max_memories:
+            if len(self.memory_index) >= self.max_memories:
                 # Remove least important memory
                 self._evict_memory()
 
-            self.memories.append(memory)
-            self.embeddings.append(embedding)
-            self.memory_index[key] = len(self.memories) - 1
+            slot = self._allocate_slot()
+            self.memory_index[key] = slot
+            self._sequence[slot] = self._next_sequence
+            self._next_sequence += 1
+
+        self._slots[slot] = memory
+        self._matrix[slot] = embedding
+        self._active[slot] = True
+        self._importance[slot] = importance
+        self._access[slot] = 0
+
+        if self.ivf_index is not None:
+            self.ivf_index.add(slot, self._matrix[slot])
 
         self.stats["total_stored"] += 1
         logger.debug(f"Stored semantic memory: {key}")
@@ -137,6 +181,7 @@ class SemanticMemory:
         query: str,
         top_k: int = 5,
         min_similarity: float = 0.3,
+        exact: bool = False,
     ) -> List[Tuple[str, Any, float]]:
         """
         Retrieve memories by semantic similarity.
@@ -145,38 +190,124 @@ class SemanticMemory:
             query: Query text
             top_k: Number of results to return
             min_similarity: Minimum similarity threshold
+            exact: Scan every memory even when the approximate index is active
 
         Returns:
             List of (key, content, similarity_score) tuples
         """
-        if not self.memories:
-            return []
+        results = self.retrieve_by_similarity_batch([query], top_k, min_similarity, exact)[0]
+        logger.debug(f"Retrieved {len(results)} memories for query: {query[:50]}...")
+        return results
 
-        # Generate query embedding
-        query_embedding = self._generate_embedding(query)
+    def retrieve_by_similarity_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_similarity: float = 0.3,
+        exact: bool = False,
+    ) -> List[List[Tuple[str, Any, float]]]:
+        """
+        Retrieve memories for many queries at once.
 
-        # Calculate similarities
-        similarities = []
-        for idx, embedding in enumerate(self.embeddings):
-            similarity = np.dot(query_embedding, embedding)
-            if similarity >= min_similarity:
-                similarities.append((idx, similarity))
+        All query embeddings are scored against the memory matrix in one
+        matrix product (per chunk of queries).
 
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            queries: Query texts
+            top_k: Number of results per query
+            min_similarity: Minimum similarity threshold
+            exact: Scan every memory even when the approximate index is active
 
-        # Get top-k results
-        results = []
-        for idx, similarity in similarities[:top_k]:
-            memory = self.memories[idx]
-            memory["access_count"] += 1
-            results.append((memory["key"], memory["content"], float(similarity)))
+        Returns:
+            One list of (key, content, similarity_score) tuples per query
+        """
+        if not self.memory_index or not queries or top_k <= 0:
+            return [[] for _ in queries]
 
-        self.stats["total_retrieved"] += len(results)
-        logger.debug(f"Retrieved {len(results)} memories for query: {query[:50]}...")
+        query_matrix = np.stack(
+            [self._generate_embedding(query) for query in queries]
+        ).astype(np.float32)
+
+        if not exact and self._use_approximate():
+            matches = self._search_approximate(query_matrix, top_k, min_similarity)
+        else:
+            matches = self._search_exact(query_matrix, top_k, min_similarity)
+
+        results = []
+        for query_matches in matches:
+            query_results = []
+            for slot, similarity in query_matches:
+                memory = self._slots[slot]
+                memory["access_count"] += 1
+                self._access[slot] += 1
+                query_results.append((memory["key"], memory["content"], similarity))
+            self.stats["total_retrieved"] += len(query_results)
+            results.append(query_results)
 
         return results
 
+    def _search_exact(
+        self, query_matrix: np.ndarray, top_k: int, min_similarity: float
+    ) -> List[List[Tuple[int, float]]]:
+        """Score queries against every slot and keep the top-k per query."""
+        n_slots = self._high_water
+        embeddings = self._matrix[:n_slots]
+        inactive = ~self._active[:n_slots]
+        k = min(top_k, n_slots)
+
+        # Bound the (queries x slots) score block to a few million entries
+        chunk_size = max(1, 4_000_000 // n_slots)
+
+        matches = []
+        for start in range(0, len(query_matrix), chunk_size):
+            scores = query_matrix[start:start + chunk_size] @ embeddings.T
+            scores[:, inactive] = -np.inf
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, slots in zip(scores, top):
+                matches.append(self._rank(slots, row[slots], top_k, min_similarity))
+        return matches
+
+    def _search_approximate(
+        self, query_matrix: np.ndarray, top_k: int, min_similarity: float
+    ) -> List[List[Tuple[int, float]]]:
+        """Score each query against the slots in its closest IVF clusters."""
+        matches = []
+        for query, slots in zip(query_matrix, self.ivf_index.candidates(query_matrix)):
+            if not len(slots):
+                matches.append([])
+                continue
+            scores = self._matrix[slots] @ query
+            if len(slots) > top_k:
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+                slots, scores = slots[top], scores[top]
+            matches.append(self._rank(slots, scores, top_k, min_similarity))
+        return matches
+
+    def _rank(
+        self, slots: np.ndarray, scores: np.ndarray, top_k: int, min_similarity: float
+    ) -> List[Tuple[int, float]]:
+        """Sort candidate slots by score and apply the similarity threshold."""
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            (int(slots[i]), float(scores[i]))
+            for i in order
+            if scores[i] >= min_similarity
+        ]
+
+    def _use_approximate(self) -> bool:
+        """Whether to answer from the IVF index, (re)training it if stale."""
+        size = len(self.memory_index)
+        if size < self.approximate_threshold:
+            return False
+
+        if self.ivf_index is None or size >= 2 * self.ivf_index.trained_size:
+            slots = np.fromiter(self.memory_index.values(), dtype=np.int64, count=size)
+            self.ivf_index = IVFIndex(n_lists=int(np.sqrt(size)), n_probe=self.n_probe)
+            self.ivf_index.train(self._matrix[slots], slots)
+            logger.info(f"Trained IVF index with {self.ivf_index.n_lists} lists over {size} memories")
+
+        return True
+
     def retrieve_contextual(
         self,
         query: str,
@@ -205,8 +336,8 @@ class SemanticMemory:
         # Re-rank based on context
         scored_matches = []
         for key, content, similarity in semantic_matches:
-            idx = self.memory_index[key]
-            memory = self.memories[idx]
+            slot = self.memory_index[key]
+            memory = self._slots[slot]
 
             # Calculate context overlap
             context_score = self._calculate_context_overlap(
@@ -246,29 +377,57 @@ class SemanticMemory:
 
         return matches / len(query_context)
 
+    def _allocate_slot(self) -> int:
+        """Take a free slot, growing the matrix if none is left."""
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        if self._high_water == self._capacity:
+            self._grow(min(self._capacity * 2, self.max_memories))
+
+        slot = self._high_water
+        self._high_water += 1
+        return slot
+
+    def _release_slot(self, slot: int) -> None:
+        """Return a slot to the free list."""
+        self._slots[slot] = None
+        self._active[slot] = False
+        self._importance[slot] = 0.0
+        self._access[slot] = 0.0
+        self._free_slots.append(slot)
+
+        if self.ivf_index is not None:
+            self.ivf_index.remove(slot)
+
+    def _grow(self, capacity: int) -> None:
+        """Resize slot storage to a new capacity."""
+        extra = capacity - self._capacity
+        self._matrix = np.vstack(
+            [self._matrix, np.zeros((extra, self.embedding_dim), dtype=np.float32)]
+        )
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        self._importance = np.concatenate([self._importance, np.zeros(extra)])
+        self._access = np.concatenate([self._access, np.zeros(extra)])
+        self._sequence = np.concatenate([self._sequence, np.zeros(extra, dtype=np.int64)])
+        self._slots.extend([None] * extra)
+        self._capacity = capacity
+
     def _evict_memory(self) -> None:
         """Evict least important memory."""
-        if not self.memories:
+        if not self.memory_index:
             return
 
-        # Calculate eviction scores (low importance + low access)
-        scores = []
-        for idx, memory in enumerate(self.memories):
-            score = memory["importance"] + memory["access_count"] / 100.0
-            scores.append((idx, score))
-
-        # Remove memory with lowest score
-        scores.sort(key=lambda x: x[1])
-        evict_idx = scores[0][0]
+        # Eviction score: low importance + low access; oldest first on ties
+        n_slots = self._high_water
+        scores = self._importance[:n_slots] + self._access[:n_slots] / 100.0
+        scores[~self._active[:n_slots]] = np.inf
+        tied = np.flatnonzero(scores == scores.min())
+        evict_slot = int(tied[np.argmin(self._sequence[tied])])
 
-        evicted_key = self.memories[evict_idx]["key"]
-        del self.memories[evict_idx]
-        del self.embeddings[evict_idx]
-
-        # Rebuild index
-        self.memory_index = {
-            mem["key"]: idx for idx, mem in enumerate(self.memories)
-        }
+        evicted_key = self._slots[evict_slot]["key"]
+        del self.memory_index[evicted_key]
+        self._release_slot(evict_slot)
 
         logger.debug(f"Evicted memory: {evicted_key}")
 
@@ -297,32 +456,39 @@ class SemanticMemory:
         """
         Consolidate similar memories.
 
+        Memories are compared in insertion order; each one absorbs later
+        memories at or above the threshold.
+
         Args:
             similarity_threshold: Threshold for merging
 
         Returns:
             Number of memories consolidated
         """
-        if len(self.memories) < 2:
+        if len(self.memory_index) < 2:
             return 0
 
+        slots = np.fromiter(self.memory_index.values(), dtype=np.int64, count=len(self.memory_index))
+        embeddings = self._matrix[slots]
+
         consolidated = 0
-        to_remove = set()
+        removed = np.zeros(len(slots), dtype=bool)
+        block_size = max(1, 4_000_000 // len(slots))
 
-        for i in range(len(self.embeddings)):
-            if i in to_remove:
-                continue
+        for start in range(0, len(slots), block_size):
+            block = embeddings[start:start + block_size] @ embeddings.T
 
-            for j in range(i + 1, len(self.embeddings)):
-                if j in to_remove:
+            for offset, row in enumerate(block):
+                i = start + offset
+                if removed[i]:
                     continue
 
-                similarity = np.dot(self.embeddings[i], self.embeddings[j])
+                similar = np.flatnonzero(row[i + 1:] >= similarity_threshold) + i + 1
+                mem_i = self._slots[slots[i]]
 
-                if similarity >= similarity_threshold:
+                for j in similar[~removed[similar]]:
                     # Merge j into i
-                    mem_i = self.memories[i]
-                    mem_j = self.memories[j]
+                    mem_j = self._slots[slots[j]]
 
                     # Keep more important one's content
                     if mem_j["importance"] > mem_i["importance"]:
@@ -339,22 +505,16 @@ class SemanticMemory:
                     # Update access count (sum)
                     mem_i["access_count"] += mem_j["access_count"]
 
-                    to_remove.add(j)
+                    removed[j] = True
                     consolidated += 1
 
+                self._importance[slots[i]] = mem_i["importance"]
+                self._access[slots[i]] = mem_i["access_count"]
+
         # Remove consolidated memories
-        if to_remove:
-            self.memories = [
-                mem for idx, mem in enumerate(self.memories) if idx not in to_remove
-            ]
-            self.embeddings = [
-                emb for idx, emb in enumerate(self.embeddings) if idx not in to_remove
-            ]
-
-            # Rebuild index
-            self.memory_index = {
-                mem["key"]: idx for idx, mem in enumerate(self.memories)
-            }
+        for slot in slots[removed].tolist():
+            del self.memory_index[self._slots[slot]["key"]]
+            self._release_slot(slot)
 
         if consolidated > 0:
             logger.info(f"Consolidated {consolidated} similar memories")
@@ -363,16 +523,28 @@ class SemanticMemory:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get semantic memory statistics."""
+        approximate = (
+            self.ivf_index is not None
+            and len(self.memory_index) >= self.approximate_threshold
+        )
         return {
             **self.stats,
-            "current_memories": len(self.memories),
+            "current_memories": len(self.memory_index),
             "capacity": self.max_memories,
-            "utilization": len(self.memories) / self.max_memories,
+            "utilization": len(self.memory_index) / self.max_memories,
+            "free_slots": len(self._free_slots),
+            "index": "ivf" if approximate else "exact",
         }
 
     def clear(self) -> None:
         """Clear all memories."""
-        self.memories.clear()
-        self.embeddings.clear()
+        self._matrix[:] = 0.0
+        self._active[:] = False
+        self._importance[:] = 0.0
+        self._access[:] = 0.0
+        self._slots = [None] * self._capacity
+        self._free_slots.clear()
+        self._high_water = 0
         self.memory_index.clear()
+        self.ivf_index = None
         logger.info("Cleared semantic memory")
@@ -0,0 +1,191 @@
+"""
+Approximate nearest-neighbour index for unit-normalized embeddings.
+
+Implements an inverted-file (IVF) index in pure NumPy:
+- Spherical k-means partitions vectors into lists
+- Queries scan only the lists whose centroids are closest
+- Removals are lazy; stale entries are dropped at query time and a list
+  is compacted once its dead entries outnumber its live ones
+"""
+
+import numpy as np
+from typing import List, Optional
+
+
+class IVFIndex:
+    """
+    Inverted-file index over embedding slots.
+
+    The index stores slot numbers only; callers keep the vectors and score
+    the returned candidates exactly.
+    """
+
+    def __init__(
+        self,
+        n_lists: int,
+        n_probe: int = 8,
+        n_iter: int = 10,
+        sample_per_list: int = 64,
+        seed: int = 0,
+        min_compact_size: int = 32,
+    ):
+        """
+        Initialize IVF index.
+
+        Args:
+            n_lists: Number of inverted lists (k-means clusters)
+            n_probe: Number of closest lists scanned per query
+            n_iter: k-means iterations when training
+            sample_per_list: Training sample size per list
+            seed: Random seed for centroid initialization and sampling
+            min_compact_size: Smallest list worth compacting
+        """
+        self.n_lists = max(1, n_lists)
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+        self.n_iter = n_iter
+        self.sample_per_list = sample_per_list
+        self.seed = seed
+        self.min_compact_size = min_compact_size
+
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+        self._live_counts = np.zeros(0, dtype=np.int64)
+        self._assignment = np.full(0, -1, dtype=np.int32)
+        self.size = 0
+        self.trained_size = 0
+
+    @property
+    def trained(self) -> bool:
+        """Whether centroids have been fitted."""
+        return self.centroids is not None
+
+    def train(self, vectors: np.ndarray, slots: np.ndarray) -> None:
+        """
+        Fit centroids and assign every given slot to a list.
+
+        Args:
+            vectors: Unit vectors, shape (n, dim)
+            slots: Slot number of each vector, shape (n,)
+        """
+        rng = np.random.default_rng(self.seed)
+        n = len(vectors)
+        n_lists = min(self.n_lists, n)
+
+        sample_size = min(n, n_lists * self.sample_per_list)
+        sample = vectors[rng.choice(n, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+
+            # Re-seed empty clusters from random sample points
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-8)
+
+        self.centroids = centroids.astype(np.float32)
+        self.lists = [[] for _ in range(n_lists)]
+        self._list_arrays = [None] * n_lists
+        self._live_counts = np.zeros(n_lists, dtype=np.int64)
+        self._assignment = np.full(max(len(self._assignment), int(slots.max()) + 1), -1, dtype=np.int32)
+        self.size = 0
+
+        labels = self._nearest_lists(vectors)
+        for slot, label in zip(slots.tolist(), labels.tolist()):
+            self.lists[label].append(slot)
+        self._assignment[slots] = labels
+        self._live_counts += np.bincount(labels, minlength=n_lists)
+        self.size = n
+        self.trained_size = n
+
+    def add(self, slot: int, vector: np.ndarray) -> None:
+        """Assign a (new or overwritten) slot to its closest list."""
+        if slot >= len(self._assignment):
+            grown = np.full(max(slot + 1, 2 * len(self._assignment)), -1, dtype=np.int32)
+            grown[:len(self._assignment)] = self._assignment
+            self._assignment = grown
+
+        label = int(self._nearest_lists(vector[None, :])[0])
+        previous = int(self._assignment[slot])
+        if previous == label:
+            # Overwritten in place; the existing entry is still valid
+            return
+
+        self._assignment[slot] = label
+        if previous < 0:
+            self.size += 1
+        else:
+            self._release(previous)
+
+        self.lists[label].append(slot)
+        self._list_arrays[label] = None
+        self._live_counts[label] += 1
+
+    def remove(self, slot: int) -> None:
+        """Drop a slot; its list entry is discarded lazily."""
+        if slot < len(self._assignment) and self._assignment[slot] >= 0:
+            label = int(self._assignment[slot])
+            self._assignment[slot] = -1
+            self.size -= 1
+            self._release(label)
+
+    def _release(self, label: int) -> None:
+        """Account for a dead entry in a list, compacting it if mostly dead."""
+        self._live_counts[label] -= 1
+        entries = len(self.lists[label])
+        if entries >= self.min_compact_size and entries > 2 * self._live_counts[label]:
+            self._compact(label)
+
+    def _compact(self, label: int) -> None:
+        """Rewrite a list with only its live, unique slots."""
+        members = self._members(label)
+        live = np.unique(members[self._assignment[members] == label])
+        self.lists[label] = live.tolist()
+        self._list_arrays[label] = live
+
+    def candidates(self, queries: np.ndarray) -> List[np.ndarray]:
+        """
+        Get candidate slots for each query.
+
+        Args:
+            queries: Unit query vectors, shape (m, dim)
+
+        Returns:
+            Unique slot array per query from its n_probe closest lists
+        """
+        scores = queries @ self.centroids.T
+        n_probe = min(self.n_probe, len(self.lists))
+        probed = np.argpartition(-scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        results = []
+        for lists in probed:
+            parts = []
+            for label in lists.tolist():
+                members = self._members(label)
+                # Skip removed slots and slots since reassigned to another list
+                parts.append(members[self._assignment[members] == label])
+            results.append(np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64))
+        return results
+
+    def _members(self, label: int) -> np.ndarray:
+        """Slot array of one list, cached until the list changes."""
+        members = self._list_arrays[label]
+        if members is None:
+            members = np.asarray(self.lists[label], dtype=np.int64)
+            self._list_arrays[label] = members
+        return members
+
+    def _nearest_lists(self, vectors: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+        """Closest centroid of each vector, computed in chunks."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            chunk = vectors[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
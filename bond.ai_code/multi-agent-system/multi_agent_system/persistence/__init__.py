@@ -1,5 +1,9 @@
 """Persistence layer for multi-agent system."""
 
-from multi_agent_system.persistence.database import DatabaseManager
+from multi_agent_system.persistence.database import (
+    AsyncDatabaseManager,
+    DatabaseManager,
+    WriteBehindError,
+)
 
-__all__ = ["DatabaseManager"]
+__all__ = ["AsyncDatabaseManager", "DatabaseManager", "WriteBehindError"]
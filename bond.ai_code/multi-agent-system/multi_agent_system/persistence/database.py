@@ -2,13 +2,22 @@
 Database persistence layer using SQLite.
 
 Provides persistent storage for tasks, results, agent states, and memories.
+
+Each thread keeps one long-lived connection in WAL mode, so statements are
+compiled once per connection and reused from sqlite3's statement cache.
+Writes can optionally go through a write-behind queue that a background
+thread flushes in batches with executemany; reads flush pending writes
+first.
 """
 
+import asyncio
 import sqlite3
 import json
 import pickle
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 from pathlib import Path
 from contextlib import contextmanager
 from loguru import logger
@@ -16,6 +25,43 @@ from loguru import logger
 from multi_agent_system.core.types import Task, Result, TaskStatus
 
 
+SAVE_TASK_SQL = """
+    INSERT OR REPLACE INTO tasks (
+        id, description, requirements, context, priority,
+        deadline, status, assigned_to, parent_task_id, subtasks,
+        created_at, started_at, completed_at, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SAVE_RESULT_SQL = """
+    INSERT INTO results (
+        task_id, success, data, error, agent_id,
+        execution_time, quality_score, metadata, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SAVE_MEMORY_SQL = """
+    INSERT OR REPLACE INTO memories (
+        agent_id, key, value, importance, memory_type,
+        context, created_at, accessed_at, access_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class WriteBehindError(Exception):
+    """Queued writes that could not be stored."""
+
+    def __init__(self, failed: List[Tuple[str, Tuple, Exception]]):
+        """
+        Initialize error.
+
+        Args:
+            failed: (sql, params, error) of every rejected row
+        """
+        self.failed = failed
+        super().__init__(f"{len(failed)} queued writes failed: {failed[0][2]}")
+
+
 class DatabaseManager:
     """
     Database manager for persistent storage.
@@ -23,33 +69,243 @@ class DatabaseManager:
     Uses SQLite for local persistence of all system data.
     """
 
-    def __init__(self, db_path: str = "./data/multi_agent_system.db"):
+    def __init__(
+        self,
+        db_path: str = "./data/multi_agent_system.db",
+        write_behind: bool = False,
+        flush_interval: float = 0.05,
+        batch_size: int = 500,
+        statement_cache_size: int = 256,
+    ):
         """
         Initialize database manager.
 
         Args:
             db_path: Path to SQLite database file
+            write_behind: Queue saves and write them in batches from a
+                background thread instead of one transaction per save;
+                call close() to drain the queue before exiting
+            flush_interval: Maximum seconds a queued write waits
+            batch_size: Queued writes that trigger an immediate flush
+            statement_cache_size: Prepared statements cached per connection
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.statement_cache_size = statement_cache_size
+
+        # One connection per thread, tracked so close() can release them all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._released = False
+
+        # Write-behind queue: SQL -> parameter rows, in arrival order
+        self._pending: Dict[str, List[Tuple]] = {}
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_error: Optional[WriteBehindError] = None
+
+        self.stats = {
+            "queued_writes": 0,
+            "flushed_writes": 0,
+            "flushes": 0,
+            "failed_writes": 0,
+        }
 
         self._init_database()
 
+        if write_behind:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="db-write-behind", daemon=True
+            )
+            self._flusher.start()
+
         logger.info(f"DatabaseManager initialized with database: {self.db_path}")
 
+    def _connection(self) -> sqlite3.Connection:
+        """Get (or open) this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._released:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,  # Only closed cross-thread, by close()
+                cached_statements=self.statement_cache_size,
+            )
+            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """Get database connection context manager (one transaction)."""
+        conn = self._connection()
         try:
             yield conn
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise
+
+    # ===== Write-Behind Queue =====
+
+    def _write(self, sql: str, params: Tuple) -> None:
+        """Execute a write now, or queue it when write-behind is enabled."""
+        if self._closed.is_set():
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+        if not self.write_behind:
+            with self._get_connection() as conn:
+                conn.execute(sql, params)
+            return
+
+        with self._pending_lock:
+            self._pending.setdefault(sql, []).append(params)
+            self._pending_count += 1
+            self.stats["queued_writes"] += 1
+            if self._pending_count >= self.batch_size:
+                self._flush_requested.set()
+
+    def flush(self) -> int:
+        """
+        Write all queued writes in one transaction.
+
+        If the batch fails, rows are retried one by one so a bad row cannot
+        discard the rest. If the database itself is unavailable, the batch
+        is requeued.
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            WriteBehindError: Rows were rejected, here or by an earlier
+                background flush
+            sqlite3.OperationalError: The batch could not be written and
+                was requeued
+        """
+        # Held across swap and write so batches commit in queue order
+        with self._flush_lock:
+            error, self._flush_error = self._flush_error, None
+
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                count, self._pending_count = self._pending_count, 0
+
+            written = 0
+            if count:
+                try:
+                    failed = self._write_batch(pending)
+                except sqlite3.OperationalError as e:
+                    self._requeue(pending, count)
+                    self._flush_error = error
+                    logger.error(f"Failed to flush {count} queued writes, requeued: {e}")
+                    raise
+
+                written = count - len(failed)
+                self.stats["flushed_writes"] += written
+                self.stats["flushes"] += 1
+                if failed:
+                    self.stats["failed_writes"] += len(failed)
+                    logger.error(f"Rejected {len(failed)} of {count} queued writes: {failed[0][2]}")
+                    error = WriteBehindError((error.failed if error else []) + failed)
+
+            if error is not None:
+                raise error
+            return written
+
+    def _write_batch(self, pending: Dict[str, List[Tuple]]) -> List[Tuple[str, Tuple, Exception]]:
+        """
+        Write a batch with executemany, falling back to one row at a time.
+
+        Returns:
+            (sql, params, error) of rows the database rejected
+        """
+        try:
+            with self._get_connection() as conn:
+                for sql, rows in pending.items():
+                    conn.executemany(sql, rows)
+            return []
+        except sqlite3.OperationalError:
+            raise
+        except sqlite3.Error:
+            pass
+
+        failed = []
+        with self._get_connection() as conn:
+            for sql, rows in pending.items():
+                for params in rows:
+                    try:
+                        conn.execute(sql, params)
+                    except sqlite3.OperationalError:
+                        raise
+                    except sqlite3.Error as e:
+                        failed.append((sql, params, e))
+        return failed
+
+    def _requeue(self, pending: Dict[str, List[Tuple]], count: int) -> None:
+        """Put an unwritten batch back ahead of writes queued since."""
+        with self._pending_lock:
+            for sql, rows in self._pending.items():
+                pending.setdefault(sql, []).extend(rows)
+            self._pending = pending
+            self._pending_count += count
+
+    def _flush_loop(self) -> None:
+        """Background flusher: write queued rows every flush_interval."""
+        while not self._closed.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except WriteBehindError as e:
+                # Reported by the next flush(), read or close()
+                with self._flush_lock:
+                    if self._flush_error is not None:
+                        e = WriteBehindError(self._flush_error.failed + e.failed)
+                    self._flush_error = e
+            except sqlite3.OperationalError:
+                pass  # Requeued; retried on the next interval
+
+    def close(self) -> None:
+        """
+        Flush queued writes, stop the flusher and close all connections.
+
+        Later reads and writes raise sqlite3.ProgrammingError.
+
+        Raises:
+            WriteBehindError: Queued rows were rejected
+        """
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        self._flush_requested.set()
+        if self._flusher is not None:
+            self._flusher.join()
+
+        try:
+            self.flush()
         finally:
-            conn.close()
+            with self._connections_lock:
+                self._released = True
+                for conn in self._connections:
+                    conn.close()
+                self._connections.clear()
+            self._local = threading.local()
+            logger.info(f"DatabaseManager closed: {self.db_path}")
 
     def _init_database(self) -> None:
         """Initialize database schema."""
@@ -188,31 +444,22 @@ class DatabaseManager:
         Args:
             task: Task to save
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO tasks (
-                    id, description, requirements, context, priority,
-                    deadline, status, assigned_to, parent_task_id, subtasks,
-                    created_at, started_at, completed_at, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                task.id,
-                task.description,
-                json.dumps(task.requirements),
-                json.dumps(task.context),
-                task.priority,
-                task.deadline.isoformat() if task.deadline else None,
-                task.status.value,
-                task.assigned_to,
-                task.parent_task_id,
-                json.dumps(task.subtasks),
-                task.created_at.isoformat(),
-                task.started_at.isoformat() if task.started_at else None,
-                task.completed_at.isoformat() if task.completed_at else None,
-                json.dumps(task.metadata),
-            ))
+        self._write(SAVE_TASK_SQL, (
+            task.id,
+            task.description,
+            json.dumps(task.requirements),
+            json.dumps(task.context),
+            task.priority,
+            task.deadline.isoformat() if task.deadline else None,
+            task.status.value,
+            task.assigned_to,
+            task.parent_task_id,
+            json.dumps(task.subtasks),
+            task.created_at.isoformat(),
+            task.started_at.isoformat() if task.started_at else None,
+            task.completed_at.isoformat() if task.completed_at else None,
+            json.dumps(task.metadata),
+        ))
 
         logger.debug(f"Saved task: {task.id}")
 
@@ -226,6 +473,8 @@ class DatabaseManager:
         Returns:
             Task instance or None
         """
+        self.flush()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -269,6 +518,8 @@ class DatabaseManager:
         Returns:
             List of tasks
         """
+        self.flush()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -309,33 +560,27 @@ class DatabaseManager:
 
     def save_result(self, result: Result) -> None:
         """Save a result to database."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Serialize data
-            data_str = json.dumps(result.data) if result.data else None
-
-            cursor.execute("""
-                INSERT INTO results (
-                    task_id, success, data, error, agent_id,
-                    execution_time, quality_score, metadata, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result.task_id,
-                1 if result.success else 0,
-                data_str,
-                result.error,
-                result.agent_id,
-                result.execution_time,
-                result.quality_score,
-                json.dumps(result.metadata),
-                result.created_at.isoformat(),
-            ))
+        # Serialize data
+        data_str = json.dumps(result.data) if result.data else None
+
+        self._write(SAVE_RESULT_SQL, (
+            result.task_id,
+            1 if result.success else 0,
+            data_str,
+            result.error,
+            result.agent_id,
+            result.execution_time,
+            result.quality_score,
+            json.dumps(result.metadata),
+            result.created_at.isoformat(),
+        ))
 
         logger.debug(f"Saved result for task: {result.task_id}")
 
     def load_results(self, task_id: str) -> List[Result]:
         """Load all results for a task."""
+        self.flush()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -374,30 +619,22 @@ class DatabaseManager:
         context: Optional[Dict] = None,
     ) -> None:
         """Save a memory entry."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Serialize value
-            value_str = pickle.dumps(value).hex()
-
-            now = datetime.now().isoformat()
-
-            cursor.execute("""
-                INSERT OR REPLACE INTO memories (
-                    agent_id, key, value, importance, memory_type,
-                    context, created_at, accessed_at, access_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                agent_id,
-                key,
-                value_str,
-                importance,
-                memory_type,
-                json.dumps(context or {}),
-                now,
-                now,
-                0,
-            ))
+        # Serialize value
+        value_str = pickle.dumps(value).hex()
+
+        now = datetime.now().isoformat()
+
+        self._write(SAVE_MEMORY_SQL, (
+            agent_id,
+            key,
+            value_str,
+            importance,
+            memory_type,
+            json.dumps(context or {}),
+            now,
+            now,
+            0,
+        ))
 
         logger.debug(f"Saved memory for {agent_id}: {key}")
 
@@ -408,6 +645,8 @@ class DatabaseManager:
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Load memories for an agent."""
+        self.flush()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -442,6 +681,8 @@ class DatabaseManager:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics."""
+        self.flush()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -469,6 +710,8 @@ class DatabaseManager:
             cursor.execute("SELECT COUNT(*) as count FROM learning_data")
             stats["total_learning_data"] = cursor.fetchone()["count"]
 
+            stats["write_behind"] = dict(self.stats)
+
             return stats
 
     def cleanup_old_data(self, days: int = 30) -> int:
@@ -481,6 +724,8 @@ class DatabaseManager:
         Returns:
             Number of rows removed
         """
+        self.flush()
+
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         removed = 0
 
@@ -507,6 +752,83 @@ class DatabaseManager:
 
     def vacuum(self) -> None:
         """Optimize database by running VACUUM."""
+        self.flush()
+
         with self._get_connection() as conn:
             conn.execute("VACUUM")
         logger.info("Database vacuumed")
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio facade over DatabaseManager.
+
+    Saves only enqueue when write-behind is enabled, so they run inline;
+    everything that touches the disk runs on a small thread pool (each
+    worker thread has its own connection), keeping the event loop free.
+    """
+
+    def __init__(self, db: Optional[DatabaseManager] = None, max_workers: int = 4, **kwargs):
+        """
+        Initialize async facade.
+
+        Args:
+            db: Database manager to wrap (created from kwargs if omitted)
+            max_workers: Threads used for reads and synchronous writes
+            **kwargs: DatabaseManager arguments when db is omitted
+        """
+        self.db = db or DatabaseManager(**kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-async")
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking DatabaseManager call on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def _save(self, func, *args, **kwargs) -> None:
+        """Enqueue inline under write-behind, otherwise write on the pool."""
+        if self.db.write_behind:
+            func(*args, **kwargs)
+        else:
+            await self._run(func, *args, **kwargs)
+
+    async def save_task(self, task: Task) -> None:
+        """Save a task to database."""
+        await self._save(self.db.save_task, task)
+
+    async def save_result(self, result: Result) -> None:
+        """Save a result to database."""
+        await self._save(self.db.save_result, result)
+
+    async def save_memory(self, *args, **kwargs) -> None:
+        """Save a memory entry."""
+        await self._save(self.db.save_memory, *args, **kwargs)
+
+    async def load_task(self, task_id: str) -> Optional[Task]:
+        """Load a task from database."""
+        return await self._run(self.db.load_task, task_id)
+
+    async def query_tasks(self, *args, **kwargs) -> List[Task]:
+        """Query tasks with filters."""
+        return await self._run(self.db.query_tasks, *args, **kwargs)
+
+    async def load_results(self, task_id: str) -> List[Result]:
+        """Load all results for a task."""
+        return await self._run(self.db.load_results, task_id)
+
+    async def load_memories(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Load memories for an agent."""
+        return await self._run(self.db.load_memories, *args, **kwargs)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get database statistics."""
+        return await self._run(self.db.get_statistics)
+
+    async def flush(self) -> int:
+        """Write all queued writes."""
+        return await self._run(self.db.flush)
+
+    async def close(self) -> None:
+        """Flush, close the database and stop the thread pool."""
+        await self._run(self.db.close)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,116 @@
+"""
+Tests for distributed coordination.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from multi_agent_system.coordination import CoordinationStrategy, DistributedCoordinator
+from multi_agent_system.coordination import distributed_coordinator
+
+
+@pytest.mark.asyncio
+async def test_load_based_allocation_follows_workload():
+    """Test that tasks go to the least-loaded capable agent."""
+    coordinator = DistributedCoordinator(strategy=CoordinationStrategy.LOAD_BASED)
+    coordinator.register_agent("coder_1", {"code", "test"})
+    coordinator.register_agent("coder_2", {"code"})
+    coordinator.register_agent("writer", {"write"})
+
+    assigned = [await coordinator.submit_task({}, {"code"}) for _ in range(4)]
+    assert assigned == ["coder_1", "coder_2", "coder_1", "coder_2"]
+
+    coordinator.report_task_completed("coder_2")
+    assert await coordinator.submit_task({}, {"code"}) == "coder_2"
+    assert await coordinator.submit_task({}, {"code", "test"}) == "coder_1"
+    assert await coordinator.submit_task({}, {"design"}) is None
+    assert len(coordinator.pending_tasks) == 1
+
+
+@pytest.mark.asyncio
+async def test_index_follows_registration_changes():
+    """Test that unregistering, liveness and capability updates re-index agents."""
+    coordinator = DistributedCoordinator(strategy=CoordinationStrategy.CAPABILITY_BASED)
+    coordinator.register_agent("generalist", {"code", "test", "write"})
+    coordinator.register_agent("specialist", {"code"})
+
+    assert await coordinator.submit_task({}, {"code"}) == "generalist"
+
+    coordinator.update_agent("generalist", is_alive=False)
+    assert await coordinator.submit_task({}, {"code"}) == "specialist"
+
+    coordinator.record_heartbeat("generalist")
+    assert await coordinator.submit_task({}, {"code"}) == "generalist"
+
+    coordinator.update_agent("specialist", capabilities={"code", "test", "write", "review"})
+    assert await coordinator.submit_task({}, {"code"}) == "specialist"
+
+    coordinator.unregister_agent("specialist")
+    assert await coordinator.submit_task({}, {"review"}) is None
+
+
+@pytest.mark.asyncio
+async def test_submit_tasks_matches_sequential_submission():
+    """Test that batch submission allocates exactly like submit_task."""
+    def build():
+        coordinator = DistributedCoordinator(strategy=CoordinationStrategy.AUCTION_BASED)
+        for i in range(20):
+            coordinator.register_agent(f"agent_{i}", {"code"} if i % 2 else {"code", "test"})
+        return coordinator
+
+    requirements = [{"code"}, {"test"}, set(), {"code", "test"}, {"deploy"}] * 10
+    tasks = [{"id": str(i)} for i in range(len(requirements))]
+
+    sequential = build()
+    expected = [await sequential.submit_task(t, r) for t, r in zip(tasks, requirements)]
+
+    batched = build()
+    assert await batched.submit_tasks(tasks, requirements) == expected
+    assert len(batched.pending_tasks) == 10
+    assert batched.metrics["total_tasks_allocated"] == 40
+
+
+@pytest.mark.asyncio
+async def test_load_heap_stays_bounded(monkeypatch):
+    """Test that workload churn neither grows the heap nor the cost per allocation."""
+    coordinator = DistributedCoordinator(strategy=CoordinationStrategy.LOAD_BASED)
+    for i in range(10):
+        coordinator.register_agent(f"agent_{i}", {"code"})
+
+    pops = []
+    real_heappop = distributed_coordinator.heapq.heappop
+    monkeypatch.setattr(
+        distributed_coordinator.heapq, "heappop", lambda heap: pops.append(1) or real_heappop(heap)
+    )
+
+    pool = coordinator._get_pool({"code"})
+    allocations = 5000
+    for i in range(allocations):
+        assigned = await coordinator.submit_task({}, {"code"})
+        if i % 3:
+            coordinator.report_task_completed(assigned)
+        assert len(pool._load_heap) <= 2 * len(pool.members) + 16
+
+    assert len(pops) <= 3 * allocations
+
+
+@pytest.mark.asyncio
+async def test_heaps_are_only_kept_for_their_strategy():
+    """Test that pools skip heaps the allocation strategy never reads."""
+    for strategy, load_heap, capability_heap in [
+        (CoordinationStrategy.ROUND_ROBIN, False, False),
+        (CoordinationStrategy.CAPABILITY_BASED, False, True),
+        (CoordinationStrategy.LOAD_BASED, True, False),
+    ]:
+        coordinator = DistributedCoordinator(strategy=strategy)
+        coordinator.register_agent("a", {"code"})
+        coordinator.register_agent("b", {"code", "test"})
+        for _ in range(50):
+            coordinator.report_task_completed(await coordinator.submit_task({}, {"code"}))
+
+        pool = coordinator._get_pool({"code"})
+        assert (pool._load_heap is not None) == load_heap
+        assert (pool._capability_heap is not None) == capability_heap
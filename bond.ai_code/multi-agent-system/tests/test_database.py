@@ -0,0 +1,149 @@
+"""
+Tests for database persistence.
+"""
+
+import asyncio
+import pytest
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from multi_agent_system.core.types import Result, Task, TaskStatus
+from multi_agent_system.persistence import AsyncDatabaseManager, DatabaseManager, WriteBehindError
+from multi_agent_system.persistence.database import SAVE_RESULT_SQL
+
+
+def test_write_behind_reads_own_writes(tmp_path):
+    """Test that queued writes are visible to reads and batched on flush."""
+    db = DatabaseManager(str(tmp_path / "test.db"), write_behind=True, flush_interval=60, batch_size=10000)
+    try:
+        task = Task(description="Analyze data", priority=3)
+        db.save_task(task)
+        task.status = TaskStatus.COMPLETED
+        db.save_task(task)
+        db.save_result(Result(task_id=task.id, success=True, data={"rows": 3}, agent_id="worker"))
+        db.save_memory("worker", "fact", {"x": 1}, 0.9, "long_term")
+
+        assert db.stats["queued_writes"] == 4
+        assert db.stats["flushed_writes"] == 0
+
+        # Reads flush the queue first; later writes to a row win
+        loaded = db.load_task(task.id)
+        assert loaded.status == TaskStatus.COMPLETED
+        assert db.stats["flushes"] == 1
+        assert db.load_results(task.id)[0].data == {"rows": 3}
+        assert db.load_memories("worker")[0]["value"] == {"x": 1}
+    finally:
+        db.close()
+
+
+def test_connections_are_per_thread_and_wal(tmp_path):
+    """Test that each thread reuses one WAL-mode connection."""
+    db = DatabaseManager(str(tmp_path / "test.db"), write_behind=False)
+    try:
+        main_conn = db._connection()
+        assert db._connection() is main_conn
+        assert main_conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db._connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not main_conn
+    finally:
+        db.close()
+
+
+def test_background_flush_and_close(tmp_path):
+    """Test that the flusher writes batches and close() drains the queue."""
+    path = str(tmp_path / "test.db")
+    db = DatabaseManager(path, write_behind=True, flush_interval=0.01, batch_size=50)
+    tasks = [Task(description=f"task {i}") for i in range(120)]
+    for task in tasks:
+        db.save_task(task)
+    db.close()
+
+    reopened = DatabaseManager(path, write_behind=False)
+    try:
+        assert reopened.get_statistics()["tasks_by_status"] == {"pending": 120}
+    finally:
+        reopened.close()
+
+
+def test_failed_row_does_not_discard_batch(tmp_path):
+    """Test that a rejected row is isolated and reported to the caller."""
+    db = DatabaseManager(str(tmp_path / "test.db"), write_behind=True, flush_interval=60, batch_size=10000)
+    try:
+        tasks = [Task(description=f"task {i}") for i in range(5)]
+        for task in tasks[:2]:
+            db.save_task(task)
+        # NOT NULL violation on results.task_id
+        db._write(SAVE_RESULT_SQL, (None, 1, None, None, "worker", 0.0, None, "{}", "2024-01-01"))
+        for task in tasks[2:]:
+            db.save_task(task)
+
+        with pytest.raises(WriteBehindError) as excinfo:
+            db.flush()
+
+        assert len(excinfo.value.failed) == 1
+        assert isinstance(excinfo.value.failed[0][2], sqlite3.IntegrityError)
+        assert db.stats["flushed_writes"] == 5
+        assert db.stats["failed_writes"] == 1
+        assert all(db.load_task(task.id) is not None for task in tasks)
+        assert db.flush() == 0
+    finally:
+        db.close()
+
+
+def test_background_failures_surface_on_next_flush(tmp_path):
+    """Test that rows rejected by the flusher are reported by the next call."""
+    db = DatabaseManager(str(tmp_path / "test.db"), write_behind=True, flush_interval=0.01)
+    try:
+        db._write(SAVE_RESULT_SQL, (None, 1, None, None, "worker", 0.0, None, "{}", "2024-01-01"))
+        for _ in range(200):
+            if db.stats["failed_writes"]:
+                break
+            threading.Event().wait(0.01)
+
+        with pytest.raises(WriteBehindError):
+            db.flush()
+        assert db.flush() == 0
+    finally:
+        db.close()
+
+
+def test_closed_manager_rejects_writes(tmp_path):
+    """Test that close() is final and saves are synchronous by default."""
+    db = DatabaseManager(str(tmp_path / "default.db"))
+    assert not db.write_behind and db._flusher is None
+    db.close()
+
+    for write_behind in (False, True):
+        db = DatabaseManager(str(tmp_path / f"test_{write_behind}.db"), write_behind=write_behind)
+        assert db.write_behind is write_behind
+        db.close()
+        db.close()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.save_task(Task(description="late"))
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.load_task("missing")
+        assert db._connections == []
+
+
+@pytest.mark.asyncio
+async def test_async_facade(tmp_path):
+    """Test saving and loading through the async facade."""
+    db = AsyncDatabaseManager(db_path=str(tmp_path / "test.db"))
+    task = Task(description="Async task")
+
+    await db.save_task(task)
+    await db.save_result(Result(task_id=task.id, success=True, agent_id="worker"))
+    loaded, results = await asyncio.gather(db.load_task(task.id), db.load_results(task.id))
+
+    assert loaded.description == "Async task"
+    assert len(results) == 1
+    await db.close()
@@ -0,0 +1,237 @@
+"""
+Tests for agent memory.
+"""
+
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from multi_agent_system.memory import MemoryManager, SemanticMemory
+from multi_agent_system.memory.vector_index import IVFIndex
+
+
+def test_semantic_memory_eviction_reuses_slots():
+    """Test that eviction frees slots for new memories, oldest first on ties."""
+    memory = SemanticMemory(agent_id="test", embedding_dim=32, max_memories=3)
+    for i in range(5):
+        memory.store(f"key_{i}", f"content {i}")
+
+    assert list(memory.memory_index) == ["key_2", "key_3", "key_4"]
+    assert memory._high_water == 3
+    assert memory.embeddings.shape == (3, 32)
+
+
+def test_semantic_memory_batch_matches_single_queries():
+    """Test that batched retrieval returns the same matches as single queries."""
+    memory = SemanticMemory(agent_id="test", embedding_dim=32)
+    for i in range(50):
+        memory.store(f"key_{i}", f"content {i}", importance=i / 50)
+
+    queries = ["key_3 content 3", "key_7 content 7", "unrelated"]
+    batch = memory.retrieve_by_similarity_batch(queries, top_k=3, min_similarity=-1.0)
+    single = [memory.retrieve_by_similarity(q, top_k=3, min_similarity=-1.0) for q in queries]
+
+    assert [[key for key, _, _ in r] for r in batch] == [[key for key, _, _ in r] for r in single]
+    assert batch[0][0][0] == "key_3"
+    assert batch[0][0][2] > 0.99
+
+
+def test_semantic_memory_approximate_index():
+    """Test that the IVF index finds the nearest memories on clustered data."""
+    rng = np.random.default_rng(0)
+    memory = SemanticMemory(agent_id="test", embedding_dim=16, approximate_threshold=500, n_probe=4)
+    for i in range(1000):
+        memory.store(f"key_{i}", i)
+
+    # Replace hash embeddings with clustered vectors
+    centers = rng.standard_normal((20, 16))
+    vectors = centers[rng.integers(0, 20, 1000)] + 0.2 * rng.standard_normal((1000, 16))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    memory._matrix[:1000] = vectors
+
+    query = "probe"
+    memory._generate_embedding = lambda text: vectors[123]
+    approximate = memory.retrieve_by_similarity(query, top_k=5, min_similarity=-1.0)
+    exact = memory.retrieve_by_similarity(query, top_k=5, min_similarity=-1.0, exact=True)
+
+    assert memory.get_statistics()["index"] == "ivf"
+    assert approximate[0][0] == "key_123"
+    assert [key for key, _, _ in approximate] == [key for key, _, _ in exact]
+
+
+def test_ivf_lists_stay_bounded_under_churn():
+    """Test removed and overwritten slots are compacted out of the lists."""
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((400, 8))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = IVFIndex(n_lists=8, n_probe=8)
+    index.train(vectors, np.arange(400))
+
+    for round_ in range(50):
+        for slot in rng.choice(400, 100, replace=False).tolist():
+            if round_ % 2:
+                index.remove(slot)
+                index.add(slot, vectors[slot])
+            else:
+                moved = rng.standard_normal(8)
+                vectors[slot] = moved / np.linalg.norm(moved)
+                index.add(slot, vectors[slot])
+
+    entries = sum(len(members) for members in index.lists)
+    assert index.size == 400
+    assert entries <= 2 * index.size + index.n_lists * index.min_compact_size
+
+    # Probing every list still returns each live slot exactly once
+    found = index.candidates(vectors[:1])[0]
+    assert found.tolist() == list(range(400))
+
+    for slot in range(300):
+        index.remove(slot)
+    assert index.candidates(vectors[:1])[0].tolist() == list(range(300, 400))
+    assert sum(len(members) for members in index.lists) <= 100 + index.n_lists * index.min_compact_size
+
+
+def test_semantic_memory_is_exact_below_threshold():
+    """Test that queries scan every memory until the approximate threshold."""
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((2000, 16))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    # The default threshold is above the default capacity
+    memory = SemanticMemory(agent_id="test", embedding_dim=16)
+    assert memory.approximate_threshold > memory.max_memories
+    for i in range(2000):
+        memory.store(f"key_{i}", i)
+    memory._matrix[:2000] = vectors
+
+    for target in rng.choice(2000, 20, replace=False):
+        query = vectors[target] + 0.5 * rng.standard_normal(16)
+        memory._generate_embedding = lambda text: query
+        results = memory.retrieve_by_similarity("probe", top_k=10, min_similarity=-1.0)
+        expected = np.argsort(-(memory._matrix[:2000] @ query.astype(np.float32)), kind="stable")[:10]
+        assert [key for key, _, _ in results] == [f"key_{i}" for i in expected]
+
+    assert memory.ivf_index is None
+    assert memory.get_statistics()["index"] == "exact"
+
+    # A lowered threshold switches to the IVF index once reached, not before
+    memory = SemanticMemory(agent_id="test", embedding_dim=16, approximate_threshold=500)
+    for i in range(499):
+        memory.store(f"key_{i}", i)
+    memory.retrieve_by_similarity("probe")
+    assert memory.ivf_index is None
+    memory.store("key_499", 499)
+    memory.retrieve_by_similarity("probe")
+    assert memory.get_statistics()["index"] == "ivf"
+
+
+def test_semantic_memory_consolidation():
+    """Test that near-duplicate memories are merged into the earliest one."""
+    memory = SemanticMemory(agent_id="test", embedding_dim=32)
+    memory.store("first", "a", context={"x": 1}, importance=0.2)
+    memory.store("second", "b", context={"y": 2}, importance=0.8)
+    memory.store("third", "c")
+    memory._matrix[memory.memory_index["second"]] = memory._matrix[memory.memory_index["first"]]
+
+    assert memory.consolidate_memories(similarity_threshold=0.99) == 1
+    assert list(memory.memory_index) == ["first", "third"]
+
+    merged = memory.memories[0]
+    assert merged["content"] == "b"
+    assert merged["context"] == {"x": 1, "y": 2}
+    assert merged["importance"] == 0.8
+    assert memory.get_statistics()["free_slots"] == 1
+
+
+def _scan(manager, query):
+    """Reference substring scan over every memory."""
+    query = query.lower()
+    entries = list(manager.short_term) + list(manager.long_term.values())
+    results = [e for e in entries if query in str(e.key).lower() or query in str(e.value).lower()]
+    results.sort(key=lambda e: (e.importance, e.access_count), reverse=True)
+    return results
+
+
+def test_memory_manager_search_matches_substring_scan():
+    """Test that indexed search returns exactly the substring matches."""
+    manager = MemoryManager(agent_id="test", short_term_size=50)
+    words = ["alpha", "beta", "research", "machine", "learning", "x1"]
+    for i in range(300):
+        value = " ".join(words[(i * j) % len(words)] for j in range(1, 5)) + f" #{i}"
+        if i % 3:
+            manager.store_short_term(f"note_{i % 80}", {"text": value}, importance=(i % 7) / 7)
+        else:
+            manager.store_long_term(f"fact_{i % 40}", value, importance=(i % 5) / 5)
+
+    for query in ["ear", "machine lear", "RESEARCH", "#12", "a b", "'text': 'al", " ", "", "zzz"]:
+        assert manager.search(query, limit=1000) == _scan(manager, query)
+
+
+def test_memory_manager_journal_persistence(tmp_path):
+    """Test that long-term memory survives a restart and the journal compacts."""
+    manager = MemoryManager(agent_id="test", long_term_path=str(tmp_path))
+    manager.journal.compact_min_records = 10
+    for i in range(30):
+        manager.store_long_term(f"fact_{i % 5}", f"version {i}")
+
+    # Repeated writes to five keys were compacted away
+    assert manager.journal.records < 30
+    manager.store_long_term("extra", "appended after compaction")
+
+    reloaded = MemoryManager(agent_id="test", long_term_path=str(tmp_path))
+    assert list(reloaded.long_term) == list(manager.long_term)
+    assert reloaded.retrieve("fact_4") == "version 29"
+    assert [e.key for e in reloaded.search("appended")] == ["extra"]
+
+    # A torn final record is ignored
+    with open(reloaded.storage_path, "ab") as f:
+        f.write(b"\x10\x00\x00\x00partial")
+    assert len(MemoryManager(agent_id="test", long_term_path=str(tmp_path)).long_term) == 6
+
+
+def test_memory_manager_journal_appends_after_torn_record(tmp_path):
+    """Test that writes after a torn record survive the next reload."""
+    def reload():
+        return MemoryManager(agent_id="test", long_term_path=str(tmp_path))
+
+    manager = reload()
+    for i in range(5):
+        manager.store_long_term(f"fact_{i}", f"value {i}")
+    manager.flush()
+    with open(manager.storage_path, "ab") as f:
+        f.write(b"\x10\x00\x00\x00partial")
+
+    manager = reload()
+    assert len(manager.long_term) == 5
+    manager.store_long_term("fact_5", "value 5")
+
+    manager = reload()
+    assert len(manager.long_term) == 6
+    manager.flush()
+    assert reload().long_term.keys() == {f"fact_{i}" for i in range(6)}
+
+    # A torn header is cut off as well
+    with open(manager.storage_path, "ab") as f:
+        f.write(b"\x10\x00")
+    manager = reload()
+    manager.store_long_term("fact_6", "value 6")
+    assert len(reload().long_term) == 7
+
+
+def test_memory_manager_keeps_unreadable_journal(tmp_path):
+    """Test that a journal that fails to load is never compacted over."""
+    manager = MemoryManager(agent_id="test", long_term_path=str(tmp_path))
+    manager.store_long_term("fact", "value")
+    manager.flush()
+    with open(manager.storage_path, "ab") as f:
+        f.write(b"\x04\x00\x00\x00junk")
+    contents = manager.storage_path.read_bytes()
+
+    broken = MemoryManager(agent_id="test", long_term_path=str(tmp_path))
+    assert broken.long_term == {}
+    broken.store_long_term("other", "value")
+    broken.flush()
+    assert manager.storage_path.read_bytes() == contents
@@ -0,0 +1,142 @@
+"""
+Tests for the message bus.
+"""
+
+import asyncio
+import copy
+import dataclasses
+import pickle
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from multi_agent_system.communication import MessageBus
+from multi_agent_system.core.types import Message, MessageType
+
+
+@pytest.mark.asyncio
+async def test_priority_order_and_batch_receive():
+    """Test that higher priority is received first, FIFO within a priority."""
+    bus = MessageBus()
+    bus.register_agent("sender")
+    bus.register_agent("receiver")
+
+    for i, priority in enumerate([1, 3, 1, 2, 3]):
+        await bus.send_message(Message(
+            sender="sender", recipient="receiver", content=i, priority=priority
+        ))
+
+    messages = await bus.receive_messages("receiver", max_messages=10, timeout=0.1)
+    assert [m.content for m in messages] == [1, 4, 3, 0, 2]
+    assert await bus.receive_messages("receiver", timeout=0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_broadcast_and_publish_share_envelopes():
+    """Test that fan-out delivers one shared message to every recipient."""
+    bus = MessageBus()
+    for agent_id in ["a", "b", "c"]:
+        bus.register_agent(agent_id)
+    bus.subscribe("b", "news")
+    bus.subscribe("c", "news")
+
+    broadcast = Message(sender="a", recipient="*", message_type=MessageType.BROADCAST, content="hi")
+    assert await bus.send_message(broadcast)
+    assert await bus.receive_message("b", timeout=0.1) is broadcast
+    assert await bus.receive_message("c", timeout=0.1) is broadcast
+    assert await bus.receive_message("a", timeout=0.01) is None
+
+    published = Message(sender="a", content="update")
+    assert await bus.publish("news", published) == 2
+    received_b = await bus.receive_message("b", timeout=0.1)
+    received_c = await bus.receive_message("c", timeout=0.1)
+    assert received_b is received_c
+    assert received_b.id == published.id
+    assert received_b.metadata["topic"] == "news"
+    assert published.metadata == {}
+
+    # Shared envelopes cannot be changed by one recipient under another
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        received_b.content = "tampered"
+    with pytest.raises(TypeError):
+        received_b.metadata["topic"] = "other"
+    assert received_c.content == "update"
+    assert received_c.metadata["topic"] == "news"
+
+    # Unregistering updates the precomputed topic targets
+    bus.unregister_agent("c")
+    assert await bus.publish("news", published) == 1
+
+
+@pytest.mark.asyncio
+async def test_backpressure_metrics():
+    """Test that full queues drop after the put timeout and report it."""
+    bus = MessageBus(max_queue_size=2, put_timeout=0.01)
+    bus.register_agent("sender")
+    bus.register_agent("receiver")
+
+    results = [
+        await bus.send_message(Message(sender="sender", recipient="receiver", content=i))
+        for i in range(3)
+    ]
+
+    assert results == [True, True, False]
+    metrics = bus.get_queue_metrics("receiver")
+    assert metrics["depth"] == 2
+    assert metrics["high_water"] == 2
+    assert metrics["dropped"] == 1
+    assert metrics["blocked_puts"] == 1
+    assert bus.get_statistics()["full_queues"] == 1
+    assert bus.get_statistics()["dropped_messages"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_response_with_frozen_messages():
+    """Test responses resolve the waiting sender without mutating messages."""
+    bus = MessageBus()
+    bus.register_agent("client")
+    bus.register_agent("server")
+
+    metadata = {"trace": "abc"}
+    request = Message(sender="client", recipient="server", content="ping", metadata=metadata)
+    metadata["trace"] = "changed"
+    assert request.metadata["trace"] == "abc"
+    assert request.to_dict()["metadata"] == {"trace": "abc"}
+
+    async def serve():
+        received = await bus.receive_message("server", timeout=1.0)
+        assert received.requires_response
+        await bus.send_response(received.id, Message(sender="server", recipient="client", content="pong"))
+
+    server = asyncio.create_task(serve())
+    response = await bus.send_and_wait_response(request, timeout=1.0)
+    await server
+
+    assert response.content == "pong"
+    assert response.in_response_to == request.id
+    assert not request.requires_response
+
+
+def test_messages_pickle_and_deepcopy():
+    """Test frozen messages round-trip with their metadata still read-only."""
+    message = Message(
+        sender="a",
+        recipient="b",
+        message_type=MessageType.RESPONSE,
+        content={"rows": [1, 2]},
+        priority=3,
+        in_response_to="req-1",
+        metadata={"trace": {"span": 7}},
+    )
+
+    for clone in [pickle.loads(pickle.dumps(message)), copy.deepcopy(message), copy.copy(message)]:
+        assert clone == message
+        assert clone.to_dict() == message.to_dict()
+        with pytest.raises(TypeError):
+            clone.metadata["trace"] = "changed"
+
+    deep = copy.deepcopy(message)
+    assert deep.metadata["trace"] is not message.metadata["trace"]
+    assert deep.content is not message.content
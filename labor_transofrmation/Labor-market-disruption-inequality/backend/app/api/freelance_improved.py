@@ -26,7 +26,7 @@ from ..db.models import (
 from ..models.freelance_hub import FreelanceHub
 from ..agents.freelance_advisor_agent import FreelanceAdvisorAgent
 from ..core.cache import cached, get_cache, invalidate_cache_pattern
-from ..core.pagination import paginate, create_paginated_response
+from ..core.pagination import paginate_keyset, create_paginated_response, invalidate_cached_counts
 
 router = APIRouter()
 
@@ -348,6 +348,7 @@ def create_job_posting(job: JobPostingCreate, db: Session = Depends(get_db)):
         # Invalidate job listings cache
         invalidate_cache_pattern("jobs_search")
         invalidate_cache_pattern("marketplace_")
+        invalidate_cached_counts()
 
         return {
             "status": "success",
@@ -370,9 +371,15 @@ def search_jobs(
     status: str = "open",
     page: int = QueryParam(default=1, ge=1),
     page_size: int = QueryParam(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Search for freelance jobs with pagination and filtering"""
+    """
+    Search for freelance jobs with pagination and filtering
+
+    Pass pagination.next_cursor from a response as cursor to fetch the
+    next page without an OFFSET scan.
+    """
     try:
         # Build query
         query = db.query(FreelanceJobPosting).filter(
@@ -392,17 +399,24 @@ def search_jobs(
         if experience_level:
             query = query.filter(FreelanceJobPosting.experience_level == experience_level)
 
-        # Order by most recent
-        query = query.order_by(desc(FreelanceJobPosting.posted_at))
+        # Order by most recent, id breaking ties
+        order_by = [desc(FreelanceJobPosting.posted_at), desc(FreelanceJobPosting.id)]
 
         # Paginate
-        items, total_count, pagination = paginate(query, page=page, page_size=page_size)
+        items, total_count, pagination, next_cursor = paginate_keyset(
+            query, order_by, cursor=cursor, page=page, page_size=page_size, count="cached"
+        )
 
         # Convert to dicts
         jobs = [job_to_dict(job) for job in items]
 
-        return create_paginated_response(jobs, total_count, page, page_size)
+        return create_paginated_response(
+            jobs, total_count, pagination.page, pagination.page_size,
+            next_cursor=next_cursor, has_next=next_cursor is not None
+        )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search jobs: {str(e)}")
 
@@ -515,6 +529,7 @@ def get_freelancer_proposals(
     status: Optional[str] = None,
     page: int = QueryParam(default=1, ge=1),
     page_size: int = QueryParam(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Get all proposals for a freelancer with pagination"""
@@ -526,10 +541,12 @@ def get_freelancer_proposals(
         if status:
             query = query.filter(FreelanceProposal.status == status)
 
-        query = query.order_by(desc(FreelanceProposal.submitted_at))
+        order_by = [desc(FreelanceProposal.submitted_at), desc(FreelanceProposal.id)]
 
         # Paginate
-        items, total_count, pagination = paginate(query, page=page, page_size=page_size)
+        items, total_count, pagination, next_cursor = paginate_keyset(
+            query, order_by, cursor=cursor, page=page, page_size=page_size
+        )
 
         # Convert to dicts
         proposals = []
@@ -560,11 +577,16 @@ def get_freelancer_proposals(
             ).count()
         }
 
-        response = create_paginated_response(proposals, total_count, page, page_size)
+        response = create_paginated_response(
+            proposals, total_count, pagination.page, pagination.page_size,
+            next_cursor=next_cursor, has_next=next_cursor is not None
+        )
         response["stats"] = stats
 
         return response
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch proposals: {str(e)}")
 
@@ -642,6 +664,7 @@ def get_freelancer_contracts(
     status: Optional[str] = None,
     page: int = QueryParam(default=1, ge=1),
     page_size: int = QueryParam(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Get all contracts for a freelancer with pagination"""
@@ -654,10 +677,12 @@ def get_freelancer_contracts(
         if status:
             query = query.filter(FreelanceContract.status == status)
 
-        query = query.order_by(desc(FreelanceContract.started_at))
+        order_by = [desc(FreelanceContract.started_at), desc(FreelanceContract.id)]
 
         # Paginate
-        items, total_count, pagination = paginate(query, page=page, page_size=page_size)
+        items, total_count, pagination, next_cursor = paginate_keyset(
+            query, order_by, cursor=cursor, page=page, page_size=page_size
+        )
 
         # Convert to dicts
         contracts = []
@@ -689,11 +714,16 @@ def get_freelancer_contracts(
             "total_earned": sum(c.amount_paid for c in all_completed)
         }
 
-        response = create_paginated_response(contracts, total_count, page, page_size)
+        response = create_paginated_response(
+            contracts, total_count, pagination.page, pagination.page_size,
+            next_cursor=next_cursor, has_next=next_cursor is not None
+        )
         response["stats"] = stats
 
         return response
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch contracts: {str(e)}")
 
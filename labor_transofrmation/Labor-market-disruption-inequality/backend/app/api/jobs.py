@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response, Query as QueryParam
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from app.db.database import get_db
 from app.db.models import Job, JobSkill, Worker, WorkerSkill
-from app.models.matcher import WorkerJobMatcher
+from app.core.pagination import paginate_keyset, cursor_after
+from app.models.matcher import JobMatchIndex, WorkerJobMatcher
 
 router = APIRouter()
 matcher = WorkerJobMatcher()
@@ -48,13 +49,20 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[JobResponse])
 def list_jobs(
-    skip: int = 0,
-    limit: int = 20,
+    response: Response,
+    skip: int = QueryParam(default=0, ge=0),
+    limit: int = QueryParam(default=20, ge=1, le=100),
     industry: Optional[str] = None,
     remote_only: bool = False,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """List available job postings with filters"""
+    """
+    List available job postings with filters
+
+    The X-Next-Cursor response header, passed back as cursor, fetches the
+    next page by seeking on id instead of skipping rows.
+    """
     query = db.query(Job)
 
     if industry:
@@ -63,7 +71,22 @@ def list_jobs(
     if remote_only:
         query = query.filter(Job.remote_friendly == True)
 
-    jobs = query.offset(skip).limit(limit).all()
+    if cursor:
+        try:
+            jobs, _, _, next_cursor = paginate_keyset(
+                query, [Job.id], cursor=cursor, page_size=limit, count=None
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        rows = query.order_by(Job.id).offset(skip).limit(limit + 1).all()
+        jobs = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = cursor_after(jobs[-1], [Job.id], skip // limit + 1)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -103,20 +126,12 @@ def match_jobs_for_worker(request: MatchRequest, db: Session = Depends(get_db)):
         Job.expires_at == None
     ).all() or db.query(Job).all()
 
-    # Get skills for each job
-    jobs_skills = {}
-    for job in jobs:
-        job_skills_db = db.query(JobSkill).filter(
-            JobSkill.job_id == job.id
-        ).all()
-        jobs_skills[job.id] = [
-            {
-                'skill_id': js.skill_id,
-                'required': js.required,
-                'importance': js.importance
-            }
-            for js in job_skills_db
-        ]
+    # Get skills for all jobs in one query
+    job_skill_rows = db.query(
+        JobSkill.job_id, JobSkill.skill_id, JobSkill.required, JobSkill.importance
+    ).filter(
+        JobSkill.job_id.in_([job.id for job in jobs])
+    ).all()
 
     # Convert worker to dict
     worker_dict = {
@@ -141,13 +156,13 @@ def match_jobs_for_worker(request: MatchRequest, db: Session = Depends(get_db)):
     ]
 
     # Get ranked matches
-    matches = matcher.rank_jobs_for_worker(
-        worker_dict,
-        worker_skills,
-        jobs_list,
-        jobs_skills,
+    index = JobMatchIndex.from_rows(jobs_list, job_skill_rows)
+    matches = matcher.rank_jobs_for_workers(
+        [worker_dict],
+        [worker_skills],
+        index,
         request.top_n
-    )
+    )[0]
 
     return {
         'worker_id': request.worker_id,
@@ -1,24 +1,251 @@
 """
 Caching utility for performance optimization
 
-Provides in-memory caching with TTL support.
+Provides bounded in-memory caching with TTL support:
+- Per-category memory budgets with LRU or LFU eviction
+- Sharded locks, so unrelated keys do not contend
+- A background sweeper that drops expired entries
+- Prefix invalidation through a trie of key namespaces
+- Single-flight loading, so concurrent misses on a key compute it once
+
 Can be easily upgraded to Redis for distributed caching.
 """
 
-from typing import Any, Optional, Callable
-from datetime import datetime, timedelta
+from typing import Any, Optional, Callable, Dict, List
+from collections import OrderedDict, defaultdict
 from functools import wraps
 import hashlib
+import heapq
+import itertools
 import json
+import sys
 import threading
+import time
 
 
-class CacheStore:
-    """Thread-safe in-memory cache with TTL support"""
+_MISSING = object()
+
+MB = 1024 * 1024
+
+
+def _estimate_size(value: Any, depth: int = 0) -> int:
+    """Approximate memory footprint of a value in bytes"""
+    size = sys.getsizeof(value)
+    if depth >= 4:
+        return size
+
+    if isinstance(value, dict):
+        size += sum(
+            _estimate_size(k, depth + 1) + _estimate_size(v, depth + 1)
+            for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, depth + 1) for item in value)
+    return size
+
+
+class _CacheEntry:
+    """A cached value and its bookkeeping"""
+
+    __slots__ = ("value", "expires_at", "created_at", "last_accessed", "hits", "category", "size")
+
+    def __init__(self, value: Any, expires_at: float, category: str, size: int):
+        now = time.monotonic()
+        self.value = value
+        self.expires_at = expires_at
+        self.created_at = now
+        self.last_accessed = now
+        self.hits = 0
+        self.category = category
+        self.size = size
+
+
+class _LRUSegment:
+    """Eviction order for one category: least recently used first"""
+
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def add(self, key: str, entry: _CacheEntry):
+        self._order[key] = None
+
+    def touch(self, key: str, entry: _CacheEntry):
+        self._order.move_to_end(key)
+
+    def remove(self, key: str, entry: _CacheEntry):
+        del self._order[key]
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+
+class _LFUSegment:
+    """Eviction order for one category: fewest hits first, oldest among ties"""
+
+    def __init__(self):
+        self._buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)  # hits -> keys
+        self._min_hits = 0
+
+    def add(self, key: str, entry: _CacheEntry):
+        self._buckets[entry.hits][key] = None
+        self._min_hits = min(self._min_hits, entry.hits)
+
+    def touch(self, key: str, entry: _CacheEntry):
+        # Called after entry.hits was incremented
+        self._discard(key, entry.hits - 1)
+        self._buckets[entry.hits][key] = None
+
+    def remove(self, key: str, entry: _CacheEntry):
+        self._discard(key, entry.hits)
+
+    def victim(self) -> Optional[str]:
+        if not self._buckets:
+            return None
+        if self._min_hits not in self._buckets:
+            self._min_hits = min(self._buckets)
+        return next(iter(self._buckets[self._min_hits]))
+
+    def _discard(self, key: str, hits: int):
+        bucket = self._buckets[hits]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[hits]
+
+
+EVICTION_POLICIES = {
+    "lru": _LRUSegment,
+    "lfu": _LFUSegment,
+}
+
+
+class _CacheShard:
+    """One lock's worth of the cache"""
+
+    def __init__(self, segment_factory: Callable):
+        self.lock = threading.Lock()
+        self.entries: Dict[str, _CacheEntry] = {}
+        self.segments = defaultdict(segment_factory)  # category -> eviction order
+        self.category_bytes: Dict[str, int] = defaultdict(int)
+        self.category_evictions: Dict[str, int] = defaultdict(int)
+        self.expiry_heap: List = []  # (expires_at, seq, key, entry)
+        self.stats: Dict[str, int] = defaultdict(int)
+
+
+class _KeyTrie:
+    """
+    Prefix index of cache keys
+
+    Keys are indexed character by character up to their first ':', the
+    namespace that callers invalidate by. Full keys are stored at the
+    node where their namespace ends, so the trie stays as small as the
+    set of namespaces.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = self._node()
+
+    @staticmethod
+    def _node() -> Dict:
+        return {"children": {}, "keys": set()}
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def add(self, key: str):
+        with self._lock:
+            node = self._root
+            for char in self._namespace(key):
+                node = node["children"].setdefault(char, self._node())
+            node["keys"].add(key)
+
+    def discard(self, key: str):
+        with self._lock:
+            path = [self._root]
+            for char in self._namespace(key):
+                node = path[-1]["children"].get(char)
+                if node is None:
+                    return
+                path.append(node)
+            path[-1]["keys"].discard(key)
+
+            # Prune nodes that no longer lead to any key
+            namespace = self._namespace(key)
+            for depth in range(len(namespace), 0, -1):
+                node = path[depth]
+                if node["keys"] or node["children"]:
+                    break
+                del path[depth - 1]["children"][namespace[depth - 1]]
+
+    def clear(self):
+        with self._lock:
+            self._root = self._node()
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """All indexed keys starting with prefix"""
+        with self._lock:
+            matches = []
+            node = self._root
+            for char in prefix:
+                # Keys whose namespace ends before the prefix does can still match
+                matches.extend(key for key in node["keys"] if key.startswith(prefix))
+                node = node["children"].get(char)
+                if node is None:
+                    return matches
+
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                matches.extend(key for key in current["keys"] if key.startswith(prefix))
+                stack.extend(current["children"].values())
+            return matches
+
+
+class _InflightLoad:
+    """A value being computed by one caller while others wait for it"""
+
+    __slots__ = ("done", "result", "error")
 
     def __init__(self):
-        self._cache = {}
-        self._lock = threading.RLock()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CacheStore:
+    """
+    Thread-safe bounded in-memory cache with TTL support
+
+    Each category has a memory budget, split evenly across shards. When a
+    shard's share is exceeded, entries of that category are evicted by
+    the configured policy ("lru" or "lfu").
+
+    The largest cacheable entry is therefore budget // num_shards bytes
+    (2 MB for the default 16 MB budget and 8 shards), not the whole
+    budget. Larger values are not cached: set() drops them, including
+    any previous value under the key, and counts them as "rejected".
+    Raise the category budget or lower num_shards for large values.
+    """
+
+    def __init__(
+        self,
+        memory_budgets: Optional[Dict[str, int]] = None,
+        eviction_policy: str = "lru",
+        num_shards: int = 8,
+        sweep_interval_seconds: Optional[float] = 30
+    ):
+        """
+        Args:
+            memory_budgets: Bytes per category; unlisted categories use "default"
+            eviction_policy: "lru" or "lfu"
+            num_shards: Number of independently locked partitions; each holds
+                budget // num_shards bytes per category, which also caps entry size
+            sweep_interval_seconds: Period of the background expiry sweep (None disables it)
+        """
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
         self._ttl_defaults = {
             "profile": 300,  # 5 minutes
             "jobs": 60,      # 1 minute
@@ -26,87 +253,298 @@ class CacheStore:
             "marketplace": 180,  # 3 minutes
             "default": 120   # 2 minutes
         }
+        self._memory_budgets = {
+            "profile": 32 * MB,
+            "jobs": 32 * MB,
+            "analytics": 32 * MB,
+            "marketplace": 16 * MB,
+            "default": 16 * MB
+        }
+        self._memory_budgets.update(memory_budgets or {})
+        self.eviction_policy = eviction_policy
 
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired"""
-        with self._lock:
-            if key not in self._cache:
-                return None
+        self._shards = [_CacheShard(EVICTION_POLICIES[eviction_policy]) for _ in range(num_shards)]
+        self._trie = _KeyTrie()
+        self._expiry_seq = itertools.count()
+
+        self._inflight: Dict[str, _InflightLoad] = {}
+        self._inflight_lock = threading.Lock()
+        self._load_stats = {"loads": 0, "coalesced": 0, "load_seconds": 0.0, "max_load_seconds": 0.0}
+
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+        self._sweeper_lock = threading.Lock()
 
-            entry = self._cache[key]
-            if datetime.utcnow() > entry["expires_at"]:
-                del self._cache[key]
-                return None
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
 
-            entry["hits"] += 1
-            entry["last_accessed"] = datetime.utcnow()
-            return entry["value"]
+    def _shard_budget(self, category: str) -> int:
+        """Bytes of category one shard may hold, and so the largest cacheable entry"""
+        budget = self._memory_budgets.get(category, self._memory_budgets["default"])
+        return budget // len(self._shards)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if not expired"""
+        value = self._lookup(key)
+        return None if value is _MISSING else value
+
+    def _lookup(self, key: str, record: bool = True) -> Any:
+        """Cached value or _MISSING; record=False skips stats and recency"""
+        started = time.perf_counter_ns()
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None and time.monotonic() > entry.expires_at:
+                self._remove(shard, key, entry)
+                shard.stats["expirations"] += 1
+                entry = None
+
+            if not record:
+                return _MISSING if entry is None else entry.value
+
+            if entry is None:
+                shard.stats["misses"] += 1
+                value = _MISSING
+            else:
+                shard.stats["hits"] += 1
+                entry.hits += 1
+                entry.last_accessed = time.monotonic()
+                shard.segments[entry.category].touch(key, entry)
+                value = entry.value
+
+            shard.stats["gets"] += 1
+            shard.stats["get_ns"] += time.perf_counter_ns() - started
+            return value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None, category: str = "default"):
         """Set value in cache with TTL"""
         if ttl_seconds is None:
             ttl_seconds = self._ttl_defaults.get(category, self._ttl_defaults["default"])
 
-        with self._lock:
-            self._cache[key] = {
-                "value": value,
-                "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds),
-                "created_at": datetime.utcnow(),
-                "last_accessed": datetime.utcnow(),
-                "hits": 0,
-                "category": category
-            }
+        size = _estimate_size(key) + _estimate_size(value)
+        budget = self._shard_budget(category)
+        self._ensure_sweeper()
+
+        shard = self._shard(key)
+        with shard.lock:
+            previous = shard.entries.get(key)
+            if previous is not None:
+                self._remove(shard, key, previous, keep_index=True)
+
+            if size > budget:
+                if previous is not None:
+                    self._trie.discard(key)
+                shard.stats["rejected"] += 1
+                return
+
+            # Make room first, so a new entry is never its own eviction victim
+            segment = shard.segments[category]
+            while shard.category_bytes[category] + size > budget:
+                victim = segment.victim()
+                self._remove(shard, victim, shard.entries[victim])
+                shard.stats["evictions"] += 1
+                shard.category_evictions[category] += 1
+
+            entry = _CacheEntry(value, time.monotonic() + ttl_seconds, category, size)
+            shard.entries[key] = entry
+            segment.add(key, entry)
+            shard.category_bytes[category] += size
+            heapq.heappush(shard.expiry_heap, (entry.expires_at, next(self._expiry_seq), key, entry))
+            if previous is None:
+                self._trie.add(key)
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl_seconds: Optional[int] = None,
+        category: str = "default"
+    ) -> Any:
+        """
+        Cached value for key, calling loader to fill a miss
+
+        Concurrent misses on the same key wait for the first caller's
+        load instead of running loader themselves; if it raises, they
+        raise the same exception.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        with self._inflight_lock:
+            load = self._inflight.get(key)
+            leader = load is None
+            if leader:
+                load = self._inflight[key] = _InflightLoad()
+
+        if not leader:
+            load.done.wait()
+            with self._inflight_lock:
+                self._load_stats["coalesced"] += 1
+            if load.error is not None:
+                raise load.error
+            return load.result
+
+        try:
+            # A previous leader may have filled the key since our miss
+            value = self._lookup(key, record=False)
+            if value is _MISSING:
+                started = time.perf_counter()
+                value = loader()
+                elapsed = time.perf_counter() - started
+                self.set(key, value, ttl_seconds=ttl_seconds, category=category)
+
+                with self._inflight_lock:
+                    self._load_stats["loads"] += 1
+                    self._load_stats["load_seconds"] += elapsed
+                    self._load_stats["max_load_seconds"] = max(self._load_stats["max_load_seconds"], elapsed)
+            load.result = value
+            return value
+        except BaseException as e:
+            load.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            load.done.set()
 
     def delete(self, key: str):
         """Delete a key from cache"""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                self._remove(shard, key, entry)
 
-    def delete_pattern(self, pattern: str):
+    def delete_pattern(self, pattern: str) -> int:
         """Delete all keys matching a pattern (simple prefix matching)"""
-        with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if k.startswith(pattern)]
-            for key in keys_to_delete:
-                del self._cache[key]
+        keys = self._trie.keys_with_prefix(pattern)
+        for key in keys:
+            self.delete(key)
+        return len(keys)
 
     def clear(self):
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                for entry in shard.entries.values():
+                    entry.value = None
+                shard.entries.clear()
+                shard.segments.clear()
+                shard.category_bytes.clear()
+                shard.expiry_heap.clear()
+        self._trie.clear()
 
     def cleanup_expired(self):
         """Remove all expired entries"""
-        with self._lock:
-            now = datetime.utcnow()
-            expired_keys = [
-                k for k, v in self._cache.items()
-                if now > v["expires_at"]
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-            return len(expired_keys)
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                now = time.monotonic()
+                heap = shard.expiry_heap
+                while heap and heap[0][0] <= now:
+                    _, _, key, entry = heapq.heappop(heap)
+                    # Skip entries that were since replaced, deleted or evicted
+                    if shard.entries.get(key) is entry:
+                        self._remove(shard, key, entry)
+                        shard.stats["expirations"] += 1
+                        removed += 1
+        return removed
+
+    def _remove(self, shard: _CacheShard, key: str, entry: _CacheEntry, keep_index: bool = False):
+        """Drop an entry; the caller holds shard.lock"""
+        del shard.entries[key]
+        shard.segments[entry.category].remove(key, entry)
+        shard.category_bytes[entry.category] -= entry.size
+        # The expiry heap may still reference the entry until it expires
+        entry.value = None
+        if not keep_index:
+            self._trie.discard(key)
+
+    def _ensure_sweeper(self):
+        """Start the background expiry sweep on first use"""
+        if self.sweep_interval_seconds is None or self._sweeper is not None:
+            return
+
+        with self._sweeper_lock:
+            if self._sweeper is None:
+                self._sweeper_stop.clear()
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, name="cache-expiry-sweeper", daemon=True
+                )
+                self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._sweeper_stop.wait(self.sweep_interval_seconds):
+            self.cleanup_expired()
+
+    def stop_sweeper(self):
+        """Stop the background expiry sweep (restarted by the next set)"""
+        with self._sweeper_lock:
+            sweeper, self._sweeper = self._sweeper, None
+            self._sweeper_stop.set()
+        if sweeper is not None:
+            sweeper.join()
 
     def get_stats(self) -> dict:
         """Get cache statistics"""
-        with self._lock:
-            total_entries = len(self._cache)
-            total_hits = sum(v["hits"] for v in self._cache.values())
-            categories = {}
-
-            for entry in self._cache.values():
-                cat = entry["category"]
-                if cat not in categories:
-                    categories[cat] = {"count": 0, "hits": 0}
-                categories[cat]["count"] += 1
-                categories[cat]["hits"] += entry["hits"]
-
-            return {
-                "total_entries": total_entries,
-                "total_hits": total_hits,
-                "categories": categories,
-                "memory_estimate_kb": total_entries * 2  # Rough estimate
-            }
+        totals = defaultdict(int)
+        categories = {}
+        total_entries = 0
+        total_hits = 0
+        total_bytes = 0
+
+        for shard in self._shards:
+            with shard.lock:
+                total_entries += len(shard.entries)
+                for name, count in shard.stats.items():
+                    totals[name] += count
+
+                for entry in shard.entries.values():
+                    cat = categories.setdefault(
+                        entry.category, {"count": 0, "hits": 0, "bytes": 0, "evictions": 0}
+                    )
+                    cat["count"] += 1
+                    cat["hits"] += entry.hits
+                    total_hits += entry.hits
+
+                for category, size in shard.category_bytes.items():
+                    total_bytes += size
+                    if category in categories:
+                        categories[category]["bytes"] += size
+
+                for category, evictions in shard.category_evictions.items():
+                    cat = categories.setdefault(
+                        category, {"count": 0, "hits": 0, "bytes": 0, "evictions": 0}
+                    )
+                    cat["evictions"] += evictions
+
+        for category, cat in categories.items():
+            cat["budget_bytes"] = self._memory_budgets.get(category, self._memory_budgets["default"])
+
+        with self._inflight_lock:
+            loads = dict(self._load_stats)
+
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "total_entries": total_entries,
+            "total_hits": total_hits,
+            "categories": categories,
+            "memory_estimate_kb": round(total_bytes / 1024, 1),
+            "eviction_policy": self.eviction_policy,
+            "hits": totals["hits"],
+            "misses": totals["misses"],
+            "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+            "evictions": totals["evictions"],
+            "expirations": totals["expirations"],
+            "rejected": totals["rejected"],
+            "avg_get_latency_us": round(totals["get_ns"] / totals["gets"] / 1000, 2) if totals["gets"] else 0.0,
+            "loads": loads["loads"],
+            "coalesced_loads": loads["coalesced"],
+            "avg_load_latency_ms": round(loads["load_seconds"] / loads["loads"] * 1000, 2) if loads["loads"] else 0.0,
+            "max_load_latency_ms": round(loads["max_load_seconds"] * 1000, 2)
+        }
 
 
 # Global cache instance
@@ -133,6 +571,8 @@ def cached(ttl_seconds: Optional[int] = None, category: str = "default", key_pre
     """
     Decorator to cache function results
 
+    Concurrent calls that miss on the same key share one execution.
+
     Usage:
         @cached(ttl_seconds=300, category="profile")
         def get_profile(user_id):
@@ -144,16 +584,12 @@ def cached(ttl_seconds: Optional[int] = None, category: str = "default", key_pre
             # Generate cache key
             key = f"{key_prefix}{func.__name__}:{cache_key(*args, **kwargs)}"
 
-            # Try to get from cache
-            cached_value = _cache.get(key)
-            if cached_value is not None:
-                return cached_value
-
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            _cache.set(key, result, ttl_seconds=ttl_seconds, category=category)
-
-            return result
+            return _cache.get_or_set(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl_seconds=ttl_seconds,
+                category=category
+            )
 
         # Add cache management methods to the wrapper
         wrapper.cache_clear = lambda: _cache.delete_pattern(f"{key_prefix}{func.__name__}:")
@@ -1,11 +1,32 @@
 """
 Pagination utilities for API endpoints
+
+Two modes:
+- Offset: paginate() pages with OFFSET/LIMIT and an exact COUNT(*)
+- Keyset: paginate_keyset() seeks past an opaque cursor with an indexed
+  WHERE (k) > (:last) predicate, so deep pages cost the same as the
+  first, and can use estimated or cached counts
+
+Keyset ordering sorts NULL above every value in nullable sort columns
+(last ascending, first descending), as PostgreSQL does by default.
 """
 
-from typing import Generic, TypeVar, List, Optional
+from typing import Generic, TypeVar, List, Optional, Sequence, Tuple, Any
 from pydantic import BaseModel
+from sqlalchemy import and_, false, or_, tuple_
 from sqlalchemy.orm import Query
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+from datetime import date, datetime
+from decimal import Decimal
 from math import ceil
+import base64
+import json
+import logging
+
+from .cache import get_cache, cache_key
+
+logger = logging.getLogger(__name__)
 
 
 T = TypeVar("T")
@@ -82,6 +103,255 @@ def paginate(
     return items, total_count, params
 
 
+COUNT_MODES = ("exact", "cached", "estimated")
+
+# Seconds a cached count is reused for before COUNT(*) runs again
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_PREFIX = "pagination_count:"
+
+
+def _sort_keys(order_by: Sequence[Any]) -> List[Tuple[Any, bool]]:
+    """(column, descending) for each order_by expression, e.g. desc(Job.posted_at)"""
+    keys = []
+    for expression in order_by:
+        descending = False
+        if isinstance(expression, UnaryExpression) and expression.modifier in (operators.desc_op, operators.asc_op):
+            descending = expression.modifier is operators.desc_op
+            expression = expression.element
+        keys.append((expression, descending))
+    return keys
+
+
+def _nullable(column: Any) -> bool:
+    """Whether a sort column may hold NULL; expressions other than columns may"""
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def _order_clauses(keys: List[Tuple[Any, bool]]) -> List[Any]:
+    """ORDER BY for keys, placing NULLs of nullable columns above every value"""
+    clauses = []
+    for column, descending in keys:
+        clause = column.desc() if descending else column.asc()
+        if _nullable(column):
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any], page: int, sort_names: Sequence[str]) -> str:
+    """Opaque cursor for the position after a row with the given sort key values"""
+    payload = {
+        "k": [_encode_value(v) for v in values],
+        "p": page,
+        "s": list(sort_names)
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_names: Sequence[str]) -> Tuple[List[Any], int]:
+    """
+    Sort key values and page number stored in a cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for a different ordering
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(v) for v in payload["k"]]
+        page = int(payload["p"])
+        names = payload["s"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+
+    if names != list(sort_names) or len(values) != len(sort_names):
+        raise ValueError("Pagination cursor does not match this listing's sort order")
+    return values, page
+
+
+def _seek_predicate(keys: List[Tuple[Any, bool]], values: List[Any]):
+    """WHERE clause selecting rows after values in the (column, descending) order"""
+    directions = {descending for _, descending in keys}
+    # A row-value comparison is false when a NULL decides it, which is only
+    # right where NULLs sort before the bound: descending keys, non-NULL values
+    row_value = all(
+        value is not None and (descending or not _nullable(column))
+        for (column, descending), value in zip(keys, values)
+    )
+    if len(directions) == 1 and row_value:
+        # Uniform direction: a single row-value comparison the index can seek on
+        columns = tuple_(*[column for column, _ in keys])
+        bound = tuple_(*values)
+        return columns < bound if directions.pop() else columns > bound
+
+    # Otherwise: (k1 > v1) OR (k1 = v1 AND k2 < v2) OR ..., with NULL the largest value
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        value = values[i]
+        if value is None:
+            if not descending:
+                continue  # Nothing sorts after NULL ascending
+            past = column.isnot(None)
+        elif descending:
+            past = column < value
+        elif _nullable(column):
+            past = or_(column > value, column.is_(None))
+        else:
+            past = column > value
+        equal = [keys[j][0].is_(None) if values[j] is None else keys[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, past))
+    return or_(*clauses) if clauses else false()
+
+
+def count_query(query: Query, mode: str = "exact") -> int:
+    """
+    Number of rows a query returns
+
+    Args:
+        query: Query to count
+        mode: "exact" runs COUNT(*); "cached" reuses a COUNT(*) for up to
+            COUNT_CACHE_TTL seconds; "estimated" reads the planner's row
+            estimate on PostgreSQL and falls back to an exact count elsewhere
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode: {mode}")
+
+    if mode == "estimated":
+        estimate = _estimated_count(query)
+        if estimate is not None:
+            return estimate
+        mode = "exact"
+
+    if mode == "cached":
+        compiled = query.statement.compile(dialect=query.session.get_bind().dialect)
+        key = f"{COUNT_CACHE_PREFIX}{cache_key(str(compiled), compiled.params)}"
+        return get_cache().get_or_set(key, query.count, ttl_seconds=COUNT_CACHE_TTL, category="pagination")
+
+    return query.count()
+
+
+def invalidate_cached_counts():
+    """Drop cached counts, e.g. after inserting rows into a listed table"""
+    get_cache().delete_pattern(COUNT_CACHE_PREFIX)
+
+
+def _estimated_count(query: Query) -> Optional[int]:
+    """Planner row estimate for a query, or None if unavailable"""
+    dialect = query.session.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+
+    try:
+        compiled = query.statement.compile(dialect=dialect)
+        plan = query.session.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Row estimate failed, using exact count: {e}")
+        return None
+
+
+def paginate_keyset(
+    query: Query,
+    order_by: Sequence[Any],
+    cursor: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20,
+    max_page_size: int = 100,
+    count: str = "exact"
+) -> tuple:
+    """
+    Paginate a SQLAlchemy query by seeking past a cursor
+
+    order_by must end in a unique column (e.g. the primary key) so that
+    every row has a distinct position, and its columns should be indexed
+    together. Nullable columns sort NULL above every value. The query
+    must not already be ordered.
+
+    Without a cursor, page is fetched with OFFSET so existing page links
+    keep working. next_cursor is set exactly when another page follows,
+    so callers can take has_next from it.
+
+    Args:
+        query: Filtered query to paginate
+        order_by: Sort expressions, e.g. [desc(Job.posted_at), desc(Job.id)]
+        cursor: next_cursor from the previous page (takes precedence over page)
+        page: Page number, used when there is no cursor
+        page_size: Items per page
+        max_page_size: Upper bound on page_size
+        count: Count mode passed to count_query, or None to skip counting
+            (total_count is then None)
+
+    Returns:
+        tuple: (items, total_count, pagination_params, next_cursor), with
+            next_cursor None on the last page
+
+    Raises:
+        ValueError: If the cursor is invalid for this ordering
+    """
+    keys = _sort_keys(order_by)
+    sort_names = [f"{column.key}:{'desc' if descending else 'asc'}" for column, descending in keys]
+
+    total_count = count_query(query, count) if count else None
+
+    if cursor:
+        values, page = decode_cursor(cursor, sort_names)
+        query = query.filter(_seek_predicate(keys, values))
+
+    params = PaginationParams(page=page, page_size=page_size, max_page_size=max_page_size)
+    query = query.order_by(*_order_clauses(keys))
+    if not cursor and params.offset:
+        query = query.offset(params.offset)
+
+    # One extra row tells whether another page follows
+    rows = query.limit(params.limit + 1).all()
+    items = rows[:params.limit]
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        next_cursor = cursor_after(items[-1], order_by, params.page)
+
+    return items, total_count, params, next_cursor
+
+
+def cursor_after(item: Any, order_by: Sequence[Any], page: int) -> str:
+    """
+    Cursor for the page following one that ends with item
+
+    Sort keys may be NULL; the cursor then seeks past NULL in the
+    NULL-above-every-value order paginate_keyset uses.
+    """
+    keys = _sort_keys(order_by)
+    values = [getattr(item, column.key) for column, _ in keys]
+    sort_names = [f"{column.key}:{'desc' if descending else 'asc'}" for column, descending in keys]
+    return encode_cursor(values, page + 1, sort_names)
+
+
 def create_pagination_metadata(
     page: int,
     page_size: int,
@@ -104,10 +374,19 @@ def create_paginated_response(
     items: List[T],
     total_count: int,
     page: int,
-    page_size: int
+    page_size: int,
+    next_cursor: Optional[str] = None,
+    has_next: Optional[bool] = None
 ) -> dict:
-    """Create a standardized paginated response"""
+    """
+    Create a standardized paginated response
+
+    next_cursor is included for keyset pagination; has_next overrides the
+    value derived from total_count, which may be estimated.
+    """
     metadata = create_pagination_metadata(page, page_size, total_count)
+    if has_next is not None:
+        metadata.has_next = has_next
 
     return {
         "status": "success",
@@ -119,6 +398,7 @@ def create_paginated_response(
             "total_items": total_count,
             "total_pages": metadata.total_pages,
             "has_next": metadata.has_next,
-            "has_previous": metadata.has_previous
+            "has_previous": metadata.has_previous,
+            "next_cursor": next_cursor
         }
     }
@@ -1,7 +1,149 @@
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Iterable, Optional
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
 
+
+def _state(location: str) -> Optional[str]:
+    """Last comma-separated part of a location, if it has more than one"""
+    parts = location.split(',')
+    return parts[-1].strip() if len(parts) > 1 else None
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals exactly as round() does; np.round can differ on values near a tie"""
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 2) for value in values[near_tie].tolist()]
+    return rounded
+
+
+class JobMatchIndex:
+    """
+    Jobs and their skill requirements as arrays, for scoring workers
+    against every job at once
+
+    Skill requirements are kept as sparse jobs x skills matrices (required
+    and preferred indicators, required importance), so a worker's skill
+    match against all jobs is a few sparse matrix-vector products.
+    """
+
+    def __init__(self, jobs: List[Dict], jobs_skills: Dict[int, List[Dict]]):
+        """
+        Args:
+            jobs: Job postings (id, title, company, location, remote_friendly,
+                salary_min, salary_max, required_experience)
+            jobs_skills: Mapping of job_id to {skill_id, required, importance}
+        """
+        rows = (
+            (job_id, skill['skill_id'], skill.get('required', True), skill.get('importance', 3))
+            for job_id, skills in jobs_skills.items()
+            for skill in skills
+        )
+        self._build(jobs, rows)
+
+    @classmethod
+    def from_rows(
+        cls,
+        jobs: List[Dict],
+        skill_rows: Iterable[Tuple[int, int, bool, int]]
+    ) -> 'JobMatchIndex':
+        """Build from (job_id, skill_id, required, importance) rows, e.g. one JobSkill query"""
+        index = cls.__new__(cls)
+        index._build(jobs, skill_rows)
+        return index
+
+    def _build(self, jobs: List[Dict], skill_rows: Iterable[Tuple[int, int, bool, int]]):
+        self.jobs = jobs
+        self.job_position = {job['id']: i for i, job in enumerate(jobs)}
+        self.skill_column: Dict[int, int] = {}
+
+        job_positions, columns, required, importance = [], [], [], []
+        for job_id, skill_id, is_required, skill_importance in skill_rows:
+            position = self.job_position.get(job_id)
+            if position is None:
+                continue
+            job_positions.append(position)
+            columns.append(self.skill_column.setdefault(skill_id, len(self.skill_column)))
+            required.append(bool(is_required))
+            importance.append(3 if skill_importance is None else skill_importance)
+
+        shape = (len(jobs), len(self.skill_column))
+        job_positions = np.asarray(job_positions, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        required = np.asarray(required, dtype=bool)
+        importance = np.asarray(importance, dtype=float)
+
+        def matrix(mask, values):
+            # Duplicate (job, skill) entries are summed, as the per-job loop counts them twice
+            return sparse.csr_matrix(
+                (values[mask], (job_positions[mask], columns[mask])), shape=shape
+            )
+
+        self.required = matrix(required, np.ones(len(required)))
+        self.preferred = matrix(~required, np.ones(len(required)))
+        self.required_importance = matrix(required, importance / 5.0)
+        self.required_total = np.asarray(self.required.sum(axis=1)).ravel()
+        self.preferred_total = np.asarray(self.preferred.sum(axis=1)).ravel()
+
+        # Location: remote flag, lowercase location code and state code per job
+        self.remote = np.array([bool(job.get('remote_friendly', False)) for job in jobs], dtype=bool)
+        locations = [(job.get('location') or '') for job in jobs]
+        self.location_codes: Dict[str, int] = {}
+        self.location = np.array(
+            [self.location_codes.setdefault(location.lower(), len(self.location_codes)) for location in locations],
+            dtype=np.int64
+        )
+        self.state_codes: Dict[str, int] = {}
+        self.state = np.array(
+            [
+                -1 if _state(location) is None
+                else self.state_codes.setdefault(_state(location), len(self.state_codes))
+                for location in locations
+            ],
+            dtype=np.int64
+        )
+
+        # Salary range (NaN when unknown) and required experience
+        self.salary_min = np.array(
+            [np.nan if job.get('salary_min') is None else job['salary_min'] for job in jobs], dtype=float
+        )
+        self.salary_max = np.array(
+            [np.nan if job.get('salary_max') is None else job['salary_max'] for job in jobs], dtype=float
+        )
+        self.required_experience = np.array(
+            [job.get('required_experience') or 0 for job in jobs], dtype=float
+        )
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def worker_matrices(self, workers_skills: List[List[Dict]]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        """
+        Skills x workers matrices of skill possession (0/1) and proficiency / 5
+
+        Skills no job asks for are dropped; a repeated skill keeps its last entry.
+        """
+        rows, columns, proficiency = [], [], []
+        for worker_position, skills in enumerate(workers_skills):
+            levels = {}
+            for skill in skills:
+                column = self.skill_column.get(skill['skill_id'])
+                if column is not None:
+                    levels[column] = skill['proficiency_level']
+            rows.extend(levels)
+            columns.extend([worker_position] * len(levels))
+            proficiency.extend(levels.values())
+
+        shape = (len(self.skill_column), len(workers_skills))
+        proficiency = np.asarray(proficiency, dtype=float)
+        has_skill = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=shape)
+        skill_level = sparse.csr_matrix((proficiency / 5.0, (rows, columns)), shape=shape)
+        return has_skill, skill_level
+
+
 class WorkerJobMatcher:
     """
     ML-based matching algorithm to connect displaced workers with opportunities
@@ -256,28 +398,185 @@ class WorkerJobMatcher:
         Returns:
             Ranked list of job matches
         """
-        matches = []
-
-        for job in jobs:
-            job_id = job['id']
-            match_result = self.match_worker_to_job(
-                worker,
-                job,
-                worker_skills,
-                jobs_skills.get(job_id, [])
-            )
+        index = JobMatchIndex(jobs, jobs_skills)
+        return self.rank_jobs_for_workers([worker], [worker_skills], index, top_n)[0]
+
+    def rank_jobs_for_workers(
+        self,
+        workers: List[Dict],
+        workers_skills: List[List[Dict]],
+        index: JobMatchIndex,
+        top_n: int = 10,
+        batch_size: int = 256
+    ) -> List[List[Dict]]:
+        """
+        Rank every job in the index for each worker
 
-            matches.append({
-                'job_id': job_id,
-                'job_title': job['title'],
-                'company': job['company'],
-                'match_score': match_result['match_score'],
-                'match_level': match_result['match_level'],
-                'recommendation': match_result['recommendation'],
-                'details': match_result
-            })
+        Scores match match_worker_to_job; ties keep job order.
 
-        # Sort by match score
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
+        Args:
+            workers: Worker data (location, expected_salary, years_experience)
+            workers_skills: Skills of each worker, aligned with workers
+            index: Jobs to rank
+            top_n: Number of top matches per worker
+            batch_size: Workers scored per matrix product
+
+        Returns:
+            Ranked list of job matches per worker
+        """
+        rankings = []
+        for start in range(0, len(workers), batch_size):
+            batch = workers[start:start + batch_size]
+            scores = self._score_jobs(batch, workers_skills[start:start + batch_size], index)
+
+            for column in range(len(batch)):
+                top = self._top_positions(scores['match_score'][:, column], top_n)
+                rankings.append([
+                    self._ranked_match(index.jobs[position], scores, position, column)
+                    for position in top
+                ])
+
+        return rankings
+
+    def _score_jobs(
+        self,
+        workers: List[Dict],
+        workers_skills: List[List[Dict]],
+        index: JobMatchIndex
+    ) -> Dict[str, np.ndarray]:
+        """Score every (job, worker) pair; each entry is a jobs x workers array"""
+        n_jobs, n_workers = len(index), len(workers)
+        has_skill, skill_level = index.worker_matrices(workers_skills)
+
+        # Skill match
+        required_matched = (index.required @ has_skill).toarray()
+        preferred_matched = (index.preferred @ has_skill).toarray()
+        quality_sum = (index.required_importance @ skill_level).toarray()
+
+        required_total = index.required_total[:, None]
+        preferred_total = index.preferred_total[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            required_score = np.where(required_total > 0, required_matched / required_total * 100, 100.0)
+            preferred_score = np.where(preferred_total > 0, preferred_matched / preferred_total * 100, 0.0)
+            quality_score = np.where(required_matched > 0, quality_sum / required_matched * 100, 0.0)
+
+        skill_score = _round2(required_score * 0.6 + quality_score * 0.3 + preferred_score * 0.1)
+
+        # Location
+        worker_locations = [(worker.get('location') or '') for worker in workers]
+        worker_location = np.array(
+            [index.location_codes.get(location.lower(), -2) for location in worker_locations]
+        )
+        worker_state = np.array([
+            -2 if _state(location) is None else index.state_codes.get(_state(location), -2)
+            for location in worker_locations
+        ])
+        same_location = index.location[:, None] == worker_location[None, :]
+        same_state = index.state[:, None] == worker_state[None, :]
+        location_score = np.where(
+            index.remote[:, None] | same_location, 100.0, np.where(same_state, 60.0, 30.0)
+        )
+
+        # Salary
+        expected = np.array(
+            [np.nan if worker.get('expected_salary') is None else worker['expected_salary'] for worker in workers],
+            dtype=float
+        )[None, :]
+        salary_min, salary_max = index.salary_min[:, None], index.salary_max[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overage = (expected - salary_max) / salary_max
+        salary_score = np.select(
+            [
+                np.isnan(salary_min) | np.isnan(salary_max),
+                np.isnan(expected),
+                (expected <= salary_max) | (expected < salary_min),
+                overage < 0.1,
+                overage < 0.2,
+            ],
+            [50.0, 75.0, 100.0, 80.0, 60.0],
+            default=30.0
+        )
+        salary_score = np.broadcast_to(salary_score, (n_jobs, n_workers))
+
+        # Experience
+        years = np.array([worker.get('years_experience') or 0 for worker in workers], dtype=float)[None, :]
+        required_years = index.required_experience[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gap_percent = (required_years - years) / required_years
+        experience_score = np.select(
+            [
+                required_years == 0,
+                years - required_years > 10,
+                years >= required_years,
+                gap_percent < 0.2,
+                gap_percent < 0.4,
+            ],
+            [100.0, 90.0, 100.0, 80.0, 60.0],
+            default=40.0
+        )
+
+        overall_score = (
+            skill_score * 0.50 +
+            location_score * 0.20 +
+            salary_score * 0.15 +
+            experience_score * 0.15
+        )
 
-        return matches[:top_n]
+        return {
+            'match_score': _round2(overall_score),
+            'overall_score': overall_score,
+            'skill_score': skill_score,
+            'required_score': required_score,
+            'preferred_score': preferred_score,
+            'quality_score': quality_score,
+            'missing_required': required_total - required_matched,
+            'location_score': location_score,
+            'salary_score': salary_score,
+            'experience_score': experience_score,
+        }
+
+    @staticmethod
+    def _top_positions(scores: np.ndarray, top_n: int) -> np.ndarray:
+        """Positions of the top_n scores, best first, earlier positions winning ties"""
+        if top_n <= 0 or len(scores) == 0:
+            return np.array([], dtype=np.int64)
+
+        if top_n < len(scores):
+            threshold = scores[np.argpartition(-scores, top_n - 1)[:top_n]].min()
+            candidates = np.nonzero(scores >= threshold)[0]
+        else:
+            candidates = np.arange(len(scores))
+
+        return candidates[np.lexsort((candidates, -scores[candidates]))][:top_n]
+
+    def _ranked_match(self, job: Dict, scores: Dict[str, np.ndarray], position: int, column: int) -> Dict:
+        """Match entry for one ranked job, shaped like match_worker_to_job's output"""
+        skill_match = {
+            'overall_match': float(scores['skill_score'][position, column]),
+            'required_skills_match': round(float(scores['required_score'][position, column]), 2),
+            'preferred_skills_match': round(float(scores['preferred_score'][position, column]), 2),
+            'skill_quality_score': round(float(scores['quality_score'][position, column]), 2),
+            'missing_required_skills': int(scores['missing_required'][position, column])
+        }
+        # Levels and recommendations use the unrounded score, as match_worker_to_job does
+        overall_score = float(scores['overall_score'][position, column])
+
+        match_result = {
+            'match_score': float(scores['match_score'][position, column]),
+            'match_level': self._categorize_match(overall_score),
+            'skill_analysis': skill_match,
+            'location_score': float(scores['location_score'][position, column]),
+            'salary_score': float(scores['salary_score'][position, column]),
+            'experience_score': float(scores['experience_score'][position, column]),
+            'recommendation': self._generate_recommendation(overall_score, skill_match)
+        }
+
+        return {
+            'job_id': job['id'],
+            'job_title': job['title'],
+            'company': job['company'],
+            'match_score': match_result['match_score'],
+            'match_level': match_result['match_level'],
+            'recommendation': match_result['recommendation'],
+            'details': match_result
+        }
@@ -3,9 +3,9 @@ Skill Graph Generator - Converts experience into intelligent skill network
 Part of AI Reskilling Autopilot
 """
 import numpy as np
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Optional, Sequence
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
 import networkx as nx
 
 @dataclass
@@ -28,6 +28,112 @@ class SkillEdge:
     relationship_type: str  # 'prerequisite', 'complementary', 'alternative'
     strength: float  # 0-1
 
+class TransitionPathIndex:
+    """
+    Successor lists of a skill graph with cached multi-source shortest paths
+
+    The index is kept in step with the graph through add_skill and
+    add_transition (or rebuilt with load_graph). Every change bumps
+    version, and cached results are keyed by it. A query runs one
+    breadth-first search from all owned skills at once. It stops as soon
+    as every target is reached.
+    """
+
+    def __init__(self, max_cached_results: int = 512):
+        self.version = 0
+        self.max_cached_results = max_cached_results
+        self._successors: Dict[int, List[int]] = {}
+        self._results: OrderedDict = OrderedDict()
+
+    def clear(self):
+        """Remove all skills and transitions"""
+        self._successors.clear()
+        self.version += 1
+
+    def add_skill(self, skill_id: int):
+        if skill_id not in self._successors:
+            self._successors[skill_id] = []
+            self.version += 1
+
+    def add_transition(self, from_skill: int, to_skill: int):
+        """Add a directed transition, adding either skill if missing"""
+        self.add_skill(from_skill)
+        self.add_skill(to_skill)
+        successors = self._successors[from_skill]
+        if to_skill not in successors:
+            successors.append(to_skill)
+            self.version += 1
+
+    def remove_transition(self, from_skill: int, to_skill: int):
+        successors = self._successors.get(from_skill, [])
+        if to_skill in successors:
+            successors.remove(to_skill)
+            self.version += 1
+
+    def load_graph(self, graph: nx.DiGraph):
+        """Replace the index contents with the nodes and edges of graph"""
+        self._successors = {node: list(graph.successors(node)) for node in graph.nodes}
+        self.version += 1
+
+    def __contains__(self, skill_id: int) -> bool:
+        return skill_id in self._successors
+
+    def shortest_paths(
+        self,
+        sources: Sequence[int],
+        targets: Sequence[int]
+    ) -> Dict[int, Tuple[int, ...]]:
+        """
+        Fewest-step path to each reachable target from the nearest source
+
+        Ties go to the source listed first. Sources and targets missing
+        from the graph are ignored.
+
+        Returns:
+            Mapping of target skill_id to its path (source first)
+        """
+        key = (self.version, tuple(sources), tuple(targets))
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            return cached
+
+        paths = self._search(sources, targets)
+
+        self._results[key] = paths
+        if len(self._results) > self.max_cached_results:
+            self._results.popitem(last=False)
+        return paths
+
+    def _search(self, sources: Sequence[int], targets: Sequence[int]) -> Dict[int, Tuple[int, ...]]:
+        """Multi-source BFS, stopping once every target has been reached"""
+        parent: Dict[int, Optional[int]] = {}
+        queue = deque()
+        for source in sources:
+            if source in self._successors and source not in parent:
+                parent[source] = None
+                queue.append(source)
+
+        remaining = {target for target in targets if target in self._successors} - set(parent)
+        while queue and remaining:
+            node = queue.popleft()
+            for successor in self._successors[node]:
+                if successor not in parent:
+                    parent[successor] = node
+                    remaining.discard(successor)
+                    queue.append(successor)
+
+        paths = {}
+        for target in targets:
+            if target not in parent:
+                continue
+            path = [target]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            paths[target] = tuple(reversed(path))
+        return paths
+
+
 class SkillGraphGenerator:
     """
     Converts worker's experience into intelligent skill graph
@@ -36,6 +142,7 @@ class SkillGraphGenerator:
 
     def __init__(self):
         self.graph = nx.DiGraph()
+        self.transition_index = TransitionPathIndex()
         self.skill_taxonomy = self._load_skill_taxonomy()
 
     def _load_skill_taxonomy(self) -> Dict:
@@ -82,6 +189,7 @@ class SkillGraphGenerator:
         """
         # Clear existing graph
         self.graph.clear()
+        self.transition_index.clear()
 
         # Add skill nodes
         skill_nodes = []
@@ -98,16 +206,12 @@ class SkillGraphGenerator:
                     'obsolescence_risk': node.obsolescence_risk
                 }
             )
+            self.transition_index.add_skill(node.skill_id)
 
         # Add edges (relationships)
         edges = self._identify_skill_relationships(skill_nodes)
         for edge in edges:
-            self.graph.add_edge(
-                edge.from_skill,
-                edge.to_skill,
-                relationship=edge.relationship_type,
-                strength=edge.strength
-            )
+            self.add_skill_edge(edge)
 
         # Analyze graph structure
         analysis = self._analyze_graph_structure()
@@ -127,6 +231,16 @@ class SkillGraphGenerator:
             'career_profile': self._generate_career_profile(skill_nodes, job_history)
         }
 
+    def add_skill_edge(self, edge: SkillEdge):
+        """Add a relationship to the graph and the transition index"""
+        self.graph.add_edge(
+            edge.from_skill,
+            edge.to_skill,
+            relationship=edge.relationship_type,
+            strength=edge.strength
+        )
+        self.transition_index.add_transition(edge.from_skill, edge.to_skill)
+
     def _create_skill_node(
         self,
         skill: Dict,
@@ -462,29 +576,29 @@ class SkillGraphGenerator:
         """
         Find optimal paths from current skills to target role
 
+        Each target gets the fewest-step path from whichever current skill
+        is nearest. Results are cached per (skills, role) until the graph
+        changes. If self.graph is edited directly rather than through
+        add_skill_edge, call transition_index.load_graph(self.graph) first.
+
         Returns:
             List of learning paths with required skills
         """
-        paths = []
+        owned = set(current_skills)
+        targets = [target for target in target_role_skills if target not in owned]
+        shortest = self.transition_index.shortest_paths(current_skills, targets)
 
-        for target in target_role_skills:
-            if target in current_skills:
-                continue  # Already have this skill
-
-            # Find shortest path
-            try:
-                for current in current_skills:
-                    if nx.has_path(self.graph, current, target):
-                        path = nx.shortest_path(self.graph, current, target)
-                        paths.append({
-                            'target_skill_id': target,
-                            'from_skill_id': current,
-                            'path': path,
-                            'steps': len(path) - 1,
-                            'estimated_weeks': (len(path) - 1) * 8  # 8 weeks per skill
-                        })
-                        break
-            except nx.NodeNotFound:
+        paths = []
+        for target in targets:
+            path = shortest.get(target)
+            if path is None:
                 continue
+            paths.append({
+                'target_skill_id': target,
+                'from_skill_id': path[0],
+                'path': list(path),
+                'steps': len(path) - 1,
+                'estimated_weeks': (len(path) - 1) * 8  # 8 weeks per skill
+            })
 
         return sorted(paths, key=lambda x: x['steps'])
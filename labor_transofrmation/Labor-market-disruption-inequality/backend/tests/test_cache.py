@@ -0,0 +1,266 @@
+"""
+Tests for the bounded in-memory cache.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.cache import CacheStore, _estimate_size
+
+
+def entry_size(key, value) -> int:
+    return _estimate_size(key) + _estimate_size(value)
+
+
+def single_shard(budget: int, policy: str = "lru") -> CacheStore:
+    """One shard, so the whole budget applies and eviction order is deterministic"""
+    return CacheStore(
+        memory_budgets={"jobs": budget}, eviction_policy=policy, num_shards=1, sweep_interval_seconds=None
+    )
+
+
+def values(count: int):
+    # Equal-sized keys and values, so each entry costs the same
+    return [(f"job:{i:03d}", "x" * 100) for i in range(count)]
+
+
+def test_category_stays_within_its_byte_budget():
+    """Entries past the budget evict older ones of the same category only"""
+    size = entry_size("job:000", "x" * 100)
+    cache = single_shard(budget=5 * size)
+    cache.set("other", "y" * 100)
+
+    for key, value in values(12):
+        cache.set(key, value, category="jobs")
+        assert cache.get_stats()["categories"]["jobs"]["bytes"] <= 5 * size
+
+    stats = cache.get_stats()
+    assert stats["categories"]["jobs"]["count"] == 5
+    assert stats["categories"]["jobs"]["evictions"] == 7
+    assert stats["evictions"] == 7
+    assert [cache.get(key) is not None for key, _ in values(12)] == [False] * 7 + [True] * 5
+    # The default category has its own budget
+    assert cache.get("other") == "y" * 100
+
+    # Overwriting a key replaces its bytes rather than adding to them
+    cache.set("job:011", "z" * 100, category="jobs")
+    assert cache.get_stats()["categories"]["jobs"]["bytes"] == 5 * size
+
+
+def test_lru_evicts_the_least_recently_read():
+    size = entry_size("job:000", "x" * 100)
+    cache = single_shard(budget=3 * size)
+    for key, value in values(3):
+        cache.set(key, value, category="jobs")
+
+    cache.get("job:000")
+    cache.set("job:003", "x" * 100, category="jobs")
+
+    assert cache.get("job:001") is None
+    assert all(cache.get(key) is not None for key in ["job:000", "job:002", "job:003"])
+
+
+def test_lfu_evicts_the_least_read_and_the_oldest_among_ties():
+    size = entry_size("job:000", "x" * 100)
+    cache = single_shard(budget=3 * size, policy="lfu")
+    for key, value in values(3):
+        cache.set(key, value, category="jobs")
+
+    for _ in range(3):
+        cache.get("job:000")
+    cache.get("job:002")
+
+    # job:001 has no hits
+    cache.set("job:003", "x" * 100, category="jobs")
+    assert cache.get("job:001") is None
+
+    # One hit each for job:002 and job:003; job:002 reached it first
+    cache.get("job:003")
+    cache.set("job:004", "x" * 100, category="jobs")
+    assert cache.get("job:002") is None
+    assert all(cache.get(key) is not None for key in ["job:000", "job:003", "job:004"])
+
+    # A new entry has no hits, so it goes before anything that was read
+    cache.set("job:005", "x" * 100, category="jobs")
+    assert cache.get("job:004") is None
+
+    with pytest.raises(ValueError):
+        CacheStore(eviction_policy="fifo")
+
+
+def test_entries_larger_than_a_shard_share_are_rejected():
+    """The largest cacheable entry is the budget divided by the shard count"""
+    cache = CacheStore(memory_budgets={"jobs": 4000}, num_shards=4, sweep_interval_seconds=None)
+    assert cache._shard_budget("jobs") == 1000
+
+    fits = "x" * (1000 - entry_size("small", "") - 10)
+    too_big = "x" * 1000
+    assert entry_size("small", fits) <= 1000 < entry_size("big", too_big)
+
+    cache.set("small", fits, category="jobs")
+    cache.set("big", too_big, category="jobs")
+    assert cache.get("small") == fits
+    assert cache.get("big") is None
+
+    # A rejected value also drops the key's previous value and its index entry
+    cache.set("small", too_big, category="jobs")
+    assert cache.get("small") is None
+    assert cache.delete_pattern("small") == 0
+    assert cache.get_stats()["rejected"] == 2
+
+    # One shard can hold the whole budget
+    cache = CacheStore(memory_budgets={"jobs": 4000}, num_shards=1, sweep_interval_seconds=None)
+    cache.set("big", too_big, category="jobs")
+    assert cache.get("big") == too_big
+
+
+def test_delete_pattern_matches_plain_prefixes():
+    """Prefixes may end inside a namespace, at its ':' or past it"""
+    cache = CacheStore(sweep_interval_seconds=None)
+    keys = ["user:1", "user:12", "user:2", "users:1", "use", "user", "job:1", "job:user:1", "nocolon"]
+    for key in keys:
+        cache.set(key, key)
+
+    def deleted(prefix):
+        removed = cache.delete_pattern(prefix)
+        gone = sorted(key for key in keys if cache.get(key) is None)
+        assert removed == len(gone)
+        for key in gone:
+            cache.set(key, key)
+        return gone
+
+    assert deleted("user:1") == ["user:1", "user:12"]
+    assert deleted("user:") == ["user:1", "user:12", "user:2"]
+    assert deleted("user") == ["user", "user:1", "user:12", "user:2", "users:1"]
+    assert deleted("us") == ["use", "user", "user:1", "user:12", "user:2", "users:1"]
+    assert deleted("job:u") == ["job:user:1"]
+    assert deleted("nocolon") == ["nocolon"]
+    assert deleted("nocolons") == []
+    assert deleted("zzz") == []
+    assert deleted("") == sorted(keys)
+
+    # Deleted, evicted and expired keys leave the index
+    cache.delete("user:2")
+    assert cache.delete_pattern("user:2") == 0
+
+
+def test_cleanup_expired_uses_the_expiry_heap():
+    """Expired entries are swept; replaced entries keep their new expiry"""
+    cache = CacheStore(sweep_interval_seconds=None)
+    cache.set("short", 1, ttl_seconds=0)
+    cache.set("replaced", 2, ttl_seconds=0)
+    cache.set("replaced", 3, ttl_seconds=60)
+    cache.set("deleted", 4, ttl_seconds=0)
+    cache.delete("deleted")
+    cache.set("long", 5, ttl_seconds=60)
+    time.sleep(0.01)
+
+    assert cache.cleanup_expired() == 1
+    assert cache.get("replaced") == 3
+    assert cache.get("long") == 5
+    assert cache.delete_pattern("short") == 0
+    stats = cache.get_stats()
+    assert stats["total_entries"] == 2
+    assert stats["expirations"] == 1
+    assert cache.cleanup_expired() == 0
+
+    # Reads also drop an expired entry
+    cache.set("read", 6, ttl_seconds=0)
+    time.sleep(0.01)
+    assert cache.get("read") is None
+    assert cache.get_stats()["expirations"] == 2
+
+
+def test_background_sweeper_removes_expired_entries():
+    cache = CacheStore(sweep_interval_seconds=0.01)
+    try:
+        cache.set("short", 1, ttl_seconds=0)
+        deadline = time.monotonic() + 5
+        while cache.get_stats()["total_entries"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get_stats()["total_entries"] == 0
+        assert cache.get_stats()["expirations"] == 1
+    finally:
+        cache.stop_sweeper()
+    assert cache._sweeper is None
+
+
+def run_concurrently(cache, loader, callers: int):
+    """Call get_or_set from several threads; returns their results or errors"""
+    results = [None] * callers
+
+    def call(position):
+        try:
+            results[position] = cache.get_or_set("report:1", loader)
+        except Exception as e:
+            results[position] = e
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_misses(cache, count: int):
+    deadline = time.monotonic() + 5
+    while cache.get_stats()["misses"] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert cache.get_stats()["misses"] == count
+
+
+def test_concurrent_misses_share_one_load():
+    """Callers that miss while a load runs wait for it instead of loading"""
+    cache = CacheStore(sweep_interval_seconds=None)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return {"rows": 3}
+
+    threads, results = run_concurrently(cache, loader, callers=8)
+    # Every caller has missed while the first load is blocked, so none can load again
+    wait_for_misses(cache, 8)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.get("report:1") is results[0]
+    stats = cache.get_stats()
+    assert stats["loads"] == 1
+    assert stats["coalesced_loads"] == 7
+
+
+def test_failed_load_reaches_every_waiter_and_is_not_cached():
+    cache = CacheStore(sweep_interval_seconds=None)
+    release = threading.Event()
+    calls = []
+
+    def failing_loader():
+        calls.append(1)
+        release.wait(5)
+        raise RuntimeError("database unavailable")
+
+    threads, results = run_concurrently(cache, failing_loader, callers=4)
+    wait_for_misses(cache, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache._inflight == {}
+
+    # The next miss loads again
+    assert cache.get_or_set("report:1", lambda: "fresh") == "fresh"
+    assert cache.get("report:1") == "fresh"
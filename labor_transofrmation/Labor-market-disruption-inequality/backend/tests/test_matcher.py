@@ -0,0 +1,167 @@
+"""
+Tests for batch job ranking against the per-job matcher.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.matcher import JobMatchIndex, WorkerJobMatcher
+
+LOCATIONS = ["Austin, TX", "Dallas, TX", "austin, tx", "Boston, MA", "Remote", "NYC"]
+
+
+def random_job(rng: random.Random, job_id: int) -> dict:
+    salary_min = rng.choice([None, 50000, 80000])
+    return {
+        "id": job_id,
+        "title": f"job {job_id}",
+        "company": "acme",
+        "location": rng.choice(LOCATIONS),
+        "remote_friendly": rng.random() < 0.2,
+        "salary_min": salary_min,
+        "salary_max": None if salary_min is None else salary_min + rng.choice([0, 20000]),
+        "required_experience": rng.choice([0, 2, 5, 10]),
+    }
+
+
+def random_workers(rng: random.Random, count: int):
+    workers, workers_skills = [], []
+    for _ in range(count):
+        workers.append({
+            "location": rng.choice(LOCATIONS),
+            "expected_salary": rng.choice([None, 60000, 95000, 120000]),
+            "years_experience": rng.choice([0, 1, 4, 9, 20]),
+        })
+        workers_skills.append([
+            {"skill_id": rng.randrange(30), "proficiency_level": rng.randint(1, 5)}
+            for _ in range(rng.randrange(8))
+        ])
+    return workers, workers_skills
+
+
+def per_job_ranking(matcher, worker, worker_skills, jobs, jobs_skills, top_n):
+    """The per-job loop rank_jobs_for_worker used before batching"""
+    matches = [
+        (job["id"], matcher.match_worker_to_job(worker, job, worker_skills, jobs_skills.get(job["id"], [])))
+        for job in jobs
+    ]
+    matches.sort(key=lambda match: match[1]["match_score"], reverse=True)
+    return matches[:top_n]
+
+
+def assert_same_ranking(ranked, expected):
+    assert [match["job_id"] for match in ranked] == [job_id for job_id, _ in expected]
+    for match, (_, details) in zip(ranked, expected):
+        assert match["details"] == details
+        assert match["match_score"] == details["match_score"]
+        assert match["match_level"] == details["match_level"]
+        assert match["recommendation"] == details["recommendation"]
+
+
+@pytest.mark.parametrize("top_n", [0, 1, 15, 500])
+def test_batch_ranking_matches_per_job_scoring(top_n):
+    """Batched ranking returns the per-job loop's jobs, order and details"""
+    rng = random.Random(top_n)
+    matcher = WorkerJobMatcher()
+    jobs = [random_job(rng, job_id) for job_id in range(400)]
+    jobs_skills = {
+        job["id"]: [
+            {"skill_id": rng.randrange(30), "required": rng.random() < 0.7, "importance": rng.randint(1, 5)}
+            for _ in range(rng.randrange(6))
+        ]
+        for job in jobs
+    }
+    workers, workers_skills = random_workers(rng, 60)
+
+    index = JobMatchIndex(jobs, jobs_skills)
+    # A small batch size so workers span several matrix products
+    rankings = matcher.rank_jobs_for_workers(workers, workers_skills, index, top_n, batch_size=7)
+
+    assert len(rankings) == len(workers)
+    for worker, worker_skills, ranked in zip(workers, workers_skills, rankings):
+        expected = per_job_ranking(matcher, worker, worker_skills, jobs, jobs_skills, top_n)
+        assert_same_ranking(ranked, expected)
+        assert_same_ranking(
+            matcher.rank_jobs_for_worker(worker, worker_skills, jobs, jobs_skills, top_n), expected
+        )
+
+
+def test_levels_use_the_unrounded_score():
+    """A score that only rounds up to a level boundary keeps the lower level"""
+    matcher = WorkerJobMatcher()
+    job = {
+        "id": 1, "title": "job", "company": "acme", "location": "Boston, MA",
+        "remote_friendly": False, "salary_min": 1, "salary_max": 1, "required_experience": 0,
+    }
+    jobs_skills = {1: [{"skill_id": 0, "required": True, "importance": 1}] + [
+        {"skill_id": skill_id, "required": False} for skill_id in range(1, 8)
+    ]}
+    worker = {"location": "Austin, TX", "expected_salary": None, "years_experience": 0}
+    worker_skills = [{"skill_id": skill_id, "proficiency_level": 1} for skill_id in range(4)]
+
+    details = matcher.match_worker_to_job(worker, job, worker_skills, jobs_skills[1])
+    assert details["match_score"] == 65.0
+    assert details["match_level"] == "fair"
+
+    [ranked] = matcher.rank_jobs_for_worker(worker, worker_skills, [job], jobs_skills, 1)
+    assert ranked["details"] == details
+    assert ranked["match_level"] == "fair"
+    assert ranked["recommendation"] == "Fair match - apply if interested"
+
+
+def test_none_fields_score_like_missing_values():
+    """None location, salary, experience and importance score as unknown, not as errors"""
+    matcher = WorkerJobMatcher()
+    job = {
+        "id": 1, "title": "job", "company": "acme", "location": None, "remote_friendly": False,
+        "salary_min": 40000, "salary_max": None, "required_experience": None,
+    }
+    jobs_skills = {1: [
+        {"skill_id": 1, "required": True, "importance": None},
+        {"skill_id": 2, "required": False},
+    ]}
+    worker = {"location": None, "expected_salary": None, "years_experience": None}
+    worker_skills = [{"skill_id": 1, "proficiency_level": 5}, {"skill_id": 2, "proficiency_level": 2}]
+
+    [ranked] = matcher.rank_jobs_for_worker(worker, worker_skills, [job], jobs_skills, 5)
+
+    # The per-job scorer with the same unknowns spelled as defaults
+    expected = matcher.match_worker_to_job(
+        {"location": "", "expected_salary": None, "years_experience": 0},
+        dict(job, location="", required_experience=0),
+        worker_skills,
+        [{"skill_id": 1, "required": True, "importance": 3}, {"skill_id": 2, "required": False}],
+    )
+    assert ranked["details"] == expected
+    assert ranked["details"]["salary_score"] == 50.0
+    assert ranked["details"]["experience_score"] == 100.0
+
+    # Workers without skills, and jobs without requirements, still rank
+    [ranked] = matcher.rank_jobs_for_worker(worker, [], [job], {}, 5)
+    assert ranked["details"]["skill_analysis"]["required_skills_match"] == 100.0
+    assert matcher.rank_jobs_for_worker(worker, worker_skills, [], {}, 5) == []
+
+
+def test_index_from_rows_skips_unknown_jobs():
+    """Rows for jobs outside the index are ignored; duplicate rows count twice"""
+    matcher = WorkerJobMatcher()
+    rng = random.Random(2)
+    jobs = [random_job(rng, job_id) for job_id in range(5)]
+    rows = [(0, 7, True, 4), (0, 7, True, 4), (3, 8, False, None), (99, 7, True, 5)]
+    jobs_skills = {
+        0: [{"skill_id": 7, "required": True, "importance": 4}] * 2,
+        3: [{"skill_id": 8, "required": False, "importance": 3}],
+    }
+    worker = {"location": "Boston, MA", "expected_salary": 70000, "years_experience": 3}
+    worker_skills = [{"skill_id": 7, "proficiency_level": 3}]
+
+    from_rows = matcher.rank_jobs_for_workers([worker], [worker_skills], JobMatchIndex.from_rows(jobs, rows), 5)
+    from_dicts = matcher.rank_jobs_for_workers([worker], [worker_skills], JobMatchIndex(jobs, jobs_skills), 5)
+    assert from_rows == from_dicts
+    assert_same_ranking(from_rows[0], per_job_ranking(matcher, worker, worker_skills, jobs, jobs_skills, 5))
@@ -0,0 +1,255 @@
+"""
+Tests for offset and keyset pagination, walked against SQLite.
+"""
+
+import random
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, asc, create_engine, desc
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.pagination import (
+    _seek_predicate,
+    _sort_keys,
+    count_query,
+    create_paginated_response,
+    cursor_after,
+    decode_cursor,
+    encode_cursor,
+    invalidate_cached_counts,
+    paginate_keyset,
+)
+
+Base = declarative_base()
+
+
+class Listing(Base):
+    __tablename__ = "listings"
+
+    id = Column(Integer, primary_key=True)
+    posted_at = Column(DateTime, nullable=True)
+    score = Column(Integer, nullable=True)
+    status = Column(String, nullable=False, default="open")
+
+
+ORDERINGS = [
+    [desc(Listing.posted_at), desc(Listing.id)],
+    [asc(Listing.posted_at), asc(Listing.id)],
+    [asc(Listing.score), desc(Listing.posted_at), asc(Listing.id)],
+    [desc(Listing.score), asc(Listing.id)],
+    [Listing.id],
+]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_listings(session, rng: random.Random, count: int):
+    start = datetime(2024, 1, 1)
+    for _ in range(count):
+        session.add(Listing(
+            # Few distinct values and many NULLs, so ties and NULLs straddle pages
+            posted_at=None if rng.random() < 0.3 else start + timedelta(days=rng.randrange(5)),
+            score=None if rng.random() < 0.3 else rng.randrange(4),
+            status=rng.choice(["open", "closed"]),
+        ))
+    session.commit()
+
+
+def expected_order(rows, order_by):
+    """Rows sorted in Python, NULL above every value"""
+    ordered = list(rows)
+    for column, descending in reversed(_sort_keys(order_by)):
+        ordered.sort(
+            key=lambda row: (getattr(row, column.key) is None, getattr(row, column.key) or 0),
+            reverse=descending,
+        )
+    return [row.id for row in ordered]
+
+
+def walk_by_cursor(query, order_by, page_size):
+    """Every page from the first by next_cursor, checking the page metadata"""
+    ids, cursor, page = [], None, 1
+    while True:
+        items, total, params, next_cursor = paginate_keyset(
+            query, order_by, cursor=cursor, page_size=page_size
+        )
+        assert params.page == page
+        assert total == query.count()
+        ids.extend(item.id for item in items)
+        if next_cursor is None:
+            return ids
+        assert len(items) == page_size
+        cursor, page = next_cursor, page + 1
+
+
+@pytest.mark.parametrize("order_index", range(len(ORDERINGS)))
+def test_cursor_walk_matches_full_ordered_query(session, order_index):
+    """Cursor pages and page-number pages cover every row once, in order, NULLs included"""
+    order_by = ORDERINGS[order_index]
+    add_listings(session, random.Random(order_index), 60)
+    query = session.query(Listing).filter(Listing.status == "open")
+    expected = expected_order(query.all(), order_by)
+
+    for page_size in [1, 3, 7, len(expected), len(expected) + 5]:
+        assert walk_by_cursor(query, order_by, page_size) == expected
+
+        # OFFSET pages (no cursor) agree with the same ordering
+        by_page = []
+        for page in range(1, len(expected) // page_size + 2):
+            items, _, _, next_cursor = paginate_keyset(query, order_by, page=page, page_size=page_size)
+            by_page.extend(item.id for item in items)
+            assert (next_cursor is not None) == (page * page_size < len(expected))
+        assert by_page == expected
+
+
+def test_last_page_ending_on_null_keys_has_no_next(session):
+    """A page that ends on a NULL sort key still knows whether more rows follow"""
+    for posted_at in [datetime(2024, 1, 2), datetime(2024, 1, 1), None, None]:
+        session.add(Listing(posted_at=posted_at))
+    session.commit()
+    query = session.query(Listing)
+    order_by = [asc(Listing.posted_at), asc(Listing.id)]
+
+    items, _, _, next_cursor = paginate_keyset(query, order_by, page_size=3)
+    assert [item.posted_at for item in items] == [datetime(2024, 1, 1), datetime(2024, 1, 2), None]
+    assert next_cursor is not None
+
+    items, _, _, next_cursor = paginate_keyset(query, order_by, cursor=next_cursor, page_size=3)
+    assert [item.id for item in items] == [4]
+    assert next_cursor is None
+
+    items, _, _, next_cursor = paginate_keyset(query, order_by, page_size=4)
+    assert len(items) == 4 and next_cursor is None
+
+
+def test_cursor_round_trip_and_rejection():
+    """Cursors carry typed sort keys, NULLs included, and only fit their ordering"""
+    values = [datetime(2024, 5, 1, 10, 30), date(2024, 5, 1), Decimal("12.50"), None, 7, "text"]
+    names = ["a:desc", "b:asc", "c:asc", "d:desc", "e:asc", "f:asc"]
+    cursor = encode_cursor(values, 3, names)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, names) == (values, 3)
+
+    with pytest.raises(ValueError, match="sort order"):
+        decode_cursor(cursor, names[:-1] + ["f:desc"])
+    for garbage in ["", "not a cursor", encode_cursor([1], 1, ["a:asc"])[:-3]]:
+        with pytest.raises(ValueError):
+            decode_cursor(garbage, ["a:asc"])
+
+    class Row:
+        posted_at = None
+        id = 5
+
+    assert decode_cursor(
+        cursor_after(Row(), [desc(Listing.posted_at), desc(Listing.id)], 1), ["posted_at:desc", "id:desc"]
+    ) == ([None, 5], 2)
+
+
+def test_a_cursor_for_another_ordering_is_rejected(session):
+    add_listings(session, random.Random(1), 10)
+    query = session.query(Listing)
+    _, _, _, next_cursor = paginate_keyset(query, ORDERINGS[0], page_size=3)
+
+    with pytest.raises(ValueError):
+        paginate_keyset(query, ORDERINGS[1], cursor=next_cursor, page_size=3)
+
+
+def compiled(predicate) -> str:
+    return str(predicate.compile(compile_kwargs={"literal_binds": True}))
+
+
+def test_seek_predicates():
+    """Row-value comparisons where NULLs cannot fall past the bound, OR chains otherwise"""
+    # Descending: NULLs sort first, so a row-value comparison is exact
+    sql = compiled(_seek_predicate(_sort_keys([desc(Listing.score), desc(Listing.id)]), [2, 4]))
+    assert sql == "(listings.score, listings.id) < (2, 4)"
+
+    # Ascending on a NOT NULL column
+    assert compiled(_seek_predicate(_sort_keys([Listing.id]), [4])) == "(listings.id) > (4)"
+
+    # Ascending on a nullable column: NULLs sort last, after the bound
+    sql = compiled(_seek_predicate(_sort_keys([asc(Listing.score), asc(Listing.id)]), [2, 4]))
+    assert sql == (
+        "listings.score > 2 OR listings.score IS NULL "
+        "OR listings.score = 2 AND listings.id > 4"
+    )
+
+    # Mixed directions
+    sql = compiled(_seek_predicate(_sort_keys([asc(Listing.id), desc(Listing.score)]), [4, 2]))
+    assert sql == "listings.id > 4 OR listings.id = 4 AND listings.score < 2"
+
+    # Past a NULL: descending moves on to values, ascending only to later ties
+    sql = compiled(_seek_predicate(_sort_keys([desc(Listing.posted_at), desc(Listing.id)]), [None, 4]))
+    assert sql == "listings.posted_at IS NOT NULL OR listings.posted_at IS NULL AND listings.id < 4"
+    sql = compiled(_seek_predicate(_sort_keys([asc(Listing.score), asc(Listing.id)]), [None, 4]))
+    assert sql == "listings.score IS NULL AND listings.id > 4"
+    assert compiled(_seek_predicate(_sort_keys([asc(Listing.score)]), [None])) == "false"
+
+
+def test_cached_counts_until_invalidated(session):
+    """Cached counts are reused until invalidate_cached_counts"""
+    invalidate_cached_counts()
+    add_listings(session, random.Random(2), 10)
+    query = session.query(Listing).filter(Listing.status == "open")
+    exact = query.count()
+
+    assert count_query(query, "cached") == exact
+    session.add(Listing(status="open"))
+    session.commit()
+    assert count_query(query, "cached") == exact
+    assert count_query(query, "exact") == exact + 1
+
+    # A differently filtered query has its own entry
+    closed = session.query(Listing).filter(Listing.status == "closed")
+    assert count_query(closed, "cached") == closed.count()
+
+    invalidate_cached_counts()
+    assert count_query(query, "cached") == exact + 1
+
+    # SQLite has no planner estimate, so "estimated" counts exactly
+    assert count_query(query, "estimated") == exact + 1
+    with pytest.raises(ValueError):
+        count_query(query, "approximate")
+
+    items, total, _, _ = paginate_keyset(session.query(Listing), [Listing.id], page_size=5, count=None)
+    assert total is None and len(items) == 5
+    invalidate_cached_counts()
+
+
+def test_paginated_response_shape():
+    response = create_paginated_response(["a", "b"], 5, page=1, page_size=2, next_cursor="abc")
+    assert response == {
+        "status": "success",
+        "items": ["a", "b"],
+        "metadata": {
+            "page": 1, "page_size": 2, "total_items": 5, "total_pages": 3,
+            "has_next": True, "has_previous": False,
+        },
+        "pagination": {
+            "page": 1, "page_size": 2, "total_items": 5, "total_pages": 3,
+            "has_next": True, "has_previous": False, "next_cursor": "abc",
+        },
+    }
+
+    # has_next overrides the value derived from a (possibly estimated) total
+    response = create_paginated_response(["e"], 4, page=3, page_size=2, has_next=False)
+    assert response["metadata"]["has_next"] is False
+    assert response["pagination"]["has_next"] is False
+    assert response["pagination"]["has_previous"] is True
+    assert response["pagination"]["next_cursor"] is None
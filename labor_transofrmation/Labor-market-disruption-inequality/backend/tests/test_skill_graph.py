@@ -0,0 +1,164 @@
+"""
+Tests for transition paths through the skill graph index.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import networkx as nx
+
+# Add backend root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.skill_graph import SkillEdge, SkillGraphGenerator, TransitionPathIndex
+
+
+def random_generator(rng: random.Random, skills: int) -> SkillGraphGenerator:
+    generator = SkillGraphGenerator()
+    for skill_id in range(skills):
+        generator.graph.add_node(skill_id)
+        generator.transition_index.add_skill(skill_id)
+    for _ in range(rng.randint(0, 3 * skills)):
+        from_skill, to_skill = rng.randrange(skills), rng.randrange(skills)
+        if from_skill != to_skill:
+            generator.add_skill_edge(SkillEdge(from_skill, to_skill, 'prerequisite', 0.9))
+    return generator
+
+
+def assert_shortest_paths(graph: nx.DiGraph, current, targets, paths):
+    """Every reachable target has one valid fewest-step path, and no other target does"""
+    reachable = {
+        target for target in targets
+        if target not in current and target in graph
+        and any(source in graph and nx.has_path(graph, source, target) for source in current)
+    }
+    assert {path['target_skill_id'] for path in paths} == reachable
+
+    for path in paths:
+        steps = path['path']
+        target = path['target_skill_id']
+        assert steps[0] == path['from_skill_id'] and steps[0] in current
+        assert steps[-1] == target
+        assert all(graph.has_edge(a, b) for a, b in zip(steps, steps[1:]))
+        assert path['steps'] == len(steps) - 1
+        assert path['estimated_weeks'] == path['steps'] * 8
+        assert path['steps'] == min(
+            nx.shortest_path_length(graph, source, target)
+            for source in current
+            if source in graph and nx.has_path(graph, source, target)
+        )
+
+    assert [path['steps'] for path in paths] == sorted(path['steps'] for path in paths)
+
+
+def test_paths_are_shortest_from_the_nearest_skill():
+    """Paths match networkx shortest paths from the nearest owned skill"""
+    rng = random.Random(1)
+    for _ in range(150):
+        skills = rng.randint(2, 60)
+        generator = random_generator(rng, skills)
+        # Ids past the graph exercise skills the index has never seen
+        current = rng.sample(range(skills + 3), rng.randint(0, 5))
+        targets = rng.sample(range(skills + 3), rng.randint(1, 8))
+
+        paths = generator.find_transition_paths(current, targets)
+        assert_shortest_paths(generator.graph, current, targets, paths)
+        assert generator.find_transition_paths(current, targets) == paths
+
+
+def test_ties_go_to_the_first_listed_skill():
+    """Equally near skills resolve to the one listed first"""
+    index = TransitionPathIndex()
+    for from_skill, to_skill in [(1, 3), (2, 3), (3, 4)]:
+        index.add_transition(from_skill, to_skill)
+
+    assert index.shortest_paths([1, 2], [4]) == {4: (1, 3, 4)}
+    assert index.shortest_paths([2, 1], [4]) == {4: (2, 3, 4)}
+    # An owned target is its own zero-step path; unknown targets are dropped
+    assert index.shortest_paths([1], [1, 9]) == {1: (1,)}
+
+
+def test_graph_changes_invalidate_cached_paths():
+    """Each kind of change is seen by the next query, not the cached result"""
+    generator = SkillGraphGenerator()
+    index = generator.transition_index
+    for skill_id in range(5):
+        generator.graph.add_node(skill_id)
+        index.add_skill(skill_id)
+    generator.add_skill_edge(SkillEdge(0, 1, 'prerequisite', 0.9))
+    generator.add_skill_edge(SkillEdge(1, 2, 'prerequisite', 0.9))
+
+    def steps():
+        return {path['target_skill_id']: path['steps'] for path in generator.find_transition_paths([0], [2, 3, 4])}
+
+    assert steps() == {2: 2}
+    cached = index.shortest_paths([0], [2, 3, 4])
+    assert index.shortest_paths([0], [2, 3, 4]) is cached
+
+    # A new edge
+    generator.add_skill_edge(SkillEdge(2, 3, 'complementary', 0.5))
+    assert steps() == {2: 2, 3: 3}
+
+    # A shortcut shortens an existing path
+    generator.add_skill_edge(SkillEdge(0, 2, 'prerequisite', 0.9))
+    assert steps() == {2: 1, 3: 2}
+
+    # Re-adding an edge changes nothing, so the cache survives
+    version = index.version
+    generator.add_skill_edge(SkillEdge(0, 2, 'prerequisite', 0.9))
+    assert index.version == version
+
+    # A removed edge
+    generator.graph.remove_edge(0, 2)
+    index.remove_transition(0, 2)
+    assert steps() == {2: 2, 3: 3}
+
+    # Direct edits to the graph, reloaded into the index
+    generator.graph.add_edge(3, 4)
+    assert steps() == {2: 2, 3: 3}
+    index.load_graph(generator.graph)
+    assert steps() == {2: 2, 3: 3, 4: 4}
+
+    # Clearing drops every skill
+    index.clear()
+    assert steps() == {}
+
+
+def test_generating_a_graph_replaces_the_index():
+    """generate_skill_graph clears paths left from the previous worker"""
+    generator = SkillGraphGenerator()
+    generator.add_skill_edge(SkillEdge(100, 101, 'prerequisite', 0.9))
+    assert generator.find_transition_paths([100], [101])
+
+    skills = [
+        {'skill_id': 1, 'skill_name': 'python', 'proficiency_level': 4},
+        {'skill_id': 2, 'skill_name': 'machine_learning', 'proficiency_level': 3},
+        {'skill_id': 3, 'skill_name': 'sql', 'proficiency_level': 2},
+    ]
+    generator.generate_skill_graph({'years': 5}, skills, [])
+
+    assert generator.find_transition_paths([100], [101]) == []
+    assert 100 not in generator.transition_index
+    # python is a prerequisite of machine_learning
+    assert [path['path'] for path in generator.find_transition_paths([1], [2])] == [[1, 2]]
+    assert_shortest_paths(generator.graph, [1], [2, 3], generator.find_transition_paths([1], [2, 3]))
+
+
+def test_cached_results_are_bounded():
+    """The result cache drops its least recently used query past its size"""
+    index = TransitionPathIndex(max_cached_results=3)
+    for skill_id in range(10):
+        index.add_transition(skill_id, skill_id + 1)
+
+    first = index.shortest_paths([0], [5])
+    second = index.shortest_paths([0], [6])
+    index.shortest_paths([0], [7])
+    assert index.shortest_paths([0], [5]) is first
+
+    # [0] -> [6] is now the least recently used
+    index.shortest_paths([0], [8])
+    assert len(index._results) == 3
+    assert index.shortest_paths([0], [5]) is first
+    recomputed = index.shortest_paths([0], [6])
+    assert recomputed is not second and recomputed == {6: (0, 1, 2, 3, 4, 5, 6)}
@@ -319,6 +319,19 @@ async def demo_deal_success():
 # COMPARABLE SELECTION ENDPOINTS
 # ================================
 
+_sample_comparable_selector: Optional[ComparableSelector] = None
+
+
+def get_sample_comparable_selector() -> ComparableSelector:
+    """Get the comparable selector over the sample database, building it on first use."""
+    global _sample_comparable_selector
+    if _sample_comparable_selector is None:
+        selector = ComparableSelector()
+        selector.build_database(generate_sample_property_database(500))
+        _sample_comparable_selector = selector
+    return _sample_comparable_selector
+
+
 @router.post("/comparables/find")
 async def find_comparable_properties(request: ComparableRequest):
     """
@@ -329,12 +342,8 @@ async def find_comparable_properties(request: ComparableRequest):
     try:
         logger.info("Finding comparable properties")
 
-        # Initialize selector
-        selector = ComparableSelector()
-
-        # Build database with sample properties
-        sample_database = generate_sample_property_database(500)
-        selector.build_database(sample_database)
+        # Sample comps database (indexed once, reused across requests)
+        selector = get_sample_comparable_selector()
 
         # Find comparables
         comparables = selector.find_comparables(
@@ -367,13 +376,11 @@ async def demo_comparable_selection():
     Demo endpoint showing comparable selection on sample data.
     """
     try:
-        # Generate sample database
-        selector = ComparableSelector()
-        sample_database = generate_sample_property_database(500)
-        selector.build_database(sample_database)
+        # Sample comps database (indexed once, reused across requests)
+        selector = get_sample_comparable_selector()
 
         # Create subject property
-        subject = sample_database[0]
+        subject = selector.property_database['raw_data'][0]
 
         # Find comparables
         comparables = selector.find_comparables(subject, n_comps=10)
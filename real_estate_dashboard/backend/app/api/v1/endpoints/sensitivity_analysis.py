@@ -65,6 +65,10 @@ class MonteCarloRequest(BaseModel):
     metric_type: str
     iterations: int = Field(10000, ge=1000, le=100000)
     distribution: str = Field("normal", description="normal, uniform, or triangular")
+    covariance: Optional[List[List[float]]] = Field(
+        None, description="Covariance matrix between variables (in variable order) for correlated draws"
+    )
+    seed: Optional[int] = Field(None, description="Random seed for reproducible simulations")
 
 
 class ScenarioAnalysisRequest(BaseModel):
@@ -210,7 +214,9 @@ async def run_monte_carlo_simulation(request: MonteCarloRequest):
             calculate_metric=calculate_metric,
             variables=variables_dict,
             iterations=request.iterations,
-            distribution=request.distribution
+            distribution=request.distribution,
+            covariance=request.covariance,
+            seed=request.seed
         )
 
         return {
@@ -5,7 +5,7 @@ Provides database caching layer for FHFA, Bank of Israel, and other integrations
 to avoid repeated API calls and improve performance.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
@@ -21,6 +21,19 @@ from app.models.official_data import (
 logger = logging.getLogger(__name__)
 
 
+def _date_range(data: List[Dict[str, Any]]) -> Optional[Tuple[datetime, datetime]]:
+    """Earliest and latest TIME_PERIOD/DATE in a batch of records"""
+    dates = []
+    for record in data:
+        date_str = record.get('TIME_PERIOD') or record.get('DATE')
+        try:
+            dates.append(datetime.strptime(date_str, "%Y-%m-%d"))
+        except (TypeError, ValueError):
+            continue
+
+    return (min(dates), max(dates)) if dates else None
+
+
 class FHFADataCache:
     """Cache manager for FHFA Housing Price Index data"""
 
@@ -45,6 +58,24 @@ class FHFADataCache:
         updated = 0
         failed = 0
 
+        # Load every stored row the batch can touch in one query
+        years = [int(record['year']) for record in data if str(record.get('year', '')).isdigit()]
+        levels = {record.get('level') for record in data}
+        existing_rows = {}
+        if years:
+            rows = db.query(HousingPriceIndex).filter(
+                and_(
+                    HousingPriceIndex.source == source,
+                    HousingPriceIndex.geography_type.in_(levels),
+                    HousingPriceIndex.year >= min(years),
+                    HousingPriceIndex.year <= max(years)
+                )
+            ).all()
+            existing_rows = {
+                (row.geography_type, row.geography_code, row.year, row.month): row
+                for row in rows
+            }
+
         for record in data:
             try:
                 # Parse date from year and period
@@ -63,16 +94,8 @@ class FHFADataCache:
 
                 date = datetime(year, month or 1, 1)
 
-                # Check if record exists
-                existing = db.query(HousingPriceIndex).filter(
-                    and_(
-                        HousingPriceIndex.source == source,
-                        HousingPriceIndex.geography_type == record.get('level'),
-                        HousingPriceIndex.geography_code == record.get('place_id'),
-                        HousingPriceIndex.year == year,
-                        HousingPriceIndex.month == month
-                    )
-                ).first()
+                key = (record.get('level'), record.get('place_id'), year, month)
+                existing = existing_rows.get(key)
 
                 # Determine seasonal adjustment
                 seasonal_adjustment = record.get('index_sa') is not None
@@ -102,6 +125,7 @@ class FHFADataCache:
                         raw_data=record
                     )
                     db.add(hpi)
+                    existing_rows[key] = hpi
                     inserted += 1
 
             except Exception as e:
@@ -209,6 +233,21 @@ class BankOfIsraelDataCache:
         updated = 0
         failed = 0
 
+        # Load the stored rates for the batch's date range in one query
+        existing_rows = {}
+        date_range = _date_range(data)
+        if date_range:
+            rows = db.query(ExchangeRate).filter(
+                and_(
+                    ExchangeRate.source == source,
+                    ExchangeRate.base_currency == base_currency,
+                    ExchangeRate.quote_currency == quote_currency,
+                    ExchangeRate.date >= date_range[0],
+                    ExchangeRate.date <= date_range[1]
+                )
+            ).all()
+            existing_rows = {row.date: row for row in rows}
+
         for record in data:
             try:
                 # Parse date
@@ -223,15 +262,7 @@ class BankOfIsraelDataCache:
                 if rate_value == 0:
                     continue
 
-                # Check if record exists
-                existing = db.query(ExchangeRate).filter(
-                    and_(
-                        ExchangeRate.source == source,
-                        ExchangeRate.base_currency == base_currency,
-                        ExchangeRate.quote_currency == quote_currency,
-                        ExchangeRate.date == date
-                    )
-                ).first()
+                existing = existing_rows.get(date)
 
                 if existing:
                     # Update existing record
@@ -255,6 +286,7 @@ class BankOfIsraelDataCache:
                         raw_data=record
                     )
                     db.add(exchange_rate)
+                    existing_rows[date] = exchange_rate
                     inserted += 1
 
             except Exception as e:
@@ -270,6 +302,94 @@ class BankOfIsraelDataCache:
 
         return {"inserted": inserted, "updated": updated, "failed": failed}
 
+    @staticmethod
+    async def save_indicator_series(
+        db: Session,
+        data: List[Dict[str, Any]],
+        indicator_code: str,
+        indicator_name: str,
+        indicator_type: str,
+        value_unit: str,
+        source: str = "boi",
+        country: str = "IL"
+    ) -> Dict[str, int]:
+        """
+        Save new observations of an economic indicator series
+
+        Existing observations (same source, country, type and date) are kept.
+
+        Args:
+            db: Database session
+            data: List of SDMX records with TIME_PERIOD/DATE and OBS_VALUE/VALUE
+            indicator_code: SDMX series code
+            indicator_name: Human-readable indicator name
+            indicator_type: Indicator type (cpi, interest_rate, ...)
+            value_unit: Unit of the values
+            source: Data source identifier
+            country: ISO country code
+
+        Returns:
+            Dict with inserted and failed counts
+        """
+        inserted = 0
+        failed = 0
+
+        # Load the stored dates for the batch's range in one query
+        existing_dates = set()
+        date_range = _date_range(data)
+        if date_range:
+            rows = db.query(EconomicIndicator.date).filter(
+                and_(
+                    EconomicIndicator.source == source,
+                    EconomicIndicator.country == country,
+                    EconomicIndicator.indicator_type == indicator_type,
+                    EconomicIndicator.date >= date_range[0],
+                    EconomicIndicator.date <= date_range[1]
+                )
+            ).all()
+            existing_dates = {row.date for row in rows}
+
+        indicators = []
+        for record in data:
+            try:
+                date_str = record.get('TIME_PERIOD') or record.get('DATE')
+                if not date_str:
+                    continue
+
+                record_date = datetime.strptime(date_str, "%Y-%m-%d")
+                if record_date in existing_dates:
+                    continue
+
+                indicators.append(EconomicIndicator(
+                    source=source,
+                    country=country,
+                    indicator_code=indicator_code,
+                    indicator_name=indicator_name,
+                    indicator_type=indicator_type,
+                    year=record_date.year,
+                    month=record_date.month,
+                    date=record_date,
+                    value=float(record.get('OBS_VALUE') or record.get('VALUE', 0)),
+                    value_unit=value_unit,
+                    raw_data=record
+                ))
+                existing_dates.add(record_date)
+
+            except Exception as e:
+                logger.error(f"Failed to process {indicator_type} record: {e}", exc_info=True)
+                failed += 1
+                continue
+
+        try:
+            db.add_all(indicators)
+            db.commit()
+            inserted = len(indicators)
+        except Exception as e:
+            logger.error(f"Failed to commit {indicator_type} data: {e}", exc_info=True)
+            db.rollback()
+
+        return {"inserted": inserted, "failed": failed}
+
     @staticmethod
     def get_exchange_rates(
         db: Session,
@@ -371,49 +371,14 @@ class BankOfIsraelIntegration(BaseIntegration):
             if result.success and result.data.get('data'):
                 # Save to cache if db available
                 if db:
-                    from app.models.official_data import EconomicIndicator
-
-                    for record in result.data['data']:
-                        try:
-                            date_str = record.get('TIME_PERIOD') or record.get('DATE')
-                            if not date_str:
-                                continue
-
-                            record_date = datetime.strptime(date_str, "%Y-%m-%d")
-                            value = float(record.get('OBS_VALUE') or record.get('VALUE', 0))
-
-                            # Check if exists
-                            existing = db.query(EconomicIndicator).filter(
-                                and_(
-                                    EconomicIndicator.source == "boi",
-                                    EconomicIndicator.country == "IL",
-                                    EconomicIndicator.indicator_type == "cpi",
-                                    EconomicIndicator.date == record_date
-                                )
-                            ).first()
-
-                            if not existing:
-                                indicator = EconomicIndicator(
-                                    source="boi",
-                                    country="IL",
-                                    indicator_code="M.IL.N.CPI.CPI.IDX",
-                                    indicator_name="Consumer Price Index",
-                                    indicator_type="cpi",
-                                    year=record_date.year,
-                                    month=record_date.month,
-                                    date=record_date,
-                                    value=value,
-                                    value_unit="index",
-                                    raw_data=record
-                                )
-                                db.add(indicator)
-                        except Exception as e:
-                            continue
-
-                    try:
-                        db.commit()
-                    except Exception as e:
-                        db.rollback()
+                    await BankOfIsraelDataCache.save_indicator_series(
+                        db,
+                        result.data['data'],
+                        indicator_code="M.IL.N.CPI.CPI.IDX",
+                        indicator_name="Consumer Price Index",
+                        indicator_type="cpi",
+                        value_unit="index"
+                    )
 
                 return self._success_response({
                     "indicator": "CPI",
@@ -510,49 +475,14 @@ class BankOfIsraelIntegration(BaseIntegration):
             if result.success and result.data.get('data'):
                 # Save to cache if db available
                 if db:
-                    from app.models.official_data import EconomicIndicator
-
-                    for record in result.data['data']:
-                        try:
-                            date_str = record.get('TIME_PERIOD') or record.get('DATE')
-                            if not date_str:
-                                continue
-
-                            record_date = datetime.strptime(date_str, "%Y-%m-%d")
-                            value = float(record.get('OBS_VALUE') or record.get('VALUE', 0))
-
-                            # Check if exists
-                            existing = db.query(EconomicIndicator).filter(
-                                and_(
-                                    EconomicIndicator.source == "boi",
-                                    EconomicIndicator.country == "IL",
-                                    EconomicIndicator.indicator_type == "interest_rate",
-                                    EconomicIndicator.date == record_date
-                                )
-                            ).first()
-
-                            if not existing:
-                                indicator = EconomicIndicator(
-                                    source="boi",
-                                    country="IL",
-                                    indicator_code="M.IL.N.BOI_IR.INT",
-                                    indicator_name="Bank of Israel Interest Rate",
-                                    indicator_type="interest_rate",
-                                    year=record_date.year,
-                                    month=record_date.month,
-                                    date=record_date,
-                                    value=value,
-                                    value_unit="percentage",
-                                    raw_data=record
-                                )
-                                db.add(indicator)
-                        except Exception as e:
-                            continue
-
-                    try:
-                        db.commit()
-                    except Exception as e:
-                        db.rollback()
+                    await BankOfIsraelDataCache.save_indicator_series(
+                        db,
+                        result.data['data'],
+                        indicator_code="M.IL.N.BOI_IR.INT",
+                        indicator_name="Bank of Israel Interest Rate",
+                        indicator_type="interest_rate",
+                        value_unit="percentage"
+                    )
 
                 return self._success_response({
                     "indicator": "Interest Rate",
@@ -9,15 +9,25 @@ Uses ML to automatically select the best comparable properties for valuations:
 """
 
 import logging
+import math
+from collections import defaultdict
 from typing import Dict, List, Optional, Any, Tuple
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.neighbors import NearestNeighbors
-from scipy.spatial.distance import cosine
+from sklearn.neighbors import KDTree
 
 logger = logging.getLogger(__name__)
 
+# Candidate similarity features, in column order
+FEATURE_ORDER = [
+    'square_feet', 'bedrooms', 'bathrooms', 'lot_size', 'age', 'condition_score',
+    'zip_code_encoded', 'property_type_encoded', 'sale_price', 'days_since_sale'
+]
+CATEGORICAL_COLUMNS = ['zip_code', 'property_type']
+CONDITION_MAP = {'poor': 1, 'fair': 2, 'average': 3, 'good': 4, 'excellent': 5}
+EARTH_RADIUS_MILES = 3958.8
+
 
 class ComparableSelector:
     """
@@ -25,94 +35,121 @@ class ComparableSelector:
 
     Uses k-nearest neighbors and custom similarity metrics to find
     the most comparable properties for valuation purposes.
+
+    Scaled features are kept in a single matrix indexed by a KD-tree.
+    Properties added after the tree was built are searched by brute force
+    until enough accumulate to justify a rebuild, and a lat/lon grid serves
+    distance filters without touching the whole database.
     """
 
-    def __init__(self):
-        """Initialize the comparable selector."""
+    def __init__(
+        self,
+        brute_force_limit: int = 4096,
+        rebuild_fraction: float = 0.1,
+        grid_cell_degrees: float = 0.1
+    ):
+        """
+        Initialize the comparable selector.
+
+        Args:
+            brute_force_limit: Candidate count at or below which filtered
+                searches skip the tree and scan the candidates directly
+            rebuild_fraction: Rebuild the tree once unindexed additions exceed
+                this fraction of the indexed properties
+            grid_cell_degrees: Lat/lon cell size of the geo grid
+        """
         self.scaler = StandardScaler()
-        self.knn_model = None
+        self.knn_index: Optional[KDTree] = None
         self.property_database = None
         self.feature_names = []
 
+        self.brute_force_limit = brute_force_limit
+        self.rebuild_fraction = rebuild_fraction
+        self.grid_cell_degrees = grid_cell_degrees
+
+        # Encoding state fitted on the database
+        self._categories: Dict[str, Dict[Any, int]] = {}
+        self._feature_medians: Optional[pd.Series] = None
+
+        # Row storage: features, scaled features and filter columns
+        self._columns: Dict[str, np.ndarray] = {}
+        self._size = 0
+        self._tree_size = 0
+        self._geo_grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
     def prepare_features(
         self,
-        properties: List[Dict[str, Any]]
+        properties: List[Dict[str, Any]],
+        fit: bool = True
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Prepare property features for comparison.
 
         Args:
             properties: List of property dictionaries
+            fit: Choose the feature set, category codes and fill values from
+                 these properties; otherwise reuse the database's
 
         Returns:
             Tuple of (numeric features DataFrame, metadata DataFrame)
         """
-        df = pd.DataFrame(properties)
+        df, features_df = self._prepare(properties, fit=fit)
 
-        # Core comparable features
-        numeric_features = []
-
-        # Size features
-        if 'square_feet' in df.columns:
-            numeric_features.append('square_feet')
-
-        if 'bedrooms' in df.columns:
-            numeric_features.append('bedrooms')
+        # Create metadata DataFrame
+        metadata_cols = [col for col in ['address', 'zip_code', 'sale_price', 'sale_date'] if col in df.columns]
+        metadata_df = df[metadata_cols] if metadata_cols else pd.DataFrame()
 
-        if 'bathrooms' in df.columns:
-            numeric_features.append('bathrooms')
+        return features_df, metadata_df
 
-        if 'lot_size' in df.columns:
-            numeric_features.append('lot_size')
+    def _prepare(
+        self,
+        properties: List[Dict[str, Any]],
+        fit: bool,
+        extend_categories: bool = False
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Build the property frame and its numeric feature frame."""
+        df = pd.DataFrame(properties)
 
         # Age and condition
         if 'year_built' in df.columns:
             df['age'] = 2025 - df['year_built']
-            numeric_features.append('age')
-
-        if 'condition_score' in df.columns:
-            numeric_features.append('condition_score')
-        elif 'condition' in df.columns:
-            condition_map = {
-                'poor': 1, 'fair': 2, 'average': 3, 'good': 4, 'excellent': 5
-            }
-            df['condition_score'] = df['condition'].map(condition_map).fillna(3)
-            numeric_features.append('condition_score')
 
-        # Location encoding (simplified - in production use lat/lon)
-        if 'zip_code' in df.columns:
-            df['zip_code_encoded'] = pd.Categorical(df['zip_code']).codes
-            numeric_features.append('zip_code_encoded')
+        if 'condition_score' not in df.columns and 'condition' in df.columns:
+            df['condition_score'] = df['condition'].map(CONDITION_MAP).fillna(3)
 
-        # Property type
-        if 'property_type' in df.columns:
-            df['property_type_encoded'] = pd.Categorical(df['property_type']).codes
-            numeric_features.append('property_type_encoded')
-
-        # Price (if available)
-        if 'sale_price' in df.columns:
-            numeric_features.append('sale_price')
+        # Location and property type encoding (simplified - distance filters use lat/lon)
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                if fit:
+                    self._categories[column] = {
+                        value: code for code, value in enumerate(pd.Categorical(df[column]).categories)
+                    }
+                df[f'{column}_encoded'] = self._encode_category(column, df[column], extend_categories)
 
         # Sale date recency (if available)
         if 'sale_date' in df.columns:
             df['sale_date'] = pd.to_datetime(df['sale_date'])
             df['days_since_sale'] = (pd.Timestamp.now() - df['sale_date']).dt.days
-            numeric_features.append('days_since_sale')
 
-        # Select available features
-        available_features = [f for f in numeric_features if f in df.columns]
-        self.feature_names = available_features
+        if fit:
+            self.feature_names = [f for f in FEATURE_ORDER if f in df.columns]
 
-        # Create metadata DataFrame
-        metadata_cols = ['address', 'zip_code', 'sale_price', 'sale_date'] if any(
-            col in df.columns for col in ['address', 'zip_code', 'sale_price', 'sale_date']
-        ) else []
-        metadata_cols = [col for col in metadata_cols if col in df.columns]
+        # Features the database has but these properties lack fall back to medians
+        features_df = df.reindex(columns=self.feature_names).astype(float)
+        if fit:
+            self._feature_medians = features_df.median()
+        features_df = features_df.fillna(self._feature_medians)
 
-        features_df = df[available_features].fillna(df[available_features].median())
-        metadata_df = df[metadata_cols] if metadata_cols else pd.DataFrame()
+        return df, features_df
 
-        return features_df, metadata_df
+    def _encode_category(self, column: str, values: pd.Series, extend: bool) -> np.ndarray:
+        """Map categorical values to the database's codes (-1 if unknown)."""
+        codes = self._categories.setdefault(column, {})
+        if extend:
+            for value in values.dropna().unique():
+                if value not in codes:
+                    codes[value] = len(codes)
+        return values.map(codes).fillna(-1).to_numpy(dtype=np.int64)
 
     def build_database(self, properties: List[Dict[str, Any]]):
         """
@@ -123,29 +160,112 @@ class ComparableSelector:
         """
         logger.info(f"Building comparable database with {len(properties)} properties")
 
-        # Prepare features
-        features_df, metadata_df = self.prepare_features(properties)
-
-        # Store database
-        self.property_database = {
-            'features': features_df,
-            'metadata': metadata_df,
-            'raw_data': properties
-        }
+        self._categories = {}
+        df, features_df = self._prepare(properties, fit=True)
 
         # Fit scaler
-        scaled_features = self.scaler.fit_transform(features_df)
+        self.scaler.fit(features_df.to_numpy())
 
-        # Build KNN model
-        self.knn_model = NearestNeighbors(
-            n_neighbors=min(20, len(properties)),
-            metric='euclidean',
-            algorithm='auto'
-        )
-        self.knn_model.fit(scaled_features)
+        self.property_database = {'raw_data': []}
+        self._columns = {}
+        self._size = 0
+        self._tree_size = 0
+        self._geo_grid = defaultdict(list)
+        self._append(properties, df, features_df)
+
+        # Build KNN index
+        self._rebuild_index()
 
         logger.info("Comparable database built successfully")
 
+    def add_properties(self, properties: List[Dict[str, Any]]):
+        """
+        Add properties to the database without refitting or rebuilding.
+
+        New rows are scaled with the existing scaler and searched by brute
+        force until they exceed rebuild_fraction of the indexed rows, at
+        which point the KD-tree is rebuilt once.
+
+        Args:
+            properties: List of property dictionaries to add
+        """
+        if self.property_database is None:
+            self.build_database(properties)
+            return
+
+        if not properties:
+            return
+
+        df, features_df = self._prepare(properties, fit=False, extend_categories=True)
+        self._append(properties, df, features_df)
+
+        if self._size - self._tree_size > self.rebuild_fraction * self._tree_size:
+            self._rebuild_index()
+
+    def _append(self, properties: List[Dict[str, Any]], df: pd.DataFrame, features_df: pd.DataFrame):
+        """Append prepared rows to the column storage and geo grid."""
+        features = features_df.to_numpy(dtype=float)
+        count = len(properties)
+
+        def column(name: str, default: float) -> np.ndarray:
+            if name not in df.columns:
+                return np.full(count, default, dtype=float)
+            return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+        if 'sale_date' in df.columns:
+            sale_days = (df['sale_date'] - pd.Timestamp(0)).dt.days.to_numpy(dtype=float)
+        else:
+            sale_days = np.full(count, np.nan)
+
+        rows = {
+            'features': features,
+            'scaled': self._scale(features),
+            'property_type': self._encode_category('property_type', df['property_type'], True)
+            if 'property_type' in df.columns else np.full(count, -1, dtype=np.int64),
+            'zip_code': self._encode_category('zip_code', df['zip_code'], True)
+            if 'zip_code' in df.columns else np.full(count, -1, dtype=np.int64),
+            'square_feet': np.nan_to_num(column('square_feet', 0.0)),
+            'sale_day': sale_days,
+            'latitude': column('latitude', np.nan),
+            'longitude': column('longitude', np.nan)
+        }
+
+        start = self._size
+        self._reserve(start + count, rows)
+        for name, values in rows.items():
+            self._columns[name][start:start + count] = values
+        self._size += count
+        self.property_database['raw_data'].extend(properties)
+
+        # Geo grid
+        lat, lon = rows['latitude'], rows['longitude']
+        located = np.nonzero(~np.isnan(lat) & ~np.isnan(lon))[0]
+        cells = np.floor(np.column_stack([lat[located], lon[located]]) / self.grid_cell_degrees).astype(np.int64)
+        for row, (cell_lat, cell_lon) in zip((located + start).tolist(), cells.tolist()):
+            self._geo_grid[(cell_lat, cell_lon)].append(row)
+
+    def _reserve(self, size: int, template: Dict[str, np.ndarray]):
+        """Grow column storage (by doubling) to hold at least size rows."""
+        capacity = len(self._columns['features']) if self._columns else 0
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity)
+        for name, values in template.items():
+            grown = np.empty((capacity,) + values.shape[1:], dtype=values.dtype)
+            if name in self._columns:
+                grown[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = grown
+
+    def _scale(self, features: np.ndarray) -> np.ndarray:
+        """Standardize raw features with the fitted scaler."""
+        return (features - self.scaler.mean_) / self.scaler.scale_
+
+    def _rebuild_index(self):
+        """Index every stored row in a fresh KD-tree."""
+        self.knn_index = KDTree(self._columns['scaled'][:self._size])
+        self._tree_size = self._size
+
     def find_comparables(
         self,
         subject_property: Dict[str, Any],
@@ -159,85 +279,236 @@ class ComparableSelector:
         Args:
             subject_property: Property to find comparables for
             n_comps: Number of comparables to return
-            filters: Optional filters (e.g., max distance, property type)
+            filters: Optional filters (property_type, same_zip_code,
+                     max_size_difference_pct, max_days_since_sale,
+                     max_distance_miles)
             weights: Optional feature weights for custom scoring
 
         Returns:
             List of comparable properties with similarity scores
         """
+        logger.info(f"Finding {n_comps} comparables for subject property")
+
+        return self.find_comparables_batch([subject_property], n_comps, filters, weights)[0]
+
+    def find_comparables_batch(
+        self,
+        subject_properties: List[Dict[str, Any]],
+        n_comps: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Find comparables for many subject properties at once.
+
+        Subjects are prepared and scaled in one pass; without filters or
+        weights the KD-tree is queried for all of them in a single call.
+
+        Args:
+            subject_properties: Properties to find comparables for
+            n_comps: Number of comparables per subject
+            filters: Optional filters applied relative to each subject
+            weights: Optional feature weights for custom scoring
+
+        Returns:
+            One list of comparables per subject, in input order
+        """
         if self.property_database is None:
             raise ValueError("No property database built. Call build_database() first.")
 
-        logger.info(f"Finding {n_comps} comparables for subject property")
+        if not subject_properties:
+            return []
 
         # Prepare subject property features
-        subject_features_df, _ = self.prepare_features([subject_property])
+        _, subject_features_df = self._prepare(subject_properties, fit=False)
+        subject_features = subject_features_df.to_numpy(dtype=float)
+        scaled_subjects = self._scale(subject_features)
 
-        # Apply filters if provided
-        filtered_indices = self._apply_filters(subject_property, filters)
+        weight_vector = None
+        if weights:
+            weight_vector = np.array([weights.get(feature, 1.0) for feature in self.feature_names])
+
+        if not filters and weight_vector is None:
+            matches = self._search_batch(scaled_subjects, n_comps)
+        else:
+            matches = []
+            for subject, scaled_subject in zip(subject_properties, scaled_subjects):
+                candidates = self._filter_candidates(subject, filters)
+                if candidates is not None and len(candidates) == 0:
+                    logger.warning("No properties match the filters")
+                matches.append(self._search(
+                    scaled_subject, n_comps, candidates, weight_vector, self._pinned_features(filters)
+                ))
+
+        return [
+            self._build_results(subject, subject_row, indices, distances)
+            for subject, subject_row, (indices, distances) in zip(subject_properties, subject_features, matches)
+        ]
+
+    def _search_batch(
+        self,
+        scaled_subjects: np.ndarray,
+        n_comps: int
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Unfiltered, unweighted nearest neighbours for many subjects."""
+        k = min(n_comps, self._tree_size)
+        tree_distances, tree_indices = self.knn_index.query(scaled_subjects, k=k)
 
-        if len(filtered_indices) == 0:
-            logger.warning("No properties match the filters")
-            return []
+        results = []
+        for row, subject in enumerate(scaled_subjects):
+            results.append(self._merge_unindexed(
+                subject, n_comps, tree_indices[row], tree_distances[row], None
+            ))
+        return results
 
-        # Get filtered database
-        filtered_features = self.property_database['features'].iloc[filtered_indices]
-        filtered_metadata = self.property_database['metadata'].iloc[filtered_indices] if not self.property_database['metadata'].empty else pd.DataFrame()
-        filtered_raw = [self.property_database['raw_data'][i] for i in filtered_indices]
+    def _search(
+        self,
+        scaled_subject: np.ndarray,
+        n_comps: int,
+        candidates: Optional[np.ndarray],
+        weight_vector: Optional[np.ndarray],
+        pinned: Optional[Dict[int, float]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest neighbours of one subject among candidate rows.
 
-        # Scale features
-        scaled_subject = self.scaler.transform(subject_features_df)
-        scaled_database = self.scaler.transform(filtered_features)
+        Weighted searches and small candidate sets are scanned directly;
+        otherwise the KD-tree is queried with a growing k until enough
+        neighbours pass the candidate filter.
 
-        # Apply custom weights if provided
-        if weights:
-            weight_vector = np.array([
-                weights.get(feature, 1.0) for feature in self.feature_names
-            ])
-            scaled_subject *= weight_vector
-            scaled_database *= weight_vector
+        Features pinned by an equality filter are identical for every
+        candidate, so the tree is queried with the pinned value (keeping
+        candidates nearest in the tree) and distances are corrected by the
+        constant offset afterwards.
 
-        # Calculate distances
-        distances = np.linalg.norm(scaled_database - scaled_subject, axis=1)
+        Returns:
+            Tuple of (row indices, distances), nearest first
+        """
+        if candidates is not None and len(candidates) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        if weight_vector is not None or (candidates is not None and len(candidates) <= self.brute_force_limit):
+            rows = np.arange(self._size) if candidates is None else candidates
+            return self._brute_force(scaled_subject, n_comps, rows, weight_vector)
+
+        mask = None
+        if candidates is not None:
+            mask = np.zeros(self._size, dtype=bool)
+            mask[candidates] = True
+
+        query = scaled_subject.copy()
+        offset = 0.0
+        for feature, value in (pinned or {}).items():
+            offset += (scaled_subject[feature] - value) ** 2
+            query[feature] = value
+
+        k = min(self._tree_size, max(n_comps, 1) * 4)
+        while True:
+            distances, indices = self.knn_index.query(query[np.newaxis, :], k=k)
+            distances, indices = np.sqrt(distances[0] ** 2 + offset), indices[0]
+            if mask is not None:
+                keep = mask[indices]
+                distances, indices = distances[keep], indices[keep]
+            if len(indices) >= n_comps or k >= self._tree_size:
+                break
+            k = min(self._tree_size, k * 4)
+
+        return self._merge_unindexed(scaled_subject, n_comps, indices[:n_comps], distances[:n_comps], mask)
+
+    def _pinned_features(self, filters: Optional[Dict[str, Any]]) -> Dict[int, float]:
+        """Scaled feature values fixed by equality filters (feature index -> value)."""
+        pinned = {}
+        if filters and 'property_type' in filters and 'property_type_encoded' in self.feature_names:
+            code = self._categories.get('property_type', {}).get(filters['property_type'])
+            if code is not None:
+                feature = self.feature_names.index('property_type_encoded')
+                pinned[feature] = (code - self.scaler.mean_[feature]) / self.scaler.scale_[feature]
+        return pinned
+
+    def _merge_unindexed(
+        self,
+        scaled_subject: np.ndarray,
+        n_comps: int,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        mask: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge tree results with rows added since the tree was built."""
+        if self._size == self._tree_size:
+            return indices, distances
+
+        rows = np.arange(self._tree_size, self._size)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        extra_indices, extra_distances = self._brute_force(scaled_subject, n_comps, rows, None)
+
+        indices = np.concatenate([indices, extra_indices])
+        distances = np.concatenate([distances, extra_distances])
+        order = np.argsort(distances, kind='stable')[:n_comps]
+        return indices[order], distances[order]
+
+    def _brute_force(
+        self,
+        scaled_subject: np.ndarray,
+        n_comps: int,
+        rows: np.ndarray,
+        weight_vector: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact nearest neighbours among the given rows."""
+        diff = self._columns['scaled'][rows] - scaled_subject
+        if weight_vector is not None:
+            diff *= weight_vector
+        distances = np.sqrt(np.einsum('ij,ij->i', diff, diff))
 
-        # Get top N comparables
         n_comps = min(n_comps, len(distances))
-        top_indices = np.argsort(distances)[:n_comps]
+        if n_comps < len(distances):
+            top = np.argpartition(distances, n_comps)[:n_comps]
+        else:
+            top = np.arange(len(distances))
+        top = top[np.argsort(distances[top], kind='stable')]
+        return rows[top], distances[top]
+
+    def _build_results(
+        self,
+        subject_property: Dict[str, Any],
+        subject_row: np.ndarray,
+        indices: np.ndarray,
+        distances: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Assemble comparable dicts with feature comparisons and adjustments."""
+        raw_data = self.property_database['raw_data']
+        subject_features = dict(zip(self.feature_names, subject_row.tolist()))
 
-        # Build results
         results = []
-        for idx in top_indices:
-            similarity_score = 1.0 / (1.0 + distances[idx])  # Convert distance to similarity
+        for idx, distance in zip(indices.tolist(), distances.tolist()):
+            comp_features = dict(zip(self.feature_names, self._columns['features'][idx].tolist()))
 
             comp = {
-                'property': filtered_raw[idx],
-                'similarity_score': float(similarity_score),
-                'distance': float(distances[idx])
+                'property': raw_data[idx],
+                'similarity_score': 1.0 / (1.0 + distance),  # Convert distance to similarity
+                'distance': distance
             }
 
             # Add detailed comparison
-            comp['feature_comparison'] = self._compare_features(
-                subject_features_df.iloc[0],
-                filtered_features.iloc[idx]
-            )
+            comp['feature_comparison'] = self._compare_features(subject_features, comp_features)
 
             # Add adjustments
             comp['suggested_adjustments'] = self._calculate_adjustments(
                 subject_property,
-                filtered_raw[idx],
-                subject_features_df.iloc[0],
-                filtered_features.iloc[idx]
+                raw_data[idx],
+                subject_features,
+                comp_features
             )
 
             results.append(comp)
 
         return results
 
-    def _apply_filters(
+    def _filter_candidates(
         self,
         subject_property: Dict[str, Any],
         filters: Optional[Dict[str, Any]]
-    ) -> List[int]:
+    ) -> Optional[np.ndarray]:
         """
         Apply filters to property database.
 
@@ -246,52 +517,89 @@ class ComparableSelector:
             filters: Filter criteria
 
         Returns:
-            List of indices that pass filters
+            Sorted row indices that pass the filters, or None if unfiltered
         """
-        if filters is None:
-            return list(range(len(self.property_database['raw_data'])))
-
-        indices = []
-        db_raw = self.property_database['raw_data']
-
-        for i, prop in enumerate(db_raw):
-            # Property type filter
-            if 'property_type' in filters:
-                if prop.get('property_type') != filters['property_type']:
-                    continue
-
-            # Location filter (simplified - in production use geo distance)
-            if 'same_zip_code' in filters and filters['same_zip_code']:
-                if prop.get('zip_code') != subject_property.get('zip_code'):
-                    continue
-
-            # Size filters
-            if 'max_size_difference_pct' in filters:
-                max_diff = filters['max_size_difference_pct']
-                subject_sqft = subject_property.get('square_feet', 0)
-                prop_sqft = prop.get('square_feet', 0)
-
-                if subject_sqft > 0:
-                    diff_pct = abs(prop_sqft - subject_sqft) / subject_sqft * 100
-                    if diff_pct > max_diff:
-                        continue
-
-            # Sale date filter
-            if 'max_days_since_sale' in filters:
-                max_days = filters['max_days_since_sale']
-                if 'sale_date' in prop:
-                    days_since = (pd.Timestamp.now() - pd.to_datetime(prop['sale_date'])).days
-                    if days_since > max_days:
-                        continue
-
-            indices.append(i)
-
-        return indices
+        if not filters:
+            return None
+
+        columns = self._columns
+        rows = None  # None means every stored row
+
+        # Location filter via the geo grid
+        if filters.get('max_distance_miles') is not None:
+            lat = subject_property.get('latitude')
+            lon = subject_property.get('longitude')
+            if lat is None or lon is None:
+                logger.warning("max_distance_miles filter ignored: subject has no latitude/longitude")
+            else:
+                rows = self._geo_candidates(float(lat), float(lon), float(filters['max_distance_miles']))
+
+        def values(name: str) -> np.ndarray:
+            return columns[name][:self._size] if rows is None else columns[name][rows]
+
+        mask = None
+
+        def restrict(condition: np.ndarray):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        # Property type filter
+        if 'property_type' in filters:
+            code = self._categories.get('property_type', {}).get(filters['property_type'], -2)
+            restrict(values('property_type') == code)
+
+        # Location filter (simplified - use max_distance_miles with lat/lon when available)
+        if filters.get('same_zip_code'):
+            code = self._categories.get('zip_code', {}).get(subject_property.get('zip_code'), -2)
+            restrict(values('zip_code') == code)
+
+        # Size filters
+        if 'max_size_difference_pct' in filters:
+            subject_sqft = subject_property.get('square_feet', 0)
+            if subject_sqft > 0:
+                diff_pct = np.abs(values('square_feet') - subject_sqft) / subject_sqft * 100
+                restrict(diff_pct <= filters['max_size_difference_pct'])
+
+        # Sale date filter (properties without a sale date pass)
+        if 'max_days_since_sale' in filters:
+            today = (pd.Timestamp.now() - pd.Timestamp(0)).days
+            sale_days = values('sale_day')
+            restrict(np.isnan(sale_days) | (today - sale_days <= filters['max_days_since_sale']))
+
+        if mask is None:
+            return rows
+        if rows is None:
+            return np.nonzero(mask)[0]
+        return rows[mask]
+
+    def _geo_candidates(self, lat: float, lon: float, max_miles: float) -> np.ndarray:
+        """Rows within max_miles of a point, gathered from the geo grid."""
+        cell = self.grid_cell_degrees
+        lat_span = max_miles / 69.0
+        cos_lat = math.cos(math.radians(lat))
+        lon_span = 180.0 if cos_lat < 1e-6 else min(180.0, max_miles / (69.17 * cos_lat))
+
+        lat_cells = range(math.floor((lat - lat_span) / cell), math.floor((lat + lat_span) / cell) + 1)
+        lon_cells = range(math.floor((lon - lon_span) / cell), math.floor((lon + lon_span) / cell) + 1)
+
+        gathered = [
+            self._geo_grid[key]
+            for key in ((a, b) for a in lat_cells for b in lon_cells)
+            if key in self._geo_grid
+        ]
+        if not gathered:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.sort(np.concatenate([np.asarray(g, dtype=np.int64) for g in gathered]))
+        distances = _haversine_miles(
+            lat, lon, self._columns['latitude'][rows], self._columns['longitude'][rows]
+        )
+        return rows[distances <= max_miles]
 
     def _compare_features(
         self,
-        subject_features: pd.Series,
-        comp_features: pd.Series
+        subject_features: Dict[str, float],
+        comp_features: Dict[str, float]
     ) -> Dict[str, Dict[str, float]]:
         """
         Compare features between subject and comparable.
@@ -325,8 +633,8 @@ class ComparableSelector:
         self,
         subject_property: Dict[str, Any],
         comp_property: Dict[str, Any],
-        subject_features: pd.Series,
-        comp_features: pd.Series
+        subject_features: Dict[str, float],
+        comp_features: Dict[str, float]
     ) -> Dict[str, float]:
         """
         Calculate suggested price adjustments.
@@ -343,17 +651,17 @@ class ComparableSelector:
         adjustments = {}
 
         # Size adjustment ($100 per sqft difference)
-        if 'square_feet' in subject_features.index:
+        if 'square_feet' in subject_features:
             sqft_diff = subject_features['square_feet'] - comp_features['square_feet']
             adjustments['size_adjustment'] = float(sqft_diff * 100)
 
         # Age adjustment (-$1000 per year older)
-        if 'age' in subject_features.index:
+        if 'age' in subject_features:
             age_diff = subject_features['age'] - comp_features['age']
             adjustments['age_adjustment'] = float(-age_diff * 1000)
 
         # Condition adjustment ($10,000 per point)
-        if 'condition_score' in subject_features.index:
+        if 'condition_score' in subject_features:
             condition_diff = subject_features['condition_score'] - comp_features['condition_score']
             adjustments['condition_adjustment'] = float(condition_diff * 10000)
 
@@ -420,6 +728,14 @@ class ComparableSelector:
         }
 
 
+def _haversine_miles(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in miles from one point to arrays of points."""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
 def generate_sample_property_database(n_properties: int = 500) -> List[Dict[str, Any]]:
     """
     Generate synthetic property database for demonstration.
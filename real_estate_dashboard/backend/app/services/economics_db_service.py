@@ -8,7 +8,8 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 
 from app.models.economics import (
@@ -22,6 +23,16 @@ from app.services.economics_data_parser import EconomicsDataParser
 
 logger = logging.getLogger(__name__)
 
+# Unique keys of the indicator snapshot and history tables
+INDICATOR_KEY = ('country_name', 'category', 'indicator_name', 'reference_period')
+HISTORY_KEY = ('country_name', 'indicator_name', 'observation_date')
+
+# Dialects with INSERT ... ON CONFLICT
+UPSERT_DIALECTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
 
 class EconomicsDBService:
     """Service for economics data database operations"""
@@ -110,13 +121,20 @@ class EconomicsDBService:
         self,
         data: List[Dict],
         country: str,
-        category: str
+        category: str,
+        bulk: bool = False
     ) -> int:
         """
         Save economic indicators to database
 
+        With bulk=True, writes through bulk_upsert_economic_indicators.
+
         Returns number of records saved
         """
+        if bulk:
+            counts = self.bulk_upsert_economic_indicators(data, country, category)
+            return counts['inserted'] + counts['updated']
+
         try:
             parsed_data = self.parser.parse_economic_indicators(data, country, category)
             saved_count = 0
@@ -173,6 +191,147 @@ class EconomicsDBService:
             self.db.rollback()
             return 0
 
+    def bulk_upsert_economic_indicators(
+        self,
+        data: List[Dict],
+        country: str,
+        category: str,
+        chunk_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Save economic indicators with set-based writes
+
+        Indicators are parsed and validated in memory, then written in chunks:
+        one INSERT ... ON CONFLICT DO UPDATE per chunk (PostgreSQL, SQLite),
+        or an executemany UPDATE plus INSERT on other databases. History
+        points for newly inserted indicators are written with executemany,
+        skipping points that already exist. Each chunk is committed on its own.
+
+        Returns:
+            Dict with inserted, updated, invalid and failed counts
+        """
+        counts = {'inserted': 0, 'updated': 0, 'invalid': 0, 'failed': 0}
+
+        # Validate, and keep the last row for each snapshot key
+        rows_by_key = {}
+        for indicator_data in self.parser.parse_economic_indicators(data, country, category):
+            if not self.parser.validate_indicator_data(indicator_data):
+                logger.warning(f"Invalid indicator data: {indicator_data}")
+                counts['invalid'] += 1
+                continue
+            indicator_data.pop('id', None)
+            rows_by_key[tuple(indicator_data.get(column) for column in INDICATOR_KEY)] = indicator_data
+
+        rows = list(rows_by_key.values())
+        upsert = UPSERT_DIALECTS.get(self.db.get_bind().dialect.name)
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                existing = self._existing_indicator_ids(chunk, country, category)
+                if upsert is not None:
+                    self._upsert_indicators(upsert, chunk)
+                else:
+                    self._insert_or_update_indicators(chunk, existing)
+
+                new_rows = [
+                    row for row in chunk
+                    if tuple(row.get(column) for column in INDICATOR_KEY) not in existing
+                ]
+                self._insert_history(upsert, new_rows, country, category)
+
+                self.db.commit()
+                counts['updated'] += len(chunk) - len(new_rows)
+                counts['inserted'] += len(new_rows)
+
+            except Exception as e:
+                logger.error(f"Error bulk saving {country}/{category} indicators: {str(e)}")
+                self.db.rollback()
+                counts['failed'] += len(chunk)
+
+        return counts
+
+    def _existing_indicator_ids(self, rows: List[Dict], country: str, category: str) -> Dict[tuple, Any]:
+        """
+        Snapshot key -> id for the rows that are already stored
+
+        Rows without a reference period never conflict (NULLs are distinct
+        in the unique constraint), so they are always new.
+        """
+        stored = self.db.query(
+            EconomicIndicator.id,
+            *(getattr(EconomicIndicator, column) for column in INDICATOR_KEY)
+        ).filter(
+            EconomicIndicator.country_name == country,
+            EconomicIndicator.category == category,
+            EconomicIndicator.indicator_name.in_({row['indicator_name'] for row in rows}),
+            EconomicIndicator.reference_period.isnot(None)
+        ).all()
+
+        return {tuple(row[1:]): row[0] for row in stored}
+
+    def _upsert_indicators(self, upsert, rows: List[Dict]):
+        """INSERT ... ON CONFLICT (snapshot key) DO UPDATE"""
+        statement = upsert(EconomicIndicator)
+        updated_columns = {
+            column: statement.excluded[column]
+            for column in rows[0]
+            if column not in INDICATOR_KEY
+        }
+        updated_columns['updated_at'] = func.now()
+
+        self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(INDICATOR_KEY),
+                set_=updated_columns
+            ),
+            rows
+        )
+
+    def _insert_or_update_indicators(self, rows: List[Dict], existing: Dict[tuple, Any]):
+        """Fallback without ON CONFLICT: executemany UPDATE by id, then INSERT"""
+        updates, inserts = [], []
+        for row in rows:
+            indicator_id = existing.get(tuple(row.get(column) for column in INDICATOR_KEY))
+            if indicator_id is None:
+                inserts.append(row)
+            else:
+                updates.append({**row, 'id': indicator_id, 'updated_at': datetime.now()})
+
+        if updates:
+            self.db.execute(update(EconomicIndicator), updates)
+        if inserts:
+            self.db.execute(insert(EconomicIndicator), inserts)
+
+    def _insert_history(self, upsert, rows: List[Dict], country: str, category: str):
+        """Insert history points for new indicators, skipping points already stored"""
+        history_by_key = {}
+        for row in rows:
+            history_data = self.parser.parse_indicator_for_history(row['raw_data'], country, category)
+            if history_data:
+                history_by_key[tuple(history_data[column] for column in HISTORY_KEY)] = history_data
+
+        if not history_by_key:
+            return
+
+        if upsert is not None:
+            statement = upsert(EconomicIndicatorHistory).on_conflict_do_nothing(
+                index_elements=list(HISTORY_KEY)
+            )
+        else:
+            stored = self.db.query(
+                *(getattr(EconomicIndicatorHistory, column) for column in HISTORY_KEY)
+            ).filter(
+                EconomicIndicatorHistory.country_name == country,
+                EconomicIndicatorHistory.indicator_name.in_({key[1] for key in history_by_key})
+            ).all()
+            for key in stored:
+                history_by_key.pop(tuple(key), None)
+            statement = insert(EconomicIndicatorHistory)
+
+        if history_by_key:
+            self.db.execute(statement, list(history_by_key.values()))
+
     def _save_indicator_history(self, history_data: Dict) -> bool:
         """Save indicator history point"""
         try:
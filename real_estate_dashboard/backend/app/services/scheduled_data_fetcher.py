@@ -3,12 +3,20 @@ Scheduled Data Fetcher Service
 
 Fetches market data from integrations on a scheduled basis.
 Runs daily to keep market intelligence data fresh and historical.
+
+Sources run concurrently, each in its own task with its own database
+session. Sources backed by the same integration share a concurrency
+limit, every source has a timeout, and the run reports how long each
+source took (and how long it waited for a slot).
 """
 
 import logging
 import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
@@ -24,6 +32,26 @@ from app.integrations.cache_utils import FHFADataCache, BankOfIsraelDataCache, D
 
 logger = logging.getLogger(__name__)
 
+# Database session of the fetch running in the current task
+_task_db: ContextVar[Optional[Session]] = ContextVar("scheduled_fetch_db", default=None)
+
+# Concurrent fetches allowed per integration
+DEFAULT_CONCURRENCY_LIMITS = {
+    "bls": 2,
+    "bank_of_israel": 3,
+    "fhfa": 1,
+}
+
+
+@dataclass
+class FetchSource:
+    """One feed in the scheduled fetch"""
+    name: str                                        # Key in the run results
+    integration: str                                 # Concurrency group
+    fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    timeout_seconds: Optional[float] = None          # Fetcher default when None
+    depends_on: Tuple[str, ...] = ()                 # Sources that must succeed first
+
 
 class ScheduledDataFetcher:
     """
@@ -32,20 +60,36 @@ class ScheduledDataFetcher:
     Designed to run daily via cron or APScheduler
     """
 
-    def __init__(self):
-        self.db: Optional[Session] = None
+    def __init__(
+        self,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        timeout_seconds: float = 300.0,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Args:
+            concurrency_limits: Max concurrent fetches per integration (default 1 for unlisted)
+            timeout_seconds: Default per-source timeout
+            session_factory: Creates the database session for each fetch
+        """
+        self.concurrency_limits = {**DEFAULT_CONCURRENCY_LIMITS, **(concurrency_limits or {})}
+        self.timeout_seconds = timeout_seconds
+        self.session_factory = session_factory
 
     def _get_db(self) -> Session:
-        """Get database session"""
-        if self.db is None:
-            self.db = SessionLocal()
-        return self.db
+        """Get the current task's database session"""
+        db = _task_db.get()
+        if db is None:
+            db = self.session_factory()
+            _task_db.set(db)
+        return db
 
     def _close_db(self):
-        """Close database session"""
-        if self.db:
-            self.db.close()
-            self.db = None
+        """Close the current task's database session"""
+        db = _task_db.get()
+        if db is not None:
+            db.close()
+            _task_db.set(None)
 
     def _log_fetch(
         self,
@@ -81,8 +125,9 @@ class ScheduledDataFetcher:
 
         except Exception as e:
             logger.error(f"Failed to log fetch operation: {e}")
-            if self.db:
-                self.db.rollback()
+            db = _task_db.get()
+            if db is not None:
+                db.rollback()
 
     async def fetch_employment_data(self, area_code: str = "0000000") -> Dict[str, Any]:
         """
@@ -387,31 +432,40 @@ class ScheduledDataFetcher:
                 total_records = 0
                 failed_currencies = []
 
-                for currency in currencies:
-                    try:
-                        # Fetch last 7 days to capture any missed updates
-                        end_date = datetime.now()
-                        start_date = end_date - timedelta(days=7)
+                # Fetch last 7 days to capture any missed updates
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=7)
 
-                        result = await boi.get_exchange_rate(
+                async def fetch_currency(currency: str):
+                    # Currencies are fetched concurrently, each caching through its own session
+                    currency_db = self.session_factory()
+                    try:
+                        return await boi.get_exchange_rate(
                             currency=currency,
                             start_date=start_date.strftime("%Y-%m-%d"),
                             end_date=end_date.strftime("%Y-%m-%d"),
-                            db=db,
+                            db=currency_db,
                             use_cache=False  # Force fresh download
                         )
+                    finally:
+                        currency_db.close()
 
-                        if result.success:
-                            count = result.data.get('count', 0)
-                            total_records += count
-                            logger.info(f"Fetched {count} {currency}/ILS exchange rates")
-                        else:
-                            failed_currencies.append(f"{currency}: {result.error}")
-                            logger.warning(f"Failed to fetch {currency} rates: {result.error}")
+                currency_results = await asyncio.gather(
+                    *(fetch_currency(currency) for currency in currencies),
+                    return_exceptions=True
+                )
 
-                    except Exception as e:
-                        failed_currencies.append(f"{currency}: {str(e)}")
-                        logger.error(f"Error fetching {currency} rates: {e}", exc_info=True)
+                for currency, result in zip(currencies, currency_results):
+                    if isinstance(result, Exception):
+                        failed_currencies.append(f"{currency}: {str(result)}")
+                        logger.error(f"Error fetching {currency} rates: {result}", exc_info=result)
+                    elif result.success:
+                        count = result.data.get('count', 0)
+                        total_records += count
+                        logger.info(f"Fetched {count} {currency}/ILS exchange rates")
+                    else:
+                        failed_currencies.append(f"{currency}: {result.error}")
+                        logger.warning(f"Failed to fetch {currency} rates: {result.error}")
 
                 # Complete update log
                 DataUpdateLogger.complete_update(
@@ -607,6 +661,117 @@ class ScheduledDataFetcher:
             duration = (datetime.utcnow() - start_time).total_seconds()
             return {"success": False, "error": str(e), "duration_seconds": duration}
 
+    def get_sources(self) -> List[FetchSource]:
+        """Feeds fetched by the scheduled run"""
+        return [
+            FetchSource("employment_national", "bls", lambda: self.fetch_employment_data("0000000")),
+            FetchSource("cpi", "bls", self.fetch_cpi_data),
+            # Daily exchange rates, monthly CPI and interest rate
+            FetchSource("bank_of_israel_exchange_rates", "bank_of_israel", self.fetch_bank_of_israel_exchange_rates),
+            FetchSource("bank_of_israel_cpi", "bank_of_israel", self.fetch_bank_of_israel_cpi),
+            FetchSource("bank_of_israel_interest_rate", "bank_of_israel", self.fetch_bank_of_israel_interest_rate),
+            # Monthly - checks cache staleness internally
+            FetchSource("fhfa_hpi", "fhfa", self.fetch_fhfa_hpi_data),
+        ]
+
+    async def run_sources(
+        self,
+        sources: List[FetchSource]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, float]]]:
+        """
+        Run fetch sources concurrently
+
+        A source starts once the sources it depends on have finished, and
+        is skipped if any of them failed. Dependencies must be listed
+        before the sources that need them.
+
+        Returns:
+            (results, timings) keyed by source name, in source order
+        """
+        semaphores = {
+            integration: asyncio.Semaphore(self.concurrency_limits.get(integration, 1))
+            for integration in {source.integration for source in sources}
+        }
+
+        seen = set()
+        for source in sources:
+            missing = [name for name in source.depends_on if name not in seen]
+            if missing:
+                raise ValueError(f"Source {source.name} depends on unknown or later sources: {missing}")
+            seen.add(source.name)
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for source in sources:
+            dependencies = {name: tasks[name] for name in source.depends_on}
+            tasks[source.name] = asyncio.create_task(
+                self._run_source(source, semaphores[source.integration], dependencies)
+            )
+
+        outcomes = await asyncio.gather(*tasks.values())
+        results = {name: result for name, (result, _) in zip(tasks, outcomes)}
+        timings = {name: timing for name, (_, timing) in zip(tasks, outcomes)}
+        return results, timings
+
+    async def _run_source(
+        self,
+        source: FetchSource,
+        semaphore: asyncio.Semaphore,
+        dependencies: Dict[str, asyncio.Task]
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Run one source in its own session, under its integration's limit and timeout"""
+
+        # Never inherit a session from the task that scheduled this one
+        _task_db.set(None)
+
+        if dependencies:
+            outcomes = await asyncio.gather(*dependencies.values())
+            failed = [
+                name for name, (result, _) in zip(dependencies, outcomes)
+                if not result.get("success", False)
+            ]
+            if failed:
+                return (
+                    {"success": False, "error": f"Skipped: dependencies failed: {', '.join(failed)}"},
+                    {"seconds": 0.0, "queued_seconds": 0.0}
+                )
+
+        timeout = source.timeout_seconds or self.timeout_seconds
+        queued_at = time.perf_counter()
+
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._fetch_in_session(source), timeout)
+            except asyncio.TimeoutError:
+                error_msg = f"Timed out after {timeout:.0f}s"
+                logger.warning(f"{source.name}: {error_msg}")
+                self._log_fetch(
+                    source.integration,
+                    source.name,
+                    "failed",
+                    error_message=error_msg,
+                    duration_seconds=timeout
+                )
+                result = {"success": False, "error": error_msg}
+            except Exception as e:
+                logger.error(f"Error running {source.name}: {e}", exc_info=True)
+                result = {"success": False, "error": str(e)}
+            finally:
+                self._close_db()
+            finished_at = time.perf_counter()
+
+        return result, {
+            "seconds": round(finished_at - started_at, 3),
+            "queued_seconds": round(started_at - queued_at, 3)
+        }
+
+    async def _fetch_in_session(self, source: FetchSource) -> Dict[str, Any]:
+        """Run a source's fetch, closing the session it opened (wait_for may run it in a new task)"""
+        try:
+            return await source.fetch()
+        finally:
+            self._close_db()
+
     async def fetch_all_data(self) -> Dict[str, Any]:
         """
         Fetch all market data from available sources
@@ -621,29 +786,7 @@ class ScheduledDataFetcher:
         results = {}
 
         try:
-            # Fetch employment data (national)
-            employment_result = await self.fetch_employment_data("0000000")
-            results["employment_national"] = employment_result
-
-            # Fetch CPI data
-            cpi_result = await self.fetch_cpi_data()
-            results["cpi"] = cpi_result
-
-            # Fetch Bank of Israel exchange rates (daily)
-            boi_result = await self.fetch_bank_of_israel_exchange_rates()
-            results["bank_of_israel_exchange_rates"] = boi_result
-
-            # Fetch Bank of Israel CPI (monthly)
-            boi_cpi_result = await self.fetch_bank_of_israel_cpi()
-            results["bank_of_israel_cpi"] = boi_cpi_result
-
-            # Fetch Bank of Israel interest rate (monthly)
-            boi_ir_result = await self.fetch_bank_of_israel_interest_rate()
-            results["bank_of_israel_interest_rate"] = boi_ir_result
-
-            # Fetch FHFA HPI data (monthly - checks cache staleness internally)
-            fhfa_result = await self.fetch_fhfa_hpi_data()
-            results["fhfa_hpi"] = fhfa_result
+            results, timings = await self.run_sources(self.get_sources())
 
             # Calculate summary
             total_records = sum(r.get("records_saved", 0) for r in results.values())
@@ -656,6 +799,8 @@ class ScheduledDataFetcher:
             logger.info(f"Scheduled data fetch completed in {overall_duration:.2f}s")
             logger.info(f"Successful fetches: {successful_fetches}/{total_fetches}")
             logger.info(f"Total records saved: {total_records}")
+            for name, timing in sorted(timings.items(), key=lambda item: -item[1]["seconds"]):
+                logger.info(f"  {name}: {timing['seconds']:.2f}s (queued {timing['queued_seconds']:.2f}s)")
             logger.info("=" * 80)
 
             return {
@@ -664,6 +809,7 @@ class ScheduledDataFetcher:
                 "successful_fetches": successful_fetches,
                 "total_fetches": total_fetches,
                 "duration_seconds": overall_duration,
+                "timings": timings,
                 "results": results
             }
 
@@ -13,10 +13,12 @@ All calculations use FREE data sources - no API keys required.
 
 import logging
 from typing import Dict, List, Any, Callable, Optional, Tuple
-import random
 import statistics
 import math
 
+import numpy as np
+from scipy.special import ndtr
+
 logger = logging.getLogger(__name__)
 
 
@@ -179,95 +181,84 @@ class SensitivityAnalysisService:
         calculate_metric: Callable[[Dict[str, float]], float],
         variables: List[Dict[str, Any]],
         iterations: int = 10000,
-        distribution: str = "normal"  # normal, uniform, triangular
+        distribution: str = "normal",  # normal, uniform, triangular
+        covariance: Optional[List[List[float]]] = None,
+        seed: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run Monte Carlo simulation
 
+        All draws are sampled as NumPy arrays. Metrics with a vectorized
+        implementation (see VECTORIZED_METRICS) are evaluated for every draw
+        at once; other metric functions are called once per draw.
+
         Args:
             base_inputs: Base case input values
             calculate_metric: Function that calculates the output metric
             variables: List of variables with statistical distributions
             iterations: Number of simulation runs
             distribution: Type of distribution (normal, uniform, triangular)
+            covariance: Optional covariance matrix between variables (in the
+                order of `variables`) to simulate correlated inputs; uniform
+                and triangular draws use only its implied correlation
+            seed: Optional random seed for reproducible runs
 
         Returns:
             Dict with simulation results and statistics
         """
-        results = []
-
         # Limit iterations for performance
         iterations = min(iterations, 100000)
 
-        for _ in range(iterations):
-            simulated_inputs = base_inputs.copy()
-
-            for var in variables:
-                var_name = var["name"]
-
-                if distribution == "normal":
-                    # Normal distribution: mean = base_value, std_dev based on range
-                    mean = var.get("base_value", base_inputs.get(var_name, 0))
-                    # Assume min/max are ~2 std deviations from mean
-                    std_dev = (var["max"] - var["min"]) / 4
-                    value = random.gauss(mean, std_dev)
-                    # Clip to min/max
-                    value = max(var["min"], min(var["max"], value))
-
-                elif distribution == "uniform":
-                    # Uniform distribution between min and max
-                    value = random.uniform(var["min"], var["max"])
-
-                elif distribution == "triangular":
-                    # Triangular distribution (min, mode, max)
-                    mode = var.get("base_value", base_inputs.get(var_name, 0))
-                    value = random.triangular(var["min"], var["max"], mode)
-
-                simulated_inputs[var_name] = value
-
-            metric = calculate_metric(simulated_inputs)
-            results.append(metric)
+        rng = np.random.default_rng(seed)
+        samples = _sample_variables(base_inputs, variables, iterations, distribution, covariance, rng)
+
+        vectorized_metric = VECTORIZED_METRICS.get(calculate_metric)
+        if vectorized_metric is not None:
+            inputs = {name: np.full(iterations, float(value)) for name, value in base_inputs.items()}
+            inputs.update(samples)
+            results = np.broadcast_to(np.asarray(vectorized_metric(inputs), dtype=float), (iterations,))
+        else:
+            names = list(samples)
+            columns = [samples[name].tolist() for name in names]
+            results = np.empty(iterations)
+            for i, row in enumerate(zip(*columns)):
+                simulated_inputs = base_inputs.copy()
+                simulated_inputs.update(zip(names, row))
+                results[i] = calculate_metric(simulated_inputs)
 
         # Calculate statistics
-        results.sort()
-        mean = statistics.mean(results)
-        median = statistics.median(results)
-        std_dev = statistics.stdev(results) if len(results) > 1 else 0
+        mean = float(results.mean())
+        std_dev = float(results.std(ddof=1)) if iterations > 1 else 0
+        min_val = float(results.min())
+        max_val = float(results.max())
 
         # Percentiles
-        p5 = results[int(len(results) * 0.05)]
-        p25 = results[int(len(results) * 0.25)]
-        p75 = results[int(len(results) * 0.75)]
-        p95 = results[int(len(results) * 0.95)]
+        p5, p25, median, p75, p95 = np.percentile(results, [5, 25, 50, 75, 95]).tolist()
 
         # Create histogram data (20 bins)
-        num_bins = 20
-        min_val = min(results)
-        max_val = max(results)
-        bin_width = (max_val - min_val) / num_bins
-
-        histogram = []
-        for i in range(num_bins):
-            bin_start = min_val + i * bin_width
-            bin_end = bin_start + bin_width
-            count = sum(1 for r in results if bin_start <= r < bin_end)
-            histogram.append({
+        counts, edges = np.histogram(results, bins=20)
+
+        histogram = [
+            {
                 "bin_start": round(bin_start, 2),
                 "bin_end": round(bin_end, 2),
                 "count": count,
                 "frequency": round(count / iterations, 4)
-            })
+            }
+            for bin_start, bin_end, count in zip(edges[:-1].tolist(), edges[1:].tolist(), counts.tolist())
+        ]
 
         return {
             "iterations": iterations,
             "distribution_type": distribution,
+            "correlated": covariance is not None,
             "statistics": {
                 "mean": round(mean, 2),
                 "median": round(median, 2),
                 "std_dev": round(std_dev, 2),
-                "min": round(min(results), 2),
-                "max": round(max(results), 2),
-                "range": round(max(results) - min(results), 2),
+                "min": round(min_val, 2),
+                "max": round(max_val, 2),
+                "range": round(max_val - min_val, 2),
                 "coefficient_of_variation": round(std_dev / mean * 100, 2) if mean != 0 else 0
             },
             "percentiles": {
@@ -279,9 +270,9 @@ class SensitivityAnalysisService:
             },
             "histogram": histogram,
             "risk_metrics": {
-                "probability_of_loss": round(sum(1 for r in results if r < 0) / iterations * 100, 2),
+                "probability_of_loss": round(float(np.count_nonzero(results < 0)) / iterations * 100, 2),
                 "value_at_risk_95": round(p5, 2),  # 95% VaR (5th percentile)
-                "expected_shortfall": round(statistics.mean([r for r in results if r <= p5]), 2) if p5 < 0 else 0
+                "expected_shortfall": round(float(results[results <= p5].mean()), 2) if p5 < 0 else 0
             }
         }
 
@@ -475,6 +466,74 @@ class SensitivityAnalysisService:
         }
 
 
+def _sample_variables(
+    base_inputs: Dict[str, float],
+    variables: List[Dict[str, Any]],
+    iterations: int,
+    distribution: str,
+    covariance: Optional[List[List[float]]],
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Draw all Monte Carlo samples as arrays.
+
+    Without a covariance matrix each variable is drawn independently. With one,
+    normal draws come from the multivariate normal directly; uniform and
+    triangular draws use a Gaussian copula so their rank correlation follows
+    the covariance while each keeps its own marginal distribution.
+
+    Returns:
+        Dict of variable name -> array of `iterations` samples
+    """
+    if not variables:
+        return {}
+
+    lows = np.array([var["min"] for var in variables], dtype=float)
+    highs = np.array([var["max"] for var in variables], dtype=float)
+    modes = np.array([
+        var.get("base_value", base_inputs.get(var["name"], 0)) for var in variables
+    ], dtype=float)
+
+    if covariance is not None and np.shape(covariance) != (len(variables), len(variables)):
+        raise ValueError("covariance must be a square matrix with one row per variable")
+
+    if distribution == "normal":
+        # Normal distribution: mean = base_value, assume min/max are ~2 std deviations from mean
+        if covariance is not None:
+            draws = rng.multivariate_normal(modes, np.asarray(covariance, dtype=float), size=iterations)
+        else:
+            draws = rng.normal(modes, (highs - lows) / 4, size=(iterations, len(variables)))
+        # Clip to min/max
+        draws = np.clip(draws, lows, highs)
+
+    elif distribution in ("uniform", "triangular"):
+        if covariance is not None:
+            cov = np.asarray(covariance, dtype=float)
+            scale = np.sqrt(np.diag(cov))
+            correlation = cov / np.outer(scale, scale)
+            normals = rng.multivariate_normal(np.zeros(len(variables)), correlation, size=iterations)
+            quantiles = ndtr(normals)
+        else:
+            quantiles = rng.random((iterations, len(variables)))
+
+        if distribution == "uniform":
+            # Uniform distribution between min and max
+            draws = lows + quantiles * (highs - lows)
+        else:
+            # Triangular distribution (min, mode, max) via its inverse CDF
+            width = highs - lows
+            with np.errstate(invalid="ignore", divide="ignore"):
+                split = np.where(width > 0, (modes - lows) / width, 0.0)
+                left = lows + np.sqrt(quantiles * width * (modes - lows))
+                right = highs - np.sqrt((1 - quantiles) * width * (highs - modes))
+            draws = np.where(quantiles < split, left, right)
+
+    else:
+        raise ValueError(f"Unknown distribution: {distribution}")
+
+    return {var["name"]: draws[:, i] for i, var in enumerate(variables)}
+
+
 # Example usage and helper functions for common real estate calculations
 
 def calculate_cash_on_cash_return(inputs: Dict[str, float]) -> float:
@@ -512,3 +571,53 @@ def calculate_irr_simple(inputs: Dict[str, float]) -> float:
         # Simple approximation
         return ((total_cash_flow / initial_investment) ** (1 / years) - 1) * 100
     return 0
+
+
+# Vectorized metric implementations: each takes a dict of equal-length arrays
+
+def calculate_cash_on_cash_return_vectorized(inputs: Dict[str, np.ndarray]) -> np.ndarray:
+    """Calculate cash-on-cash return for arrays of inputs"""
+    annual_noi = inputs.get("annual_noi", 0)
+    total_cash_invested = inputs.get("total_cash_invested", 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total_cash_invested > 0, annual_noi / total_cash_invested * 100, 0.0)
+
+
+def calculate_cap_rate_vectorized(inputs: Dict[str, np.ndarray]) -> np.ndarray:
+    """Calculate capitalization rate for arrays of inputs"""
+    annual_noi = inputs.get("annual_noi", 0)
+    property_value = inputs.get("property_value", 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(property_value > 0, annual_noi / property_value * 100, 0.0)
+
+
+def calculate_dscr_vectorized(inputs: Dict[str, np.ndarray]) -> np.ndarray:
+    """Calculate debt service coverage ratio for arrays of inputs"""
+    annual_noi = inputs.get("annual_noi", 0)
+    annual_debt_service = inputs.get("annual_debt_service", 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(annual_debt_service > 0, annual_noi / annual_debt_service, 0.0)
+
+
+def calculate_irr_simple_vectorized(inputs: Dict[str, np.ndarray]) -> np.ndarray:
+    """Simplified IRR for arrays of inputs (a non-positive total cash flow is a -100% return)"""
+    total_cash_flow = inputs.get("total_cash_flow", 0)
+    initial_investment = inputs.get("initial_investment", 1)
+    years = inputs.get("years", 1)
+
+    valid = (initial_investment > 0) & (years > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        multiple = np.maximum(total_cash_flow / initial_investment, 0.0)
+        irr = (np.power(multiple, 1 / years) - 1) * 100
+    return np.where(valid, irr, 0.0)
+
+
+VECTORIZED_METRICS: Dict[Callable, Callable[[Dict[str, np.ndarray]], np.ndarray]] = {
+    calculate_cash_on_cash_return: calculate_cash_on_cash_return_vectorized,
+    calculate_cap_rate: calculate_cap_rate_vectorized,
+    calculate_dscr: calculate_dscr_vectorized,
+    calculate_irr_simple: calculate_irr_simple_vectorized
+}
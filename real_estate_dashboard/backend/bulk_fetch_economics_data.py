@@ -153,7 +153,7 @@ class BulkEconomicsFetcher:
             # Save to database
             if 'data' in result and isinstance(result['data'], list):
                 saved = self.db_service.save_economic_indicators(
-                    result['data'], country, category
+                    result['data'], country, category, bulk=True
                 )
                 self.stats['successful_requests'] += 1
                 self.stats['total_records_saved'] += saved
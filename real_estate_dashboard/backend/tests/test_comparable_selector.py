@@ -0,0 +1,119 @@
+"""
+Unit Tests for Comparable Selector
+
+Tests indexed comparable search against an exhaustive scan.
+"""
+
+import numpy as np
+import pytest
+
+from app.ml.comparable_selector import ComparableSelector, generate_sample_property_database
+
+
+@pytest.fixture(scope="module")
+def properties():
+    """Sample comps with coordinates around Los Angeles"""
+    rng = np.random.default_rng(0)
+    database = generate_sample_property_database(1500)
+    for prop in database:
+        prop["latitude"] = 34 + rng.uniform(-1, 1)
+        prop["longitude"] = -118 + rng.uniform(-1, 1)
+    return database
+
+
+def exhaustive(selector, subject, keep=lambda prop: True, weights=None):
+    """Rank every stored property that passes `keep` by scaled feature distance"""
+    raw = selector.property_database["raw_data"]
+    rows = np.array([i for i, prop in enumerate(raw) if keep(prop)])
+    _, subject_df = selector._prepare([subject], fit=False)
+    scaled_subject = selector._scale(subject_df.to_numpy())[0]
+
+    diff = selector._columns["scaled"][rows] - scaled_subject
+    if weights:
+        diff *= np.array([weights.get(f, 1.0) for f in selector.feature_names])
+    distances = np.linalg.norm(diff, axis=1)
+    order = np.argsort(distances, kind="stable")[:10]
+    return [raw[i]["id"] for i in rows[order]], distances[order]
+
+
+def test_unfiltered_search_matches_exhaustive_scan(properties):
+    """KD-tree results and similarity scores match a full scan"""
+    selector = ComparableSelector()
+    selector.build_database(properties[:1200])
+
+    for subject in properties[1200:1220]:
+        comps = selector.find_comparables(subject, n_comps=10)
+        expected_ids, expected_distances = exhaustive(selector, subject)
+
+        assert [c["property"]["id"] for c in comps] == expected_ids
+        np.testing.assert_allclose([c["distance"] for c in comps], expected_distances)
+        assert comps[0]["similarity_score"] == pytest.approx(1 / (1 + expected_distances[0]))
+
+
+def test_filters_and_weights_match_exhaustive_scan(properties):
+    """Filtered (tree and brute force) and weighted searches return the exact top comps"""
+    selector = ComparableSelector(brute_force_limit=0)
+    selector.build_database(properties[:1200])
+
+    for subject in properties[1200:1210]:
+        other_type = "condo" if subject["property_type"] != "condo" else "townhouse"
+        comps = selector.find_comparables(subject, filters={"property_type": other_type})
+        expected_ids, expected_distances = exhaustive(
+            selector, subject, lambda p: p["property_type"] == other_type
+        )
+        assert [c["property"]["id"] for c in comps] == expected_ids
+        np.testing.assert_allclose([c["distance"] for c in comps], expected_distances)
+
+        weights = {"square_feet": 3.0, "age": 0.5}
+        comps = selector.find_comparables(subject, filters={"max_size_difference_pct": 25}, weights=weights)
+        expected_ids, _ = exhaustive(
+            selector, subject,
+            lambda p: abs(p["square_feet"] - subject["square_feet"]) / subject["square_feet"] * 100 <= 25,
+            weights
+        )
+        assert [c["property"]["id"] for c in comps] == expected_ids
+
+
+def test_distance_filter_uses_geo_grid(properties):
+    """Only properties within the radius are returned"""
+    selector = ComparableSelector()
+    selector.build_database(properties[:1200])
+    subject = dict(properties[1300], latitude=34.0, longitude=-118.0)
+
+    comps = selector.find_comparables(subject, n_comps=50, filters={"max_distance_miles": 15})
+
+    def miles(prop):
+        lat1, lon1, lat2, lon2 = map(np.radians, [34.0, -118.0, prop["latitude"], prop["longitude"]])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * 3958.8 * np.arcsin(np.sqrt(a))
+
+    expected_ids, _ = exhaustive(selector, subject, lambda p: miles(p) <= 15)
+    assert comps
+    assert all(miles(c["property"]) <= 15 for c in comps)
+    assert [c["property"]["id"] for c in comps][:10] == expected_ids
+
+
+def test_incremental_add_and_batch_queries(properties):
+    """Added properties are searchable before and after the tree is rebuilt"""
+    selector = ComparableSelector(rebuild_fraction=0.25)
+    selector.build_database(properties[:1000])
+    selector.add_properties(properties[1000:1200])
+
+    assert selector._tree_size == 1000
+    assert selector._size == 1200
+
+    subjects = properties[1200:1230]
+    batch = selector.find_comparables_batch(subjects, n_comps=10)
+    for subject, comps in zip(subjects, batch):
+        assert [c["property"]["id"] for c in comps] == exhaustive(selector, subject)[0]
+
+    # Exceeding the rebuild fraction indexes everything
+    selector.add_properties(properties[1200:1500])
+    assert selector._tree_size == selector._size == 1500
+    assert selector.find_comparables(properties[1234], n_comps=1)[0]["property"]["id"] == properties[1234]["id"]
+
+
+def test_find_comparables_requires_database():
+    """Searching before building the database is an error"""
+    with pytest.raises(ValueError):
+        ComparableSelector().find_comparables({"square_feet": 1000})
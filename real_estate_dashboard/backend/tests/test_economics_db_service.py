@@ -0,0 +1,98 @@
+"""
+Unit Tests for Economics DB Service
+
+Tests the bulk indicator upsert against the per-row save path on SQLite.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+import app.services.economics_db_service as economics_db_module
+from app.core.database import Base
+from app.models.economics import EconomicIndicator, EconomicIndicatorHistory
+from app.services.economics_db_service import EconomicsDBService
+
+
+@compiles(UUID, "sqlite")
+def compile_uuid_for_sqlite(type_, compiler, **kw):
+    """UUIDMixin keys are PostgreSQL UUIDs; SQLite stores them as hex strings"""
+    return "CHAR(32)"
+
+
+def indicators(count, last="1.5", reference="Nov/25"):
+    """Raw API indicator payloads"""
+    return [
+        {
+            "Related": f"Indicator {i}",
+            "Last": last,
+            "Previous": "1.0",
+            "Highest": "9",
+            "Lowest": "0",
+            "Reference": reference,
+            "Unit": "percent"
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def service():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[EconomicIndicator.__table__, EconomicIndicatorHistory.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    yield EconomicsDBService(session)
+    session.close()
+
+
+def snapshot(service):
+    """Stored indicators as comparable tuples"""
+    return sorted(
+        (row.indicator_name, row.reference_period, row.last_value)
+        for row in service.db.query(EconomicIndicator).all()
+    )
+
+
+@pytest.mark.parametrize("native_upsert", [True, False])
+def test_bulk_upsert_reports_inserted_and_updated(service, monkeypatch, native_upsert):
+    if not native_upsert:
+        monkeypatch.setattr(economics_db_module, "UPSERT_DIALECTS", {})
+
+    counts = service.bulk_upsert_economic_indicators(indicators(25), "Israel", "gdp", chunk_size=10)
+    assert counts == {"inserted": 25, "updated": 0, "invalid": 0, "failed": 0}
+    assert service.db.query(EconomicIndicatorHistory).count() == 25
+
+    data = indicators(30, last="2.5") + [{"Related": "", "Last": "1"}]
+    counts = service.bulk_upsert_economic_indicators(data, "Israel", "gdp", chunk_size=10)
+    assert counts == {"inserted": 5, "updated": 25, "invalid": 1, "failed": 0}
+
+    assert service.db.query(EconomicIndicator).count() == 30
+    assert {row[2] for row in snapshot(service)} == {"2.5"}
+    assert service.db.query(EconomicIndicatorHistory).count() == 30
+
+
+def test_bulk_upsert_matches_row_by_row_save(service):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[EconomicIndicator.__table__, EconomicIndicatorHistory.__table__]
+    )
+    row_by_row = EconomicsDBService(sessionmaker(bind=engine)())
+
+    for batch in (indicators(12), indicators(8, last="3.0", reference="Dec/25"), indicators(15, last="4.0")):
+        saved = row_by_row.save_economic_indicators(batch, "Israel", "prices")
+        assert service.save_economic_indicators(batch, "Israel", "prices", bulk=True) == saved
+
+    assert snapshot(service) == snapshot(row_by_row)
+
+
+def test_duplicate_keys_in_one_batch_keep_last_row(service):
+    data = indicators(3) + indicators(3, last="7.0")
+
+    counts = service.bulk_upsert_economic_indicators(data, "Israel", "labour")
+
+    assert counts["inserted"] == 3
+    assert {row[2] for row in snapshot(service)} == {"7.0"}
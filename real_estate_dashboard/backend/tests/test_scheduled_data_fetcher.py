@@ -0,0 +1,190 @@
+"""
+Unit Tests for Scheduled Data Fetcher
+
+Runs the fetch pipeline against stub integrations that return canned
+payloads after injected delays.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import configure_mappers
+
+import app.services.scheduled_data_fetcher as fetcher_module
+from app.services.scheduled_data_fetcher import FetchSource, ScheduledDataFetcher
+
+
+DELAY = 0.2
+
+
+def response(data):
+    """Successful integration response"""
+    return SimpleNamespace(success=True, data=data, error=None)
+
+
+class StubBLS:
+    is_available = True
+
+    async def _retry_with_exponential_backoff(self, func, **kwargs):
+        return await func()
+
+    async def get_employment_stats(self, area_code):
+        await asyncio.sleep(DELAY)
+        return response({"series_data": {"LNS14000000": [{"value": "4.1"}]}})
+
+    async def get_cpi(self):
+        await asyncio.sleep(DELAY)
+        return response({"series_data": {"CUSR0000SA0": [{"value": "310.3"}]}})
+
+
+class StubBankOfIsrael:
+    is_available = True
+
+    async def get_exchange_rate(self, currency, start_date, end_date, db=None, use_cache=True):
+        await asyncio.sleep(DELAY)
+        return response({"count": 5})
+
+    async def get_cpi(self, start_date, end_date, db=None, use_cache=True):
+        await asyncio.sleep(DELAY)
+        return response({"count": 12})
+
+    async def get_interest_rate(self, start_date, end_date, db=None, use_cache=True):
+        await asyncio.sleep(DELAY)
+        return response({"count": 24})
+
+
+class StubFHFA:
+    is_available = True
+
+    async def get_house_price_index(self, **kwargs):
+        await asyncio.sleep(DELAY)
+        return response({"count": 36})
+
+
+@pytest.fixture
+def sessions():
+    """Sessions handed out by the fetcher's session factory"""
+    return []
+
+
+@pytest.fixture
+def fetcher(monkeypatch, sessions):
+    integrations = {"bls": StubBLS(), "bank_of_israel": StubBankOfIsrael(), "fhfa": StubFHFA()}
+    monkeypatch.setattr(fetcher_module, "integration_manager", SimpleNamespace(get=integrations.get))
+
+    def session_factory():
+        session = MagicMock()
+        sessions.append(session)
+        return session
+
+    # Configure ORM mappers up front so the first fetch is not charged for it
+    configure_mappers()
+    return ScheduledDataFetcher(session_factory=session_factory)
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_data_runs_sources_concurrently(fetcher):
+    """Total run time tracks the slowest source, not the sum of all sources"""
+    started = time.perf_counter()
+    summary = await fetcher.fetch_all_data()
+    elapsed = time.perf_counter() - started
+
+    assert summary["successful_fetches"] == summary["total_fetches"] == 6
+    assert summary["total_records_saved"] == 25 + 12 + 24 + 36
+    assert elapsed < 3 * DELAY
+
+    assert set(summary["timings"]) == set(summary["results"])
+    assert all(timing["seconds"] >= DELAY * 0.9 for timing in summary["timings"].values())
+
+
+@pytest.mark.asyncio
+async def test_each_source_gets_its_own_session(fetcher, sessions):
+    """Concurrent sources never share a session, and every session is closed"""
+    seen = {}
+
+    def source(name):
+        async def fetch():
+            db = fetcher._get_db()
+            await asyncio.sleep(DELAY / 4)
+            assert fetcher._get_db() is db
+            seen[name] = db
+            return {"success": True}
+        return FetchSource(name, "test", fetch)
+
+    fetcher.concurrency_limits["test"] = 4
+    await fetcher.run_sources([source(f"source_{i}") for i in range(4)])
+
+    assert len({id(db) for db in seen.values()}) == 4
+    assert all(session.close.called for session in sessions)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_integration(fetcher):
+    """Sources of one integration never exceed its concurrency limit"""
+    active = {"now": 0, "peak": 0}
+
+    async def fetch():
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(DELAY / 4)
+        active["now"] -= 1
+        return {"success": True}
+
+    fetcher.concurrency_limits["limited"] = 2
+    _, timings = await fetcher.run_sources(
+        [FetchSource(f"source_{i}", "limited", fetch) for i in range(6)]
+    )
+
+    assert active["peak"] == 2
+    assert max(timing["queued_seconds"] for timing in timings.values()) >= DELAY / 2
+
+
+@pytest.mark.asyncio
+async def test_slow_source_times_out_without_blocking_others(fetcher):
+    async def slow():
+        await asyncio.sleep(10)
+        return {"success": True}
+
+    async def fast():
+        return {"success": True}
+
+    started = time.perf_counter()
+    results, _ = await fetcher.run_sources([
+        FetchSource("slow", "a", slow, timeout_seconds=DELAY),
+        FetchSource("fast", "b", fast),
+    ])
+
+    assert time.perf_counter() - started < 2 * DELAY
+    assert results["slow"]["success"] is False
+    assert "Timed out" in results["slow"]["error"]
+    assert results["fast"]["success"] is True
+
+
+@pytest.mark.asyncio
+async def test_dependent_source_waits_and_is_skipped_on_failure(fetcher):
+    order = []
+
+    def source(name, success, depends_on=()):
+        async def fetch():
+            await asyncio.sleep(DELAY / 4)
+            order.append(name)
+            return {"success": success}
+        return FetchSource(name, name, fetch, depends_on=depends_on)
+
+    results, _ = await fetcher.run_sources([
+        source("upstream", True),
+        source("broken", False),
+        source("downstream", True, depends_on=("upstream",)),
+        source("orphan", True, depends_on=("broken",)),
+    ])
+
+    assert order.index("downstream") > order.index("upstream")
+    assert "orphan" not in order
+    assert results["orphan"]["success"] is False
+    assert results["downstream"]["success"] is True
+
+    with pytest.raises(ValueError):
+        await fetcher.run_sources([source("early", True, depends_on=("late",)), source("late", True)])
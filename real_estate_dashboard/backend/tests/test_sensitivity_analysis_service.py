@@ -0,0 +1,115 @@
+"""
+Unit Tests for Sensitivity Analysis Service
+
+Tests the vectorized Monte Carlo simulation against the scalar metric functions.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.services.sensitivity_analysis_service import (
+    SensitivityAnalysisService,
+    VECTORIZED_METRICS,
+    calculate_cap_rate,
+    calculate_cash_on_cash_return,
+    calculate_dscr,
+    calculate_irr_simple
+)
+
+
+BASE_INPUTS = {
+    "annual_noi": 120000,
+    "property_value": 1500000,
+    "total_cash_invested": 400000,
+    "annual_debt_service": 90000,
+    "total_cash_flow": 650000,
+    "initial_investment": 400000,
+    "years": 5
+}
+
+VARIABLES = [
+    {"name": "annual_noi", "label": "NOI", "base_value": 120000, "min": 80000, "max": 160000},
+    {"name": "property_value", "label": "Value", "base_value": 1500000, "min": 1200000, "max": 1800000}
+]
+
+
+@pytest.mark.parametrize("metric", [calculate_cap_rate, calculate_cash_on_cash_return, calculate_dscr, calculate_irr_simple])
+def test_vectorized_metrics_match_scalar(metric):
+    """Each vectorized metric reproduces its scalar counterpart draw by draw"""
+    rng = np.random.default_rng(0)
+    inputs = {name: value * rng.uniform(0.5, 1.5, 200) for name, value in BASE_INPUTS.items()}
+
+    expected = [
+        metric({name: values[i] for name, values in inputs.items()})
+        for i in range(200)
+    ]
+
+    np.testing.assert_allclose(VECTORIZED_METRICS[metric](inputs), expected)
+
+
+def test_monte_carlo_vectorized_matches_per_draw_evaluation():
+    """The vectorized path and the per-draw fallback agree for the same seed"""
+    vectorized = SensitivityAnalysisService.monte_carlo_simulation(
+        BASE_INPUTS, calculate_cap_rate, VARIABLES, iterations=5000, seed=42
+    )
+    per_draw = SensitivityAnalysisService.monte_carlo_simulation(
+        BASE_INPUTS, lambda inputs: calculate_cap_rate(inputs), VARIABLES, iterations=5000, seed=42
+    )
+
+    assert vectorized == per_draw
+    assert sum(b["count"] for b in vectorized["histogram"]) == 5000
+    assert vectorized["percentiles"]["p5"] < vectorized["percentiles"]["p50_median"] < vectorized["percentiles"]["p95"]
+    assert 7 < vectorized["statistics"]["mean"] < 9
+
+
+@pytest.mark.parametrize("distribution", ["normal", "uniform", "triangular"])
+def test_monte_carlo_samples_respect_bounds_and_covariance(distribution):
+    """Draws stay within min/max and follow the requested correlation"""
+    covariance = [[400000000, 4000000000], [4000000000, 56250000000]]  # correlation ~0.84
+    variables = [
+        {"name": "annual_noi", "label": "NOI", "base_value": 120000, "min": 60000, "max": 180000},
+        {"name": "property_value", "label": "Value", "base_value": 1500000, "min": 750000, "max": 2250000}
+    ]
+
+    def capture(inputs):
+        capture.draws.append((inputs["annual_noi"], inputs["property_value"]))
+        return calculate_cap_rate(inputs)
+    capture.draws = []
+
+    result = SensitivityAnalysisService.monte_carlo_simulation(
+        BASE_INPUTS, capture, variables, iterations=5000,
+        distribution=distribution, covariance=covariance, seed=7
+    )
+
+    draws = np.array(capture.draws)
+    assert result["correlated"] is True
+    assert draws[:, 0].min() >= 60000 and draws[:, 0].max() <= 180000
+    assert draws[:, 1].min() >= 750000 and draws[:, 1].max() <= 2250000
+    assert np.corrcoef(draws.T)[0, 1] > 0.7
+
+    # Correlated NOI and value move together, so cap rate varies less than independently
+    independent = SensitivityAnalysisService.monte_carlo_simulation(
+        BASE_INPUTS, calculate_cap_rate, variables, iterations=5000, distribution=distribution, seed=7
+    )
+    assert result["statistics"]["std_dev"] < independent["statistics"]["std_dev"]
+
+
+def test_monte_carlo_rejects_mismatched_covariance():
+    """Covariance must have one row and column per variable"""
+    with pytest.raises(ValueError):
+        SensitivityAnalysisService.monte_carlo_simulation(
+            BASE_INPUTS, calculate_cap_rate, VARIABLES, iterations=1000, covariance=[[1.0]]
+        )
+
+
+def test_monte_carlo_100k_iterations_is_fast():
+    """The maximum iteration count runs well under a second"""
+    started = time.perf_counter()
+    result = SensitivityAnalysisService.monte_carlo_simulation(
+        BASE_INPUTS, calculate_dscr, VARIABLES, iterations=100000, distribution="triangular"
+    )
+
+    assert result["iterations"] == 100000
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,127 @@
+"""
+Knowledge graph traversal benchmark.
+
+Builds a synthetic multi-million-edge graph through the public API and
+times each traversal on the compact (CSR) path against the original
+dictionary walk:
+- find_path (bidirectional BFS vs BFS)
+- find_connections, cold and from the k-hop cache
+- find_similar_nodes
+- detect_communities
+
+Usage:
+    python benchmarks/knowledge_graph_benchmark.py --nodes 500000 --edges 2000000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add package root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cross_platform_intelligence.knowledge_graph import (
+    CrossPlatformKnowledgeGraph,
+    EdgeType,
+    NodeType,
+)
+
+NODE_TYPES = [NodeType.PERSON, NodeType.COMPANY, NodeType.SKILL, NodeType.OPPORTUNITY]
+
+
+async def build_graph(n_nodes: int, n_edges: int, seed: int) -> tuple:
+    """Random graph with community structure: most edges stay inside blocks of 1000 nodes."""
+    rng = random.Random(seed)
+    graph = CrossPlatformKnowledgeGraph()
+
+    node_ids = []
+    for i in range(n_nodes):
+        node = await graph.add_node(NODE_TYPES[i % len(NODE_TYPES)], f"node {i}")
+        node_ids.append(node.node_id)
+
+    edge_types = list(EdgeType)
+    for _ in range(n_edges):
+        source = rng.randrange(n_nodes)
+        if rng.random() < 0.8:
+            block = source - source % 1000
+            target = min(block + rng.randrange(1000), n_nodes - 1)
+        else:
+            target = rng.randrange(n_nodes)
+        await graph.add_edge(
+            rng.choice(edge_types),
+            node_ids[source],
+            node_ids[target],
+            bidirectional=rng.random() < 0.5
+        )
+
+    return graph, node_ids
+
+
+async def timed(label: str, func, repeat: int = 1) -> float:
+    """Average seconds per call of an async callable."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await func()
+    seconds = (time.perf_counter() - started) / repeat
+    print(f"  {label:<42} {seconds * 1000:10.2f} ms")
+    return seconds
+
+
+async def main(args):
+    print(f"Building graph: {args.nodes:,} nodes, {args.edges:,} edges")
+    started = time.perf_counter()
+    graph, node_ids = await build_graph(args.nodes, args.edges, args.seed)
+    print(f"  built in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(args.seed + 1)
+    pairs = [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(args.queries)]
+    centers = [rng.choice(node_ids) for _ in range(args.queries)]
+
+    async def find_paths():
+        for start, end in pairs:
+            await graph.find_path(start, end, max_depth=6)
+
+    async def find_connections():
+        for center in centers:
+            await graph.find_connections(center, NodeType.COMPANY, max_hops=3)
+
+    async def find_similar():
+        for center in centers:
+            await graph.find_similar_nodes(center, limit=10)
+
+    print(f"\nCompact storage ({args.queries} queries per row)")
+    started = time.perf_counter()
+    graph._get_compact()
+    print(f"  {'CSR build':<42} {(time.perf_counter() - started) * 1000:10.2f} ms")
+    await timed("find_path x queries", find_paths)
+    await timed("find_connections x queries (cold)", find_connections)
+    await timed("find_connections x queries (cached)", find_connections)
+    await timed("find_similar_nodes x queries", find_similar)
+    await timed("detect_communities", graph.detect_communities)
+
+    if args.skip_baseline:
+        return
+
+    print("\nDictionary walk")
+    graph.compact_storage = False
+    await timed("find_path x queries", find_paths)
+    await timed("find_connections x queries", find_connections)
+    await timed("find_similar_nodes x queries", find_similar)
+    if args.communities_baseline:
+        await timed("detect_communities", graph.detect_communities)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, default=500_000)
+    parser.add_argument("--edges", type=int, default=2_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-baseline", action="store_true",
+                        help="Only time the compact path")
+    parser.add_argument("--communities-baseline", action="store_true",
+                        help="Also time dictionary label propagation (slow)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,28 @@
+"""
+Pytest configuration for the package root.
+
+The root directory's name is not importable, so pytest must not collect it
+as a package: that would import its __init__.py, whose relative imports
+then fail. Conftest hooks only apply below their own directory, so the
+override is registered as a plugin.
+"""
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+
+
+class RootDirectoryCollector:
+    """Collects the package root as a plain directory."""
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collect_directory(self, path, parent):
+        if path == ROOT:
+            return pytest.Dir.from_parent(parent, path=path)
+        return None
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(RootDirectoryCollector(), "unified-platform-core-root")
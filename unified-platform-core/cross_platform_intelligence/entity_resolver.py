@@ -6,15 +6,25 @@ Same person appearing in Bond.AI network should link to their Labor profile
 and any Finance/Real Estate transactions.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from collections import Counter, defaultdict
+import asyncio
 import hashlib
+import itertools
 import logging
+import math
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Character n-gram size used for fuzzy-field blocking
+NGRAM_SIZE = 3
+
+# Slack for float comparisons when deriving edit-distance bounds
+_EPSILON = 1e-9
+
 
 class EntityType(Enum):
     PERSON = "person"
@@ -47,6 +57,301 @@ class UnifiedEntity:
     updated_at: datetime
 
 
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    """Bit mask of the positions of each character in the pattern"""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _bit_parallel_distance(
+    masks: Dict[str, int],
+    length: int,
+    text: str,
+    max_distance: Optional[int] = None
+) -> int:
+    """
+    Levenshtein distance between a pattern and a text.
+
+    Myers/Hyyrö bit-parallel algorithm: one column of the DP matrix is
+    encoded as vertical delta bit vectors, so each text character costs
+    a handful of integer operations regardless of the pattern length.
+
+    Args:
+        masks: Output of _pattern_masks for the pattern
+        length: Pattern length
+        text: Text to compare against
+        max_distance: Stop early and return max_distance + 1 once the
+            distance is known to exceed this bound
+
+    Returns:
+        Edit distance (or max_distance + 1 if it was exceeded)
+    """
+    if length == 0 or not text:
+        distance = max(length, len(text))
+        if max_distance is not None and distance > max_distance:
+            return max_distance + 1
+        return distance
+
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    positive, negative = full, 0
+    score = length
+    remaining = len(text)
+
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        h_positive = negative | (~(xh | positive) & full)
+        h_negative = positive & xh
+
+        if h_positive & high:
+            score += 1
+        elif h_negative & high:
+            score -= 1
+
+        remaining -= 1
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+
+        h_positive = ((h_positive << 1) | 1) & full
+        h_negative = (h_negative << 1) & full
+        positive = h_negative | (~(xv | h_positive) & full)
+        negative = h_positive & xv
+
+    return score
+
+
+def edit_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between two strings.
+
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Optional bound; distances above it are reported
+            as max_distance + 1
+
+    Returns:
+        Number of single-character insertions, deletions and substitutions
+    """
+    # Iterate over the shorter string; the longer one becomes the bit pattern
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    return _bit_parallel_distance(_pattern_masks(s1), len(s1), s2, max_distance)
+
+
+def string_similarity(s1: str, s2: str) -> float:
+    """Levenshtein ratio: 1 - distance / length of the longer string"""
+    if s1 == s2:
+        return 1.0
+
+    longest = max(len(s1), len(s2))
+    if min(len(s1), len(s2)) == 0:
+        return 0.0
+    return 1.0 - edit_distance(s1, s2) / longest
+
+
+def _max_edit_distance(length: int, threshold: float) -> int:
+    """Largest edit distance that keeps similarity >= threshold for this length"""
+    return int((1.0 - threshold) * length + _EPSILON)
+
+
+def _ngrams(text: str) -> Set[str]:
+    """Distinct character n-grams of a string, padded so short strings get grams too"""
+    padded = f"\x02\x02{text}\x03\x03"
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def _index_key(value: Any) -> Any:
+    """Hashable key for an exact-match value"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class _BlockingIndex:
+    """
+    Candidate index over the matching fields of one entity type.
+
+    Exact fields are hash indexes from value to unified IDs. Fuzzy fields
+    keep character n-gram postings plus a length index; a lookup returns
+    every entity whose similarity can reach the threshold (q-gram count
+    filter), so blocking never drops a true match.
+    """
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.exact_fields: List[str] = list(rule["exact_fields"])
+        self.fuzzy_fields: List[str] = list(rule["fuzzy_fields"])
+        self.threshold: float = rule["fuzzy_threshold"]
+
+        self.exact: Dict[str, Dict[Any, Set[str]]] = {
+            f: defaultdict(set) for f in self.exact_fields
+        }
+        self.grams: Dict[str, Dict[str, Set[str]]] = {
+            f: defaultdict(set) for f in self.fuzzy_fields
+        }
+        self.lengths: Dict[str, Dict[int, Set[str]]] = {
+            f: defaultdict(set) for f in self.fuzzy_fields
+        }
+        # unified_id -> field -> indexed value (exact key or lowercased text)
+        self.values: Dict[str, Dict[str, Any]] = {}
+        self.comparisons = 0
+
+    def index(self, unified_id: str, attributes: Dict[str, Any]):
+        """Index (or re-index) an entity's merged attributes"""
+        self.remove(unified_id)
+
+        values: Dict[str, Any] = {}
+        for f in self.exact_fields:
+            value = attributes.get(f)
+            if value:
+                key = _index_key(value)
+                self.exact[f][key].add(unified_id)
+                values[f] = key
+
+        for f in self.fuzzy_fields:
+            value = attributes.get(f)
+            if value:
+                text = str(value).lower()
+                for gram in _ngrams(text):
+                    self.grams[f][gram].add(unified_id)
+                self.lengths[f][len(text)].add(unified_id)
+                values[f] = text
+
+        self.values[unified_id] = values
+
+    def remove(self, unified_id: str):
+        """Drop an entity from every index"""
+        values = self.values.pop(unified_id, None)
+        if not values:
+            return
+
+        for f in self.exact_fields:
+            if f in values:
+                _discard(self.exact[f], values[f], unified_id)
+
+        for f in self.fuzzy_fields:
+            if f in values:
+                text = values[f]
+                for gram in _ngrams(text):
+                    _discard(self.grams[f], gram, unified_id)
+                _discard(self.lengths[f], len(text), unified_id)
+
+    def match(self, attributes: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Score indexed entities against a reference's attributes.
+
+        Same rule as a full scan: exact field matches count 1.0, fuzzy
+        field similarities count when >= threshold, and the entity matches
+        when the average over matched fields is >= 0.7.
+
+        Returns:
+            unified_id -> average match score
+        """
+        totals: Dict[str, float] = defaultdict(float)
+        counts: Dict[str, int] = defaultdict(int)
+
+        for f in self.exact_fields:
+            value = attributes.get(f)
+            if not value:
+                continue
+            for unified_id in self.exact[f].get(_index_key(value), ()):
+                totals[unified_id] += 1.0
+                counts[unified_id] += 1
+
+        for f in self.fuzzy_fields:
+            value = attributes.get(f)
+            if not value:
+                continue
+            for unified_id, similarity in self._fuzzy_matches(f, str(value).lower()):
+                totals[unified_id] += similarity
+                counts[unified_id] += 1
+
+        scores = {}
+        for unified_id, total in totals.items():
+            avg_score = total / counts[unified_id]
+            if avg_score >= 0.7:
+                scores[unified_id] = avg_score
+        return scores
+
+    def _fuzzy_matches(self, f: str, text: str) -> List[Tuple[str, float]]:
+        """Entities whose field value is within the fuzzy threshold of text"""
+        threshold = self.threshold
+        length = len(text)
+        # A candidate may be longer than the query by up to length / threshold
+        max_distance = _max_edit_distance(int(length / threshold + _EPSILON), threshold)
+
+        grams = _ngrams(text)
+        # Each edit destroys at most NGRAM_SIZE of the query's distinct n-grams
+        required = len(grams) - NGRAM_SIZE * max_distance
+
+        if required >= 1:
+            # Any match shares at least one of the (len - required + 1) rarest
+            # grams; count shared grams for those candidates against the
+            # remaining postings, dropping any that can no longer reach the bound
+            postings = self.grams[f]
+            lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+            prefix = len(grams) - required + 1
+            shared: Dict[str, int] = Counter()
+            for posting in lists[:prefix]:
+                shared.update(posting)
+
+            remaining = len(lists) - prefix
+            for posting in lists[prefix:]:
+                remaining -= 1
+                survivors = {}
+                for unified_id, count in shared.items():
+                    if unified_id in posting:
+                        count += 1
+                    if count + remaining >= required:
+                        survivors[unified_id] = count
+                shared = survivors
+            candidates = list(shared)
+        else:
+            by_length = self.lengths[f]
+            low = math.ceil(length * threshold - _EPSILON)
+            high = int(length / threshold + _EPSILON)
+            candidates = set().union(*(by_length.get(n, ()) for n in range(low, high + 1)))
+
+        if not candidates:
+            return []
+
+        masks = _pattern_masks(text)
+        matches = []
+        for unified_id in candidates:
+            other = self.values[unified_id][f]
+            if other == text:
+                matches.append((unified_id, 1.0))
+                continue
+
+            longest = max(length, len(other))
+            bound = _max_edit_distance(longest, threshold)
+            if abs(length - len(other)) > bound:
+                continue
+
+            self.comparisons += 1
+            distance = _bit_parallel_distance(masks, length, other, bound)
+            if distance <= bound:
+                similarity = 1.0 - distance / longest
+                if similarity >= threshold:
+                    matches.append((unified_id, similarity))
+        return matches
+
+
+def _discard(index: Dict[Any, Set[str]], key: Any, unified_id: str):
+    """Remove an ID from a posting set, dropping the set once empty"""
+    members = index.get(key)
+    if members is not None:
+        members.discard(unified_id)
+        if not members:
+            del index[key]
+
+
 class UnifiedEntityResolver:
     """
     Resolves entities across platforms using multiple matching strategies.
@@ -56,6 +361,10 @@ class UnifiedEntityResolver:
     - Fuzzy match (name similarity)
     - Graph-based (connected entities)
     - Vector similarity (embeddings)
+
+    Matching only scores candidates from per-type blocking indexes (exact
+    field hashes and fuzzy field n-grams), so resolving n references costs
+    roughly O(n) lookups instead of O(n^2) comparisons.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -63,6 +372,18 @@ class UnifiedEntityResolver:
         self.entity_cache: Dict[str, UnifiedEntity] = {}
         self.resolution_rules = self._initialize_rules()
 
+        # First rule per type wins, as in a linear rule scan
+        self._blocking: Dict[EntityType, _BlockingIndex] = {}
+        for rule in self.resolution_rules:
+            if rule["entity_type"] not in self._blocking:
+                self._blocking[rule["entity_type"]] = _BlockingIndex(rule)
+
+        # Reference cache key -> unified_id of the entity holding it
+        self.reference_index: Dict[str, str] = {}
+        self._id_sequence = itertools.count()
+        # unified_id -> creation order, so ties go to the oldest entity
+        self._creation_order: Dict[str, int] = {}
+
     def _initialize_rules(self) -> List[Dict[str, Any]]:
         """Initialize entity resolution rules by type"""
 
@@ -110,40 +431,80 @@ class UnifiedEntityResolver:
 
         If entity already exists, merge. Otherwise create new.
         """
+        return self._resolve(entity_ref)
 
-        # Check cache first
+    async def resolve_batch(
+        self,
+        entity_refs: List[EntityReference]
+    ) -> List[UnifiedEntity]:
+        """Resolve multiple entities in batch"""
+        return [self._resolve(ref) for ref in entity_refs]
+
+    async def resolve_bulk(
+        self,
+        entity_refs: List[EntityReference],
+        chunk_size: int = 10000
+    ) -> List[UnifiedEntity]:
+        """
+        Resolve a large import, deduplicating references as they arrive.
+
+        Works through the references in chunks, yielding to the event loop
+        and logging progress between chunks so a million-reference import
+        does not starve other tasks.
+
+        Args:
+            entity_refs: References to resolve, in import order
+            chunk_size: References resolved between event loop yields
+
+        Returns:
+            Unified entity for each reference, in input order
+        """
+        results: List[UnifiedEntity] = []
+        entities_before = len(self.entity_cache)
+        total = len(entity_refs)
+
+        for start in range(0, total, chunk_size):
+            for ref in entity_refs[start:start + chunk_size]:
+                results.append(self._resolve(ref))
+
+            done = min(start + chunk_size, total)
+            if done < total:
+                logger.debug(f"Bulk resolution progress: {done}/{total} references")
+                await asyncio.sleep(0)
+
+        logger.info(
+            f"Bulk resolved {total} references into "
+            f"{len(self.entity_cache) - entities_before} new unified entities"
+        )
+        return results
+
+    def _resolve(self, entity_ref: EntityReference) -> UnifiedEntity:
+        """Resolve one reference: merge into a known or matching entity, else create"""
+
+        # A reference seen before stays with the entity that absorbed it
         cache_key = self._compute_cache_key(entity_ref)
-        if cache_key in self.entity_cache:
-            existing = self.entity_cache[cache_key]
-            return await self._merge_entity(existing, entity_ref)
+        unified_id = self.reference_index.get(cache_key)
+        if unified_id is not None and unified_id in self.entity_cache:
+            return self._merge_reference(self.entity_cache[unified_id], entity_ref)
 
         # Search for matching entities
-        matches = await self._find_matches(entity_ref)
+        matches = self._match_candidates(entity_ref)
 
         if matches:
-            # Merge with best match
-            best_match = max(matches, key=lambda x: x[1])
-            unified = await self._merge_entity(best_match[0], entity_ref)
+            # Merge with best match; equal scores go to the oldest entity
+            order = self._creation_order
+            best_match = max(matches, key=lambda x: (x[1], -order[x[0].unified_id]))
+            unified = self._merge_reference(best_match[0], entity_ref)
         else:
             # Create new unified entity
             unified = self._create_unified_entity(entity_ref)
+            self.entity_cache[unified.unified_id] = unified
+            self._creation_order[unified.unified_id] = len(self._creation_order)
+            self._index_entity(unified)
 
-        # Cache and return
-        self.entity_cache[unified.unified_id] = unified
+        self.reference_index[cache_key] = unified.unified_id
         return unified
 
-    async def resolve_batch(
-        self,
-        entity_refs: List[EntityReference]
-    ) -> List[UnifiedEntity]:
-        """Resolve multiple entities in batch"""
-
-        results = []
-        for ref in entity_refs:
-            unified = await self.resolve_entity(ref)
-            results.append(unified)
-        return results
-
     async def find_cross_platform_matches(
         self,
         entity_type: EntityType,
@@ -190,54 +551,27 @@ class UnifiedEntityResolver:
         entity_ref: EntityReference
     ) -> List[Tuple[UnifiedEntity, float]]:
         """Find existing entities that match the reference"""
+        return self._match_candidates(entity_ref)
 
-        matches = []
-
-        # Get rules for this entity type
-        rules = [r for r in self.resolution_rules
-                 if r["entity_type"] == entity_ref.entity_type]
-
-        if not rules:
-            return matches
-
-        rule = rules[0]
+    def _match_candidates(
+        self,
+        entity_ref: EntityReference
+    ) -> List[Tuple[UnifiedEntity, float]]:
+        """Score the blocked candidates for a reference"""
 
-        for unified_id, entity in self.entity_cache.items():
-            if entity.entity_type != entity_ref.entity_type:
-                continue
+        blocking = self._blocking.get(entity_ref.entity_type)
+        if blocking is None:
+            return []
 
-            score = 0.0
-            match_count = 0
-
-            # Check exact field matches
-            for field in rule["exact_fields"]:
-                ref_value = entity_ref.attributes.get(field)
-                entity_value = entity.merged_attributes.get(field)
-
-                if ref_value and entity_value and ref_value == entity_value:
-                    score += 1.0
-                    match_count += 1
-
-            # Check fuzzy field matches
-            for field in rule["fuzzy_fields"]:
-                ref_value = entity_ref.attributes.get(field)
-                entity_value = entity.merged_attributes.get(field)
-
-                if ref_value and entity_value:
-                    similarity = self._string_similarity(
-                        str(ref_value).lower(),
-                        str(entity_value).lower()
-                    )
-                    if similarity >= rule["fuzzy_threshold"]:
-                        score += similarity
-                        match_count += 1
-
-            if match_count > 0:
-                avg_score = score / match_count
-                if avg_score >= 0.7:
-                    matches.append((entity, avg_score))
+        scores = blocking.match(entity_ref.attributes)
+        return [(self.entity_cache[unified_id], score)
+                for unified_id, score in scores.items()]
 
-        return matches
+    def _index_entity(self, entity: UnifiedEntity):
+        """Add or refresh an entity in its type's blocking index"""
+        blocking = self._blocking.get(entity.entity_type)
+        if blocking is not None:
+            blocking.index(entity.unified_id, entity.merged_attributes)
 
     async def _merge_entity(
         self,
@@ -245,6 +579,14 @@ class UnifiedEntityResolver:
         new_ref: EntityReference
     ) -> UnifiedEntity:
         """Merge a new reference into an existing unified entity"""
+        return self._merge_reference(existing, new_ref)
+
+    def _merge_reference(
+        self,
+        existing: UnifiedEntity,
+        new_ref: EntityReference
+    ) -> UnifiedEntity:
+        """Merge a reference into an entity and refresh its index entries"""
 
         # Check if this reference already exists
         existing_platforms = {ref.platform for ref in existing.references}
@@ -264,6 +606,7 @@ class UnifiedEntityResolver:
             if key not in merged or new_ref.confidence > existing.resolution_confidence:
                 merged[key] = value
 
+        attributes_changed = merged != existing.merged_attributes
         existing.merged_attributes = merged
         existing.updated_at = datetime.now()
         existing.resolution_confidence = max(
@@ -271,6 +614,8 @@ class UnifiedEntityResolver:
             new_ref.confidence
         )
 
+        if attributes_changed:
+            self._index_entity(existing)
         return existing
 
     def _create_unified_entity(self, entity_ref: EntityReference) -> UnifiedEntity:
@@ -297,8 +642,10 @@ class UnifiedEntityResolver:
 
     def _generate_unified_id(self, entity_ref: EntityReference) -> str:
         """Generate a unique ID for a unified entity"""
+        # The sequence keeps IDs unique when bulk resolution creates several per tick
         timestamp = datetime.now().timestamp()
-        data = f"{entity_ref.entity_type.value}:{timestamp}:{entity_ref.entity_id}"
+        data = (f"{entity_ref.entity_type.value}:{timestamp}:{next(self._id_sequence)}:"
+                f"{entity_ref.platform}:{entity_ref.entity_id}")
         return f"unified_{hashlib.sha256(data.encode()).hexdigest()[:16]}"
 
     def _extract_canonical_name(self, entity_ref: EntityReference) -> str:
@@ -311,16 +658,7 @@ class UnifiedEntityResolver:
 
     def _string_similarity(self, s1: str, s2: str) -> float:
         """Calculate string similarity using Levenshtein ratio"""
-        if s1 == s2:
-            return 1.0
-
-        len1, len2 = len(s1), len(s2)
-        if len1 == 0 or len2 == 0:
-            return 0.0
-
-        # Simple character-based similarity
-        matches = sum(1 for a, b in zip(s1, s2) if a == b)
-        return (2.0 * matches) / (len1 + len2)
+        return string_similarity(s1, s2)
 
     def _calculate_attribute_match(
         self,
@@ -387,7 +725,8 @@ class UnifiedEntityResolver:
             "total_unified_entities": len(self.entity_cache),
             "by_type": {},
             "cross_platform_entities": 0,
-            "average_references_per_entity": 0
+            "average_references_per_entity": 0,
+            "fuzzy_comparisons": sum(b.comparisons for b in self._blocking.values())
         }
 
         total_refs = 0
@@ -14,10 +14,19 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
+# NumPy import with fallback
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    logger.warning("NumPy not installed. Compact graph storage disabled.")
+
 
 class NodeType(Enum):
     """Types of nodes in the knowledge graph"""
@@ -78,6 +87,453 @@ class GraphEdge:
     created_at: datetime = field(default_factory=datetime.now)
 
 
+# Integer code of each node type in the compact layer
+_TYPE_CODES = {node_type: code for code, node_type in enumerate(NodeType)}
+
+
+@dataclass
+class _Neighborhood:
+    """BFS tree of one node out to k hops, in discovery order"""
+    nodes: Any           # node indices, start first
+    depths: Any          # hop count per node
+    parents: Any         # parent node index (-1 for the start)
+    parent_edges: Any    # edge index used to reach the node (-1 for the start)
+    interior: Set[int]   # nodes closer than k hops; new arcs from these change the tree
+    _parent_map: Optional[Dict[int, Tuple[int, int]]] = None
+
+    def parent_map(self) -> Dict[int, Tuple[int, int]]:
+        """node index -> (parent index, edge index), built on first use"""
+        if self._parent_map is None:
+            self._parent_map = dict(zip(
+                self.nodes.tolist(),
+                zip(self.parents.tolist(), self.parent_edges.tolist())
+            ))
+        return self._parent_map
+
+
+class _CompactAdjacency:
+    """
+    Integer-indexed CSR copy of the graph's adjacency lists.
+
+    Arcs follow get_neighbors(direction="both"): each edge in a node's
+    adjacency list points at its other endpoint. Forward and reverse CSR
+    arrays are kept; arcs added after a build go to a delta that is
+    folded into the arrays once it outgrows rebuild_fraction of them.
+    """
+
+    def __init__(
+        self,
+        nodes: Dict[str, GraphNode],
+        edges: Dict[str, GraphEdge],
+        adjacency: Dict[str, List[str]],
+        rebuild_fraction: float = 0.1
+    ):
+        self.rebuild_fraction = rebuild_fraction
+
+        self.node_ids: List[str] = list(nodes)
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.edge_ids: List[str] = []
+        self.edge_index: Dict[str, int] = {}
+
+        n = len(self.node_ids)
+        capacity = max(16, n)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.types[:n] = np.fromiter(
+            (_TYPE_CODES[node.node_type] for node in nodes.values()), dtype=np.int8, count=n
+        )
+
+        # Scratch BFS state, reset after every traversal
+        self._dist_forward = np.full(capacity, -1, dtype=np.int32)
+        self._dist_backward = np.full(capacity, -1, dtype=np.int32)
+        self._parent_forward = np.full(capacity, -1, dtype=np.int64)
+        self._parent_backward = np.full(capacity, -1, dtype=np.int64)
+        self._edge_forward = np.full(capacity, -1, dtype=np.int64)
+        self._edge_backward = np.full(capacity, -1, dtype=np.int64)
+
+        # Arcs not yet folded into the CSR arrays
+        self._pending_out: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self._pending_in: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        self._has_pending_out = np.zeros(capacity, dtype=bool)
+        self._has_pending_in = np.zeros(capacity, dtype=bool)
+        self._pending: List[Tuple[int, int, int]] = []
+
+        sources, targets, arc_edges = [], [], []
+        for i, node_id in enumerate(self.node_ids):
+            for edge_id in adjacency.get(node_id, ()):
+                edge = edges.get(edge_id)
+                if not edge:
+                    continue
+                neighbor_id = edge.target_id if edge.source_id == node_id else edge.source_id
+                j = self.index.get(neighbor_id)
+                if j is None:
+                    continue
+                sources.append(i)
+                targets.append(j)
+                arc_edges.append(self._edge_position(edge_id))
+
+        self._build(
+            n,
+            np.asarray(sources, dtype=np.int64),
+            np.asarray(targets, dtype=np.int64),
+            np.asarray(arc_edges, dtype=np.int64)
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_arcs(self) -> int:
+        return len(self.indices) + len(self._pending)
+
+    def _edge_position(self, edge_id: str) -> int:
+        position = self.edge_index.get(edge_id)
+        if position is None:
+            position = len(self.edge_ids)
+            self.edge_index[edge_id] = position
+            self.edge_ids.append(edge_id)
+        return position
+
+    def _build(self, n: int, sources, targets, arc_edges):
+        """Lay out forward and reverse CSR arrays (stable, so arc order is kept)"""
+        order = np.argsort(sources, kind="stable")
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+        self.indices = targets[order]
+        self.arc_edges = arc_edges[order]
+
+        order = np.argsort(targets, kind="stable")
+        self.rev_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=n), out=self.rev_indptr[1:])
+        self.rev_indices = sources[order]
+        self.rev_arc_edges = arc_edges[order]
+
+        self.num_base_nodes = n
+        self._distinct_degree = None
+
+    def _grow(self, n: int):
+        """Make room for n nodes in the per-node arrays"""
+        capacity = len(self.types)
+        if n <= capacity:
+            return
+        capacity = max(n, 2 * capacity)
+        for name, fill in (
+            ("types", 0), ("_has_pending_out", False), ("_has_pending_in", False),
+            ("_dist_forward", -1), ("_dist_backward", -1),
+            ("_parent_forward", -1), ("_parent_backward", -1),
+            ("_edge_forward", -1), ("_edge_backward", -1),
+        ):
+            old = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def add_node(self, node_id: str, node_type: NodeType):
+        """Register a new node; it has no arcs yet"""
+        if node_id in self.index:
+            self.types[self.index[node_id]] = _TYPE_CODES[node_type]
+            return
+
+        i = len(self.node_ids)
+        self._grow(i + 1)
+        self.node_ids.append(node_id)
+        self.index[node_id] = i
+        self.types[i] = _TYPE_CODES[node_type]
+
+    def add_arc(self, node_id: str, neighbor_id: str, edge_id: str) -> Optional[int]:
+        """
+        Record an arc into the delta.
+
+        Returns:
+            Index of the arc's tail node, or None if either end is unknown
+        """
+        i = self.index.get(node_id)
+        j = self.index.get(neighbor_id)
+        if i is None or j is None:
+            return None
+
+        e = self._edge_position(edge_id)
+        self._pending.append((i, j, e))
+        self._pending_out[i].append((j, e))
+        self._pending_in[j].append((i, e))
+        self._has_pending_out[i] = True
+        self._has_pending_in[j] = True
+        self._distinct_degree = None
+        return i
+
+    def refresh(self, force: bool = False):
+        """Fold the delta into the CSR arrays once it is large enough (or always, if forced)"""
+        if force:
+            if self._pending or self.num_base_nodes < self.num_nodes:
+                self._fold()
+        elif len(self._pending) > self.rebuild_fraction * max(len(self.indices), 1):
+            self._fold()
+
+    def _fold(self):
+        n = self.num_nodes
+        base_sources = np.repeat(
+            np.arange(self.num_base_nodes, dtype=np.int64), np.diff(self.indptr)
+        )
+        if self._pending:
+            pending = np.asarray(self._pending, dtype=np.int64)
+            sources = np.concatenate([base_sources, pending[:, 0]])
+            targets = np.concatenate([self.indices, pending[:, 1]])
+            arc_edges = np.concatenate([self.arc_edges, pending[:, 2]])
+        else:
+            sources, targets, arc_edges = base_sources, self.indices, self.arc_edges
+
+        self._build(n, sources, targets, arc_edges)
+        self._pending = []
+        self._pending_out.clear()
+        self._pending_in.clear()
+        self._has_pending_out[:] = False
+        self._has_pending_in[:] = False
+
+    def expand(self, frontier, reverse: bool = False):
+        """
+        All arcs leaving (or, in reverse, entering) the frontier nodes.
+
+        Arcs come out grouped by frontier node in frontier order, each
+        node's arcs in adjacency-list order, as a sequential BFS sees them.
+
+        Returns:
+            (owners, neighbors, edges) index arrays
+        """
+        if reverse:
+            indptr, indices, arc_edges = self.rev_indptr, self.rev_indices, self.rev_arc_edges
+            pending, has_pending = self._pending_in, self._has_pending_in
+        else:
+            indptr, indices, arc_edges = self.indptr, self.indices, self.arc_edges
+            pending, has_pending = self._pending_out, self._has_pending_out
+
+        positions = np.arange(len(frontier))
+        in_base = frontier < self.num_base_nodes
+        base, base_positions = frontier[in_base], positions[in_base]
+
+        starts = indptr[base]
+        counts = indptr[base + 1] - starts
+        total = int(counts.sum())
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+        owner_positions = np.repeat(base_positions, counts)
+        neighbors = indices[offsets]
+        edges = arc_edges[offsets]
+
+        hits = np.nonzero(has_pending[frontier])[0]
+        if len(hits):
+            extra = [
+                (p, j, e)
+                for p in hits.tolist()
+                for j, e in pending[int(frontier[p])]
+            ]
+            extra = np.asarray(extra, dtype=np.int64)
+            owner_positions = np.concatenate([owner_positions, extra[:, 0]])
+            neighbors = np.concatenate([neighbors, extra[:, 1]])
+            edges = np.concatenate([edges, extra[:, 2]])
+            order = np.argsort(owner_positions, kind="stable")
+            owner_positions, neighbors, edges = owner_positions[order], neighbors[order], edges[order]
+
+        return frontier[owner_positions], neighbors, edges
+
+    def _discover(self, frontier, dist, parents, parent_edges, depth: int, reverse: bool = False):
+        """Expand one BFS level; returns newly reached nodes in discovery order"""
+        owners, neighbors, edges = self.expand(frontier, reverse)
+        unseen = dist[neighbors] < 0
+        owners, neighbors, edges = owners[unseen], neighbors[unseen], edges[unseen]
+
+        _, first = np.unique(neighbors, return_index=True)
+        first.sort()
+        reached = neighbors[first]
+        dist[reached] = depth
+        parents[reached] = owners[first]
+        parent_edges[reached] = edges[first]
+        return reached
+
+    def neighborhood(self, start: int, k: int) -> _Neighborhood:
+        """BFS tree of start out to k hops"""
+        dist = self._dist_forward
+        parents, parent_edges = self._parent_forward, self._edge_forward
+
+        frontier = np.array([start], dtype=np.int64)
+        dist[start] = 0
+        parents[start] = -1
+        parent_edges[start] = -1
+        levels = [frontier]
+        try:
+            for depth in range(1, k + 1):
+                frontier = self._discover(frontier, dist, parents, parent_edges, depth)
+                if not len(frontier):
+                    break
+                levels.append(frontier)
+
+            nodes = np.concatenate(levels)
+            depths = dist[nodes].copy()
+            interior = set(nodes[depths < k].tolist())
+            return _Neighborhood(
+                nodes=nodes,
+                depths=depths,
+                parents=parents[nodes].copy(),
+                parent_edges=parent_edges[nodes].copy(),
+                interior=interior
+            )
+        finally:
+            for level in levels:
+                dist[level] = -1
+
+    def shortest_path(self, start: int, end: int, max_depth: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Bidirectional BFS between two nodes.
+
+        Expands whichever side has the smaller frontier, one full level at
+        a time, until the searches meet or max_depth hops are exhausted.
+
+        Returns:
+            [(node index, edge index used to reach it)], start edge -1
+        """
+        if start == end:
+            return [(start, -1)]
+
+        dist_f, dist_b = self._dist_forward, self._dist_backward
+        front_f = np.array([start], dtype=np.int64)
+        front_b = np.array([end], dtype=np.int64)
+        dist_f[start] = 0
+        dist_b[end] = 0
+        touched_f, touched_b = [front_f], [front_b]
+        depth_f = depth_b = 0
+        meeting = None
+
+        try:
+            while len(front_f) and len(front_b) and depth_f + depth_b < max_depth:
+                if len(front_f) <= len(front_b):
+                    depth_f += 1
+                    front_f = self._discover(
+                        front_f, dist_f, self._parent_forward, self._edge_forward, depth_f
+                    )
+                    touched_f.append(front_f)
+                    met = front_f[dist_b[front_f] >= 0]
+                    if len(met):
+                        meeting = int(met[np.argmin(dist_b[met])])
+                        break
+                else:
+                    depth_b += 1
+                    front_b = self._discover(
+                        front_b, dist_b, self._parent_backward, self._edge_backward,
+                        depth_b, reverse=True
+                    )
+                    touched_b.append(front_b)
+                    met = front_b[dist_f[front_b] >= 0]
+                    if len(met):
+                        meeting = int(met[np.argmin(dist_f[met])])
+                        break
+
+            if meeting is None:
+                return None
+
+            head = []
+            node = meeting
+            while node != start:
+                head.append((node, int(self._edge_forward[node])))
+                node = int(self._parent_forward[node])
+            head.reverse()
+
+            tail = []
+            node = meeting
+            while node != end:
+                successor = int(self._parent_backward[node])
+                tail.append((successor, int(self._edge_backward[node])))
+                node = successor
+
+            return [(start, -1)] + head + tail
+        finally:
+            for level in touched_f:
+                dist_f[level] = -1
+            for level in touched_b:
+                dist_b[level] = -1
+
+    def _distinct_degrees(self):
+        """Number of distinct neighbors per node (folded arcs only)"""
+        if self._distinct_degree is None:
+            n = self.num_base_nodes
+            sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+            pairs = np.unique(sources * n + self.indices)
+            self._distinct_degree = np.bincount(pairs // n, minlength=n)
+        return self._distinct_degree
+
+    def similar(self, node: int, limit: int) -> List[Tuple[int, float]]:
+        """Same-type nodes ranked by Jaccard similarity of neighbor sets"""
+        self.refresh(force=True)
+        n = self.num_base_nodes
+
+        neighbors = np.unique(self.indices[self.indptr[node]:self.indptr[node + 1]])
+        if not len(neighbors):
+            return []
+
+        # Nodes sharing a neighbor w are exactly the tails of w's incoming arcs
+        owners, candidates, _ = self.expand(neighbors, reverse=True)
+        pairs = np.unique(candidates * n + owners)
+        candidates, shared = np.unique(pairs // n, return_counts=True)
+
+        keep = (candidates != node) & (self.types[candidates] == self.types[node])
+        candidates, shared = candidates[keep], shared[keep]
+
+        union = len(neighbors) + self._distinct_degrees()[candidates] - shared
+        similarity = shared / union
+
+        order = np.argsort(-similarity, kind="stable")[:limit]
+        return list(zip(candidates[order].tolist(), similarity[order].tolist()))
+
+    def label_propagation(self, max_iterations: int = 10, seed: int = 0):
+        """
+        Label propagation over all nodes.
+
+        Every iteration updates a random half of the nodes, then the other
+        half, from their neighbors' current labels. A node keeps its label
+        when it ties for the most common; other ties go to the smallest
+        label. Stops early once an iteration changes nothing.
+
+        Returns:
+            Label per node index
+        """
+        self.refresh(force=True)
+        n = self.num_base_nodes
+        labels = np.arange(n, dtype=np.int64)
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        targets = self.indices
+        rng = np.random.default_rng(seed)
+
+        for _ in range(max_iterations):
+            changed = False
+            first_half = rng.random(n) < 0.5
+
+            for half in (first_half, ~first_half):
+                arcs = half[sources]
+                arc_sources = sources[arcs]
+                if not len(arc_sources):
+                    continue
+
+                keys, counts = np.unique(
+                    arc_sources * n + labels[targets[arcs]], return_counts=True
+                )
+                nodes, candidate_labels = keys // n, keys % n
+
+                # Highest count wins, the current label wins ties, then smallest label
+                score = 2 * counts + (candidate_labels == labels[nodes])
+                order = np.lexsort((candidate_labels, -score, nodes))
+                nodes, candidate_labels = nodes[order], candidate_labels[order]
+                first = np.ones(len(nodes), dtype=bool)
+                first[1:] = nodes[1:] != nodes[:-1]
+
+                winners, new_labels = nodes[first], candidate_labels[first]
+                if np.any(labels[winners] != new_labels):
+                    changed = True
+                    labels[winners] = new_labels
+
+            if not changed:
+                break
+
+        return labels
+
+
 class CrossPlatformKnowledgeGraph:
     """
     Unified knowledge graph connecting entities across all platforms.
@@ -88,14 +544,31 @@ class CrossPlatformKnowledgeGraph:
     - Graph traversal and path finding
     - Pattern detection
     - Knowledge inference
+
+    With compact storage enabled (requires NumPy), traversals run on an
+    integer-indexed CSR copy of the adjacency lists that is built on first
+    use and kept current as nodes and edges are added. k-hop neighborhoods
+    are cached and dropped when a new edge can change them.
     """
 
-    def __init__(self):
+    def __init__(self, compact_storage: bool = True, khop_cache_size: int = 1024):
+        """
+        Initialize the knowledge graph.
+
+        Args:
+            compact_storage: Run traversals on a CSR index when NumPy is available
+            khop_cache_size: Number of k-hop neighborhoods kept (0 disables the cache)
+        """
         self.nodes: Dict[str, GraphNode] = {}
         self.edges: Dict[str, GraphEdge] = {}
         self.adjacency: Dict[str, List[str]] = defaultdict(list)  # node_id -> [edge_ids]
         self.type_index: Dict[NodeType, Set[str]] = defaultdict(set)  # type -> {node_ids}
 
+        self.compact_storage = compact_storage and NUMPY_AVAILABLE
+        self.khop_cache_size = khop_cache_size
+        self._compact: Optional[_CompactAdjacency] = None
+        self._khop_cache: "OrderedDict[Tuple[int, int], _Neighborhood]" = OrderedDict()
+
     async def add_node(
         self,
         node_type: NodeType,
@@ -117,6 +590,8 @@ class CrossPlatformKnowledgeGraph:
 
         self.nodes[node_id] = node
         self.type_index[node_type].add(node_id)
+        if self._compact is not None:
+            self._compact.add_node(node_id, node_type)
 
         logger.info(f"Added node: {node_id} ({node_type.value})")
         return node
@@ -153,9 +628,11 @@ class CrossPlatformKnowledgeGraph:
 
         self.edges[edge_id] = edge
         self.adjacency[source_id].append(edge_id)
+        self._record_arc(source_id, target_id, edge_id)
 
         if bidirectional:
             self.adjacency[target_id].append(edge_id)
+            self._record_arc(target_id, source_id, edge_id)
 
         logger.info(f"Added edge: {source_id} --{edge_type.value}--> {target_id}")
         return edge
@@ -221,12 +698,23 @@ class CrossPlatformKnowledgeGraph:
         if start_id == end_id:
             return [(self.nodes[start_id], None)]
 
+        compact = self._get_compact()
+        if compact is not None:
+            compact.refresh()
+            path = compact.shortest_path(compact.index[start_id], compact.index[end_id], max_depth)
+            if path is None:
+                return None
+            return [
+                (self.nodes[compact.node_ids[i]], self.edges[compact.edge_ids[e]] if e >= 0 else None)
+                for i, e in path
+            ]
+
         # BFS
         visited = {start_id}
-        queue = [(start_id, [(self.nodes[start_id], None)])]
+        queue = deque([(start_id, [(self.nodes[start_id], None)])])
 
         while queue:
-            current_id, path = queue.pop(0)
+            current_id, path = queue.popleft()
 
             if len(path) > max_depth:
                 continue
@@ -254,12 +742,16 @@ class CrossPlatformKnowledgeGraph:
         if node_id not in self.nodes:
             return []
 
+        compact = self._get_compact()
+        if compact is not None:
+            return self._find_connections_compact(compact, node_id, target_type, max_hops)
+
         connections = []
         visited = {node_id}
-        queue = [(node_id, 0, [])]
+        queue = deque([(node_id, 0, [])])
 
         while queue:
-            current_id, depth, path = queue.pop(0)
+            current_id, depth, path = queue.popleft()
 
             if depth > max_hops:
                 continue
@@ -287,6 +779,44 @@ class CrossPlatformKnowledgeGraph:
         connections.sort(key=lambda x: x["hops"])
         return connections
 
+    def _find_connections_compact(
+        self,
+        compact: _CompactAdjacency,
+        node_id: str,
+        target_type: NodeType,
+        max_hops: int
+    ) -> List[Dict[str, Any]]:
+        """find_connections over the cached BFS tree (already in hop order)"""
+
+        start = compact.index[node_id]
+        # The start node is always expanded, so at least one hop is searched
+        tree = self._neighborhood(compact, start, max(max_hops, 1))
+
+        matches = np.nonzero(compact.types[tree.nodes] == _TYPE_CODES[target_type])[0]
+        matches = matches[tree.depths[matches] > 0]
+        if not len(matches):
+            return []
+
+        parent_map = tree.parent_map()
+        connections = []
+        for position in matches.tolist():
+            current = found = int(tree.nodes[position])
+            path = []
+            while current != start:
+                parent, edge_position = parent_map[current]
+                edge = self.edges[compact.edge_ids[edge_position]]
+                path.append((compact.node_ids[current], edge.edge_type.value))
+                current = parent
+            path.reverse()
+
+            connections.append({
+                "node": self.nodes[compact.node_ids[found]],
+                "hops": int(tree.depths[position]),
+                "path": path
+            })
+
+        return connections
+
     async def get_subgraph(
         self,
         center_id: str,
@@ -297,13 +827,23 @@ class CrossPlatformKnowledgeGraph:
         if center_id not in self.nodes:
             return {"nodes": [], "edges": []}
 
+        compact = self._get_compact()
+        if compact is not None:
+            tree = self._neighborhood(compact, compact.index[center_id], max(radius, 0))
+            interior = tree.nodes[tree.depths < radius]
+            edge_positions = np.unique(compact.expand(interior)[2]).tolist() if len(interior) else []
+            return {
+                "nodes": [self.nodes[compact.node_ids[i]] for i in tree.nodes.tolist()],
+                "edges": [self.edges[compact.edge_ids[e]] for e in edge_positions]
+            }
+
         # BFS to find all nodes within radius
         node_ids = {center_id}
         edge_ids = set()
-        queue = [(center_id, 0)]
+        queue = deque([(center_id, 0)])
 
         while queue:
-            current_id, depth = queue.pop(0)
+            current_id, depth = queue.popleft()
 
             if depth >= radius:
                 continue
@@ -335,6 +875,13 @@ class CrossPlatformKnowledgeGraph:
         if node_id not in self.nodes:
             return []
 
+        compact = self._get_compact()
+        if compact is not None:
+            return [
+                (self.nodes[compact.node_ids[i]], similarity)
+                for i, similarity in compact.similar(compact.index[node_id], limit)
+            ]
+
         node = self.nodes[node_id]
         candidates = list(self.type_index.get(node.node_type, set()))
 
@@ -375,6 +922,14 @@ class CrossPlatformKnowledgeGraph:
     async def detect_communities(self) -> Dict[int, List[str]]:
         """Detect communities in the graph using label propagation"""
 
+        compact = self._get_compact()
+        if compact is not None:
+            labels = compact.label_propagation()
+            communities = defaultdict(list)
+            for node_id, label in zip(compact.node_ids, labels.tolist()):
+                communities[label].append(node_id)
+            return dict(communities)
+
         # Simple label propagation
         labels = {node_id: i for i, node_id in enumerate(self.nodes.keys())}
 
@@ -447,6 +1002,44 @@ class CrossPlatformKnowledgeGraph:
             "source_platforms": node.source_platforms
         }
 
+    def _get_compact(self) -> Optional[_CompactAdjacency]:
+        """Compact index of the graph, built on first use; None when disabled"""
+        if not self.compact_storage:
+            return None
+        if self._compact is None:
+            self._compact = _CompactAdjacency(self.nodes, self.edges, self.adjacency)
+            self._khop_cache.clear()
+        return self._compact
+
+    def _record_arc(self, node_id: str, neighbor_id: str, edge_id: str):
+        """Mirror a new adjacency entry into the compact index and drop stale neighborhoods"""
+        if self._compact is None:
+            return
+
+        tail = self._compact.add_arc(node_id, neighbor_id, edge_id)
+        if tail is None or not self._khop_cache:
+            return
+
+        stale = [key for key, tree in self._khop_cache.items() if tail in tree.interior]
+        for key in stale:
+            del self._khop_cache[key]
+
+    def _neighborhood(self, compact: _CompactAdjacency, start: int, k: int) -> _Neighborhood:
+        """k-hop BFS tree of a node, served from the LRU cache when possible"""
+        key = (start, k)
+        tree = self._khop_cache.get(key)
+        if tree is not None:
+            self._khop_cache.move_to_end(key)
+            return tree
+
+        compact.refresh()
+        tree = compact.neighborhood(start, k)
+        if self.khop_cache_size > 0:
+            self._khop_cache[key] = tree
+            if len(self._khop_cache) > self.khop_cache_size:
+                self._khop_cache.popitem(last=False)
+        return tree
+
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge graph statistics"""
 
@@ -515,6 +1108,10 @@ class CrossPlatformKnowledgeGraph:
         del self.adjacency[remove]
         self.type_index[remove_node.node_type].discard(remove)
 
+        # Node indices shift; rebuild the compact index on next use
+        self._compact = None
+        self._khop_cache.clear()
+
         logger.info(f"Merged node {remove} into {keep}")
         return keep
 
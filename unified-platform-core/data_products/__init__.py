@@ -30,6 +30,12 @@ __version__ = "1.0.0"
 
 from .api_gateway import DataProductGateway, ProductType
 from .metering import UsageMetering, PricingTier
+from .rate_limiter import (
+    RateLimiter,
+    RateLimitWindow,
+    InMemoryRateLimitBackend,
+    RedisRateLimitBackend
+)
 from .products.finance_data_products import (
     ExtremeEventsAlertsAPI,
     MarketRegimeIndicators,
@@ -54,6 +60,10 @@ __all__ = [
     "ProductType",
     "UsageMetering",
     "PricingTier",
+    "RateLimiter",
+    "RateLimitWindow",
+    "InMemoryRateLimitBackend",
+    "RedisRateLimitBackend",
     # Finance Products
     "ExtremeEventsAlertsAPI",
     "MarketRegimeIndicators",
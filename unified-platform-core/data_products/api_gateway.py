@@ -16,6 +16,7 @@ import logging
 from functools import wraps
 
 from .metering import UsageMetering, PricingTier
+from .rate_limiter import RateLimiter, RateLimitWindow
 
 logger = logging.getLogger(__name__)
 
@@ -62,11 +63,25 @@ class DataProductGateway:
     - Product routing
     """
 
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize the gateway.
+
+        Args:
+            rate_limiter: Limiter shared with metering (in-process by default)
+        """
         self.api_keys: Dict[str, APIKey] = {}
-        self.metering = UsageMetering()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metering = UsageMetering(rate_limiter=self.rate_limiter)
         self.rate_limits = self._initialize_rate_limits()
-        self.request_counts: Dict[str, Dict[str, int]] = {}
+        self.rate_windows = {
+            tier: (
+                RateLimitWindow("minute", config.requests_per_minute, 60),
+                RateLimitWindow("hour", config.requests_per_hour, 3600),
+                RateLimitWindow("day", config.requests_per_day, 86400)
+            )
+            for tier, config in self.rate_limits.items()
+        }
 
     def _initialize_rate_limits(self) -> Dict[PricingTier, RateLimitConfig]:
         """Initialize rate limits per tier"""
@@ -166,69 +181,19 @@ class DataProductGateway:
                 "reason": "Invalid API key"
             }
 
-        rate_limit = self.rate_limits[api_key.tier]
-
-        # Initialize request counts
-        if key_id not in self.request_counts:
-            self.request_counts[key_id] = {
-                "minute": 0,
-                "hour": 0,
-                "day": 0,
-                "last_reset_minute": datetime.now(),
-                "last_reset_hour": datetime.now(),
-                "last_reset_day": datetime.now()
-            }
-
-        counts = self.request_counts[key_id]
-        now = datetime.now()
-
-        # Reset counters if needed
-        if (now - counts["last_reset_minute"]).seconds >= 60:
-            counts["minute"] = 0
-            counts["last_reset_minute"] = now
-
-        if (now - counts["last_reset_hour"]).seconds >= 3600:
-            counts["hour"] = 0
-            counts["last_reset_hour"] = now
-
-        if (now - counts["last_reset_day"]).seconds >= 86400:
-            counts["day"] = 0
-            counts["last_reset_day"] = now
-
-        # Check limits
-        if counts["minute"] >= rate_limit.requests_per_minute:
-            return {
-                "allowed": False,
-                "reason": "Rate limit exceeded (per minute)",
-                "retry_after_seconds": 60 - (now - counts["last_reset_minute"]).seconds
-            }
-
-        if counts["hour"] >= rate_limit.requests_per_hour:
-            return {
-                "allowed": False,
-                "reason": "Rate limit exceeded (per hour)",
-                "retry_after_seconds": 3600 - (now - counts["last_reset_hour"]).seconds
-            }
+        # Sliding windows over the last minute, hour and day
+        result = self.rate_limiter.hit(f"gateway:{key_id}", self.rate_windows[api_key.tier])
 
-        if counts["day"] >= rate_limit.requests_per_day:
+        if not result.allowed:
             return {
                 "allowed": False,
-                "reason": "Rate limit exceeded (per day)",
-                "retry_after_seconds": 86400 - (now - counts["last_reset_day"]).seconds
+                "reason": f"Rate limit exceeded (per {result.window})",
+                "retry_after_seconds": result.retry_after_seconds
             }
 
-        # Increment counters
-        counts["minute"] += 1
-        counts["hour"] += 1
-        counts["day"] += 1
-
         return {
             "allowed": True,
-            "remaining": {
-                "minute": rate_limit.requests_per_minute - counts["minute"],
-                "hour": rate_limit.requests_per_hour - counts["hour"],
-                "day": rate_limit.requests_per_day - counts["day"]
-            }
+            "remaining": result.remaining
         }
 
     async def process_request(
@@ -303,7 +268,7 @@ class DataProductGateway:
         if not api_key:
             return {"error": "API key not found"}
 
-        counts = self.request_counts.get(key_id, {})
+        usage = self.rate_limiter.peek(f"gateway:{key_id}", self.rate_windows[api_key.tier])
 
         return {
             "key_id": key_id[:10] + "...",
@@ -313,7 +278,7 @@ class DataProductGateway:
             "is_active": api_key.is_active,
             "created_at": api_key.created_at.isoformat(),
             "expires_at": api_key.expires_at.isoformat() if api_key.expires_at else None,
-            "requests_today": counts.get("day", 0)
+            "requests_today": usage["day"]
         }
 
 
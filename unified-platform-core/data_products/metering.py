@@ -4,12 +4,15 @@ Usage Metering and Pricing
 Tracks API usage and enforces pricing tiers for data products.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
 import logging
 
+from .rate_limiter import RateLimiter, RateLimitWindow
+
 logger = logging.getLogger(__name__)
 
 
@@ -121,6 +124,14 @@ class UsageRecord:
     cost_usd: float = 0.0
 
 
+@dataclass
+class UsageAggregate:
+    """Running usage totals for one API key in one calendar month"""
+    requests: int = 0
+    data_points: int = 0
+    cost_usd: float = 0.0
+
+
 @dataclass
 class CustomerSubscription:
     """Customer subscription details"""
@@ -145,10 +156,23 @@ class UsageMetering:
     - Usage analytics
     """
 
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize metering.
+
+        Args:
+            rate_limiter: Limiter for per-minute limits (in-process by default)
+        """
         self.usage_records: List[UsageRecord] = []
         self.subscriptions: Dict[str, CustomerSubscription] = {}
-        self.minute_counters: Dict[str, List[datetime]] = {}
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        # (api_key, "YYYY-MM") -> running totals, updated on every record
+        self.monthly_usage: Dict[Tuple[str, str], UsageAggregate] = {}
+
+        # api_key -> its records and their timestamps, sorted by timestamp
+        self._records_by_key: Dict[str, List[UsageRecord]] = {}
+        self._timestamps_by_key: Dict[str, List[datetime]] = {}
 
     def register_subscription(
         self,
@@ -218,36 +242,21 @@ class UsageMetering:
         }
 
     def _check_rate_limit(self, api_key: str, limit: int) -> bool:
-        """Check if within rate limit"""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-
-        if api_key not in self.minute_counters:
-            self.minute_counters[api_key] = []
-
-        # Clean old records
-        self.minute_counters[api_key] = [
-            t for t in self.minute_counters[api_key]
-            if t > one_minute_ago
-        ]
-
-        # Check limit
-        if len(self.minute_counters[api_key]) >= limit:
-            return False
-
-        # Record this request
-        self.minute_counters[api_key].append(now)
-        return True
+        """Check if within rate limit, counting the request if so"""
+        result = self.rate_limiter.hit(
+            f"metering:{api_key}", (RateLimitWindow("minute", limit, 60),)
+        )
+        return result.allowed
 
     def _get_monthly_usage(self, api_key: str) -> int:
         """Get total requests this month"""
-        now = datetime.now()
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        aggregate = self.monthly_usage.get((api_key, self._month_key(datetime.now())))
+        return aggregate.requests if aggregate else 0
 
-        return len([
-            r for r in self.usage_records
-            if r.api_key == api_key and r.timestamp >= month_start
-        ])
+    @staticmethod
+    def _month_key(timestamp: datetime) -> str:
+        """Calendar month a timestamp is billed in"""
+        return timestamp.strftime("%Y-%m")
 
     def record_usage(
         self,
@@ -256,15 +265,16 @@ class UsageMetering:
         method: str,
         data_points: int,
         response_time_ms: int,
-        status_code: int
+        status_code: int,
+        timestamp: Optional[datetime] = None
     ) -> UsageRecord:
-        """Record API usage"""
+        """Record API usage, at timestamp if given (e.g. when backfilling)"""
 
         # Calculate cost (for overage billing)
         cost = self._calculate_cost(api_key, data_points)
 
         record = UsageRecord(
-            timestamp=datetime.now(),
+            timestamp=timestamp or datetime.now(),
             api_key=api_key,
             endpoint=endpoint,
             method=method,
@@ -275,6 +285,21 @@ class UsageMetering:
         )
 
         self.usage_records.append(record)
+
+        # Usually an append; clock steps and backfills insert in place
+        timestamps = self._timestamps_by_key.setdefault(api_key, [])
+        position = bisect_right(timestamps, record.timestamp)
+        timestamps.insert(position, record.timestamp)
+        self._records_by_key.setdefault(api_key, []).insert(position, record)
+
+        month_key = (api_key, self._month_key(record.timestamp))
+        aggregate = self.monthly_usage.get(month_key)
+        if aggregate is None:
+            aggregate = self.monthly_usage[month_key] = UsageAggregate()
+        aggregate.requests += 1
+        aggregate.data_points += data_points
+        aggregate.cost_usd += cost
+
         return record
 
     def _calculate_cost(self, api_key: str, data_points: int) -> float:
@@ -303,10 +328,9 @@ class UsageMetering:
 
         cutoff = datetime.now() - timedelta(days=period_days)
 
-        records = [
-            r for r in self.usage_records
-            if r.api_key == api_key and r.timestamp >= cutoff
-        ]
+        # Records are kept sorted by timestamp, so the period is a suffix
+        timestamps = self._timestamps_by_key.get(api_key, [])
+        records = self._records_by_key.get(api_key, [])[bisect_left(timestamps, cutoff):]
 
         if not records:
             return {
@@ -361,18 +385,10 @@ class UsageMetering:
             month = datetime.now()
 
         month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if month.month == 12:
-            month_end = month.replace(year=month.year + 1, month=1, day=1) - timedelta(seconds=1)
-        else:
-            month_end = month.replace(month=month.month + 1, day=1) - timedelta(seconds=1)
-
-        records = [
-            r for r in self.usage_records
-            if r.api_key == api_key and month_start <= r.timestamp <= month_end
-        ]
+        usage = self.monthly_usage.get((api_key, self._month_key(month))) or UsageAggregate()
 
         base_charge = limits.price_per_month_usd
-        overage_charge = sum(r.cost_usd for r in records)
+        overage_charge = usage.cost_usd
         total_charge = base_charge + overage_charge
 
         return {
@@ -380,8 +396,8 @@ class UsageMetering:
             "period": f"{month_start.strftime('%Y-%m')}",
             "tier": subscription.tier.value,
             "base_charge": base_charge,
-            "total_requests": len(records),
-            "total_data_points": sum(r.data_points_returned for r in records),
+            "total_requests": usage.requests,
+            "total_data_points": usage.data_points,
             "overage_charge": overage_charge,
             "total_charge": total_charge,
             "generated_at": datetime.now().isoformat()
@@ -0,0 +1,248 @@
+"""
+Rate Limiting for Data Products
+
+Sliding-window counter rate limiter shared by the API gateway and
+usage metering.
+
+Each window keeps two counters: the current fixed window and the one
+before it. Usage is estimated as the previous count weighted by how much
+of it still overlaps the sliding window, plus the current count, so a
+request costs a constant number of counter reads and increments no
+matter how much traffic a key has seen.
+
+Counters live in a pluggable backend:
+- InMemoryRateLimitBackend: in-process dictionaries
+- RedisRateLimitBackend: any redis-py compatible client (redis.Redis, or
+  fakeredis.FakeRedis as a local stand-in), for limits shared across
+  processes
+"""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from abc import ABC, abstractmethod
+import math
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitWindow:
+    """A named limit over a sliding window"""
+    name: str
+    limit: int
+    seconds: int
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check"""
+    allowed: bool
+    window: Optional[str] = None  # Window that rejected the request
+    retry_after_seconds: int = 0
+    remaining: Dict[str, int] = field(default_factory=dict)
+
+
+class RateLimitBackend(ABC):
+    """Counter storage for the rate limiter"""
+
+    @abstractmethod
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        """Current value of each counter (0 if missing or expired)"""
+        pass
+
+    @abstractmethod
+    def increment_many(self, keys: Sequence[str], amount: int, ttls: Sequence[int]):
+        """Add amount to each counter, (re)setting its time to live in seconds"""
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local counters with lazy expiry"""
+
+    def __init__(self, sweep_interval: int = 10000):
+        """
+        Initialize the backend.
+
+        Args:
+            sweep_interval: Increments between sweeps of expired counters
+        """
+        self._counters: Dict[str, List[float]] = {}  # key -> [count, expires_at]
+        self._lock = threading.Lock()
+        self._sweep_interval = sweep_interval
+        self._since_sweep = 0
+
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._counters.get(key)
+                values.append(int(entry[0]) if entry and entry[1] > now else 0)
+        return values
+
+    def increment_many(self, keys: Sequence[str], amount: int, ttls: Sequence[int]):
+        now = time.monotonic()
+        with self._lock:
+            for key, ttl in zip(keys, ttls):
+                entry = self._counters.get(key)
+                if entry is None or entry[1] <= now:
+                    self._counters[key] = [amount, now + ttl]
+                else:
+                    entry[0] += amount
+                    entry[1] = now + ttl
+
+            self._since_sweep += 1
+            if self._since_sweep >= self._sweep_interval:
+                self._since_sweep = 0
+                expired = [key for key, entry in self._counters.items() if entry[1] <= now]
+                for key in expired:
+                    del self._counters[key]
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Counters in Redis, shared by every process using the same server"""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:"):
+        """
+        Initialize the backend.
+
+        Args:
+            client: Synchronous redis-py compatible client
+            prefix: Namespace for counter keys
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get_many(self, keys: Sequence[str]) -> List[int]:
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def increment_many(self, keys: Sequence[str], amount: int, ttls: Sequence[int]):
+        pipeline = self.client.pipeline()
+        for key, ttl in zip(keys, ttls):
+            pipeline.incrby(self.prefix + key, amount)
+            pipeline.expire(self.prefix + key, ttl)
+        pipeline.execute()
+
+
+class RateLimiter:
+    """
+    Sliding-window counter rate limiter.
+
+    A request is admitted only if it fits every window it is checked
+    against; rejected requests are not counted. With a shared backend the
+    check and the increment are separate round trips, so concurrent
+    callers can overshoot a limit by the number of requests in flight.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    def hit(
+        self,
+        key: str,
+        windows: Sequence[RateLimitWindow],
+        cost: int = 1,
+        now: Optional[float] = None
+    ) -> RateLimitResult:
+        """
+        Check a request against each window and count it if allowed.
+
+        Args:
+            key: Identity being limited (API key, customer, ...)
+            windows: Limits to enforce
+            cost: Units the request consumes
+            now: Unix timestamp (defaults to the current time)
+
+        Returns:
+            RateLimitResult with remaining capacity per window
+        """
+        if now is None:
+            now = time.time()
+
+        counter_keys, counts = self._read(key, windows, now)
+
+        remaining = {}
+        for i, window in enumerate(windows):
+            previous, current = counts[2 * i], counts[2 * i + 1]
+            elapsed = now % window.seconds
+            used = self._estimate(previous, current, elapsed, window.seconds)
+
+            if used + cost > window.limit:
+                return RateLimitResult(
+                    allowed=False,
+                    window=window.name,
+                    retry_after_seconds=self._retry_after(
+                        window, previous, current, elapsed, cost
+                    ),
+                    remaining={window.name: 0}
+                )
+            remaining[window.name] = int(window.limit - used - cost)
+
+        current_keys = counter_keys[1::2]
+        self.backend.increment_many(
+            current_keys, cost, [2 * window.seconds for window in windows]
+        )
+        return RateLimitResult(allowed=True, remaining=remaining)
+
+    def peek(
+        self,
+        key: str,
+        windows: Sequence[RateLimitWindow],
+        now: Optional[float] = None
+    ) -> Dict[str, int]:
+        """Estimated usage in each window, without counting a request"""
+        if now is None:
+            now = time.time()
+
+        _, counts = self._read(key, windows, now)
+        return {
+            window.name: int(round(self._estimate(
+                counts[2 * i], counts[2 * i + 1], now % window.seconds, window.seconds
+            )))
+            for i, window in enumerate(windows)
+        }
+
+    def _read(
+        self,
+        key: str,
+        windows: Sequence[RateLimitWindow],
+        now: float
+    ) -> Tuple[List[str], List[int]]:
+        """Fetch (previous, current) counters for every window in one backend call"""
+        counter_keys = []
+        for window in windows:
+            index = int(now // window.seconds)
+            counter_keys.append(f"{key}:{window.name}:{index - 1}")
+            counter_keys.append(f"{key}:{window.name}:{index}")
+        return counter_keys, self.backend.get_many(counter_keys)
+
+    @staticmethod
+    def _estimate(previous: int, current: int, elapsed: float, seconds: int) -> float:
+        """Requests in the sliding window ending now"""
+        return previous * (1 - elapsed / seconds) + current
+
+    @staticmethod
+    def _retry_after(
+        window: RateLimitWindow,
+        previous: int,
+        current: int,
+        elapsed: float,
+        cost: int
+    ) -> int:
+        """Seconds until the window has room for cost more units"""
+        allowance = window.limit - cost
+        if allowance < 0:
+            return window.seconds
+
+        if current > allowance:
+            # Wait for the next window, then for the current count to decay
+            wait = window.seconds - elapsed
+            wait += window.seconds * max(0.0, 1 - allowance / current)
+        else:
+            wait = window.seconds * (1 - (allowance - current) / previous) - elapsed
+
+        return max(1, math.ceil(wait))
@@ -0,0 +1,196 @@
+"""
+Tests for cross-platform entity resolution.
+"""
+
+import asyncio
+import random
+import string
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add package root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cross_platform_intelligence.entity_resolver import (
+    EntityReference,
+    EntityType,
+    UnifiedEntityResolver,
+    _BlockingIndex,
+    edit_distance,
+    string_similarity,
+)
+
+
+def dp_distance(s1: str, s2: str) -> int:
+    """Reference Levenshtein distance by dynamic programming."""
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, start=1):
+        current = [i]
+        for j, c2 in enumerate(s2, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (c1 != c2)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def mutate(rng: random.Random, text: str, edits: int, alphabet: str) -> str:
+    """Apply random insertions, deletions and substitutions."""
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.randrange(3)
+        position = rng.randrange(len(chars) + 1)
+        if op == 0 or not chars:
+            chars.insert(position, rng.choice(alphabet))
+        elif op == 1:
+            del chars[min(position, len(chars) - 1)]
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice(alphabet)
+    return "".join(chars)
+
+
+def test_edit_distance_matches_dynamic_programming():
+    """Bit-parallel distance equals the DP distance, including past 64 characters."""
+    rng = random.Random(7)
+    alphabet = "abcde"
+
+    cases = [("", ""), ("", "abc"), ("kitten", "sitting"), ("flaw", "lawn")]
+    for length in [1, 5, 31, 63, 64, 65, 100, 150]:
+        for _ in range(10):
+            s1 = "".join(rng.choice(alphabet) for _ in range(length))
+            cases.append((s1, mutate(rng, s1, rng.randrange(length // 2 + 2), alphabet)))
+
+    for s1, s2 in cases:
+        expected = dp_distance(s1, s2)
+        assert edit_distance(s1, s2) == expected
+        assert edit_distance(s2, s1) == expected
+
+        # Bounded mode is exact up to the bound and saturates above it
+        for bound in [0, 1, expected - 1, expected, expected + 3]:
+            if bound < 0:
+                continue
+            assert edit_distance(s1, s2, bound) == min(expected, bound + 1)
+
+
+def test_string_similarity_edges():
+    """Similarity is a Levenshtein ratio over the longer string."""
+    assert string_similarity("", "") == 1.0
+    assert string_similarity("abc", "") == 0.0
+    assert string_similarity("kitten", "sitting") == pytest.approx(1 - 3 / 7)
+
+
+def brute_force_match(rule, entities, attributes):
+    """Full-scan scoring with the same rule as _BlockingIndex.match."""
+    scores = {}
+    for unified_id, values in entities.items():
+        total, count = 0.0, 0
+        for f in rule["exact_fields"]:
+            if attributes.get(f) and values.get(f) == attributes[f]:
+                total += 1.0
+                count += 1
+        for f in rule["fuzzy_fields"]:
+            if attributes.get(f) and values.get(f):
+                similarity = string_similarity(str(attributes[f]).lower(), str(values[f]).lower())
+                if similarity >= rule["fuzzy_threshold"]:
+                    total += similarity
+                    count += 1
+        if count and total / count >= 0.7:
+            scores[unified_id] = total / count
+    return scores
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.85, 0.9, 0.95])
+def test_blocking_matches_brute_force(threshold):
+    """Blocking returns exactly the full-scan matches at every threshold."""
+    rng = random.Random(int(threshold * 100))
+    alphabet = string.ascii_lowercase[:8] + " "
+    rule = {
+        "exact_fields": ["email"],
+        "fuzzy_fields": ["name"],
+        "fuzzy_threshold": threshold,
+    }
+
+    bases = ["".join(rng.choice(alphabet) for _ in range(rng.randint(3, 24))) for _ in range(40)]
+    entities = {}
+    for i in range(300):
+        base = rng.choice(bases)
+        entities[f"e{i}"] = {
+            "name": mutate(rng, base, rng.randrange(4), alphabet),
+            "email": f"user{rng.randrange(50)}@example.com" if rng.random() < 0.3 else None,
+        }
+
+    index = _BlockingIndex(rule)
+    for unified_id, values in entities.items():
+        index.index(unified_id, values)
+
+    # Re-index and remove some entities so stale postings would show up
+    for i in range(0, 300, 7):
+        entities[f"e{i}"]["name"] = mutate(rng, entities[f"e{i}"]["name"], 2, alphabet)
+        index.index(f"e{i}", entities[f"e{i}"])
+    for i in range(3, 300, 11):
+        index.remove(f"e{i}")
+        del entities[f"e{i}"]
+
+    for _ in range(60):
+        query = {
+            "name": mutate(rng, rng.choice(bases), rng.randrange(4), alphabet),
+            "email": f"user{rng.randrange(50)}@example.com" if rng.random() < 0.3 else None,
+        }
+        found = index.match(query)
+        expected = brute_force_match(rule, entities, query)
+        assert found.keys() == expected.keys()
+        for unified_id, score in expected.items():
+            assert found[unified_id] == pytest.approx(score)
+
+
+def reference(i: int, platform: str, **attributes) -> EntityReference:
+    return EntityReference(
+        entity_id=str(i),
+        platform=platform,
+        entity_type=EntityType.PERSON,
+        attributes=attributes,
+        confidence=0.9,
+    )
+
+
+def test_resolve_bulk_matches_batch_resolution():
+    """Bulk resolution groups references exactly like one-by-one resolution."""
+    rng = random.Random(3)
+    people = [("Alice Johnson", "alice@example.com"), ("Bob Smith", "bob@example.com"),
+              ("Carol Diaz", "carol@example.com"), ("Dan Brown", "dan@example.com")]
+
+    refs = []
+    for i in range(200):
+        name, email = rng.choice(people)
+        platform = rng.choice(["bond_ai", "labor", "finance"])
+        if rng.random() < 0.5:
+            refs.append(reference(i, platform, email=email))
+        else:
+            refs.append(reference(i, platform, name=mutate(rng, name, rng.randrange(2), "xyz")))
+    # The same reference twice stays with its first entity
+    refs.append(refs[0])
+
+    def groups(entities):
+        by_id = {}
+        for position, entity in enumerate(entities):
+            by_id.setdefault(entity.unified_id, []).append(position)
+        return sorted(by_id.values())
+
+    batch = asyncio.run(UnifiedEntityResolver().resolve_batch(refs))
+    bulk_resolver = UnifiedEntityResolver()
+    bulk = asyncio.run(bulk_resolver.resolve_bulk(refs, chunk_size=17))
+
+    assert len(bulk) == len(refs)
+    assert groups(bulk) == groups(batch)
+    assert bulk[-1] is bulk[0]
+
+    # References sharing an email land in one entity
+    by_email = {}
+    for ref, entity in zip(refs, bulk):
+        if "email" in ref.attributes:
+            by_email.setdefault(ref.attributes["email"], set()).add(entity.unified_id)
+    assert all(len(ids) == 1 for ids in by_email.values())
@@ -0,0 +1,131 @@
+"""
+Tests for the knowledge graph's compact (CSR) traversals.
+
+Each query runs on the compact index and on the original dictionary walk
+over the same graph, with nodes and edges added between rounds so the
+incremental CSR updates and k-hop cache invalidation are exercised.
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add package root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cross_platform_intelligence.knowledge_graph import (
+    NUMPY_AVAILABLE,
+    CrossPlatformKnowledgeGraph,
+    EdgeType,
+    NodeType,
+)
+
+pytestmark = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="compact storage requires NumPy")
+
+NODE_TYPES = [NodeType.PERSON, NodeType.COMPANY, NodeType.SKILL]
+EDGE_TYPES = [EdgeType.WORKS_AT, EdgeType.KNOWS, EdgeType.HAS_SKILL]
+
+
+async def grow(graph, rng, node_ids, nodes: int, edges: int):
+    """Add random nodes and edges, some of them bidirectional."""
+    for _ in range(nodes):
+        node = await graph.add_node(rng.choice(NODE_TYPES), f"node {len(node_ids)}")
+        node_ids.append(node.node_id)
+    for _ in range(edges):
+        source, target = rng.sample(node_ids, 2)
+        await graph.add_edge(
+            rng.choice(EDGE_TYPES), source, target, bidirectional=rng.random() < 0.3
+        )
+
+
+async def both_ways(graph, method, *args, **kwargs):
+    """Run a query on the compact index and on the dictionary walk."""
+    graph.compact_storage = True
+    compact = await getattr(graph, method)(*args, **kwargs)
+    graph.compact_storage = False
+    walked = await getattr(graph, method)(*args, **kwargs)
+    graph.compact_storage = True
+    return compact, walked
+
+
+def assert_valid_path(graph, path, start_id, end_id):
+    """Consecutive path nodes are joined by the edge recorded for the step."""
+    assert path[0][0].node_id == start_id
+    assert path[-1][0].node_id == end_id
+    for (previous, _), (node, edge) in zip(path, path[1:]):
+        assert {edge.source_id, edge.target_id} == {previous.node_id, node.node_id}
+
+
+async def check_round(graph, rng, node_ids):
+    for _ in range(40):
+        start_id, end_id = rng.sample(node_ids, 2)
+        max_depth = rng.randint(1, 6)
+        compact, walked = await both_ways(graph, "find_path", start_id, end_id, max_depth=max_depth)
+        assert (compact is None) == (walked is None)
+        if compact is not None:
+            assert len(compact) == len(walked)
+            assert_valid_path(graph, compact, start_id, end_id)
+
+    for _ in range(20):
+        center = rng.choice(node_ids)
+        max_hops = rng.randint(1, 4)
+        target_type = rng.choice(NODE_TYPES)
+        compact, walked = await both_ways(graph, "find_connections", center, target_type, max_hops=max_hops)
+        assert {c["node"].node_id: c["hops"] for c in compact} == {
+            c["node"].node_id: c["hops"] for c in walked
+        }
+        hops = [c["hops"] for c in compact]
+        assert hops == sorted(hops)
+        assert all(len(c["path"]) == c["hops"] for c in compact)
+
+        radius = rng.randint(0, 3)
+        compact, walked = await both_ways(graph, "get_subgraph", center, radius=radius)
+        assert {n.node_id for n in compact["nodes"]} == {n.node_id for n in walked["nodes"]}
+        assert {e.edge_id for e in compact["edges"]} == {e.edge_id for e in walked["edges"]}
+
+        compact, walked = await both_ways(graph, "find_similar_nodes", center, limit=len(node_ids))
+        assert {n.node_id: s for n, s in compact} == pytest.approx({n.node_id: s for n, s in walked})
+
+
+def test_compact_traversals_match_dictionary_walk():
+    """Paths, connections, subgraphs and similarity agree after interleaved adds."""
+    async def run():
+        rng = random.Random(11)
+        graph = CrossPlatformKnowledgeGraph(khop_cache_size=64)
+        node_ids = []
+
+        await grow(graph, rng, node_ids, nodes=60, edges=90)
+        for _ in range(4):
+            await check_round(graph, rng, node_ids)
+            # Repeat queries are answered from the k-hop cache; new edges must evict them
+            await check_round(graph, rng, node_ids)
+            await grow(graph, rng, node_ids, nodes=15, edges=40)
+        await check_round(graph, rng, node_ids)
+
+    asyncio.run(run())
+
+
+def test_new_edge_invalidates_cached_neighborhood():
+    """A cached k-hop result picks up an edge added inside its interior."""
+    async def run():
+        graph = CrossPlatformKnowledgeGraph()
+        a = await graph.add_node(NodeType.PERSON, "a")
+        b = await graph.add_node(NodeType.PERSON, "b")
+        company = await graph.add_node(NodeType.COMPANY, "acme")
+        await graph.add_edge(EdgeType.KNOWS, a.node_id, b.node_id)
+
+        assert await graph.find_connections(a.node_id, NodeType.COMPANY, max_hops=2) == []
+        assert graph._khop_cache
+
+        await graph.add_edge(EdgeType.WORKS_AT, b.node_id, company.node_id)
+        connections = await graph.find_connections(a.node_id, NodeType.COMPANY, max_hops=2)
+        assert [(c["node"].node_id, c["hops"]) for c in connections] == [(company.node_id, 2)]
+
+        path = await graph.find_path(a.node_id, company.node_id)
+        assert [node.node_id for node, _ in path] == [a.node_id, b.node_id, company.node_id]
+        assert await graph.find_path(a.node_id, company.node_id, max_depth=1) is None
+
+    asyncio.run(run())
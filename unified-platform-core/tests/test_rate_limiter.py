@@ -0,0 +1,265 @@
+"""
+Tests for the sliding-window rate limiter and its users.
+"""
+
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add package root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_products.api_gateway import DataProductGateway, ProductType
+from data_products.metering import CustomerSubscription, PricingTier, UsageMetering
+from data_products.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitWindow,
+    RedisRateLimitBackend,
+)
+
+
+class StandInRedis:
+    """
+    Minimal redis-py compatible client: MGET, INCRBY and EXPIRE in a pipeline.
+
+    Expiry follows a settable clock so tests can age keys without sleeping.
+    """
+
+    def __init__(self):
+        self.clock = 0.0
+        self.data = {}  # key -> (bytes value, expires_at or None)
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock:
+            del self.data[key]
+            return None
+        return value
+
+    def mget(self, keys):
+        return [self._get(key) for key in keys]
+
+    def incrby(self, key, amount):
+        value = int(self._get(key) or 0) + amount
+        expires_at = self.data[key][1] if key in self.data else None
+        self.data[key] = (str(value).encode(), expires_at)
+        return value
+
+    def expire(self, key, seconds):
+        if self._get(key) is None:
+            return False
+        self.data[key] = (self.data[key][0], self.clock + seconds)
+        return True
+
+    def pipeline(self):
+        return _StandInPipeline(self)
+
+
+class _StandInPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def incrby(self, key, amount):
+        self.commands.append((self.client.incrby, key, amount))
+        return self
+
+    def expire(self, key, seconds):
+        self.commands.append((self.client.expire, key, seconds))
+        return self
+
+    def execute(self):
+        results = [command(*args) for command, *args in self.commands]
+        self.commands = []
+        return results
+
+
+def in_memory_backend():
+    return InMemoryRateLimitBackend()
+
+
+def redis_backend():
+    return RedisRateLimitBackend(StandInRedis())
+
+
+BACKENDS = [in_memory_backend, redis_backend]
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_limit_within_one_window(make_backend):
+    """Requests are admitted up to the limit and rejected ones are not counted."""
+    limiter = RateLimiter(make_backend())
+    window = RateLimitWindow("minute", 5, 60)
+    now = 6000.0  # Start of a window, so nothing carries over
+
+    results = [limiter.hit("key", [window], now=now + i) for i in range(7)]
+    assert [r.allowed for r in results] == [True] * 5 + [False] * 2
+    assert [r.remaining["minute"] for r in results[:5]] == [4, 3, 2, 1, 0]
+    assert results[5].window == "minute"
+    assert limiter.peek("key", [window], now=now + 7) == {"minute": 5}
+
+    # Other keys have their own counters
+    assert limiter.hit("other", [window], now=now).allowed
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_previous_window_decays_linearly(make_backend):
+    """The previous window counts in proportion to its remaining overlap."""
+    limiter = RateLimiter(make_backend())
+    window = RateLimitWindow("minute", 10, 60)
+
+    for i in range(10):
+        assert limiter.hit("key", [window], now=6000.0 + i).allowed
+
+    # A quarter into the next window, three quarters of the old count remain
+    assert limiter.peek("key", [window], now=6075.0) == {"minute": 8}
+    assert limiter.hit("key", [window], now=6075.0).allowed
+    assert limiter.hit("key", [window], now=6075.0).allowed
+    assert not limiter.hit("key", [window], now=6075.0).allowed
+
+    # The two late requests decay through the following window, then vanish
+    assert limiter.peek("key", [window], now=6150.0) == {"minute": 1}
+    assert limiter.peek("key", [window], now=6180.0) == {"minute": 0}
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_every_window_must_have_room(make_backend):
+    """The tightest window rejects, and the request is not counted anywhere."""
+    limiter = RateLimiter(make_backend())
+    windows = [RateLimitWindow("minute", 100, 60), RateLimitWindow("hour", 3, 3600)]
+
+    for i in range(3):
+        assert limiter.hit("key", windows, now=36000.0 + i).allowed
+    rejected = limiter.hit("key", windows, now=36010.0)
+    assert not rejected.allowed and rejected.window == "hour"
+    assert limiter.peek("key", windows, now=36010.0) == {"minute": 3, "hour": 3}
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_retry_after_is_the_earliest_admission(make_backend):
+    """Waiting retry_after admits the request; waiting one second less does not."""
+    rng = random.Random(5)
+    rejections = 0
+
+    for _ in range(300):
+        limit = rng.randint(1, 20)
+        seconds = rng.choice([10, 60, 3600])
+        cost = rng.randint(1, limit)
+        window = RateLimitWindow("w", limit, seconds)
+
+        # Random traffic over the previous and the current window
+        times = []
+        now = 1_000_000.0 * seconds
+        for _ in range(rng.randint(0, 3 * limit)):
+            now += rng.uniform(0, seconds / limit)
+            times.append(now)
+
+        def replay():
+            limiter = RateLimiter(make_backend())
+            for t in times:
+                limiter.hit("key", [window], now=t)
+            return limiter
+
+        result = replay().hit("key", [window], cost=cost, now=now)
+        if result.allowed:
+            continue
+        rejections += 1
+
+        retry = result.retry_after_seconds
+        assert 1 <= retry <= 2 * seconds
+        assert replay().hit("key", [window], cost=cost, now=now + retry).allowed
+        if retry > 1:
+            assert not replay().hit("key", [window], cost=cost, now=now + retry - 1).allowed
+
+    assert rejections > 50
+
+
+def test_redis_counters_expire():
+    """Counters are written with a TTL of two windows."""
+    client = StandInRedis()
+    limiter = RateLimiter(RedisRateLimitBackend(client, prefix="rl:"))
+    window = RateLimitWindow("minute", 5, 60)
+    limiter.hit("key", [window], now=6000.0)
+
+    assert list(client.data) == ["rl:key:minute:100"]
+    client.clock = 119.0
+    assert client.mget(["rl:key:minute:100"]) == [b"1"]
+    client.clock = 120.0
+    assert client.mget(["rl:key:minute:100"]) == [None]
+
+
+def test_gateway_enforces_tier_windows():
+    """The gateway rejects past the per-minute limit and reports a retry delay."""
+    async def run():
+        gateway = DataProductGateway()
+        api_key = await gateway.create_api_key("customer", PricingTier.FREE, [ProductType.FINANCE])
+
+        checks = [await gateway.check_rate_limit(api_key.key_id, ProductType.FINANCE) for _ in range(11)]
+        assert all(check["allowed"] for check in checks[:10])
+        assert checks[9]["remaining"]["minute"] == 0
+        assert checks[9]["remaining"]["hour"] == 90
+
+        rejected = checks[10]
+        assert not rejected["allowed"]
+        assert rejected["reason"] == "Rate limit exceeded (per minute)"
+        assert 1 <= rejected["retry_after_seconds"] <= 120
+
+    asyncio.run(run())
+
+
+def test_metering_shares_the_limiter():
+    """Metering applies the tier's per-minute limit through the same limiter."""
+    async def run():
+        limiter = RateLimiter(RedisRateLimitBackend(StandInRedis()))
+        metering = UsageMetering(rate_limiter=limiter)
+        metering.register_subscription(CustomerSubscription(
+            customer_id="customer",
+            api_key="key",
+            tier=PricingTier.FREE,
+            products=["finance"],
+            start_date=datetime.now(),
+            end_date=None,
+            monthly_spend_limit=None,
+        ))
+
+        assert (await metering.check_limits("key", "/finance"))["allowed"]
+        second = await metering.check_limits("key", "/finance")
+        assert not second["allowed"]
+        assert second["reason"] == "Rate limit exceeded: 1/minute"
+
+    asyncio.run(run())
+
+
+def test_usage_stats_cover_the_wall_clock_period():
+    """Usage stats count records by their timestamps, whatever order they arrive in."""
+    metering = UsageMetering()
+    now = datetime.now()
+    days_ago = [0.5, 45, 3, 29.9, 31, 0, 10, 90, 1]
+    for i, days in enumerate(days_ago):
+        status = 500 if i % 3 == 0 else 200
+        metering.record_usage("key", "/finance", "GET", i, 20, status, timestamp=now - timedelta(days=days))
+    metering.record_usage("other", "/jobs", "GET", 100, 20, 200, timestamp=now)
+
+    timestamps = metering._timestamps_by_key["key"]
+    assert timestamps == sorted(timestamps)
+    assert [r.timestamp for r in metering._records_by_key["key"]] == timestamps
+
+    for period_days in [1, 7, 30, 60, 365]:
+        expected = [i for i, days in enumerate(days_ago) if days < period_days]
+        stats = metering.get_usage_stats("key", period_days=period_days)
+        assert stats["total_requests"] == len(expected)
+        assert stats["total_data_points"] == sum(expected)
+        assert stats["error_rate"] == len([i for i in expected if i % 3 == 0]) / len(expected)
+
+    # Unstamped records are recorded now
+    metering.record_usage("key", "/finance", "GET", 5, 20, 200)
+    assert metering.get_usage_stats("key", period_days=1)["total_requests"] == 3
+    assert metering.get_usage_stats("missing")["total_requests"] == 0